@@ -0,0 +1,49 @@
+"""
+ETag / If-None-Match for polled endpoints.
+
+Every write bumps a version per collection (medicines, inventory, alerts,
+suppliers) in the data layer. ``etag(...)`` is a route dependency that
+builds a strong ETag from the versions the endpoint reads and answers
+``304 Not Modified`` when the client already has it. Dependencies run
+before the endpoint, so a 304 never loads or serializes any data.
+
+Usage:
+    @router.get("/categories", dependencies=[Depends(etag("medicines"))])
+"""
+
+from datetime import date
+
+from fastapi import HTTPException, Request, Response
+
+from services.data_source import get_collection_version
+
+
+def _matches(if_none_match: str, tag: str):
+    """Does an If-None-Match header value match ``tag``?"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (value.strip() for value in if_none_match.split(","))
+    return any(value.removeprefix("W/") == tag for value in candidates)
+
+
+def etag(*collections: str, daily: bool = False):
+    """
+    Dependency for an endpoint whose response only depends on ``collections``.
+    Set ``daily`` when the response also depends on today's date
+    (e.g. "expiring within 30 days").
+    """
+    prefix = "-".join(collections)
+
+    def check_etag(request: Request, response: Response):
+        version = get_collection_version(collections)
+        if daily:
+            version = f"{version}.{date.today().isoformat()}"
+        tag = f'"{prefix}.{version}"'
+
+        headers = {"ETag": tag, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, tag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+    return check_etag
@@ -2,6 +2,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import os
 
+from core.database import get_pool_stats
+from services.data_source import result_cache
+
 # Import API routers
 from api.v1 import inventory, analytics, alerts
 from features.rag_safety import router as safety_router
@@ -27,6 +30,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],  # Pagination cursor, cache validator
 )
 
 # Include API routers
@@ -61,6 +65,24 @@ def health_check():
     }
 
 
+@app.get("/health/db-pool")
+def db_pool_stats():
+    """Connection pool usage of this worker: checked-out connections, overflow, wait times"""
+    return get_pool_stats()
+
+
+@app.get("/health/result-cache")
+def result_cache_stats():
+    """Result cache of this worker: hits, misses, evictions, invalidations and memory use"""
+    return result_cache.stats()
+
+
+@app.get("/health/alert-stream")
+def alert_stream_stats():
+    """Alert stream of this worker: connected clients, events and polls"""
+    return alerts.alert_hub.stats()
+
+
 @app.get("/api/v1/status")
 def api_status():
     """API status endpoint - Lists all available endpoints"""
@@ -71,11 +93,21 @@ def api_status():
             "inventory": [
                 "GET /api/v1/inventory/medicines",
                 "GET /api/v1/inventory/medicines/{id}",
+                "POST /api/v1/inventory/medicines/batch",
                 "GET /api/v1/inventory/inventory",
+                "POST /api/v1/inventory/inventory/batch",
                 "GET /api/v1/inventory/low-stock",
+                "POST /api/v1/inventory/inventory/reorder-points",
                 "GET /api/v1/inventory/expiring-soon",
+                "GET /api/v1/inventory/expired",
                 "GET /api/v1/inventory/categories",
                 "GET /api/v1/inventory/stats",
+                "POST /api/v1/inventory/inventory/import",
+                "POST /api/v1/inventory/inventory/{id}/movements",
+                "GET /api/v1/inventory/inventory/{id}/movements",
+                "GET /api/v1/inventory/inventory/{id}/stock",
+                "POST /api/v1/inventory/inventory/{id}/sales",
+                "GET /api/v1/inventory/medicines/{id}/consumption",
             ],
             "analytics": [
                 "GET /api/v1/analytics/dashboard",
@@ -83,12 +115,20 @@ def api_status():
                 "GET /api/v1/analytics/category-distribution",
                 "GET /api/v1/analytics/inventory-value",
                 "GET /api/v1/analytics/top-medicines",
+                "POST /api/v1/analytics/rollups/reconcile",
+                "GET /api/v1/analytics/export/summary",
+                "GET /api/v1/analytics/export/{collection}",
                 "GET /api/v1/analytics/supplier-performance",
             ],
             "alerts": [
                 "GET /api/v1/alerts/",
                 "GET /api/v1/alerts/unread-count",
+                "GET /api/v1/alerts/stream",
                 "GET /api/v1/alerts/stats",
+                "POST /api/v1/alerts/batch",
+                "POST /api/v1/alerts/sweep",
+                "POST /api/v1/alerts/archive",
+                "POST /api/v1/alerts/counters/reconcile",
                 "PUT /api/v1/alerts/{id}/acknowledge",
                 "PUT /api/v1/alerts/{id}/resolve",
                 "DELETE /api/v1/alerts/{id}",
@@ -3,16 +3,36 @@ Alerts API Endpoints
 Manages system alerts and notifications.
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
-from pydantic import BaseModel
-from services.mock_data import (
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+from api.etag import etag
+from api.fast_json import project, records_response
+from services.alert_hub import AlertHub
+from services.data_source import (
+    acknowledge_alert as mark_acknowledged,
+    dismiss_alert as delete_alert,
+    get_alert_counts,
     get_all_alerts,
+    get_alert_by_id,
+    get_alerts_by_ids,
+    get_alerts_page,
+    get_archived_alerts_page,
+    archive_alerts,
+    get_collection_version,
+    get_latest_alert_id,
     get_unread_alerts_count,
+    reconcile_alert_counters,
+    resolve_alert as mark_resolved,
+    sweep_alerts,
 )
 
 router = APIRouter()
 
+MAX_BATCH_IDS = 1000
+HISTORY_PAGE_SIZE = 100  # History listings are always paged
+
 
 # ==================== PYDANTIC SCHEMAS ====================
 
@@ -26,28 +46,74 @@ class AlertResponse(BaseModel):
     medicine_id: Optional[int]
     inventory_id: Optional[int]
     status: str
+    condition: Optional[str] = None
+    occurrences: int = 1
+    last_triggered_at: Optional[str] = None
     created_at: str
     acknowledged_at: Optional[str]
     resolved_at: Optional[str]
+    archived_at: Optional[str] = None
+
+
+class BatchRequest(BaseModel):
+    """IDs to fetch in one request"""
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_IDS)
+
+
+class AlertBatchResponse(BaseModel):
+    """Alerts found, in request order, and the IDs that do not exist"""
+    items: List[AlertResponse]
+    missing: List[int]
 
 
 class AlertStats(BaseModel):
     """Alert statistics"""
     total: int
     unread: int
+    acknowledged: int
+    resolved: int
     critical: int
     high: int
     medium: int
     low: int
+    by_type: Dict[str, int]
+
+
+def _stream_page(limit: int, after: int = None):
+    """New alerts for the stream, reduced to the AlertResponse fields"""
+    alerts, next_cursor = get_alerts_page(limit, after)
+    return project(alerts, AlertResponse), next_cursor
+
+
+# Push channel of this worker (GET /stream)
+alert_hub = AlertHub(get_collection_version, _stream_page, get_unread_alerts_count, get_latest_alert_id)
+
+
+def _history_page(limit: int, after: int, status: str, priority: str, alert_type: str):
+    """
+    One keyset page over the hot and the archived alerts. Ids are unique
+    across both tables, so the first ``limit`` of the two pages merged by
+    id are the page of the union.
+    """
+    hot, hot_next = get_alerts_page(limit, after, status, priority, alert_type)
+    archived, archived_next = get_archived_alerts_page(limit, after, status, priority, alert_type)
+    merged = sorted(hot + archived, key=lambda alert: alert["id"])
+    more = len(merged) > limit or hot_next is not None or archived_next is not None
+    merged = merged[:limit]
+    return merged, merged[-1]["id"] if more and merged else None
 
 
 # ==================== ALERT ENDPOINTS ====================
 
-@router.get("/", response_model=List[AlertResponse])
+@router.get("/", response_model=List[AlertResponse], dependencies=[Depends(etag("alerts"))])
 def list_alerts(
+    response: Response,
     status: Optional[str] = Query(None, description="Filter by status (unread/acknowledged/resolved)"),
     priority: Optional[str] = Query(None, description="Filter by priority (critical/high/medium/low)"),
     alert_type: Optional[str] = Query(None, description="Filter by type (low_stock/expiry/anomaly)"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (omit for all)"),
+    after: Optional[int] = Query(None, description="Cursor: return alerts after this ID"),
+    history: bool = Query(False, description="Include archived alerts (always paged)"),
 ):
     """
     Get list of all alerts.
@@ -55,7 +121,23 @@ def list_alerts(
     - **status**: Filter by alert status (optional)
     - **priority**: Filter by priority level (optional)
     - **alert_type**: Filter by alert type (optional)
+    - **limit** / **after**: Keyset pagination. The cursor for the next page
+      is returned in the `X-Next-Cursor` header (absent on the last page).
+    - **history**: Also list archived alerts (resolved alerts past the
+      retention age). Without it only the hot alerts table is read.
     """
+    if history:
+        alerts, next_cursor = _history_page(limit or HISTORY_PAGE_SIZE, after, status, priority, alert_type)
+        if next_cursor is not None:
+            response.headers["X-Next-Cursor"] = str(next_cursor)
+        return records_response(alerts, AlertResponse, response)
+    
+    if limit:
+        alerts, next_cursor = get_alerts_page(limit, after, status, priority, alert_type)
+        if next_cursor is not None:
+            response.headers["X-Next-Cursor"] = str(next_cursor)
+        return records_response(alerts, AlertResponse, response)
+    
     alerts = get_all_alerts()
     
     # Apply filters
@@ -68,10 +150,10 @@ def list_alerts(
     if alert_type:
         alerts = [a for a in alerts if a["alert_type"] == alert_type]
     
-    return alerts
+    return records_response(alerts, AlertResponse, response)
 
 
-@router.get("/unread-count")
+@router.get("/unread-count", dependencies=[Depends(etag("alerts"))])
 def get_unread_count():
     """
     Get count of unread alerts.
@@ -84,26 +166,119 @@ def get_unread_count():
     }
 
 
-@router.get("/stats", response_model=AlertStats)
+@router.get("/stream")
+async def stream_alerts(last_event_id: Optional[str] = Header(None)):
+    """
+    Server-Sent Events stream of new alerts and unread-count changes.
+    Replaces polling /unread-count for the notification badge.
+    
+    - `unread`: `{"unread_count", "delta"}`, sent on connect and on every change
+    - `alerts`: `{"alerts": [...]}`, new alerts; the event id is the last alert ID.
+      Repeats folded into an open alert update it in place and are not sent
+      (an escalation that makes it unread again shows in `unread`)
+    - `resync`: the client fell behind and should reload
+    
+    On reconnect the browser sends `Last-Event-ID` and the alerts created
+    since are sent first.
+    """
+    after = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+
+    async def events():
+        subscriber = await alert_hub.subscribe()
+        try:
+            yield "retry: 3000\n\n"  # Reconnect delay (ms)
+            if after is not None:
+                for message in await alert_hub.replay(after):
+                    yield message
+            yield alert_hub.snapshot()
+            while True:
+                yield await subscriber.next_message()
+        finally:
+            alert_hub.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stats", response_model=AlertStats, dependencies=[Depends(etag("alerts"))])
 def get_alert_stats():
     """
     Get alert statistics.
-    Returns counts by status and priority.
+    Returns counts by status, priority and type, read from the alert
+    counters (constant time, however many alerts there are).
     """
-    alerts = get_all_alerts()
+    counts = get_alert_counts()
+    by_status, by_priority = counts["status"], counts["priority"]
     
     stats = {
-        "total": len(alerts),
-        "unread": len([a for a in alerts if a["status"] == "unread"]),
-        "critical": len([a for a in alerts if a["priority"] == "critical"]),
-        "high": len([a for a in alerts if a["priority"] == "high"]),
-        "medium": len([a for a in alerts if a["priority"] == "medium"]),
-        "low": len([a for a in alerts if a["priority"] == "low"]),
+        "total": sum(by_status.values()),
+        "unread": by_status.get("unread", 0),
+        "acknowledged": by_status.get("acknowledged", 0),
+        "resolved": by_status.get("resolved", 0),
+        "critical": by_priority.get("critical", 0),
+        "high": by_priority.get("high", 0),
+        "medium": by_priority.get("medium", 0),
+        "low": by_priority.get("low", 0),
+        "by_type": counts["alert_type"],
     }
     
     return stats
 
 
+@router.post("/archive")
+def archive_resolved_alerts(
+    older_than_days: Optional[int] = Query(None, ge=0, description="Retention age (default ALERT_RETENTION_DAYS)"),
+):
+    """
+    Move resolved alerts created more than `older_than_days` ago from the
+    alerts table to the archive, in batches.
+    
+    Archived alerts are left out of listings, stats and the unread count;
+    list them with `?history=true`. Also run by workers/archive_alerts.py.
+    """
+    return archive_alerts(older_than_days)
+
+
+@router.post("/counters/reconcile")
+def reconcile_counters():
+    """
+    Recount the alerts per status, priority and type and report any drift
+    of the counters behind /stats and /unread-count.
+    
+    The counters are updated on every alert write; this is the periodic
+    safety net (also run by workers/reconcile_alert_counters.py).
+    """
+    return reconcile_alert_counters()
+
+
+@router.post("/batch", response_model=AlertBatchResponse)
+def get_alerts_batch(request: BatchRequest):
+    """
+    Get many alerts by ID in one call.
+    
+    - **ids**: Up to 1000 alert IDs. Unknown IDs are listed in `missing`;
+      archived alerts are found, as with GET /alerts/{alert_id}.
+    """
+    items, missing = get_alerts_by_ids(request.ids)
+    return {"items": items, "missing": missing}
+
+
+@router.post("/sweep")
+def sweep_all_alerts():
+    """
+    Evaluate the alert rules (low stock, expiry bands, forecast shortfall)
+    for every inventory batch, page by page.
+    
+    Stock changes already raise alerts for the batch they touch; the sweep
+    picks up time-based conditions such as batches entering a new expiry
+    band. Also run by workers/sweep_alerts.py.
+    """
+    return sweep_alerts()
+
+
 @router.get("/{alert_id}", response_model=AlertResponse)
 def get_alert(alert_id: int):
     """
@@ -111,8 +286,7 @@ def get_alert(alert_id: int):
     
     - **alert_id**: The alert ID
     """
-    alerts = get_all_alerts()
-    alert = next((a for a in alerts if a["id"] == alert_id), None)
+    alert = get_alert_by_id(alert_id)
     
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
@@ -127,22 +301,17 @@ def acknowledge_alert(alert_id: int):
     
     - **alert_id**: The alert ID to acknowledge
     
-    Note: In production, this will update the database.
-    For now, it returns success message.
+    Only unread alerts change; the status is returned as it is now.
     """
-    alerts = get_all_alerts()
-    alert = next((a for a in alerts if a["id"] == alert_id), None)
+    alert = mark_acknowledged(alert_id)
     
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
     
-    # In production, update database here
-    # For now, just return success
-    
     return {
         "message": "Alert acknowledged successfully",
         "alert_id": alert_id,
-        "status": "acknowledged"
+        "status": alert["status"]
     }
 
 
@@ -153,8 +322,7 @@ def resolve_alert(alert_id: int):
     
     - **alert_id**: The alert ID to resolve
     """
-    alerts = get_all_alerts()
-    alert = next((a for a in alerts if a["id"] == alert_id), None)
+    alert = mark_resolved(alert_id)
     
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
@@ -162,7 +330,7 @@ def resolve_alert(alert_id: int):
     return {
         "message": "Alert resolved successfully",
         "alert_id": alert_id,
-        "status": "resolved"
+        "status": alert["status"]
     }
 
 
@@ -173,8 +341,7 @@ def dismiss_alert(alert_id: int):
     
     - **alert_id**: The alert ID to dismiss
     """
-    alerts = get_all_alerts()
-    alert = next((a for a in alerts if a["id"] == alert_id), None)
+    alert = delete_alert(alert_id)
     
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
@@ -3,19 +3,40 @@ Analytics API Endpoints
 Provides dashboard statistics, trends, and insights.
 """
 
-from fastapi import APIRouter, Query
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from datetime import datetime, timezone
+from functools import partial
+from typing import List, Optional
 from pydantic import BaseModel
-from services.mock_data import (
+from api.etag import etag
+from api.fast_json import payload_response, records_response
+from services.data_source import (
     get_dashboard_stats,
+    get_inventory_stats,
     get_sales_trends,
     get_category_distribution,
-    get_all_medicines,
-    get_all_inventory,
+    get_inventory_value_by_category,
+    get_top_medicines as fetch_top_medicines,
+    reconcile_analytics_rollups,
+    get_medicines_page,
+    get_inventory_page,
+    get_alerts_page,
+    get_sales_page,
 )
+from services.exports import FORMATS, ExportError, csv_chunks, iter_pages, parquet_chunks, select_columns
+from services.sales_buckets import GRANULARITIES, MAX_HOURLY_DAYS
 
 router = APIRouter()
 
+# Export collection -> (page function, filters it accepts)
+EXPORT_SOURCES = {
+    "medicines": (get_medicines_page, ("category", "search")),
+    "inventory": (get_inventory_page, ("low_stock", "expiring_days")),
+    "alerts": (get_alerts_page, ("status", "priority", "alert_type")),
+    "sales": (get_sales_page, ("medicine_id", "category", "start", "end")),
+}
+
 
 # ==================== PYDANTIC SCHEMAS ====================
 
@@ -28,7 +49,7 @@ class DashboardStats(BaseModel):
 
 
 class SalesTrend(BaseModel):
-    """Sales trend data point"""
+    """Sales trend data point (date is the hour, day or month)"""
     date: str
     sales: int
     revenue: float
@@ -42,7 +63,11 @@ class CategoryDistribution(BaseModel):
 
 # ==================== DASHBOARD ENDPOINTS ====================
 
-@router.get("/dashboard", response_model=DashboardStats)
+@router.get(
+    "/dashboard",
+    response_model=DashboardStats,
+    dependencies=[Depends(etag("medicines", "inventory", daily=True))],
+)
 def get_dashboard():
     """
     Get dashboard statistics.
@@ -52,15 +77,27 @@ def get_dashboard():
 
 
 @router.get("/sales-trends", response_model=List[SalesTrend])
-def get_sales(days: int = Query(30, description="Number of days")):
+def get_sales(
+    days: int = Query(30, ge=1, le=3650, description="Number of days"),
+    granularity: str = Query("day", description="Bucket size: hour, day or month"),
+    category: Optional[str] = Query(None, description="Only sales of this category"),
+    medicine_id: Optional[int] = Query(None, description="Only sales of this medicine (overrides category)"),
+):
     """
-    Get sales trends over time.
+    Get units sold and revenue over time, one point per bucket (UTC).
     
     - **days**: Number of days to retrieve (default: 30)
+    - **granularity**: hour (up to 92 days), day or month
+    - **category** / **medicine_id**: Optional filters
     
-    Note: This returns mock data. Data Scientist will replace with real sales data.
+    Read from hourly / daily / monthly rollups kept up to date on every sale,
+    so long windows cost the same as short ones.
     """
-    return get_sales_trends(days)
+    if granularity not in GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"granularity must be one of: {', '.join(GRANULARITIES)}")
+    if granularity == "hour" and days > MAX_HOURLY_DAYS:
+        raise HTTPException(status_code=400, detail=f"Hourly trends cover at most {MAX_HOURLY_DAYS} days")
+    return records_response(get_sales_trends(days, granularity, category, medicine_id), SalesTrend)
 
 
 @router.get("/category-distribution", response_model=List[CategoryDistribution])
@@ -69,7 +106,7 @@ def get_categories():
     Get distribution of medicines by category.
     Useful for pie charts and category analysis.
     """
-    return get_category_distribution()
+    return records_response(get_category_distribution(), CategoryDistribution)
 
 
 # ==================== INVENTORY ANALYTICS ====================
@@ -79,38 +116,12 @@ def get_inventory_value():
     """
     Get detailed inventory value breakdown by category.
     """
-    medicines = get_all_medicines()
-    inventory = get_all_inventory()
-    
-    # Calculate value by category
-    category_values = {}
-    
-    for inv in inventory:
-        med = next((m for m in medicines if m["id"] == inv["medicine_id"]), None)
-        if med:
-            category = med["category"]
-            value = inv["quantity"] * med["price"]
-            
-            if category not in category_values:
-                category_values[category] = {
-                    "category": category,
-                    "total_value": 0,
-                    "item_count": 0,
-                    "total_quantity": 0,
-                }
-            
-            category_values[category]["total_value"] += value
-            category_values[category]["item_count"] += 1
-            category_values[category]["total_quantity"] += inv["quantity"]
+    categories = get_inventory_value_by_category()
     
-    # Round values
-    for cat in category_values.values():
-        cat["total_value"] = round(cat["total_value"], 2)
-    
-    return {
-        "categories": list(category_values.values()),
-        "total_categories": len(category_values),
-    }
+    return payload_response({
+        "categories": categories,
+        "total_categories": len(categories),
+    })
 
 
 @router.get("/top-medicines")
@@ -120,38 +131,24 @@ def get_top_medicines(limit: int = Query(10, description="Number of top items"))
     
     - **limit**: Number of items to return (default: 10)
     """
-    medicines = get_all_medicines()
-    inventory = get_all_inventory()
+    top_medicines, in_stock = fetch_top_medicines(limit)
     
-    # Calculate value for each medicine
-    medicine_values = []
-    
-    for med in medicines:
-        total_quantity = 0
-        total_value = 0
-        
-        for inv in inventory:
-            if inv["medicine_id"] == med["id"]:
-                total_quantity += inv["quantity"]
-                total_value += inv["quantity"] * med["price"]
-        
-        if total_quantity > 0:
-            medicine_values.append({
-                "medicine_id": med["id"],
-                "name": med["name"],
-                "category": med["category"],
-                "total_quantity": total_quantity,
-                "total_value": round(total_value, 2),
-                "unit_price": med["price"],
-            })
-    
-    # Sort by value and return top N
-    medicine_values.sort(key=lambda x: x["total_value"], reverse=True)
+    return payload_response({
+        "top_medicines": top_medicines,
+        "total_medicines": in_stock,
+    })
+
+
+@router.post("/rollups/reconcile")
+def reconcile_rollups():
+    """
+    Rebuild the analytics rollups behind inventory-value, top-medicines and
+    category-distribution from the inventory, and report any drift.
     
-    return {
-        "top_medicines": medicine_values[:limit],
-        "total_medicines": len(medicine_values),
-    }
+    The rollups are updated on every stock write; this is the periodic
+    safety net (also run by workers/reconcile_rollups.py).
+    """
+    return reconcile_analytics_rollups()
 
 
 # ==================== SUPPLIER ANALYTICS ====================
@@ -163,20 +160,20 @@ def get_supplier_performance():
     
     Note: This returns mock data. Data Scientist will add real metrics.
     """
-    from services.mock_data import get_all_suppliers
+    from services.data_source import get_all_suppliers
     
-    suppliers = get_all_suppliers()
+    suppliers = [dict(supplier) for supplier in get_all_suppliers()]
     
     # Add mock performance metrics
     for supplier in suppliers:
         supplier["on_time_delivery"] = 95 if supplier["rating"] >= 4 else 85
         supplier["quality_score"] = supplier["rating"] * 20  # Convert 1-5 to 20-100
-        supplier["avg_delivery_days"] = 3 if supplier["rating"] >= 4 else 5
+        supplier["avg_delivery_days"] = supplier.get("lead_time_days") or (3 if supplier["rating"] >= 4 else 5)
     
-    return {
+    return payload_response({
         "suppliers": suppliers,
         "total_suppliers": len(suppliers),
-    }
+    })
 
 
 # ==================== EXPORT ENDPOINTS ====================
@@ -188,13 +185,76 @@ def export_summary():
     Returns comprehensive data for reports.
     """
     stats = get_dashboard_stats()
-    medicines = get_all_medicines()
-    inventory = get_all_inventory()
+    inventory_stats = get_inventory_stats()
     
     return {
-        "generated_at": "2024-12-08T19:00:00",
+        "generated_at": datetime.now(timezone.utc).isoformat(),
         "summary": stats,
-        "medicines_count": len(medicines),
-        "inventory_items": len(inventory),
+        "medicines_count": inventory_stats["total_medicines"],
+        "inventory_items": inventory_stats["total_inventory_items"],
         "categories": get_category_distribution(),
+        "exports": [f"/api/v1/analytics/export/{collection}" for collection in EXPORT_SOURCES],
     }
+
+
+@router.get("/export/{collection}")
+def export_collection(
+    collection: str,
+    format: str = Query("csv", description="csv or parquet"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns (default: all)"),
+    category: Optional[str] = Query(None, description="medicines, sales: category"),
+    search: Optional[str] = Query(None, description="medicines: name search"),
+    low_stock: bool = Query(False, description="inventory: below reorder level only"),
+    expiring_days: Optional[int] = Query(None, ge=1, description="inventory: expiring within N days"),
+    status: Optional[str] = Query(None, description="alerts: status"),
+    priority: Optional[str] = Query(None, description="alerts: priority"),
+    alert_type: Optional[str] = Query(None, description="alerts: type"),
+    medicine_id: Optional[int] = Query(None, description="sales: medicine"),
+    start: Optional[datetime] = Query(None, description="sales: sold at or after (ISO 8601)"),
+    end: Optional[datetime] = Query(None, description="sales: sold before (ISO 8601)"),
+):
+    """
+    Stream a whole collection (medicines, inventory, alerts or sales) as a file.
+    
+    - **format**: csv (chunked text) or parquet (one row group per 50k rows)
+    - **columns**: Optional column selection, in output order
+    - Filters apply to the collections listed in their description
+    
+    Rows are read and encoded one page at a time, so memory use does not
+    grow with the number of rows.
+    """
+    if collection not in EXPORT_SOURCES:
+        raise HTTPException(
+            status_code=404, detail=f"Unknown export '{collection}'. Use one of: {', '.join(EXPORT_SOURCES)}"
+        )
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(FORMATS)}")
+    try:
+        selected = select_columns(collection, columns)
+    except ExportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    fetch_page, accepted = EXPORT_SOURCES[collection]
+    given = {
+        "category": category, "search": search, "low_stock": low_stock or None, "expiring_days": expiring_days,
+        "status": status, "priority": priority, "alert_type": alert_type,
+        "medicine_id": medicine_id, "start": start, "end": end,
+    }
+    given = {name: value for name, value in given.items() if value is not None}
+    unsupported = [name for name in given if name not in accepted]
+    if unsupported:
+        raise HTTPException(
+            status_code=400, detail=f"{collection} export does not support filters: {', '.join(unsupported)}"
+        )
+    
+    pages = iter_pages(partial(fetch_page, **given))
+    if format == "csv":
+        chunks = csv_chunks(pages, selected)
+    else:
+        chunks = parquet_chunks(pages, collection, selected)
+    filename = f"{collection}-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.{format}"
+    return StreamingResponse(
+        chunks,
+        media_type=FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
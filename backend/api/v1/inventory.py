@@ -3,20 +3,47 @@ Inventory API Endpoints
 Handles all medicine and inventory-related operations.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile
+import os
+from datetime import datetime, timedelta
 from typing import List, Optional
-from pydantic import BaseModel
-from services.mock_data import (
+from pydantic import BaseModel, Field
+from services.data_source import (
     get_all_medicines,
     get_medicine_by_id,
+    get_medicines_by_ids,
+    get_medicines_by_category as find_medicines_by_category,
+    get_categories as list_categories,
     search_medicines,
+    get_medicines_page,
+    add_medicine,
+    edit_medicine,
+    remove_medicine,
     get_all_inventory,
+    get_inventory_by_ids,
+    get_inventory_by_medicine_id,
+    get_inventory_page,
     get_low_stock_items,
     get_expiring_soon,
+    get_expired_items,
+    get_inventory_stats as compute_inventory_stats,
+    import_stock_rows,
+    record_stock_movement,
+    record_sale,
+    get_stock_movements_page,
+    get_stock_level,
+    get_consumption,
+    recompute_reorder_points,
 )
+from api.etag import etag
+from api.fast_json import records_response
+from services.bulk_import import ImportFormatError, import_file, save_upload
+from services.movement_types import StockError
 
 router = APIRouter()
 
+MAX_BATCH_IDS = 1000
+
 
 # ==================== PYDANTIC SCHEMAS ====================
 
@@ -44,29 +71,69 @@ class InventoryResponse(BaseModel):
     shelf_location: Optional[str]
 
 
+class BatchRequest(BaseModel):
+    """IDs to fetch in one request"""
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_IDS)
+
+
+class MedicineBatchResponse(BaseModel):
+    """Medicines found, in request order, and the IDs that do not exist"""
+    items: List[MedicineResponse]
+    missing: List[int]
+
+
+class InventoryBatchResponse(BaseModel):
+    """Inventory batches found, in request order, and the IDs that do not exist"""
+    items: List[InventoryResponse]
+    missing: List[int]
+
+
 # ==================== MEDICINE ENDPOINTS ====================
 
-@router.get("/medicines", response_model=List[MedicineResponse])
+@router.get("/medicines", response_model=List[MedicineResponse], dependencies=[Depends(etag("medicines"))])
 def list_medicines(
+    response: Response,
     category: Optional[str] = Query(None, description="Filter by category"),
-    search: Optional[str] = Query(None, description="Search by name"),
+    search: Optional[str] = Query(None, description="Fuzzy search by name, generic name, salt or manufacturer"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (omit for all)"),
+    after: Optional[int] = Query(None, description="Cursor: return items after this ID"),
 ):
     """
     Get list of all medicines.
     
     - **category**: Filter by medicine category (optional)
-    - **search**: Search medicines by name (optional)
+    - **search**: Typo-tolerant search, best matches first (optional). With
+      DATA_BACKEND=db it is fuzzy on PostgreSQL (pg_trgm) but a plain
+      substring match on SQLite.
+    - **limit** / **after**: Keyset pagination. The cursor for the next page
+      is returned in the `X-Next-Cursor` header (absent on the last page).
     """
-    if search:
+    if limit:
+        medicines, next_cursor = get_medicines_page(limit, after, category, search)
+        if next_cursor is not None:
+            response.headers["X-Next-Cursor"] = str(next_cursor)
+    elif search:
         medicines = search_medicines(search)
+        # Filter by category if provided
+        if category:
+            medicines = [m for m in medicines if m["category"] == category]
+    elif category:
+        medicines = find_medicines_by_category(category)
     else:
         medicines = get_all_medicines()
     
-    # Filter by category if provided
-    if category:
-        medicines = [m for m in medicines if m["category"] == category]
+    return records_response(medicines, MedicineResponse, response)
+
+
+@router.post("/medicines/batch", response_model=MedicineBatchResponse)
+def get_medicines_batch(request: BatchRequest):
+    """
+    Get many medicines by ID in one call.
     
-    return medicines
+    - **ids**: Up to 1000 medicine IDs. Unknown IDs are listed in `missing`.
+    """
+    items, missing = get_medicines_by_ids(request.ids)
+    return {"items": items, "missing": missing}
 
 
 @router.get("/medicines/{medicine_id}", response_model=MedicineResponse)
@@ -112,57 +179,24 @@ class MedicineUpdate(BaseModel):
 def create_medicine(medicine: MedicineCreate):
     """
     Create a new medicine.
+    """
+    data = medicine.model_dump()
+    data["salt_composition"] = medicine.generic_name
     
-    NOTE: Currently returns mock data. 
-    DATA SCIENTIST: Replace with actual database insert.
-    """
-    # TODO: Replace with actual database insert
-    # For now, return the created medicine with a mock ID
-    new_medicine = {
-        "id": 999,  # Mock ID
-        "name": medicine.name,
-        "generic_name": medicine.generic_name,
-        "category": medicine.category,
-        "manufacturer": medicine.manufacturer,
-        "dosage": medicine.dosage,
-        "price": medicine.price,
-        "unit": medicine.unit,
-    }
-    
-    return new_medicine
+    return add_medicine(data)
 
 
 @router.put("/medicines/{medicine_id}", response_model=MedicineResponse)
 def update_medicine(medicine_id: int, medicine: MedicineUpdate):
     """
     Update an existing medicine.
-    
-    NOTE: Currently returns mock data.
-    DATA SCIENTIST: Replace with actual database update.
+    Only the fields that are provided are changed.
     """
-    # Check if medicine exists
-    existing = get_medicine_by_id(medicine_id)
-    if not existing:
-        raise HTTPException(status_code=404, detail="Medicine not found")
-    
-    # TODO: Replace with actual database update
-    # For now, return the updated medicine
-    updated_medicine = existing.copy()
+    changes = medicine.model_dump(exclude_none=True)
+    updated_medicine = edit_medicine(medicine_id, changes)
     
-    if medicine.name is not None:
-        updated_medicine["name"] = medicine.name
-    if medicine.generic_name is not None:
-        updated_medicine["generic_name"] = medicine.generic_name
-    if medicine.category is not None:
-        updated_medicine["category"] = medicine.category
-    if medicine.manufacturer is not None:
-        updated_medicine["manufacturer"] = medicine.manufacturer
-    if medicine.dosage is not None:
-        updated_medicine["dosage"] = medicine.dosage
-    if medicine.price is not None:
-        updated_medicine["price"] = medicine.price
-    if medicine.unit is not None:
-        updated_medicine["unit"] = medicine.unit
+    if not updated_medicine:
+        raise HTTPException(status_code=404, detail="Medicine not found")
     
     return updated_medicine
 
@@ -171,17 +205,12 @@ def update_medicine(medicine_id: int, medicine: MedicineUpdate):
 def delete_medicine(medicine_id: int):
     """
     Delete a medicine.
-    
-    NOTE: Currently returns success without actual deletion.
-    DATA SCIENTIST: Replace with actual database delete.
+    Its inventory batches are removed as well.
     """
-    # Check if medicine exists
-    existing = get_medicine_by_id(medicine_id)
-    if not existing:
+    deleted = remove_medicine(medicine_id)
+    if not deleted:
         raise HTTPException(status_code=404, detail="Medicine not found")
     
-    # TODO: Replace with actual database delete
-    # For now, just return success
     return None
 
 
@@ -192,33 +221,54 @@ def get_medicines_by_category(category: str):
     
     - **category**: Medicine category (e.g., "Painkiller", "Antibiotic")
     """
-    medicines = get_all_medicines()
-    filtered = [m for m in medicines if m["category"] == category]
-    
-    return filtered
+    return records_response(find_medicines_by_category(category), MedicineResponse)
 
 
 # ==================== INVENTORY ENDPOINTS ====================
 
-@router.get("/inventory", response_model=List[InventoryResponse])
+@router.get(
+    "/inventory",
+    response_model=List[InventoryResponse],
+    dependencies=[Depends(etag("inventory", daily=True))],
+)
 def list_inventory(
+    response: Response,
     low_stock: Optional[bool] = Query(None, description="Filter low stock items"),
     expiring_days: Optional[int] = Query(None, description="Filter items expiring within N days"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (omit for all)"),
+    after: Optional[int] = Query(None, description="Cursor: return items after this ID"),
 ):
     """
     Get list of all inventory items.
     
     - **low_stock**: If true, return only items below reorder level
     - **expiring_days**: Return items expiring within specified days
+    - **limit** / **after**: Keyset pagination. The cursor for the next page
+      is returned in the `X-Next-Cursor` header (absent on the last page).
     """
-    if low_stock:
+    if limit:
+        inventory, next_cursor = get_inventory_page(limit, after, bool(low_stock), expiring_days)
+        if next_cursor is not None:
+            response.headers["X-Next-Cursor"] = str(next_cursor)
+    elif low_stock:
         inventory = get_low_stock_items()
     elif expiring_days:
         inventory = get_expiring_soon(expiring_days)
     else:
         inventory = get_all_inventory()
     
-    return inventory
+    return records_response(inventory, InventoryResponse, response)
+
+
+@router.post("/inventory/batch", response_model=InventoryBatchResponse)
+def get_inventory_batch(request: BatchRequest):
+    """
+    Get many inventory batches by ID in one call.
+    
+    - **ids**: Up to 1000 inventory IDs. Unknown IDs are listed in `missing`.
+    """
+    items, missing = get_inventory_by_ids(request.ids)
+    return {"items": items, "missing": missing}
 
 
 @router.get("/inventory/low-stock", response_model=List[InventoryResponse])
@@ -227,7 +277,22 @@ def get_low_stock():
     Get all items with stock below reorder level.
     These items need to be reordered soon.
     """
-    return get_low_stock_items()
+    return records_response(get_low_stock_items(), InventoryResponse)
+
+
+@router.post("/inventory/reorder-points")
+def recompute_reorder_levels():
+    """
+    Recompute every batch's reorder level from recent demand.
+    
+    Reorder points come from the daily demand rate and its variability
+    over the last 8 weeks (sales and other dispenses) and the supplier
+    lead time, and are split over a medicine's batches by stock. Medicines
+    with demand on fewer than REORDER_MIN_DEMAND_DAYS days keep their
+    current levels. Medicines predicted to run out before a new order
+    arrives get a `forecast` alert. Also run by workers/reorder_points.py.
+    """
+    return recompute_reorder_points()
 
 
 @router.get("/inventory/expiring-soon", response_model=List[InventoryResponse])
@@ -237,7 +302,16 @@ def get_expiring(days: int = Query(30, description="Days until expiry")):
     
     - **days**: Number of days (default: 30)
     """
-    return get_expiring_soon(days)
+    return records_response(get_expiring_soon(days), InventoryResponse)
+
+
+@router.get("/inventory/expired", response_model=List[InventoryResponse])
+def get_expired():
+    """
+    Get in-stock items that are already past their expiry date.
+    These batches should be pulled from the shelves.
+    """
+    return records_response(get_expired_items(), InventoryResponse)
 
 
 @router.get("/inventory/medicine/{medicine_id}", response_model=List[InventoryResponse])
@@ -247,25 +321,172 @@ def get_inventory_by_medicine(medicine_id: int):
     
     - **medicine_id**: The medicine ID
     """
-    all_inventory = get_all_inventory()
-    medicine_inventory = [inv for inv in all_inventory if inv["medicine_id"] == medicine_id]
+    medicine_inventory = get_inventory_by_medicine_id(medicine_id)
     
     if not medicine_inventory:
         raise HTTPException(status_code=404, detail="No inventory found for this medicine")
     
-    return medicine_inventory
+    return records_response(medicine_inventory, InventoryResponse)
+
+
+# ==================== STOCK LEDGER ENDPOINTS ====================
+
+class StockMovementCreate(BaseModel):
+    """Schema for recording a stock movement"""
+    movement_type: str  # receipt, dispense, adjustment, write_off
+    quantity: int  # positive; adjustments may be negative
+    note: Optional[str] = None
+
+
+class StockMovementResponse(BaseModel):
+    """Stock movement response schema"""
+    id: int
+    inventory_id: int
+    medicine_id: int
+    movement_type: str
+    quantity_change: int
+    note: Optional[str]
+    created_at: Optional[str]
+
+
+@router.post("/inventory/{inventory_id}/movements", response_model=StockMovementResponse, status_code=201)
+def create_stock_movement(inventory_id: int, movement: StockMovementCreate):
+    """
+    Record a stock movement for a batch and update its quantity.
+    
+    - **movement_type**: receipt, dispense, write_off (positive quantity)
+      or adjustment (signed quantity)
+    """
+    try:
+        created = record_stock_movement(inventory_id, movement.movement_type, movement.quantity, movement.note)
+    except StockError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if not created:
+        raise HTTPException(status_code=404, detail="Inventory item not found")
+    
+    return created
+
+
+class SaleCreate(BaseModel):
+    """Schema for recording a sale from a batch"""
+    quantity: int = Field(..., gt=0)
+    unit_price: Optional[float] = Field(None, ge=0)  # default: the medicine's price
+    sold_at: Optional[datetime] = None  # default: now
+
+
+class SaleResponse(BaseModel):
+    """Sale response schema"""
+    id: int
+    medicine_id: int
+    inventory_id: Optional[int]
+    category: str
+    quantity: int
+    unit_price: float
+    total: float
+    sold_at: str
+
+
+@router.post("/inventory/{inventory_id}/sales", response_model=SaleResponse, status_code=201)
+def create_sale(inventory_id: int, sale: SaleCreate):
+    """
+    Sell from a batch: dispenses the stock and records the sale for the
+    sales trends.
+    """
+    try:
+        created = record_sale(inventory_id, sale.quantity, sale.unit_price, sale.sold_at)
+    except StockError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if not created:
+        raise HTTPException(status_code=404, detail="Inventory item not found")
+    
+    return created
+
+
+@router.get("/inventory/{inventory_id}/movements", response_model=List[StockMovementResponse])
+def list_stock_movements(
+    inventory_id: int,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500, description="Page size"),
+    after: Optional[int] = Query(None, description="Cursor: return movements after this ID"),
+):
+    """
+    Get the movement history of a batch, oldest first.
+    The cursor for the next page is returned in the `X-Next-Cursor` header.
+    """
+    movements, next_cursor = get_stock_movements_page(inventory_id, limit, after)
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+    return movements
+
+
+@router.get("/inventory/{inventory_id}/stock")
+def get_batch_stock(
+    inventory_id: int,
+    at: Optional[datetime] = Query(None, description="Point in time (ISO 8601, default: now)"),
+):
+    """
+    Get the quantity of a batch now or at a point in time.
+    """
+    level = get_stock_level(inventory_id, at)
+    
+    if not level:
+        raise HTTPException(status_code=404, detail="Inventory item not found")
+    
+    return level
+
+
+@router.get("/medicines/{medicine_id}/consumption")
+def get_medicine_consumption(
+    medicine_id: int,
+    days: int = Query(30, ge=1, le=3650, description="Window ending now, in days"),
+    start: Optional[datetime] = Query(None, description="Window start (overrides days)"),
+    end: Optional[datetime] = Query(None, description="Window end (default: now)"),
+):
+    """
+    Get units of a medicine dispensed and written off in a time window.
+    """
+    end = end or datetime.now(start.tzinfo if start else None)
+    start = start or end - timedelta(days=days)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    return get_consumption(medicine_id, start, end)
+
+
+# ==================== BULK IMPORT ENDPOINT ====================
+
+@router.post("/inventory/import")
+def import_inventory(file: UploadFile = File(..., description="Stock sheet (.csv or .xlsx)")):
+    """
+    Bulk import a stock sheet into medicines and inventory.
+    
+    Required columns: name, category, price, quantity.
+    Optional: generic_name, manufacturer, dosage, salt_composition, unit, description,
+    reorder_level, batch_number, expiry_date, shelf_location, supplier_id.
+    
+    Medicines are matched on (name, dosage) and batches on batch_number; matches
+    are updated and new rows inserted. Invalid rows are skipped and listed in
+    the report with their row number.
+    """
+    path = save_upload(file.file, file.filename)
+    try:
+        return import_file(path, import_stock_rows)
+    except ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        os.remove(path)
 
 
 # ==================== CATEGORIES ENDPOINT ====================
 
-@router.get("/categories")
+@router.get("/categories", dependencies=[Depends(etag("medicines"))])
 def get_categories():
     """
     Get list of all medicine categories.
     Useful for dropdown filters in frontend.
     """
-    medicines = get_all_medicines()
-    categories = list(set(m["category"] for m in medicines))
+    categories = list_categories()
     
     return {
         "categories": sorted(categories),
@@ -275,29 +496,11 @@ def get_categories():
 
 # ==================== STATS ENDPOINT ====================
 
-@router.get("/stats")
+@router.get("/stats", dependencies=[Depends(etag("medicines", "inventory", daily=True))])
 def get_inventory_stats():
     """
     Get inventory statistics.
     Returns counts and summaries for dashboard.
     """
-    all_medicines = get_all_medicines()
-    all_inventory = get_all_inventory()
-    low_stock = get_low_stock_items()
-    expiring = get_expiring_soon(30)
-    
-    # Calculate total value
-    total_value = 0
-    for inv in all_inventory:
-        med = next((m for m in all_medicines if m["id"] == inv["medicine_id"]), None)
-        if med:
-            total_value += inv["quantity"] * med["price"]
-    
-    return {
-        "total_medicines": len(all_medicines),
-        "total_inventory_items": len(all_inventory),
-        "total_value": round(total_value, 2),
-        "low_stock_count": len(low_stock),
-        "expiring_soon_count": len(expiring),
-    }
+    return compute_inventory_stats()
 
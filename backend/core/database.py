@@ -1,26 +1,211 @@
 """
 Database configuration and session management.
 This file sets up the database connection that will be used throughout the app.
+
+Pool sizing comes from environment variables (see .env.example). Every
+worker process gets its own pool, so with gunicorn the database sees up to
+workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections - keep that below
+the server's max_connections.
+
+Engines:
+- ``engine`` / ``SessionLocal`` / ``get_db``: synchronous, for ``def`` endpoints
+  (FastAPI runs them in a threadpool) and scripts
+- ``read_engine`` / ``ReadSessionLocal`` / ``get_read_db``: read-only work. A
+  separate pool on DATABASE_READ_URL (e.g. a replica) or, for SQLite, on the
+  same file; otherwise the same engine as writes
+- ``get_async_engine()`` / ``get_async_db``: asyncio (asyncpg / aiosqlite), for
+  ``async def`` endpoints so queries do not block the event loop
+
+SQLite profile (SQLITE_PROFILE, default "production"): every connection
+gets WAL journaling, synchronous=NORMAL, a memory map, a larger page cache
+and a busy timeout, so readers no longer block the writer. Writes go
+through a single pooled connection (SQLite allows one writer at a time;
+queueing in the pool beats failing with "database is locked") and reads
+use their own pool of query_only connections. SQLITE_PROFILE=default keeps
+SQLite's stock settings.
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 import os
+import threading
+import time
 
 # Database URL - will be set via environment variable
 # For now using SQLite for local development (easy to switch to PostgreSQL later)
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./pharmacy.db")
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+
+def _env_bool(name: str, default: bool):
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes")
+
+
+# Pool settings (per worker process)
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))     # seconds to wait for a free connection
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))     # seconds; replace older connections
+POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)          # test connections before handing them out
+ECHO_SQL = _env_bool("DB_ECHO", False)
+
+# Read-only work (optional replica; SQLite reads use their own pool on the same file)
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+
+# SQLite profile
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "production")
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536")),  # negative = KiB
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "temp_store": "MEMORY",
+}
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", str(POOL_SIZE)))
+
+
+# ==================== POOL STATISTICS ====================
+
+class PoolStats:
+    """Wait times for pool checkouts (counts come from the pool itself)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def snapshot(self, pool):
+        """Current pool usage plus the accumulated wait figures"""
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            waits = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(1000 * self.wait_total / attempts, 3) if attempts else 0.0,
+                "wait_max_ms": round(1000 * self.wait_max, 3),
+            }
+        usage = {"pool_class": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            usage.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+            })
+        return {**usage, **waits}
+
+
+def _instrumented(pool_class, stats: PoolStats):
+    """Subclass of ``pool_class`` that times every checkout into ``stats``"""
+
+    class InstrumentedPool(pool_class):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except PoolTimeoutError:
+                stats.record(time.perf_counter() - started, timed_out=True)
+                raise
+            stats.record(time.perf_counter() - started)
+            return connection
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
+
+
+def _is_memory_sqlite(url: str):
+    return ":memory:" in url or url.rstrip("/").endswith(":")
+
+
+USE_SQLITE_PROFILE = IS_SQLITE and SQLITE_PROFILE == "production" and not _is_memory_sqlite(DATABASE_URL)
+
+
+def _engine_options(pool_class, stats: PoolStats, url: str = DATABASE_URL, pool_size: int = POOL_SIZE,
+                    max_overflow: int = MAX_OVERFLOW):
+    """create_engine keyword arguments shared by the sync and async engines"""
+    options = {"echo": ECHO_SQL}
+    if url.startswith("sqlite"):
+        options["connect_args"] = {"check_same_thread": False}
+        if _is_memory_sqlite(url):
+            return options  # In-memory SQLite keeps SQLAlchemy's single-connection pool
+    options.update({
+        "poolclass": _instrumented(pool_class, stats),
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_pre_ping": POOL_PRE_PING,
+    })
+    return options
+
+
+def _write_pool_sizes():
+    """(pool_size, max_overflow) for the write engine: one connection for profiled SQLite"""
+    return (1, 0) if USE_SQLITE_PROFILE else (POOL_SIZE, MAX_OVERFLOW)
+
+
+def _apply_sqlite_profile(engine, read_only: bool = False):
+    """Set the profile pragmas on every new connection of ``engine``"""
+    pragmas = dict(SQLITE_PRAGMAS)
+    if read_only:
+        pragmas["query_only"] = "ON"
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+# ==================== SYNC ENGINE ====================
+
+pool_stats = PoolStats()
 
 # Create database engine
+WRITE_POOL_SIZE, WRITE_MAX_OVERFLOW = _write_pool_sizes()
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
+    **_engine_options(QueuePool, pool_stats, pool_size=WRITE_POOL_SIZE, max_overflow=WRITE_MAX_OVERFLOW),
 )
+if USE_SQLITE_PROFILE:
+    _apply_sqlite_profile(engine)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read-only engine: replica, separate SQLite read pool, or the write engine
+read_pool_stats = PoolStats()
+if DATABASE_READ_URL:
+    read_engine = create_engine(DATABASE_READ_URL, **_engine_options(QueuePool, read_pool_stats, DATABASE_READ_URL))
+elif USE_SQLITE_PROFILE:
+    read_engine = create_engine(
+        DATABASE_URL,
+        **_engine_options(QueuePool, read_pool_stats, pool_size=SQLITE_READ_POOL_SIZE),
+    )
+    _apply_sqlite_profile(read_engine, read_only=True)
+else:
+    read_engine = engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
 # Base class for all models
 Base = declarative_base()
 
@@ -38,3 +223,74 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Dependency function for read-only endpoints (read pool / replica)"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# ==================== ASYNC ENGINE ====================
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+async_pool_stats = PoolStats()
+_async_engine = None
+_async_session_factory = None
+
+
+def async_database_url(url: str = DATABASE_URL):
+    """DATABASE_URL with its driver swapped for the asyncio one"""
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def get_async_engine():
+    """
+    The process-wide async engine, created on first use so the asyncpg /
+    aiosqlite drivers are only needed by deployments that use it.
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        _async_engine = create_async_engine(
+            async_database_url(),
+            **_engine_options(AsyncAdaptedQueuePool, async_pool_stats, async_database_url()),
+        )
+        if USE_SQLITE_PROFILE:
+            _apply_sqlite_profile(_async_engine.sync_engine)
+        _async_session_factory = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+
+async def get_async_db():
+    """
+    Async dependency function to get database session.
+    Usage in FastAPI:
+        @app.get("/endpoint")
+        async def endpoint(db: AsyncSession = Depends(get_async_db)):
+            result = await db.execute(select(Medicine))
+    """
+    get_async_engine()
+    async with _async_session_factory() as db:
+        yield db
+
+
+def get_pool_stats():
+    """Pool usage and checkout wait times of this worker's engines"""
+    stats = {"sync": pool_stats.snapshot(engine.pool)}
+    if read_engine is not engine:
+        stats["read"] = read_pool_stats.snapshot(read_engine.pool)
+    if _async_engine is not None:
+        stats["async"] = async_pool_stats.snapshot(_async_engine.sync_engine.pool)
+    return stats
@@ -4,7 +4,10 @@ Run this script once to create all database tables.
 """
 
 from core.database import engine, Base
-from models import Medicine, Inventory, Supplier, Alert
+from models import (
+    Medicine, Inventory, Supplier, Alert, AlertArchive, AlertCounter, StockMovement, StockSnapshot,
+    CollectionVersion, MedicineRollup, CategoryRollup, Sale, SalesRollup,
+)
 
 def init_db():
     """Create all database tables"""
@@ -16,6 +19,15 @@ def init_db():
     print("  - inventory")
     print("  - suppliers")
     print("  - alerts")
+    print("  - alerts_archive")
+    print("  - alert_counters")
+    print("  - stock_movements")
+    print("  - stock_snapshots")
+    print("  - collection_versions")
+    print("  - medicine_rollups")
+    print("  - category_rollups")
+    print("  - sales")
+    print("  - sales_rollups")
 
 if __name__ == "__main__":
     init_db()
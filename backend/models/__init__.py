@@ -7,6 +7,12 @@ from models.medicine import Medicine
 from models.inventory import Inventory
 from models.supplier import Supplier
 from models.alert import Alert
+from models.alert_archive import AlertArchive
+from models.alert_counter import AlertCounter
+from models.stock_movement import StockMovement, StockSnapshot
+from models.collection_version import CollectionVersion
+from models.analytics_rollup import MedicineRollup, CategoryRollup
+from models.sale import Sale, SalesRollup
 
 # Export all models
 __all__ = [
@@ -14,4 +20,13 @@ __all__ = [
     "Inventory",
     "Supplier",
     "Alert",
+    "AlertArchive",
+    "AlertCounter",
+    "StockMovement",
+    "StockSnapshot",
+    "CollectionVersion",
+    "MedicineRollup",
+    "CategoryRollup",
+    "Sale",
+    "SalesRollup",
 ]
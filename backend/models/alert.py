@@ -1,12 +1,19 @@
 """
 Alert Model - System notifications and warnings.
 This model stores all alerts generated by the system (low stock, expiry, etc.)
+
+This is the hot table: open alerts and recently resolved ones. Resolved
+alerts older than the retention age are moved to alerts_archive
+(models/alert_archive.py, services/alert_archive.py).
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, text
 from sqlalchemy.sql import func
 from core.database import Base
 
+# Statuses of an open alert (services/alert_dedup.OPEN_STATUSES)
+OPEN_ALERT = text("status IN ('unread', 'acknowledged')")
+
 
 class Alert(Base):
     """
@@ -14,6 +21,18 @@ class Alert(Base):
     Stores system-generated alerts for pharmacy staff.
     """
     __tablename__ = "alerts"
+    __table_args__ = (
+        # At most one open alert per dedup key (services/alert_dedup.py), also the lookup index.
+        # Concurrent evaluations that both insert the same key conflict here (see store_alerts).
+        Index(
+            "uq_alerts_dedup_key_open", "dedup_key", unique=True,
+            sqlite_where=OPEN_ALERT, postgresql_where=OPEN_ALERT,
+        ),
+        # Filtered listings, and resolved alerts past the retention age (archival)
+        Index("ix_alerts_status_priority_created_at", "status", "priority", "created_at"),
+        # Never reuse the id of a deleted / archived alert (SQLite), ids stay unique across both tables
+        {"sqlite_autoincrement": True},
+    )
 
     # Primary key
     id = Column(Integer, primary_key=True, index=True)
@@ -38,6 +57,14 @@ class Alert(Base):
     status = Column(String(20), default="unread")
     # Status: 'unread', 'acknowledged', 'resolved'
     
+    # Deduplication: the rule condition that raised the alert (e.g. 'below_reorder',
+    # 'expiring_30d', 'digest:expiring_30d') and the key of
+    # (alert_type, medicine_id, inventory_id, condition)
+    condition = Column(String(50), nullable=True)
+    dedup_key = Column(String(120), nullable=True)
+    occurrences = Column(Integer, default=1)  # Triggers folded into this alert
+    last_triggered_at = Column(DateTime(timezone=True), nullable=True)
+    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     acknowledged_at = Column(DateTime(timezone=True), nullable=True)
@@ -54,6 +81,10 @@ class Alert(Base):
             "medicine_id": self.medicine_id,
             "inventory_id": self.inventory_id,
             "status": self.status,
+            "condition": self.condition,
+            "dedup_key": self.dedup_key,
+            "occurrences": self.occurrences,
+            "last_triggered_at": self.last_triggered_at.isoformat() if self.last_triggered_at else None,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "acknowledged_at": self.acknowledged_at.isoformat() if self.acknowledged_at else None,
             "resolved_at": self.resolved_at.isoformat() if self.resolved_at else None,
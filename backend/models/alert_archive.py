@@ -0,0 +1,70 @@
+"""
+Alert Archive Model - Resolved alerts past the retention age.
+
+Same columns as the alerts table (models/alert.py), plus archived_at.
+services/alert_archive.py moves resolved alerts whose created_at is older
+than ALERT_RETENTION_DAYS here in batches, so the hot table that the
+unread badge, the stats and the default listings read only holds open
+and recent alerts. Alerts keep their id; the listing endpoints read this
+table only when history is requested.
+
+No foreign keys: archived alerts outlive the medicines and batches they
+refer to.
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy.sql import func
+from core.database import Base
+
+
+class AlertArchive(Base):
+    """An archived alert"""
+    __tablename__ = "alerts_archive"
+    __table_args__ = (
+        # Filtered history listings
+        Index("ix_alerts_archive_status_priority_created_at", "status", "priority", "created_at"),
+    )
+
+    # Id of the alert in the hot table
+    id = Column(Integer, primary_key=True, autoincrement=False)
+
+    alert_type = Column(String(50), nullable=False, index=True)
+    priority = Column(String(20), default="medium")
+    title = Column(String(255), nullable=False)
+    message = Column(Text, nullable=False)
+    medicine_id = Column(Integer, nullable=True)
+    inventory_id = Column(Integer, nullable=True)
+    status = Column(String(20), default="resolved")
+
+    # Deduplication (see models/alert.py)
+    condition = Column(String(50), nullable=True)
+    dedup_key = Column(String(120), nullable=True)
+    occurrences = Column(Integer, default=1)
+    last_triggered_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True))
+    acknowledged_at = Column(DateTime(timezone=True), nullable=True)
+    resolved_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def to_dict(self):
+        """Convert model to dictionary for API responses"""
+        return {
+            "id": self.id,
+            "alert_type": self.alert_type,
+            "priority": self.priority,
+            "title": self.title,
+            "message": self.message,
+            "medicine_id": self.medicine_id,
+            "inventory_id": self.inventory_id,
+            "status": self.status,
+            "condition": self.condition,
+            "dedup_key": self.dedup_key,
+            "occurrences": self.occurrences,
+            "last_triggered_at": self.last_triggered_at.isoformat() if self.last_triggered_at else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "acknowledged_at": self.acknowledged_at.isoformat() if self.acknowledged_at else None,
+            "resolved_at": self.resolved_at.isoformat() if self.resolved_at else None,
+            "archived_at": self.archived_at.isoformat() if self.archived_at else None,
+        }
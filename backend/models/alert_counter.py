@@ -0,0 +1,27 @@
+"""
+Alert Counter Model - Number of alerts per status, priority and type.
+
+One row per (dimension, value), e.g. ('status', 'unread'). The counters
+are updated by delta in the same transaction as every alert write
+(services/alert_counters.py), so the alert stats and the unread badge are
+read from a handful of rows instead of counting the alerts table.
+workers/reconcile_alert_counters.py recounts them and reports any drift.
+"""
+
+from sqlalchemy import BigInteger, Column, String
+from core.database import Base
+
+
+class AlertCounter(Base):
+    """Number of alerts whose ``dimension`` field equals ``value``"""
+    __tablename__ = "alert_counters"
+
+    # Dimension: 'status', 'priority' or 'alert_type'
+    dimension = Column(String(20), primary_key=True)
+    value = Column(String(50), primary_key=True)
+
+    count = Column(BigInteger, nullable=False, default=0)
+
+    def to_dict(self):
+        """Convert model to dictionary for API responses"""
+        return {"dimension": self.dimension, "value": self.value, "count": self.count}
@@ -0,0 +1,71 @@
+"""
+Analytics Rollup Models - Pre-aggregated stock totals for the analytics API.
+
+MedicineRollup holds each medicine's units, batch count and stock value;
+CategoryRollup sums them per category. Both are updated by delta in the
+same transaction as every stock write (services/analytics_rollups.py), so
+the category breakdown and top medicines are read from a few rows instead
+of a GROUP BY over the whole inventory. workers/reconcile_rollups.py
+rebuilds them from the source tables and reports any drift.
+"""
+
+from sqlalchemy import BigInteger, Column, Float, Integer, String, Index
+from core.database import Base
+
+
+class MedicineRollup(Base):
+    """Stock totals of one medicine (one row per medicine)"""
+    __tablename__ = "medicine_rollups"
+
+    # Medicine is the primary key
+    medicine_id = Column(Integer, primary_key=True)
+
+    # Denormalized so a category change can move the totals
+    category = Column(String(100), nullable=False)
+    price = Column(Float, nullable=False, default=0.0)
+
+    # Totals over the medicine's batches
+    total_quantity = Column(BigInteger, nullable=False, default=0)
+    total_value = Column(Float, nullable=False, default=0.0)
+    batch_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Top medicines by value: a backward index scan, stops after LIMIT rows
+        Index("ix_medicine_rollups_total_value", "total_value"),
+    )
+
+    def to_dict(self):
+        """Convert model to dictionary for API responses"""
+        return {
+            "medicine_id": self.medicine_id,
+            "category": self.category,
+            "price": self.price,
+            "total_quantity": self.total_quantity,
+            "total_value": self.total_value,
+            "batch_count": self.batch_count,
+        }
+
+
+class CategoryRollup(Base):
+    """Stock totals of one category (one row per category with medicines)"""
+    __tablename__ = "category_rollups"
+
+    # Category name is the primary key
+    category = Column(String(100), primary_key=True)
+
+    total_value = Column(Float, nullable=False, default=0.0)
+    total_quantity = Column(BigInteger, nullable=False, default=0)
+    batch_count = Column(Integer, nullable=False, default=0)
+    medicine_count = Column(Integer, nullable=False, default=0)
+    stocked_count = Column(Integer, nullable=False, default=0)  # Medicines with quantity > 0
+
+    def to_dict(self):
+        """Convert model to dictionary for API responses"""
+        return {
+            "category": self.category,
+            "total_value": self.total_value,
+            "total_quantity": self.total_quantity,
+            "batch_count": self.batch_count,
+            "medicine_count": self.medicine_count,
+            "stocked_count": self.stocked_count,
+        }
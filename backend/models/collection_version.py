@@ -0,0 +1,26 @@
+"""
+Collection Version Model - Write counters per collection.
+
+One row per collection (medicines, inventory, alerts, suppliers, sales) whose
+version is incremented in the same transaction as every write to that
+collection. The API derives ETags from it, so polling clients get
+304 Not Modified without the data being loaded, and the result cache
+(services/result_cache.py) drops results computed from older versions.
+Being a table, the counter is shared by all worker processes.
+"""
+
+from sqlalchemy import BigInteger, Column, String
+from core.database import Base
+
+
+class CollectionVersion(Base):
+    """Monotonic version of one collection"""
+    __tablename__ = "collection_versions"
+
+    # Collection name is the primary key
+    name = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+    def to_dict(self):
+        """Convert model to dictionary for API responses"""
+        return {"name": self.name, "version": self.version}
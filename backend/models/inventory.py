@@ -15,6 +15,8 @@ class Inventory(Base):
     Tracks stock levels, batch numbers, and expiry dates.
     """
     __tablename__ = "inventory"
+    # Never reuse the id of a deleted batch (SQLite): its stock ledger is kept
+    __table_args__ = {"sqlite_autoincrement": True}
 
     # Primary key
     id = Column(Integer, primary_key=True, index=True)
@@ -28,7 +30,7 @@ class Inventory(Base):
     
     # Batch tracking
     batch_number = Column(String(100))
-    expiry_date = Column(Date)
+    expiry_date = Column(Date, index=True)  # Indexed for expiry range queries
     
     # Location
     shelf_location = Column(String(50))  # e.g., "A-12", "B-05"
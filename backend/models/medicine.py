@@ -1,12 +1,17 @@
 """
 Medicine Model - Represents the medicine catalog.
 This is the master list of all medicines available in the pharmacy.
+
+On PostgreSQL the searchable fields get pg_trgm GIN indexes, which the
+fuzzy search in services/real_data.py uses; other databases skip them.
 """
 
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime
+from sqlalchemy import DDL, Column, Integer, String, Float, Text, DateTime, Index, event
 from sqlalchemy.sql import func
 from core.database import Base
 
+SEARCH_FIELDS = ("name", "generic_name", "salt_composition", "manufacturer")
+
 
 class Medicine(Base):
     """
@@ -14,6 +19,16 @@ class Medicine(Base):
     Stores information about each medicine in the pharmacy.
     """
     __tablename__ = "medicines"
+    __table_args__ = (
+        # Trigram search (PostgreSQL only)
+        *(
+            Index(f"ix_medicines_{field}_trgm", field, postgresql_using="gin", postgresql_ops={field: "gin_trgm_ops"})
+            .ddl_if(dialect="postgresql")
+            for field in SEARCH_FIELDS
+        ),
+        # Never reuse the id of a deleted medicine (SQLite): its stock ledger and sales are kept
+        {"sqlite_autoincrement": True},
+    )
 
     # Primary key
     id = Column(Integer, primary_key=True, index=True)
@@ -55,3 +70,11 @@ class Medicine(Base):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+
+
+# The trigram indexes need the pg_trgm extension
+event.listen(
+    Medicine.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,87 @@
+"""
+Sale Models - Sales transactions and their time-bucketed rollups.
+
+Every sale (a dispense to a customer) is one Sale row. SalesRollup holds
+units, revenue and transaction counts per hour, day and month, for all
+sales, per category and per medicine; it is updated in the same
+transaction as every sale (services/sales_ledger.py), so sales trends
+read one row per bucket instead of scanning years of transactions.
+"""
+
+from sqlalchemy import BigInteger, Column, DateTime, Float, Index, Integer, String
+from core.database import Base
+from models.stock_movement import LedgerId
+
+
+class Sale(Base):
+    """
+    One sales transaction.
+    Medicine and batch are plain columns (no foreign keys): sales history
+    is kept when a medicine or batch is deleted.
+    """
+    __tablename__ = "sales"
+
+    # Primary key
+    id = Column(LedgerId, primary_key=True)
+
+    # What was sold (category denormalized for history)
+    medicine_id = Column(Integer, nullable=False)
+    inventory_id = Column(Integer)
+    category = Column(String(100), nullable=False)
+
+    # Amounts
+    quantity = Column(Integer, nullable=False)
+    unit_price = Column(Float, nullable=False)
+    total = Column(Float, nullable=False)
+
+    # Time of sale
+    sold_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_sales_sold_at", "sold_at"),
+        Index("ix_sales_medicine_id_sold_at", "medicine_id", "sold_at"),
+    )
+
+    def to_dict(self):
+        """Convert model to dictionary for API responses"""
+        return {
+            "id": self.id,
+            "medicine_id": self.medicine_id,
+            "inventory_id": self.inventory_id,
+            "category": self.category,
+            "quantity": self.quantity,
+            "unit_price": self.unit_price,
+            "total": self.total,
+            "sold_at": self.sold_at.isoformat() if self.sold_at else None,
+        }
+
+
+class SalesRollup(Base):
+    """
+    Sales totals of one time bucket in one scope.
+    scope is 'all', 'category' or 'medicine'; key is '' / the category /
+    the medicine id. bucket is the bucket start in UTC.
+    """
+    __tablename__ = "sales_rollups"
+
+    # A trend is one primary key range: (granularity, scope, key, bucket >= start)
+    granularity = Column(String(5), primary_key=True)  # hour, day, month
+    scope = Column(String(10), primary_key=True)
+    key = Column(String(100), primary_key=True)
+    bucket = Column(DateTime, primary_key=True)
+
+    units = Column(BigInteger, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0.0)
+    transactions = Column(Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        """Convert model to dictionary for API responses"""
+        return {
+            "granularity": self.granularity,
+            "scope": self.scope,
+            "key": self.key,
+            "bucket": self.bucket.isoformat(),
+            "units": self.units,
+            "revenue": self.revenue,
+            "transactions": self.transactions,
+        }
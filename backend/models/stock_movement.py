@@ -0,0 +1,97 @@
+"""
+Stock Movement Models - Append-only ledger of stock changes per batch.
+
+Every change to an inventory batch's quantity is written as a StockMovement
+row (receipt, dispense, adjustment, write-off) and rows are never updated or
+deleted. StockSnapshot rows materialize each batch's quantity up to a ledger
+position, so current stock is "latest snapshot + the movements after it"
+instead of a sum over the batch's whole history.
+
+Batch and medicine ids are plain columns (no foreign keys), as in
+models/sale.py: the ledger of a deleted batch or medicine is kept.
+"""
+
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Index
+from sqlalchemy.sql import func
+from core.database import Base
+
+# BIGINT ids on PostgreSQL; SQLite only auto-increments INTEGER primary keys
+LedgerId = BigInteger().with_variant(Integer, "sqlite")
+
+
+class StockMovement(Base):
+    """
+    One stock change for one inventory batch.
+    quantity_change is signed: positive adds stock, negative removes it.
+    """
+    __tablename__ = "stock_movements"
+
+    # Primary key (monotonic, doubles as the ledger position)
+    id = Column(LedgerId, primary_key=True)
+    
+    # Batch and medicine (medicine is denormalized for consumption queries)
+    inventory_id = Column(Integer, nullable=False)
+    medicine_id = Column(Integer, nullable=False)
+    
+    # Movement details
+    movement_type = Column(String(20), nullable=False)
+    # Types: 'receipt', 'dispense', 'adjustment', 'write_off'
+    quantity_change = Column(Integer, nullable=False)
+    note = Column(String(255))
+    
+    # Timestamp
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # Tail of the ledger for one batch, and stock-at-time-T lookups
+        Index("ix_stock_movements_inventory_id_id", "inventory_id", "id"),
+        Index("ix_stock_movements_inventory_id_created_at", "inventory_id", "created_at"),
+        # Consumption of a medicine over a time window
+        Index("ix_stock_movements_medicine_type_created_at", "medicine_id", "movement_type", "created_at"),
+    )
+
+    def to_dict(self):
+        """Convert model to dictionary for API responses"""
+        return {
+            "id": self.id,
+            "inventory_id": self.inventory_id,
+            "medicine_id": self.medicine_id,
+            "movement_type": self.movement_type,
+            "quantity_change": self.quantity_change,
+            "note": self.note,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+
+class StockSnapshot(Base):
+    """
+    Materialized quantity of one batch as of a ledger position.
+    quantity already includes every movement with id <= last_movement_id.
+    """
+    __tablename__ = "stock_snapshots"
+
+    # Primary key
+    id = Column(LedgerId, primary_key=True)
+    
+    # Batch and the quantity it held
+    inventory_id = Column(Integer, nullable=False)
+    quantity = Column(Integer, nullable=False)
+    
+    # Ledger position and time covered by this snapshot
+    last_movement_id = Column(BigInteger, nullable=False)
+    taken_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_stock_snapshots_inventory_id_last_movement_id", "inventory_id", "last_movement_id"),
+        Index("ix_stock_snapshots_inventory_id_taken_at", "inventory_id", "taken_at"),
+    )
+
+    def to_dict(self):
+        """Convert model to dictionary for API responses"""
+        return {
+            "id": self.id,
+            "inventory_id": self.inventory_id,
+            "quantity": self.quantity,
+            "last_movement_id": self.last_movement_id,
+            "taken_at": self.taken_at.isoformat() if self.taken_at else None,
+        }
@@ -34,6 +34,7 @@ class Supplier(Base):
     # Performance tracking (will be updated by Data Scientist's analytics)
     rating = Column(Integer, default=5)  # 1-5 stars
     total_orders = Column(Integer, default=0)
+    lead_time_days = Column(Integer, default=7)  # Order to delivery (used for reorder points)
     
     # Status
     is_active = Column(Integer, default=1)  # 1 = active, 0 = inactive
@@ -55,6 +56,7 @@ class Supplier(Base):
             "license_number": self.license_number,
             "rating": self.rating,
             "total_orders": self.total_orders,
+            "lead_time_days": self.lead_time_days,
             "is_active": bool(self.is_active),
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
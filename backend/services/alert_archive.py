@@ -0,0 +1,59 @@
+"""
+Alert Archive Service - Move resolved alerts past the retention age out of
+the hot alerts table.
+
+The alerts table (models/alert.py) is what the unread badge, the stats and
+the default listings read. Resolved alerts whose created_at is older than
+ALERT_RETENTION_DAYS are moved to alerts_archive (models/alert_archive.py)
+with the same id, BATCH_SIZE at a time: one INSERT ... SELECT and one
+DELETE per batch, found through ix_alerts_status_priority_created_at. The
+alert counters (services/alert_counters.py) count the hot table, so they
+are decremented by the archived alerts.
+
+Functions take an open session and never commit; callers own the transaction.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert, select
+
+from models import Alert, AlertArchive
+from services import alert_counters
+
+RETENTION_DAYS = int(os.getenv("ALERT_RETENTION_DAYS", "90"))
+BATCH_SIZE = 1000
+COLUMNS = tuple(column.name for column in Alert.__table__.columns)  # Shared by both tables
+
+
+def cutoff(retention_days: int = RETENTION_DAYS, now=None):
+    """Alerts created before this are past the retention age"""
+    return (now or datetime.now(timezone.utc)) - timedelta(days=retention_days)
+
+
+def archive(db, retention_days: int = RETENTION_DAYS, batch_size: int = BATCH_SIZE, now=None):
+    """
+    Move resolved alerts created before the retention cutoff to the archive.
+    Yields the number of alerts moved after each batch, so the caller can
+    commit between batches.
+    """
+    before = cutoff(retention_days, now)
+    while True:
+        rows = db.execute(
+            select(Alert.id, Alert.status, Alert.priority, Alert.alert_type)
+            .where(Alert.status == "resolved", Alert.created_at < before)
+            .order_by(Alert.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return
+        ids = [row.id for row in rows]
+        db.execute(
+            insert(AlertArchive).from_select(
+                COLUMNS, select(*(getattr(Alert, name) for name in COLUMNS)).where(Alert.id.in_(ids))
+            )
+        )
+        db.execute(delete(Alert).where(Alert.id.in_(ids)))
+        alert_counters.apply(db, alert_counters.deltas([dict(row._mapping) for row in rows], -1))
+        yield len(ids)
+
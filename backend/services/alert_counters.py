@@ -0,0 +1,127 @@
+"""
+Alert Counters Service - Alerts per status, priority and type kept up to
+date by delta.
+
+Database side of the alert counters (models/alert_counter.py). Every path
+that writes alerts applies the change to the counters in the same
+transaction:
+
+- alert_engine.store_alerts: new alerts, and priority / status changes of
+  the open alerts it updates
+- acknowledge, resolve and dismiss in services/real_data.py
+
+Reads (the stats and the unread badge) load the few counter rows, so they
+cost the same whatever the number of alerts.
+
+reconcile() recounts the alerts with one grouped query, fixes the counters
+that differ and reports the drift (workers/reconcile_alert_counters.py).
+Run it once after creating the table on an existing database.
+
+Functions take an open session and never commit; callers own the transaction.
+"""
+
+from sqlalchemy import delete, func, select, tuple_
+
+from models import Alert, AlertCounter
+from services.upserts import add_deltas
+
+DIMENSIONS = ("status", "priority", "alert_type")
+
+
+def deltas(alerts, sign: int = 1, into: dict = None):
+    """Count alert dicts (status, priority, alert_type) into {(dimension, value): delta}"""
+    into = {} if into is None else into
+    for alert in alerts:
+        for dimension in DIMENSIONS:
+            value = alert.get(dimension)
+            if value is not None:
+                into[dimension, value] = into.get((dimension, value), 0) + sign
+    return into
+
+
+def change(old: dict, new: dict, into: dict = None):
+    """Deltas of one alert changing from ``old`` to ``new`` (either may be None)"""
+    into = {} if into is None else into
+    if old is not None:
+        deltas([old], -1, into)
+    if new is not None:
+        deltas([new], 1, into)
+    return into
+
+
+# ==================== WRITES ====================
+
+def apply(db, counter_deltas: dict):
+    """
+    Add deltas to the counters in place (one upsert, so concurrent writers
+    creating the same counter do not conflict) and drop the counters that
+    reach zero.
+    """
+    counter_deltas = {key: delta for key, delta in counter_deltas.items() if delta}
+    if not counter_deltas:
+        return
+    add_deltas(db, AlertCounter, (
+        {"dimension": dimension, "value": value, "count": delta}
+        for (dimension, value), delta in counter_deltas.items()
+    ), ("count",))
+    db.execute(delete(AlertCounter).where(
+        tuple_(AlertCounter.dimension, AlertCounter.value).in_(list(counter_deltas)),
+        AlertCounter.count == 0,
+    ))
+
+
+def reconcile(db):
+    """
+    Recount the alerts (one GROUP BY status, priority, type) and fix the
+    counters that differ. Returns a drift report.
+    """
+    stored = {
+        (row.dimension, row.value): row
+        for row in db.scalars(select(AlertCounter).with_for_update())
+    }
+    rows = db.execute(
+        select(Alert.status, Alert.priority, Alert.alert_type, func.count(Alert.id))
+        .group_by(Alert.status, Alert.priority, Alert.alert_type)
+    ).all()
+    actual = {}
+    total = 0
+    for status, priority, alert_type, alerts in rows:
+        total += alerts
+        deltas([{"status": status, "priority": priority, "alert_type": alert_type}], alerts, actual)
+
+    drift = []
+    for key in sorted(actual.keys() | stored.keys()):
+        row = stored.get(key)
+        counter = row.count if row is not None else 0
+        alerts = actual.get(key, 0)
+        if counter == alerts:
+            continue
+        drift.append({"dimension": key[0], "value": key[1], "counter": counter, "actual": alerts})
+        if alerts == 0:
+            db.delete(row)
+        elif row is None:
+            db.add(AlertCounter(dimension=key[0], value=key[1], count=alerts))
+        else:
+            row.count = alerts
+    db.flush()
+
+    return {"alerts": total, "counters": len(actual), "drift": drift}
+
+
+# ==================== READS ====================
+
+def counts(db):
+    """All counters -> {dimension: {value: count}}"""
+    result = {dimension: {} for dimension in DIMENSIONS}
+    for dimension, value, count in db.execute(
+        select(AlertCounter.dimension, AlertCounter.value, AlertCounter.count)
+    ):
+        result.setdefault(dimension, {})[value] = count
+    return result
+
+
+def count(db, dimension: str, value: str):
+    """One counter (0 if there is none)"""
+    return db.scalar(
+        select(AlertCounter.count).where(AlertCounter.dimension == dimension, AlertCounter.value == value)
+    ) or 0
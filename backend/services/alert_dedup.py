@@ -0,0 +1,149 @@
+"""
+Alert Dedup - Fold repeated and bursty alerts into the alerts already open.
+
+Used by services/alert_engine.py (database) and services/memory_alerts.py
+(mock data); kept free of database imports.
+
+An alert is identified by (alert_type, medicine_id, inventory_id,
+condition), stored as ``dedup_key`` so one indexed lookup finds the open
+alert (unread or acknowledged) for a trigger:
+
+- Repeat: a trigger whose key has an open alert updates that alert in
+  place (priority, text, occurrences, last_triggered_at) instead of
+  adding a row. An acknowledged alert becomes unread again only if its
+  priority went up.
+- Burst: when one evaluation raises more than DIGEST_THRESHOLD new alerts
+  of the same type and condition, they are stored as one digest alert
+  (no medicine or batch) that counts them. While a digest is open, new
+  alerts of its type and condition are added to it as well.
+- Clear: when a change makes a condition stop holding, the open alert of
+  its key is resolved (cleared_keys); a digest stays open until resolved
+  by hand.
+
+The table therefore grows with the number of distinct open conditions,
+not with the number of evaluations.
+"""
+
+OPEN_STATUSES = ("unread", "acknowledged")
+DIGEST_THRESHOLD = 20  # New alerts of one type and condition per evaluation
+DIGEST_EXAMPLES = 5  # Alerts named in a digest message
+DIGEST_PREFIX = "digest:"
+PRIORITY_RANK = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+
+
+def dedup_key(alert_type: str, medicine_id: int = None, inventory_id: int = None, condition: str = None):
+    """Key of an alert condition: 'low_stock:12:34:below_reorder' ('-' for a missing id)"""
+    ids = ("-" if value is None else str(value) for value in (medicine_id, inventory_id))
+    return ":".join((alert_type, *ids, condition or ""))
+
+
+def alert_key(alert: dict):
+    return dedup_key(alert["alert_type"], alert["medicine_id"], alert["inventory_id"], alert["condition"])
+
+
+def digest_key(alert_type: str, condition: str):
+    return dedup_key(alert_type, condition=DIGEST_PREFIX + condition)
+
+
+def lookup_keys(alerts):
+    """dedup_keys whose open alerts plan() needs: the alerts' own keys and their digests'"""
+    keys = {alert_key(alert) for alert in alerts}
+    keys.update(digest_key(alert["alert_type"], alert["condition"]) for alert in alerts)
+    return keys
+
+
+def cleared_keys(cleared, alerts):
+    """dedup_keys of conditions that stopped holding (alert_rules.cleared_conditions) and were not raised again"""
+    return {alert_key(condition) for condition in cleared} - {alert_key(alert) for alert in alerts}
+
+
+def _higher(priority: str, other: str):
+    return priority if PRIORITY_RANK.get(priority, 0) >= PRIORITY_RANK.get(other, 0) else other
+
+
+def _refresh(open_alert: dict, priority: str, title: str, message: str, occurrences: int, now):
+    """Changes that bring an open alert up to date with new triggers"""
+    changes = {
+        "priority": priority,
+        "title": title,
+        "message": message,
+        "occurrences": (open_alert.get("occurrences") or 1) + occurrences,
+        "last_triggered_at": now,
+    }
+    escalated = PRIORITY_RANK.get(priority, 0) > PRIORITY_RANK.get(open_alert["priority"], 0)
+    if open_alert["status"] == "acknowledged" and escalated:
+        changes.update(status="unread", acknowledged_at=None)
+    return changes
+
+
+def _digest_text(alert_type: str, condition: str, alerts, total: int):
+    label = alert_type.replace("_", " ")
+    names = [alert["title"].split(": ", 1)[-1] for alert in alerts[:DIGEST_EXAMPLES]]
+    more = total - len(names)
+    return (
+        f"Digest: {total:,} {label} alerts ({condition.replace('_', ' ')})",
+        ", ".join(names) + (f" and {more:,} more." if more > 0 else "."),
+    )
+
+
+def plan(alerts, open_alerts: dict, now):
+    """
+    Decide how to store new alert triggers (dicts with the Alert columns
+    and ``condition``). ``open_alerts`` maps dedup_key -> open alert dict
+    (id, priority, status, occurrences) for lookup_keys(alerts).
+
+    Returns ``(inserts, updates)``: alert dicts to insert (with dedup_key,
+    occurrences and last_triggered_at) and ``(alert_id, changes)`` pairs.
+    """
+    # One trigger per key: the last one wins
+    latest = {}
+    for alert in alerts:
+        latest[alert_key(alert)] = alert
+
+    updates = {}
+    groups = {}
+    for key, alert in latest.items():
+        open_alert = open_alerts.get(key)
+        if open_alert is not None:
+            updates[open_alert["id"]] = _refresh(
+                open_alert, alert["priority"], alert["title"], alert["message"], 1, now
+            )
+        else:
+            groups.setdefault((alert["alert_type"], alert["condition"]), []).append(alert)
+
+    inserts = []
+    for (alert_type, condition), group in groups.items():
+        key = digest_key(alert_type, condition)
+        digest = open_alerts.get(key)
+        if digest is None and len(group) <= DIGEST_THRESHOLD:
+            inserts.extend(
+                {**alert, "dedup_key": alert_key(alert), "occurrences": 1, "last_triggered_at": now}
+                for alert in group
+            )
+            continue
+
+        priority = group[0]["priority"]
+        for alert in group[1:]:
+            priority = _higher(priority, alert["priority"])
+        if digest is None:
+            title, message = _digest_text(alert_type, condition, group, len(group))
+            inserts.append({
+                "alert_type": alert_type,
+                "priority": priority,
+                "title": title,
+                "message": message,
+                "medicine_id": None,
+                "inventory_id": None,
+                "status": "unread",
+                "condition": DIGEST_PREFIX + condition,
+                "dedup_key": key,
+                "occurrences": len(group),
+                "last_triggered_at": now,
+            })
+        else:
+            total = (digest.get("occurrences") or 1) + len(group)
+            title, message = _digest_text(alert_type, condition, group, total)
+            updates[digest["id"]] = _refresh(
+                digest, _higher(priority, digest["priority"]), title, message, len(group), now
+            )
+    return inserts, list(updates.items())
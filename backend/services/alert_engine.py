@@ -0,0 +1,221 @@
+"""
+Alert Engine Service - Raise alerts from the rules in services/alert_rules.py.
+
+Database side of the alert rules. Batch states are read with one joined
+SELECT (batch, medicine name, medicine units from the analytics rollups,
+supplier lead time) plus a grouped read of the daily sales rollups for
+the demand rate, so a page of batches costs a few queries, not one per batch.
+
+- Incremental: write paths read the states of the batches they are about
+  to change (batch_states), make the change and refresh the rollups, then
+  call evaluate_changes; only those batches are evaluated, and open
+  alerts whose conditions the change cleared are resolved.
+- Sweep: sweep() walks the whole inventory by keyset pages, so memory use
+  depends on the page size, not on the number of batches.
+
+Alerts are stored through store_alerts, which folds repeats and bursts
+into the open alerts (services/alert_dedup.py); the open alerts of a set
+of dedup keys are found through the partial unique index on dedup_key,
+and the alert counters (services/alert_counters.py) are updated with the
+change. The index also keeps two concurrent evaluations from opening the
+same alert twice: the losing insert fails, and store_alerts re-reads the
+open alerts and plans again so its triggers update the winner's alert.
+
+Functions take an open session and never commit; callers own the transaction.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from models import Alert, Inventory, Medicine, MedicineRollup, SalesRollup, Supplier
+from services import alert_counters, alert_dedup
+from services.alert_rules import cleared_conditions, evaluate_change, sweep as sweep_rules
+from services.reorder_policy import DEFAULT_LEAD_TIME_DAYS, DEMAND_WINDOW_DAYS, demand_window
+
+SWEEP_PAGE_SIZE = 5000
+CHUNK_SIZE = 500  # Ids per IN (...) lookup
+STORE_ATTEMPTS = 3  # Plans per store_alerts call when a concurrent insert takes a dedup key
+STATE_FIELDS = (
+    "id", "medicine_id", "medicine_name", "batch_number", "quantity", "reorder_level", "expiry_date",
+    "on_hand", "lead_time_days",
+)
+
+
+def _state_query():
+    return (
+        select(
+            Inventory.id,
+            Inventory.medicine_id,
+            Medicine.name,
+            Inventory.batch_number,
+            Inventory.quantity,
+            Inventory.reorder_level,
+            Inventory.expiry_date,
+            func.coalesce(MedicineRollup.total_quantity, 0),
+            func.coalesce(Supplier.lead_time_days, DEFAULT_LEAD_TIME_DAYS),
+        )
+        .join(Medicine, Inventory.medicine_id == Medicine.id)
+        .outerjoin(MedicineRollup, MedicineRollup.medicine_id == Inventory.medicine_id)
+        .outerjoin(Supplier, Inventory.supplier_id == Supplier.id)
+    )
+
+
+def _demand_rates(db, medicine_ids):
+    """Average daily units of each medicine over the demand window"""
+    start, end = demand_window()
+    keys = [str(medicine_id) for medicine_id in set(medicine_ids)]
+    rates = {}
+    for offset in range(0, len(keys), CHUNK_SIZE):
+        rows = db.execute(
+            select(SalesRollup.key, func.sum(SalesRollup.units))
+            .where(
+                SalesRollup.granularity == "day",
+                SalesRollup.scope == "medicine",
+                SalesRollup.key.in_(keys[offset:offset + CHUNK_SIZE]),
+                SalesRollup.bucket >= start,
+                SalesRollup.bucket < end,
+            )
+            .group_by(SalesRollup.key)
+        )
+        rates.update((int(key), units / DEMAND_WINDOW_DAYS) for key, units in rows)
+    return rates
+
+
+def _states(db, query):
+    states = [dict(zip(STATE_FIELDS, row)) for row in db.execute(query)]
+    rates = _demand_rates(db, [state["medicine_id"] for state in states])
+    for state in states:
+        state["demand_rate"] = rates.get(state["medicine_id"], 0.0)
+    return states
+
+
+def batch_states(db, inventory_ids):
+    """Current alert-rule states of some batches -> {inventory_id: state}"""
+    inventory_ids = list(dict.fromkeys(inventory_ids))
+    states = {}
+    for start in range(0, len(inventory_ids), CHUNK_SIZE):
+        chunk = inventory_ids[start:start + CHUNK_SIZE]
+        query = _state_query().where(Inventory.id.in_(chunk))
+        states.update((state["id"], state) for state in _states(db, query))
+    return states
+
+
+def _open_alerts(db, keys):
+    """Open alerts of some dedup keys -> {dedup_key: {id, alert_type, priority, status, occurrences}}"""
+    keys = list(keys)
+    found = {}
+    for start in range(0, len(keys), CHUNK_SIZE):
+        rows = db.execute(
+            select(Alert.dedup_key, Alert.id, Alert.alert_type, Alert.priority, Alert.status, Alert.occurrences)
+            .where(Alert.dedup_key.in_(keys[start:start + CHUNK_SIZE]), Alert.status.in_(alert_dedup.OPEN_STATUSES))
+            .order_by(Alert.id)
+        )
+        for key, *values in rows:
+            found[key] = dict(zip(("id", "alert_type", "priority", "status", "occurrences"), values))
+    return found
+
+
+def store_alerts(db, alerts, now=None):
+    """
+    Store alert dicts from the rules: repeats of an open alert update it,
+    bursts become digest alerts. Returns ``(created, updated)``.
+    """
+    if not alerts:
+        return 0, 0
+    now = now or datetime.now(timezone.utc)
+    keys = alert_dedup.lookup_keys(alerts)
+    for attempt in range(1, STORE_ATTEMPTS + 1):
+        open_alerts = _open_alerts(db, keys)
+        inserts, updates = alert_dedup.plan(alerts, open_alerts, now)
+        if not inserts:
+            break
+        try:
+            # A savepoint, so a unique violation leaves the caller's transaction usable
+            with db.begin_nested():
+                db.execute(insert(Alert), inserts)
+            break
+        except IntegrityError:
+            if attempt == STORE_ATTEMPTS:
+                raise
+
+    # One executemany UPDATE per set of changed columns
+    table = Alert.__table__
+    by_columns = {}
+    for alert_id, changes in updates:
+        by_columns.setdefault(tuple(sorted(changes)), []).append({"b_id": alert_id, **{
+            f"b_{column}": value for column, value in changes.items()
+        }})
+    for columns, params in by_columns.items():
+        statement = (
+            table.update()
+            .where(table.c.id == bindparam("b_id"))
+            .values({column: bindparam(f"b_{column}") for column in columns})
+        )
+        db.execute(statement, params)
+
+    counter_deltas = alert_counters.deltas(inserts)
+    by_id = {alert["id"]: alert for alert in open_alerts.values()}
+    for alert_id, changes in updates:
+        old = by_id[alert_id]
+        alert_counters.change(old, {**old, **changes}, counter_deltas)
+    alert_counters.apply(db, counter_deltas)
+    return len(inserts), len(updates)
+
+
+def resolve_alerts(db, keys, now=None):
+    """Resolve the open alerts of some dedup keys (their conditions no longer hold) -> count"""
+    open_alerts = _open_alerts(db, keys)
+    if not open_alerts:
+        return 0
+    now = now or datetime.now(timezone.utc)
+    alert_ids = [alert["id"] for alert in open_alerts.values()]
+    for start in range(0, len(alert_ids), CHUNK_SIZE):
+        db.execute(
+            update(Alert)
+            .where(Alert.id.in_(alert_ids[start:start + CHUNK_SIZE]))
+            .values(status="resolved", resolved_at=now)
+        )
+    counter_deltas = {}
+    for alert in open_alerts.values():
+        alert_counters.change(alert, {**alert, "status": "resolved"}, counter_deltas)
+    alert_counters.apply(db, counter_deltas)
+    return len(alert_ids)
+
+
+def evaluate_changes(db, before: dict, inventory_ids, today=None):
+    """
+    Evaluate the rules for batches that changed since ``before`` (states
+    read before the write; new batches are absent), store the alerts and
+    resolve the open alerts of conditions that no longer hold. Returns
+    ``(created, updated)`` alert counts; resolved alerts count as updated.
+    """
+    after = batch_states(db, inventory_ids)
+    alerts, cleared = [], []
+    for inventory_id, state in after.items():
+        old = before.get(inventory_id)
+        alerts.extend(evaluate_change(old, state, today=today))
+        cleared.extend(cleared_conditions(old, state, today=today))
+    created, updated = store_alerts(db, alerts)
+    return created, updated + resolve_alerts(db, alert_dedup.cleared_keys(cleared, alerts))
+
+
+def _pages(db, page_size: int):
+    after = 0
+    while True:
+        states = _states(db, _state_query().where(Inventory.id > after).order_by(Inventory.id).limit(page_size))
+        if not states:
+            return
+        yield states
+        after = states[-1]["id"]
+
+
+def sweep(db, page_size: int = SWEEP_PAGE_SIZE, today=None):
+    """
+    Evaluate every batch, one keyset page at a time. Yields
+    ``(batches, alerts_created, alerts_updated)`` after each page, so the
+    caller can commit between pages.
+    """
+    for states, alerts in sweep_rules(_pages(db, page_size), today=today):
+        yield (len(states), *store_alerts(db, alerts))
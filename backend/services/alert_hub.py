@@ -0,0 +1,181 @@
+"""
+Alert Hub - Push new alerts and unread-count changes to connected clients.
+
+Replaces polling GET /alerts/unread-count: clients keep one connection open
+(GET /alerts/stream, Server-Sent Events) and the hub fans events out to
+all of them.
+
+- One watcher task per worker process reads the alerts collection version
+  (get_collection_version) every ALERT_STREAM_POLL_SECONDS. Only when it
+  changed does it load the alerts created since the last one it saw
+  (keyset pages) and the unread count, so the cost is per worker, not per
+  connection. Writes made by other workers are seen the same way, since
+  the versions live in the data layer.
+- Each event is encoded once and the same string is queued for every
+  subscriber. An idle connection is a suspended coroutine and a small
+  queue, so one worker holds thousands of them. A subscriber that falls
+  SUBSCRIBER_QUEUE_SIZE events behind gets a single "resync" event
+  instead of the backlog.
+- The watcher runs while there are subscribers. A failed poll is logged
+  (module logger) and retried on the next one.
+
+Only new alerts are streamed. A repeat of an open alert updates it in place
+(services/alert_dedup.py) and keeps its id, so it is not sent again; when
+the update makes it unread again (escalation) the change shows in the
+"unread" event. Clients reload the list to see updated priorities, texts
+and occurrence counts.
+
+Events (``data`` is JSON):
+    alerts  {"alerts": [...]}                  new alerts, oldest first; id: last alert id
+    unread  {"unread_count": n, "delta": d}    unread count now and the change
+    resync  {}                                 reload alerts and unread count
+"""
+
+import asyncio
+import json
+import logging
+import os
+
+POLL_SECONDS = float(os.getenv("ALERT_STREAM_POLL_SECONDS", "0.5"))
+HEARTBEAT_SECONDS = 15  # Comment line on idle connections, keeps proxies from closing them
+SUBSCRIBER_QUEUE_SIZE = 64
+PAGE_SIZE = 100  # Alerts per "alerts" event (and per replay)
+
+logger = logging.getLogger(__name__)
+
+
+def sse_message(event: str, data: dict, event_id=None):
+    """One Server-Sent Events message"""
+    lines = [f"event: {event}", f"data: {json.dumps(data, separators=(',', ':'), default=str)}"]
+    if event_id is not None:
+        lines.insert(0, f"id: {event_id}")
+    return "\n".join(lines) + "\n\n"
+
+
+RESYNC = sse_message("resync", {})
+HEARTBEAT = ": keepalive\n\n"
+
+
+class Subscriber:
+    """One connected client: a bounded queue of encoded messages"""
+    __slots__ = ("queue",)
+
+    def __init__(self, size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue = asyncio.Queue(size)
+
+    def put(self, message: str):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Too far behind: drop the backlog, the client reloads instead
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def next_message(self, timeout: float = HEARTBEAT_SECONDS):
+        """Next message, or the heartbeat after ``timeout`` idle seconds"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return HEARTBEAT
+
+
+class AlertHub:
+    """Watches the alerts collection and fans changes out to subscribers"""
+
+    def __init__(self, version, page, unread_count, latest_id, poll_seconds: float = POLL_SECONDS):
+        self._version = version  # collections -> version token
+        self._page = page  # (limit, after) -> (alerts, next_cursor)
+        self._unread_count = unread_count  # () -> unread alerts
+        self._latest_id = latest_id  # () -> highest alert id (None if there are none)
+        self.poll_seconds = poll_seconds
+        self.subscribers = set()
+        self.last_id = None
+        self.unread_count = None
+        self._version_seen = None
+        self._watcher = None
+        self._lock = None
+        self._stats = {"events": 0, "messages": 0, "polls": 0, "changes": 0, "errors": 0}
+
+    # ==================== SUBSCRIBERS ====================
+
+    async def subscribe(self):
+        """Register a client; starts the watcher if it is not running"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._watcher is None or self._watcher.done():
+                self._version_seen = await asyncio.to_thread(self._version, ("alerts",))
+                self.last_id = await asyncio.to_thread(self._latest_id)
+                self.unread_count = await asyncio.to_thread(self._unread_count)
+                self._watcher = asyncio.get_running_loop().create_task(self._watch())
+            subscriber = Subscriber()
+            self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+
+    def snapshot(self):
+        """Unread message with the current count, sent when a client connects"""
+        return sse_message("unread", {"unread_count": self.unread_count, "delta": 0})
+
+    async def replay(self, after: int):
+        """Messages for a reconnecting client: the alerts after ``after`` (its Last-Event-ID)"""
+        alerts, next_cursor = await asyncio.to_thread(self._page, PAGE_SIZE, after)
+        if next_cursor is not None:
+            return [RESYNC]
+        return [sse_message("alerts", {"alerts": alerts}, alerts[-1]["id"])] if alerts else []
+
+    def publish(self, event: str, data: dict, event_id=None):
+        """Encode an event once and queue it for every subscriber"""
+        message = sse_message(event, data, event_id)
+        for subscriber in list(self.subscribers):
+            subscriber.put(message)
+        self._stats["events"] += 1
+        self._stats["messages"] += len(self.subscribers)
+
+    # ==================== WATCHER ====================
+
+    async def _publish_changes(self):
+        after = self.last_id
+        while True:
+            alerts, next_cursor = await asyncio.to_thread(self._page, PAGE_SIZE, after)
+            if alerts:
+                after = alerts[-1]["id"]
+                self.publish("alerts", {"alerts": alerts}, after)
+            if next_cursor is None:
+                break
+        self.last_id = after
+
+        count = await asyncio.to_thread(self._unread_count)
+        if count != self.unread_count:
+            self.publish("unread", {"unread_count": count, "delta": count - (self.unread_count or 0)})
+            self.unread_count = count
+
+    async def _watch(self):
+        while self.subscribers:
+            try:
+                # Read the version before the data, so a write in between is seen on the next poll
+                version = await asyncio.to_thread(self._version, ("alerts",))
+                self._stats["polls"] += 1
+                if version != self._version_seen:
+                    await self._publish_changes()
+                    self._version_seen = version
+                    self._stats["changes"] += 1
+            except Exception:
+                # Keep the connections open; the next poll retries
+                self._stats["errors"] += 1
+                logger.exception("Alert stream poll failed")
+            await asyncio.sleep(self.poll_seconds)
+
+    def stats(self):
+        """Subscribers and event counters of this worker"""
+        return {
+            "subscribers": len(self.subscribers),
+            "watching": self._watcher is not None and not self._watcher.done(),
+            "poll_seconds": self.poll_seconds,
+            "last_alert_id": self.last_id,
+            "unread_count": self.unread_count,
+            **self._stats,
+        }
@@ -0,0 +1,255 @@
+"""
+Alert Rules - Declarative alert rules evaluated per inventory batch.
+
+Used by services/alert_engine.py (database) and services/memory_alerts.py
+(mock data); kept free of database imports. Rules read a flat batch state
+built by the backend:
+
+    id, medicine_id, medicine_name, batch_number, quantity, reorder_level,
+    expiry_date, on_hand (units of the medicine over all batches),
+    demand_rate (units per day), lead_time_days
+
+Each rule lists the state fields it reads and returns a condition and a
+priority when it fires. The engine runs in two modes:
+
+- evaluate_change(old, new): when a batch changes, only the rules whose
+  fields changed are re-evaluated, and only conditions that hold now but
+  did not before raise an alert (a restock that stays below the reorder
+  level does not raise it again)
+- cleared_conditions(old, new): conditions of those rules that held before
+  the change and no longer do; the backends resolve their open alerts
+- sweep(pages): every batch, one page at a time, for time-based
+  conditions (expiry bands move as days pass) and to catch up after bulk
+  changes
+
+Alerts are returned as dicts of Alert columns, including the rule's
+``condition``; services/alert_dedup.py folds them into the open alerts.
+"""
+
+from datetime import date
+
+# (days left at most, condition, priority), first match wins; only batches with stock
+EXPIRY_BANDS = (
+    (-1, "expired", "critical"),
+    (6, "expiring_7d", "critical"),
+    (30, "expiring_30d", "high"),
+    (90, "expiring_90d", "medium"),
+)
+ANOMALY_FACTOR = 5  # A single drop of this many days of demand is unusual...
+ANOMALY_MIN_UNITS = 20  # ...if it is at least this many units
+
+
+def _days_left(expiry, today: date):
+    if isinstance(expiry, str):
+        expiry = date.fromisoformat(expiry)
+    return (expiry - today).days
+
+
+class LowStockRule:
+    """Batch below its reorder level; critical when empty"""
+    alert_type = "low_stock"
+    scope = "batch"
+    fields = ("quantity", "reorder_level")
+    on_change_only = False
+
+    def check(self, state, today, previous=None):
+        quantity, level = state["quantity"], state["reorder_level"]
+        if level is None or quantity >= level:
+            return None
+        if quantity <= 0:
+            return "out_of_stock", "critical"
+        return "below_reorder", "high" if quantity < level / 2 else "medium"
+
+    def describe(self, state, condition, today, previous=None):
+        name = state["medicine_name"]
+        if condition == "out_of_stock":
+            return f"Out of Stock: {name}", f"Batch {state['batch_number']} is empty. Please reorder now."
+        return (
+            f"Low Stock: {name}",
+            f"Stock level ({state['quantity']}) is below reorder level ({state['reorder_level']}). "
+            "Please reorder soon.",
+        )
+
+
+class ExpiryRule:
+    """Batch with stock inside one of the expiry bands"""
+    alert_type = "expiry"
+    scope = "batch"
+    fields = ("quantity", "expiry_date")
+    on_change_only = False
+
+    def __init__(self, bands=EXPIRY_BANDS):
+        self.bands = bands
+
+    def check(self, state, today, previous=None):
+        if state["quantity"] <= 0 or not state["expiry_date"]:
+            return None
+        days_left = _days_left(state["expiry_date"], today)
+        for limit, condition, priority in self.bands:
+            if days_left <= limit:
+                return condition, priority
+        return None
+
+    def describe(self, state, condition, today, previous=None):
+        days_left = _days_left(state["expiry_date"], today)
+        if condition == "expired":
+            return (
+                f"Expired: {state['medicine_name']}",
+                f"Batch {state['batch_number']} expired {-days_left} days ago "
+                f"with {state['quantity']} units on the shelf.",
+            )
+        return f"Expiring Soon: {state['medicine_name']}", f"Batch {state['batch_number']} expires in {days_left} days."
+
+
+class ForecastShortfallRule:
+    """Medicine stock covers less than its supplier lead time at the current demand rate"""
+    alert_type = "forecast"
+    scope = "medicine"
+    fields = ("on_hand", "demand_rate", "lead_time_days")
+    on_change_only = False
+
+    def check(self, state, today, previous=None):
+        rate, lead = state["demand_rate"], state["lead_time_days"]
+        if not rate or state["on_hand"] >= rate * lead:
+            return None
+        return "shortfall", "critical" if state["on_hand"] < rate * lead / 2 else "high"
+
+    def describe(self, state, condition, today, previous=None):
+        rate = state["demand_rate"]
+        return (
+            f"Stock-out Forecast: {state['medicine_name']}",
+            f"{state['on_hand']} units cover {state['on_hand'] / rate:.1f} days at {rate:.1f}/day, "
+            f"less than the {state['lead_time_days']}-day supplier lead time.",
+        )
+
+
+class AnomalyRule:
+    """A single change that removes far more stock than the usual daily demand"""
+    alert_type = "anomaly"
+    scope = "batch"
+    fields = ("quantity",)
+    on_change_only = True  # Needs the previous state
+
+    def __init__(self, factor: float = ANOMALY_FACTOR, min_units: int = ANOMALY_MIN_UNITS):
+        self.factor = factor
+        self.min_units = min_units
+
+    def check(self, state, today, previous=None):
+        if previous is None:
+            return None
+        drop = previous["quantity"] - state["quantity"]
+        threshold = max(self.min_units, self.factor * (state["demand_rate"] or 0))
+        if drop < threshold:
+            return None
+        return "drawdown", "high" if drop >= 2 * threshold else "medium"
+
+    def describe(self, state, condition, today, previous=None):
+        drop = previous["quantity"] - state["quantity"]
+        return (
+            f"Unusual Stock Drop: {state['medicine_name']}",
+            f"Batch {state['batch_number']} dropped by {drop} units in one change "
+            f"(typical demand {state['demand_rate'] or 0:.1f}/day).",
+        )
+
+
+RULES = (LowStockRule(), ExpiryRule(), ForecastShortfallRule(), AnomalyRule())
+
+
+def _alert(rule, state, condition: str, priority: str, today, previous=None):
+    title, message = rule.describe(state, condition, today, previous)
+    return {
+        "alert_type": rule.alert_type,
+        "priority": priority,
+        "title": title,
+        "message": message,
+        "medicine_id": state["medicine_id"],
+        "inventory_id": state["id"] if rule.scope == "batch" else None,
+        "status": "unread",
+        "condition": condition,
+    }
+
+
+def evaluate(state, rules=RULES, today: date = None):
+    """Alerts for every rule that holds for a batch now (change-only rules are skipped)"""
+    today = today or date.today()
+    alerts = []
+    for rule in rules:
+        if rule.on_change_only:
+            continue
+        hit = rule.check(state, today)
+        if hit is not None:
+            alerts.append(_alert(rule, state, *hit, today))
+    return alerts
+
+
+def evaluate_change(old, new, rules=RULES, today: date = None):
+    """
+    Alerts raised by a batch changing from ``old`` to ``new`` (None for an
+    insert / delete). Rules whose fields did not change are not evaluated;
+    a condition that already held with the same priority is not raised again.
+    """
+    if new is None:
+        return []
+    today = today or date.today()
+    alerts = []
+    for rule in rules:
+        if old is not None and all(old[field] == new[field] for field in rule.fields):
+            continue
+        hit = rule.check(new, today, old)
+        if hit is None:
+            continue
+        if old is not None and not rule.on_change_only and rule.check(old, today) == hit:
+            continue
+        alerts.append(_alert(rule, new, *hit, today, old))
+    return alerts
+
+
+def cleared_conditions(old, new, rules=RULES, today: date = None):
+    """
+    Conditions that held for a batch before it changed from ``old`` to
+    ``new`` and no longer do, as dicts of the alert key columns
+    (alert_type, medicine_id, inventory_id, condition). Change-only rules
+    describe a single change and are never cleared.
+    """
+    if old is None or new is None:
+        return []
+    today = today or date.today()
+    cleared = []
+    for rule in rules:
+        if rule.on_change_only or all(old[field] == new[field] for field in rule.fields):
+            continue
+        held = rule.check(old, today)
+        if held is None:
+            continue
+        hit = rule.check(new, today)
+        if hit is not None and hit[0] == held[0]:
+            continue
+        cleared.append({
+            "alert_type": rule.alert_type,
+            "medicine_id": new["medicine_id"],
+            "inventory_id": new["id"] if rule.scope == "batch" else None,
+            "condition": held[0],
+        })
+    return cleared
+
+
+def sweep(pages, rules=RULES, today: date = None):
+    """
+    Evaluate every batch state of ``pages`` (an iterable of lists of
+    states); yields ``(states, alerts)`` per page. Medicine-level rules
+    fire once per medicine over the whole sweep.
+    """
+    today = today or date.today()
+    seen = set()
+    for states in pages:
+        alerts = []
+        for state in states:
+            for alert in evaluate(state, rules, today):
+                if alert["inventory_id"] is None:
+                    key = (alert["alert_type"], alert["medicine_id"])
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                alerts.append(alert)
+        yield states, alerts
+
@@ -0,0 +1,241 @@
+"""
+Analytics Rollups Service - Category and per-medicine stock totals kept
+up to date by delta.
+
+Database side of the rollups (models/analytics_rollup.py). Every write path
+in services/real_data.py that changes stock, prices or categories calls
+refresh_medicines() with the medicines it touched, before committing.
+That recomputes only those medicines from their batches (one indexed
+GROUP BY), writes the new MedicineRollup rows and applies the difference
+to their CategoryRollup rows. The cost depends on the medicines touched,
+not on the catalog size.
+
+Reads:
+- value per category / category distribution = the CategoryRollup rows
+- top medicines by value = backward scan of ix_medicine_rollups_total_value
+- medicines in stock = sum of CategoryRollup.stocked_count
+
+reconcile() recomputes everything from the source tables, fixes the rows
+that differ and reports the drift (workers/reconcile_rollups.py). Run it
+once after creating the tables on an existing database.
+
+Functions take an open session and never commit; callers own the transaction.
+"""
+
+import math
+
+from sqlalchemy import delete, func, insert, select, update
+
+from models import CategoryRollup, Inventory, Medicine, MedicineRollup
+
+CATEGORY_FIELDS = ("total_value", "total_quantity", "batch_count", "medicine_count", "stocked_count")
+
+
+def _medicine_totals(db, medicine_ids=None):
+    """Totals from the source tables: {medicine_id: (category, price, quantity, value, batches)}"""
+    query = (
+        select(
+            Medicine.id,
+            Medicine.category,
+            Medicine.price,
+            func.coalesce(func.sum(Inventory.quantity), 0),
+            func.count(Inventory.id),
+        )
+        .outerjoin(Inventory, Inventory.medicine_id == Medicine.id)
+        .group_by(Medicine.id, Medicine.category, Medicine.price)
+    )
+    if medicine_ids is not None:
+        query = query.where(Medicine.id.in_(medicine_ids))
+    totals = {}
+    for medicine_id, category, price, quantity, batches in db.execute(query):
+        price = price or 0.0
+        totals[medicine_id] = (category, price, int(quantity), int(quantity) * price, batches)
+    return totals
+
+
+def _accumulate(deltas: dict, category: str, quantity: int, value: float, batches: int, sign: int):
+    """Add one medicine's contribution to the per-category deltas"""
+    delta = deltas.setdefault(category, [0.0, 0, 0, 0, 0])
+    delta[0] += sign * value
+    delta[1] += sign * quantity
+    delta[2] += sign * batches
+    delta[3] += sign
+    delta[4] += sign * (quantity > 0)
+
+
+# ==================== WRITES ====================
+
+def refresh_medicines(db, medicine_ids):
+    """Recompute the rollups of ``medicine_ids`` and apply the change to their categories"""
+    medicine_ids = {i for i in medicine_ids if i is not None}
+    if not medicine_ids:
+        return
+    db.flush()
+
+    # Lock the stored rows first, so a concurrent reconcile or write is applied before we diff
+    stored = {
+        row.medicine_id: row
+        for row in db.scalars(
+            select(MedicineRollup).where(MedicineRollup.medicine_id.in_(medicine_ids)).with_for_update()
+        )
+    }
+    fresh = _medicine_totals(db, medicine_ids)
+
+    deltas = {}
+    for medicine_id in medicine_ids:
+        row = stored.get(medicine_id)
+        if row is not None:
+            _accumulate(deltas, row.category, row.total_quantity, row.total_value, row.batch_count, -1)
+        if medicine_id not in fresh:
+            if row is not None:
+                db.delete(row)
+            continue
+
+        category, price, quantity, value, batches = fresh[medicine_id]
+        _accumulate(deltas, category, quantity, value, batches, 1)
+        if row is None:
+            row = MedicineRollup(medicine_id=medicine_id)
+            db.add(row)
+        row.category, row.price = category, price
+        row.total_quantity, row.total_value, row.batch_count = quantity, value, batches
+
+    _apply_category_deltas(db, deltas)
+    db.flush()
+
+
+def _apply_category_deltas(db, deltas: dict):
+    """Add per-category deltas in place and drop categories left without medicines"""
+    deltas = {category: delta for category, delta in deltas.items() if any(delta)}
+    if not deltas:
+        return
+    existing = set(db.scalars(select(CategoryRollup.category).where(CategoryRollup.category.in_(deltas))))
+    for category, delta in deltas.items():
+        values = dict(zip(CATEGORY_FIELDS, delta))
+        if category in existing:
+            db.execute(
+                update(CategoryRollup)
+                .where(CategoryRollup.category == category)
+                .values({field: getattr(CategoryRollup, field) + value for field, value in values.items()})
+            )
+        else:
+            db.execute(insert(CategoryRollup).values(category=category, **values))
+    db.execute(
+        delete(CategoryRollup)
+        .where(CategoryRollup.category.in_(deltas), CategoryRollup.medicine_count <= 0)
+    )
+
+
+def reconcile(db):
+    """
+    Recompute all rollups from the source tables and fix the rows that differ.
+    Returns a drift report (categories whose stored totals were wrong).
+    """
+    stored_medicines = {row.medicine_id: row for row in db.scalars(select(MedicineRollup).with_for_update())}
+    stored_categories = {row.category: row for row in db.scalars(select(CategoryRollup).with_for_update())}
+    fresh = _medicine_totals(db)
+
+    medicines_fixed = 0
+    expected = {}
+    for medicine_id, (category, price, quantity, value, batches) in fresh.items():
+        _accumulate(expected, category, quantity, value, batches, 1)
+        row = stored_medicines.pop(medicine_id, None)
+        current = (category, price, quantity, value, batches)
+        if row is not None and _stored_totals(row) == current:
+            continue
+        if row is None:
+            row = MedicineRollup(medicine_id=medicine_id)
+            db.add(row)
+        row.category, row.price = category, price
+        row.total_quantity, row.total_value, row.batch_count = quantity, value, batches
+        medicines_fixed += 1
+    for row in stored_medicines.values():
+        db.delete(row)
+    medicines_fixed += len(stored_medicines)
+
+    drift = []
+    for category in sorted(expected.keys() | stored_categories.keys()):
+        row = stored_categories.get(category)
+        stored = dict.fromkeys(CATEGORY_FIELDS, 0)
+        if row is not None:
+            stored = {field: getattr(row, field) for field in CATEGORY_FIELDS}
+        actual = dict(zip(CATEGORY_FIELDS, expected.get(category, [0.0, 0, 0, 0, 0])))
+        if _same_totals(stored, actual):
+            continue
+        drift.append({"category": category, "rollup": stored, "actual": actual})
+        if category not in expected:
+            db.delete(row)
+        elif row is None:
+            db.add(CategoryRollup(category=category, **actual))
+        else:
+            for field, value in actual.items():
+                setattr(row, field, value)
+    db.flush()
+
+    return {
+        "medicines": len(fresh),
+        "categories": len(expected),
+        "medicines_fixed": medicines_fixed,
+        "drift": drift,
+    }
+
+
+def _stored_totals(row: MedicineRollup):
+    """A MedicineRollup row in the shape of _medicine_totals()"""
+    return row.category, row.price, row.total_quantity, row.total_value, row.batch_count
+
+
+def _same_totals(stored: dict, actual: dict):
+    """Category totals equal (stock value compared with a float tolerance)"""
+    return math.isclose(stored["total_value"], actual["total_value"], rel_tol=1e-9, abs_tol=1e-6) and all(
+        stored[field] == actual[field] for field in CATEGORY_FIELDS if field != "total_value"
+    )
+
+
+# ==================== READS ====================
+
+def value_by_category(db):
+    """Value, units and batch count per category with batches"""
+    rows = db.scalars(
+        select(CategoryRollup).where(CategoryRollup.batch_count > 0).order_by(CategoryRollup.category)
+    )
+    return [
+        {
+            "category": row.category,
+            "total_value": round(row.total_value, 2),
+            "item_count": row.batch_count,
+            "total_quantity": row.total_quantity,
+        }
+        for row in rows
+    ]
+
+
+def category_distribution(db):
+    """Number of medicines per category"""
+    rows = db.execute(
+        select(CategoryRollup.category, CategoryRollup.medicine_count).order_by(CategoryRollup.category)
+    )
+    return [{"category": category, "count": count} for category, count in rows]
+
+
+def top_medicines(db, limit: int):
+    """Stocked medicines ranked by value, plus the number of medicines in stock"""
+    rows = db.execute(
+        select(MedicineRollup, Medicine.name)
+        .join(Medicine, Medicine.id == MedicineRollup.medicine_id)
+        .where(MedicineRollup.total_quantity > 0)
+        .order_by(MedicineRollup.total_value.desc())
+        .limit(limit)
+    )
+    top = [
+        {
+            "medicine_id": rollup.medicine_id,
+            "name": name,
+            "category": rollup.category,
+            "total_quantity": rollup.total_quantity,
+            "total_value": round(rollup.total_value, 2),
+            "unit_price": rollup.price,
+        }
+        for rollup, name in rows
+    ]
+    in_stock = db.scalar(select(func.coalesce(func.sum(CategoryRollup.stocked_count), 0)))
+    return top, int(in_stock)
@@ -0,0 +1,232 @@
+"""
+Bulk Import Service - Onboard pharmacy stock sheets (CSV / Excel).
+
+The upload is streamed to a temporary file, read back in fixed-size chunks
+(pandas for CSV, openpyxl read-only mode for Excel) and validated one
+chunk at a time with vectorized pandas checks. Valid rows are written
+through the data backend's ``import_stock_rows`` (bulk insert / upsert),
+so memory use depends on the chunk size, not on the file size.
+
+Each row describes one inventory batch together with its medicine:
+    required: name, category, price, quantity
+    optional: generic_name, manufacturer, dosage, salt_composition, unit,
+              description, reorder_level, batch_number, expiry_date (YYYY-MM-DD),
+              shelf_location, supplier_id
+
+Medicines are matched on (name, dosage) and batches on
+(medicine, batch_number); matches are updated, everything else is inserted.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+CHUNK_SIZE = 10_000
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Only the first errors are returned in the report; the rest are counted
+MAX_REPORTED_ERRORS = 1000
+
+REQUIRED_COLUMNS = ["name", "category", "price", "quantity"]
+OPTIONAL_COLUMNS = [
+    "generic_name",
+    "manufacturer",
+    "dosage",
+    "salt_composition",
+    "unit",
+    "description",
+    "reorder_level",
+    "batch_number",
+    "expiry_date",
+    "shelf_location",
+    "supplier_id",
+]
+TEXT_COLUMNS = [
+    "name",
+    "category",
+    "generic_name",
+    "manufacturer",
+    "dosage",
+    "salt_composition",
+    "unit",
+    "description",
+    "batch_number",
+    "shelf_location",
+]
+
+EXCEL_SUFFIXES = (".xlsx", ".xlsm")
+
+
+class ImportFormatError(ValueError):
+    """The file cannot be imported at all (unknown type, missing columns)"""
+
+
+# ==================== READING ====================
+
+def save_upload(fileobj, filename: str):
+    """Stream an uploaded file to a temporary file and return its path"""
+    suffix = os.path.splitext(filename or "")[1].lower()
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        shutil.copyfileobj(fileobj, tmp, COPY_BUFFER_SIZE)
+        return tmp.name
+
+
+def _normalize_columns(columns):
+    return [str(c).strip().lower().replace(" ", "_") for c in columns]
+
+
+def _iter_excel_chunks(path: str, chunksize: int):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = _normalize_columns(header)
+
+        buffer = []
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) == chunksize:
+                yield pd.DataFrame(buffer, columns=columns, dtype=object)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=columns, dtype=object)
+    finally:
+        workbook.close()
+
+
+def iter_chunks(path: str, chunksize: int = CHUNK_SIZE):
+    """Yield the rows of a CSV or Excel file as DataFrames of ``chunksize`` rows"""
+    if path.lower().endswith(EXCEL_SUFFIXES):
+        yield from _iter_excel_chunks(path, chunksize)
+    elif path.lower().endswith(".csv"):
+        for chunk in pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=False):
+            chunk.columns = _normalize_columns(chunk.columns)
+            yield chunk
+    else:
+        raise ImportFormatError("Unsupported file type. Upload a .csv or .xlsx file.")
+
+
+# ==================== VALIDATION ====================
+
+def _text(df: pd.DataFrame, column: str):
+    """Column as stripped strings, with blanks as <NA>"""
+    if column not in df:
+        return pd.Series(pd.NA, index=df.index, dtype="string")
+    values = df[column].astype("string").str.strip()
+    return values.mask(values == "")
+
+
+def _number(df: pd.DataFrame, column: str):
+    """Column as floats (NaN for blank or unparsable) and a mask of non-blank cells"""
+    raw = _text(df, column)
+    return pd.to_numeric(raw, errors="coerce"), raw.notna()
+
+
+def validate_chunk(df: pd.DataFrame, first_row: int):
+    """
+    Validate one chunk.
+
+    ``first_row`` is the file row number of the chunk's first data row.
+    Returns ``(records, errors)``: clean dicts for the valid rows and
+    ``{"row": n, "errors": [...]}`` entries for the rejected ones.
+    """
+    missing = [c for c in REQUIRED_COLUMNS if c not in df]
+    if missing:
+        raise ImportFormatError(f"Missing required columns: {', '.join(missing)}")
+
+    df = df.reset_index(drop=True)
+    text = {column: _text(df, column) for column in TEXT_COLUMNS}
+    price, _ = _number(df, "price")
+    quantity, _ = _number(df, "quantity")
+    reorder_level, has_reorder_level = _number(df, "reorder_level")
+    supplier_id, has_supplier_id = _number(df, "supplier_id")
+    expiry_raw = _text(df, "expiry_date")
+    expiry = pd.to_datetime(expiry_raw.str.slice(0, 10), format="%Y-%m-%d", errors="coerce")
+
+    checks = [
+        (text["name"].isna(), "name is required"),
+        (text["category"].isna(), "category is required"),
+        (price.isna() | (price < 0), "price must be a non-negative number"),
+        (quantity.isna() | (quantity < 0) | (quantity % 1 != 0), "quantity must be a non-negative integer"),
+        (has_reorder_level & (reorder_level.isna() | (reorder_level < 0) | (reorder_level % 1 != 0)),
+         "reorder_level must be a non-negative integer"),
+        (has_supplier_id & (supplier_id.isna() | (supplier_id % 1 != 0)), "supplier_id must be an integer"),
+        (expiry_raw.notna() & expiry.isna(), "expiry_date must be a date (YYYY-MM-DD)"),
+    ]
+    masks = [mask.fillna(True).to_numpy(dtype=bool) for mask, _ in checks]
+    invalid = pd.Series(False, index=df.index)
+    for mask in masks:
+        invalid |= mask
+
+    errors = []
+    for pos in invalid[invalid].index:
+        errors.append({
+            "row": first_row + pos,
+            "errors": [message for mask, (_, message) in zip(masks, checks) if mask[pos]],
+        })
+
+    valid = ~invalid
+    clean = pd.DataFrame({column: values[valid] for column, values in text.items()})
+    clean["price"] = price[valid]
+    clean["quantity"] = quantity[valid].astype("int64")
+    clean["reorder_level"] = reorder_level[valid].astype("Int64")
+    clean["supplier_id"] = supplier_id[valid].astype("Int64")
+    clean["expiry_date"] = expiry[valid].dt.strftime("%Y-%m-%d")
+
+    records = [
+        {key: (None if pd.isna(value) else value) for key, value in record.items()}
+        for record in clean.astype(object).to_dict("records")
+    ]
+    return records, errors
+
+
+# ==================== IMPORT ====================
+
+def import_file(path: str, write_rows, chunksize: int = CHUNK_SIZE):
+    """
+    Import a saved CSV / Excel file chunk by chunk.
+
+    ``write_rows`` is the data backend's ``import_stock_rows``. Returns a
+    report with row counts, throughput and the per-row errors.
+    """
+    started = time.perf_counter()
+    report = {
+        "rows_total": 0,
+        "rows_imported": 0,
+        "rows_failed": 0,
+        "medicines_created": 0,
+        "medicines_updated": 0,
+        "batches_created": 0,
+        "batches_updated": 0,
+        "errors": [],
+    }
+
+    next_row = 2  # Row 1 is the header
+    for chunk in iter_chunks(path, chunksize):
+        records, errors = validate_chunk(chunk, next_row)
+        next_row += len(chunk)
+
+        report["rows_total"] += len(chunk)
+        report["rows_failed"] += len(errors)
+        room = MAX_REPORTED_ERRORS - len(report["errors"])
+        if room > 0:
+            report["errors"].extend(errors[:room])
+
+        if records:
+            written = write_rows(records)
+            report["rows_imported"] += len(records)
+            for key, count in written.items():
+                report[key] += count
+
+    elapsed = time.perf_counter() - started
+    report["seconds"] = round(elapsed, 3)
+    report["rows_per_sec"] = round(report["rows_total"] / elapsed, 1) if elapsed > 0 else None
+    report["errors_truncated"] = report["rows_failed"] > len(report["errors"])
+    return report
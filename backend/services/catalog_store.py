@@ -0,0 +1,238 @@
+"""
+Catalog Store - Indexed in-memory tables for the mock data service.
+
+Every table keeps its records in a dict keyed by ``id`` and maintains hash
+indexes on selected fields, so lookups by id or by an indexed field never
+scan the whole collection. Index buckets hold record ids in sorted order,
+which keeps results stable and lets callers resume a listing from an id.
+
+Listings are paged by keyset: a page starts right after a given id, so
+page N costs the same as page 1.
+
+Indexes are kept up to date on insert, update and delete. Other components
+(counters, search, analytics) can subscribe to a table to be told about
+every change. Each table also counts its writes in ``version``, which the
+API uses for ETags.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+
+
+class IndexedTable:
+    """
+    Dict-backed table with hash indexes on selected fields.
+
+    Records are plain dicts with an integer ``id``. Updates replace the
+    stored dict instead of mutating it, so listeners receive both the old
+    and the new version of a record.
+    """
+
+    def __init__(self, name: str, indexed_fields=()):
+        self.name = name
+        self._rows = {}
+        self._ids = []
+        self._indexes = {field: {} for field in indexed_fields}
+        self._listeners = []
+        self._next_id = 1
+        self.version = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, record_id):
+        return record_id in self._rows
+
+    def __getitem__(self, record_id):
+        return self._rows[record_id]
+
+    # ==================== READS ====================
+
+    def get(self, record_id: int):
+        """Get a record by id (O(1))"""
+        return self._rows.get(record_id)
+
+    def get_many(self, record_ids):
+        """
+        Get records for a list of ids (O(1) each), in request order.
+        Returns ``(records, missing_ids)``; repeated ids are returned once.
+        """
+        rows = self._rows
+        records, missing = [], []
+        for record_id in dict.fromkeys(record_ids):
+            record = rows.get(record_id)
+            if record is None:
+                missing.append(record_id)
+            else:
+                records.append(record)
+        return records, missing
+
+    def all(self):
+        """Get all records in insertion order"""
+        return list(self._rows.values())
+
+    def last_id(self):
+        """Get the highest id (None if the table is empty)"""
+        return self._ids[-1] if self._ids else None
+
+    def ids_where(self, field: str, value):
+        """Get the sorted ids of records whose indexed field equals value"""
+        return self._indexes[field].get(value, [])
+
+    def where(self, field: str, value):
+        """Get records whose indexed field equals value"""
+        rows = self._rows
+        return [rows[i] for i in self.ids_where(field, value)]
+
+    def distinct(self, field: str):
+        """Get the distinct values of an indexed field"""
+        return list(self._indexes[field].keys())
+
+    def count_where(self, field: str, value):
+        """Count records whose indexed field equals value"""
+        return len(self.ids_where(field, value))
+
+    def page(self, limit: int, after: int = None, field: str = None, value=None, predicate=None):
+        """
+        Get one keyset page of records ordered by id.
+
+        Starts right after ``after`` (binary search), optionally restricted to
+        an indexed ``field == value`` and to records matching ``predicate``.
+        Returns ``(records, next_cursor)``; next_cursor is None on the last page.
+        """
+        ids = self._ids if field is None else self.ids_where(field, value)
+        return page_ids(ids, self._rows, limit, after, predicate)
+
+    # ==================== WRITES ====================
+
+    def insert(self, record: dict):
+        """Insert a record, assigning the next id if it has none"""
+        record = dict(record)
+        if record.get("id") is None:
+            record["id"] = self._next_id
+        record_id = record["id"]
+        if record_id in self._rows:
+            raise KeyError(f"{self.name}: duplicate id {record_id}")
+
+        self._rows[record_id] = record
+        insort(self._ids, record_id)
+        self._next_id = max(self._next_id, record_id + 1)
+        for field, index in self._indexes.items():
+            self._index_add(index, record.get(field), record_id)
+
+        self._notify(None, record)
+        return record
+
+    def update(self, record_id: int, changes: dict):
+        """Apply changes to a record and return the new version (None if missing)"""
+        old = self._rows.get(record_id)
+        if old is None:
+            return None
+
+        new = {**old, **changes, "id": record_id}
+        self._rows[record_id] = new
+        for field, index in self._indexes.items():
+            if old.get(field) != new.get(field):
+                self._index_remove(index, old.get(field), record_id)
+                self._index_add(index, new.get(field), record_id)
+
+        self._notify(old, new)
+        return new
+
+    def delete(self, record_id: int):
+        """Delete a record and return it (None if missing)"""
+        old = self._rows.pop(record_id, None)
+        if old is None:
+            return None
+
+        self._ids.pop(bisect_left(self._ids, record_id))
+        for field, index in self._indexes.items():
+            self._index_remove(index, old.get(field), record_id)
+
+        self._notify(old, None)
+        return old
+
+    # ==================== LISTENERS ====================
+
+    def subscribe(self, listener):
+        """
+        Register a change listener.
+
+        The listener is called as ``listener(old, new)`` after every write:
+        ``old`` is None on insert and ``new`` is None on delete.
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, old, new):
+        self.version += 1
+        for listener in self._listeners:
+            listener(old, new)
+
+    # ==================== INDEX HELPERS ====================
+
+    @staticmethod
+    def _index_add(index, value, record_id):
+        insort(index.setdefault(value, []), record_id)
+
+    @staticmethod
+    def _index_remove(index, value, record_id):
+        bucket = index.get(value)
+        if not bucket:
+            return
+        pos = bisect_left(bucket, record_id)
+        if pos < len(bucket) and bucket[pos] == record_id:
+            bucket.pop(pos)
+        if not bucket:
+            del index[value]
+
+
+def page_ids(ids, rows, limit: int, after: int = None, predicate=None):
+    """
+    Keyset page over a sorted list of ids.
+
+    ``rows`` maps id to record. Returns ``(records, next_cursor)``.
+    """
+    pos = 0 if after is None else bisect_right(ids, after)
+    records = []
+    while pos < len(ids):
+        record = rows[ids[pos]]
+        pos += 1
+        if predicate is None or predicate(record):
+            if len(records) == limit:
+                return records, records[-1]["id"]
+            records.append(record)
+    return records, None
+
+
+class CatalogStore:
+    """
+    All in-memory tables used by the mock data service.
+
+    Keeps the denormalized ``medicine_name`` on inventory rows in sync
+    with the medicine catalog and removes a medicine's batches when the
+    medicine itself is deleted.
+    """
+
+    def __init__(self):
+        self.medicines = IndexedTable("medicines", ("category", "name"))
+        self.inventory = IndexedTable("inventory", ("medicine_id", "supplier_id"))
+        self.suppliers = IndexedTable("suppliers")
+        self.alerts = IndexedTable("alerts", ("status", "priority", "alert_type", "dedup_key"))
+        self.alerts_archive = IndexedTable("alerts_archive", ("status", "priority", "alert_type"))
+        self.sales = IndexedTable("sales", ("medicine_id",))
+
+        self.medicines.subscribe(self._on_medicine_change)
+
+    def _on_medicine_change(self, old, new):
+        """Propagate medicine renames and deletes to inventory rows"""
+        if old is None:
+            return
+
+        batch_ids = list(self.inventory.ids_where("medicine_id", old["id"]))
+        if new is None:
+            for batch_id in batch_ids:
+                self.inventory.delete(batch_id)
+        elif old["name"] != new["name"]:
+            now = datetime.now().isoformat()
+            for batch_id in batch_ids:
+                self.inventory.update(batch_id, {"medicine_name": new["name"], "updated_at": now})
@@ -0,0 +1,48 @@
+"""
+Data Source - Selects the data backend used by the API routers.
+
+The backend is picked once at startup from the DATA_BACKEND environment
+variable:
+    DATA_BACKEND=mock  -> services/mock_data.py (default, in-memory sample data)
+    DATA_BACKEND=db    -> services/real_data.py (SQLAlchemy, core.database)
+
+Both modules export the same functions, so routers simply import from here.
+
+The analytics and stats functions are wrapped in the result cache
+(services/result_cache.py): results are reused for a per-function TTL and
+dropped as soon as a collection they were computed from is written.
+"""
+
+import os
+
+DATA_BACKEND = os.getenv("DATA_BACKEND", "mock").lower()
+
+if DATA_BACKEND == "db":
+    from services.real_data import *  # noqa: F401,F403
+    from services.real_data import __all__
+elif DATA_BACKEND == "mock":
+    from services.mock_data import *  # noqa: F401,F403
+    from services.mock_data import __all__
+else:
+    raise ValueError(f"Unknown DATA_BACKEND '{DATA_BACKEND}' (expected 'mock' or 'db')")
+
+
+# ==================== RESULT CACHE ====================
+
+from services.result_cache import ResultCache  # noqa: E402
+
+result_cache = ResultCache(get_collection_version)  # noqa: F405
+
+# function -> (collections it reads, TTL in seconds, depends on today's date)
+CACHED_FUNCTIONS = {
+    "get_dashboard_stats": (("medicines", "inventory"), 300, True),
+    "get_inventory_stats": (("medicines", "inventory"), 300, True),
+    "get_inventory_value_by_category": (("medicines", "inventory"), 300, False),
+    "get_top_medicines": (("medicines", "inventory"), 300, False),
+    "get_category_distribution": (("medicines",), 600, False),
+    "get_sales_trends": (("sales",), 60, False),  # The window moves with the clock
+    "get_all_suppliers": (("suppliers",), 600, False),
+}
+
+for _name, (_collections, _ttl, _daily) in CACHED_FUNCTIONS.items():
+    globals()[_name] = result_cache.cached(*_collections, ttl=_ttl, daily=_daily)(globals()[_name])
@@ -0,0 +1,86 @@
+"""
+Expiry Index - Inventory batches kept in expiry-date order.
+
+Expiry dates are parsed once, when a batch is inserted or its expiry date
+changes, and stored as ordinals in a sorted list of ``(ordinal, batch_id)``
+pairs. "Expiring within N days" and "already expired" are then a bisect
+plus a slice instead of a parse-and-compare pass over every batch.
+
+Only batches that still hold stock are indexed: a batch whose quantity
+drops to zero leaves the index, and re-enters it when restocked.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, timedelta
+
+
+def _ordinal(expiry_date):
+    """Expiry date (ISO string or date) as an ordinal, None if missing"""
+    if not expiry_date:
+        return None
+    if isinstance(expiry_date, str):
+        expiry_date = date.fromisoformat(expiry_date)
+    return expiry_date.toordinal()
+
+
+class ExpiryIndex:
+    """
+    Sorted ``(expiry ordinal, batch id)`` pairs for in-stock batches.
+    Subscribe ``on_change`` to the inventory IndexedTable.
+    """
+
+    def __init__(self):
+        self._entries = []
+        self._ordinals = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    # ==================== MAINTENANCE ====================
+
+    def add(self, batch_id: int, expiry_date):
+        ordinal = _ordinal(expiry_date)
+        if ordinal is None or batch_id in self._ordinals:
+            return
+        self._ordinals[batch_id] = ordinal
+        insort(self._entries, (ordinal, batch_id))
+
+    def remove(self, batch_id: int):
+        ordinal = self._ordinals.pop(batch_id, None)
+        if ordinal is None:
+            return
+        pos = bisect_left(self._entries, (ordinal, batch_id))
+        self._entries.pop(pos)
+
+    def on_change(self, old, new):
+        """IndexedTable listener: track expiry date and in-stock changes"""
+        was_indexed = old is not None and old["quantity"] > 0
+        now_indexed = new is not None and new["quantity"] > 0
+        if was_indexed and now_indexed and old.get("expiry_date") == new.get("expiry_date"):
+            return
+        if was_indexed:
+            self.remove(old["id"])
+        if now_indexed:
+            self.add(new["id"], new.get("expiry_date"))
+
+    # ==================== QUERIES ====================
+
+    def ids_expiring_within(self, days: int, today: date = None):
+        """Ids of batches expiring on or before today + days (soonest first)"""
+        cutoff = ((today or date.today()) + timedelta(days=days)).toordinal()
+        end = bisect_right(self._entries, (cutoff, float("inf")))
+        return [batch_id for _, batch_id in self._entries[:end]]
+
+    def ids_expired(self, today: date = None):
+        """Ids of batches whose expiry date has already passed (oldest first)"""
+        end = bisect_left(self._entries, ((today or date.today()).toordinal(),))
+        return [batch_id for _, batch_id in self._entries[:end]]
+
+    def count_expiring_within(self, days: int, today: date = None):
+        """Number of batches expiring on or before today + days"""
+        cutoff = ((today or date.today()) + timedelta(days=days)).toordinal()
+        return bisect_right(self._entries, (cutoff, float("inf")))
+
+    def count_expired(self, today: date = None):
+        """Number of batches that have already expired"""
+        return bisect_left(self._entries, ((today or date.today()).toordinal(),))
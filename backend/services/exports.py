@@ -0,0 +1,177 @@
+"""
+Exports Service - Stream collections out as CSV or Parquet.
+
+Rows are read one keyset page at a time through the data backend's
+``get_*_page`` functions and encoded as they arrive:
+
+- CSV: one chunk of text per page (header first)
+- Parquet: pages are buffered up to ROW_GROUP_SIZE rows, written as one
+  row group and the bytes produced so far are handed out
+
+so memory use depends on the page / row group size, never on the number
+of rows exported. Each collection has a fixed column list with types
+(Parquet needs the schema before the first row group); callers may select
+a subset of the columns.
+"""
+
+import csv
+import io
+
+PAGE_SIZE = 1000
+ROW_GROUP_SIZE = 50_000
+
+# Column -> type ("int", "float", "bool", "str"; dates and times are ISO strings)
+EXPORT_COLUMNS = {
+    "medicines": {
+        "id": "int",
+        "name": "str",
+        "generic_name": "str",
+        "category": "str",
+        "manufacturer": "str",
+        "dosage": "str",
+        "salt_composition": "str",
+        "price": "float",
+        "unit": "str",
+        "description": "str",
+        "created_at": "str",
+        "updated_at": "str",
+    },
+    "inventory": {
+        "id": "int",
+        "medicine_id": "int",
+        "medicine_name": "str",
+        "quantity": "int",
+        "reorder_level": "int",
+        "batch_number": "str",
+        "expiry_date": "str",
+        "shelf_location": "str",
+        "supplier_id": "int",
+        "created_at": "str",
+        "updated_at": "str",
+    },
+    "alerts": {
+        "id": "int",
+        "alert_type": "str",
+        "priority": "str",
+        "title": "str",
+        "message": "str",
+        "medicine_id": "int",
+        "inventory_id": "int",
+        "status": "str",
+        "condition": "str",
+        "occurrences": "int",
+        "last_triggered_at": "str",
+        "created_at": "str",
+        "acknowledged_at": "str",
+        "resolved_at": "str",
+    },
+    "sales": {
+        "id": "int",
+        "medicine_id": "int",
+        "inventory_id": "int",
+        "category": "str",
+        "quantity": "int",
+        "unit_price": "float",
+        "total": "float",
+        "sold_at": "str",
+    },
+}
+FORMATS = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+
+class ExportError(ValueError):
+    """Unknown collection, format or column"""
+
+
+def select_columns(collection: str, columns: str = None):
+    """Validate a comma-separated column selection (default: all columns)"""
+    if collection not in EXPORT_COLUMNS:
+        raise ExportError(f"Unknown collection '{collection}'. Use one of: {', '.join(EXPORT_COLUMNS)}")
+    available = EXPORT_COLUMNS[collection]
+    if not columns:
+        return list(available)
+    selected = [column.strip() for column in columns.split(",") if column.strip()]
+    unknown = [column for column in selected if column not in available]
+    if unknown or not selected:
+        raise ExportError(f"Unknown columns {unknown} for {collection}. Available: {', '.join(available)}")
+    return list(dict.fromkeys(selected))
+
+
+def iter_pages(fetch_page, page_size: int = PAGE_SIZE):
+    """Yield pages of records from ``fetch_page(limit, after) -> (records, next_cursor)``"""
+    after = None
+    while True:
+        records, after = fetch_page(page_size, after)
+        if records:
+            yield records
+        if after is None:
+            return
+
+
+# ==================== CSV ====================
+
+def csv_chunks(pages, columns):
+    """Encode pages of records as CSV, one chunk per page"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for records in pages:
+        writer.writerows([record.get(column) for column in columns] for record in records)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+# ==================== PARQUET ====================
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that collects the bytes written since the last drain()"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def parquet_chunks(pages, collection: str, columns, row_group_size: int = ROW_GROUP_SIZE):
+    """Encode pages of records as a Parquet file, one row group per ``row_group_size`` rows"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {"int": pa.int64(), "float": pa.float64(), "bool": pa.bool_(), "str": pa.string()}
+    schema = pa.schema([(column, types[EXPORT_COLUMNS[collection][column]]) for column in columns])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+
+    def row_group(records):
+        arrays = [pa.array([record.get(c) for record in records], type=schema.field(c).type) for c in columns]
+        writer.write_table(pa.Table.from_arrays(arrays, schema=schema), row_group_size=row_group_size)
+        return sink.drain()
+
+    buffered = []
+    for records in pages:
+        buffered.extend(records)
+        if len(buffered) >= row_group_size:
+            yield row_group(buffered)
+            buffered = []
+    if buffered:
+        yield row_group(buffered)
+    writer.close()
+    yield sink.drain()
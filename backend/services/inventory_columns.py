@@ -0,0 +1,157 @@
+"""
+Inventory Columns - Columnar NumPy snapshot of the inventory for analytics.
+
+Each inventory batch occupies one slot in a set of parallel arrays
+(medicine_id, quantity, reorder_level, expiry ordinal, supplier_id,
+category code, price). The snapshot subscribes to the medicines and
+inventory tables of a CatalogStore and patches the affected slots on every
+write, so passes over every batch are vectorized instead of Python loops
+over dicts.
+
+The analytics endpoints (inventory value, category breakdown, top
+medicines) first aggregated these columns per request. They now read the
+delta-maintained rollups of services/memory_rollups.py, which cost O(1)
+per read instead of a pass over all batches, so the snapshot only keeps
+the aggregations those rollups and other whole-inventory jobs need:
+
+- values() and by_medicine(): the source MemoryRollups.reconcile()
+  rebuilds from and checks the rollups against
+- the raw columns: the batch arrays of MockDataService.recompute_reorder_points()
+
+Deleted batches free their slot for reuse; the arrays double in size when
+full.
+"""
+
+import numpy as np
+
+from services.expiry_index import _ordinal
+
+INITIAL_CAPACITY = 1024
+NO_EXPIRY = np.iinfo(np.int32).max
+NO_SUPPLIER = -1
+
+COLUMNS = {
+    "batch_id": np.int64,
+    "medicine_id": np.int64,
+    "quantity": np.int64,
+    "reorder_level": np.int64,
+    "expiry": np.int32,
+    "supplier_id": np.int64,
+    "category": np.int32,
+    "price": np.float64,
+    "valid": np.bool_,
+}
+
+
+class InventoryColumns:
+    """NumPy columns over the inventory of one CatalogStore, patched on writes"""
+
+    def __init__(self, store):
+        self.store = store
+        self.size = 0  # High-water mark of used slots
+        self.columns = {name: np.zeros(INITIAL_CAPACITY, dtype=dtype) for name, dtype in COLUMNS.items()}
+        self._slots = {}  # batch_id -> slot
+        self._free = []
+        self.categories = []  # category code -> name
+        self._category_codes = {}
+        self._medicines = {}  # medicine_id -> (price, category code)
+
+        for med in store.medicines.all():
+            self.on_medicine_change(None, med)
+        for inv in store.inventory.all():
+            self.on_inventory_change(None, inv)
+
+        store.medicines.subscribe(self.on_medicine_change)
+        store.inventory.subscribe(self.on_inventory_change)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def column(self, name: str):
+        """View of one column over the used slots (freed slots have valid=False)"""
+        return self.columns[name][:self.size]
+
+    # ==================== MAINTENANCE ====================
+
+    def _category_code(self, category: str):
+        code = self._category_codes.get(category)
+        if code is None:
+            code = self._category_codes[category] = len(self.categories)
+            self.categories.append(category)
+        return code
+
+    def _grow(self):
+        capacity = 2 * len(self.columns["valid"])
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            self.columns[name] = grown
+
+    def _write(self, slot: int, inv: dict):
+        price, category = self._medicines.get(inv["medicine_id"], (0.0, self._category_code("")))
+        supplier_id = inv.get("supplier_id")
+        ordinal = _ordinal(inv.get("expiry_date"))
+        row = {
+            "batch_id": inv["id"],
+            "medicine_id": inv["medicine_id"],
+            "quantity": inv["quantity"],
+            "reorder_level": inv["reorder_level"],
+            "expiry": NO_EXPIRY if ordinal is None else ordinal,
+            "supplier_id": NO_SUPPLIER if supplier_id is None else supplier_id,
+            "category": category,
+            "price": price,
+            "valid": True,
+        }
+        for name, value in row.items():
+            self.columns[name][slot] = value
+
+    def on_inventory_change(self, old, new):
+        """IndexedTable listener: write, move or free the batch's slot"""
+        if new is None:
+            slot = self._slots.pop(old["id"])
+            self.columns["valid"][slot] = False
+            self.columns["quantity"][slot] = 0
+            self._free.append(slot)
+            return
+
+        slot = self._slots.get(new["id"])
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+            else:
+                if self.size == len(self.columns["valid"]):
+                    self._grow()
+                slot = self.size
+                self.size += 1
+            self._slots[new["id"]] = slot
+        self._write(slot, new)
+
+    def on_medicine_change(self, old, new):
+        """IndexedTable listener: patch price and category on the medicine's batches"""
+        if new is None:
+            self._medicines.pop(old["id"], None)  # Batches are deleted by the store
+            return
+
+        entry = (new["price"], self._category_code(new["category"]))
+        self._medicines[new["id"]] = entry
+        if old is None or (old["price"], old["category"]) == (new["price"], new["category"]):
+            return
+
+        slots = [self._slots[i] for i in self.store.inventory.ids_where("medicine_id", new["id"]) if i in self._slots]
+        if slots:
+            self.columns["price"][slots] = entry[0]
+            self.columns["category"][slots] = entry[1]
+
+    # ==================== AGGREGATIONS ====================
+
+    def values(self):
+        """Stock value (quantity x price) per slot"""
+        return self.column("quantity") * self.column("price")
+
+    def by_medicine(self):
+        """Units and batch count per medicine -> (medicine_ids, quantity, batches) arrays"""
+        valid = self.column("valid")
+        medicine_ids, groups = np.unique(self.column("medicine_id")[valid], return_inverse=True)
+        quantity = np.bincount(groups, weights=self.column("quantity")[valid], minlength=len(medicine_ids))
+        batches = np.bincount(groups, minlength=len(medicine_ids))
+        return medicine_ids, quantity.astype(np.int64), batches
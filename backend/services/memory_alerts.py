@@ -0,0 +1,151 @@
+"""
+Memory Alerts - Alert rules for the mock data service.
+
+In-memory counterpart of services/alert_engine.py. Subscribes to the
+inventory table of a CatalogStore after the analytics rollups, so when a
+batch changes the medicine totals are already current; the rules of
+services/alert_rules.py are evaluated for that batch only and the alerts
+are stored in the store's alerts table, folded into the open alerts by
+services/alert_dedup.py; open alerts of conditions the change cleared are
+resolved. The open alerts are found in a dedup_key -> alert id map that a
+listener on the alerts table keeps to the open statuses, so a lookup does
+not walk the acknowledged-then-resolved history of a key.
+sweep() evaluates every batch, one page at a time.
+"""
+
+from datetime import datetime
+
+from services import alert_dedup
+from services.alert_rules import cleared_conditions, evaluate_change, sweep as sweep_rules
+from services.reorder_policy import DEFAULT_LEAD_TIME_DAYS, DEMAND_WINDOW_DAYS, demand_window
+
+SWEEP_PAGE_SIZE = 5000
+
+
+class MemoryAlertEngine:
+    """Raises alerts for one CatalogStore as its inventory changes"""
+
+    def __init__(self, store, rollups, sales):
+        self.store = store
+        self.rollups = rollups  # MemoryRollups: units per medicine
+        self.sales = sales  # MemorySales: daily units per medicine
+        self._open = {}  # dedup_key -> id of the open alert
+        for alert in store.alerts.all():
+            self.on_alert_change(None, alert)
+        store.alerts.subscribe(self.on_alert_change)
+        store.inventory.subscribe(self.on_inventory_change)
+
+    # ==================== STATES ====================
+
+    def _demand_rates(self, medicine_ids):
+        start, _ = demand_window()
+        keys, _, units = self.sales.daily_units(medicine_ids, start, DEMAND_WINDOW_DAYS)
+        rates = dict.fromkeys(medicine_ids, 0.0)
+        for medicine_id, sold in zip(keys, units):
+            rates[medicine_id] += sold / DEMAND_WINDOW_DAYS
+        return rates
+
+    def _lead_time(self, supplier_id):
+        supplier = self.store.suppliers.get(supplier_id) if supplier_id is not None else None
+        return (supplier or {}).get("lead_time_days") or DEFAULT_LEAD_TIME_DAYS
+
+    def _on_hand(self, medicine_id):
+        entry = self.rollups.medicines.get(medicine_id)
+        return entry.quantity if entry else 0
+
+    def _state(self, inv: dict, on_hand: int, demand_rate: float):
+        return {
+            "id": inv["id"],
+            "medicine_id": inv["medicine_id"],
+            "medicine_name": inv.get("medicine_name"),
+            "batch_number": inv.get("batch_number"),
+            "quantity": inv["quantity"],
+            "reorder_level": inv["reorder_level"],
+            "expiry_date": inv.get("expiry_date"),
+            "on_hand": on_hand,
+            "demand_rate": demand_rate,
+            "lead_time_days": self._lead_time(inv.get("supplier_id")),
+        }
+
+    def states(self, batches):
+        """Alert-rule states of inventory dicts (current medicine totals and demand)"""
+        rates = self._demand_rates(list({inv["medicine_id"] for inv in batches}))
+        return [
+            self._state(inv, self._on_hand(inv["medicine_id"]), rates[inv["medicine_id"]])
+            for inv in batches
+        ]
+
+    # ==================== EVALUATION ====================
+
+    def on_alert_change(self, old, new):
+        """IndexedTable listener: keep the dedup_key -> open alert id map"""
+        if old is not None and self._open.get(old.get("dedup_key")) == old["id"]:
+            del self._open[old["dedup_key"]]
+        if new is not None and new.get("dedup_key") and new["status"] in alert_dedup.OPEN_STATUSES:
+            self._open[new["dedup_key"]] = new["id"]
+
+    def _open_alerts(self, keys):
+        alerts = self.store.alerts
+        return {key: alerts[self._open[key]] for key in keys if key in self._open}
+
+    def store_alerts(self, alerts):
+        """Store alert dicts from the rules (repeats update the open alert) -> (created, updated)"""
+        if not alerts:
+            return 0, 0
+        now = datetime.now().isoformat()
+        inserts, updates = alert_dedup.plan(alerts, self._open_alerts(alert_dedup.lookup_keys(alerts)), now)
+        for alert in inserts:
+            self.store.alerts.insert({
+                **alert,
+                "id": None,
+                "created_at": now,
+                "acknowledged_at": None,
+                "resolved_at": None,
+            })
+        for alert_id, changes in updates:
+            self.store.alerts.update(alert_id, changes)
+        return len(inserts), len(updates)
+
+    def resolve_alerts(self, keys):
+        """Resolve the open alerts of some dedup keys (their conditions no longer hold) -> count"""
+        open_alerts = self._open_alerts(keys)
+        now = datetime.now().isoformat()
+        for alert in open_alerts.values():
+            self.store.alerts.update(alert["id"], {"status": "resolved", "resolved_at": now})
+        return len(open_alerts)
+
+    def on_inventory_change(self, old, new):
+        """IndexedTable listener: evaluate the rules for the changed batch"""
+        if new is None:
+            return
+        new_state, = self.states([new])
+        old_state = None
+        if old is not None:
+            # The rollups already hold the new quantity: take it back out for the old state
+            on_hand = self._on_hand(old["medicine_id"]) + old["quantity"]
+            if old["medicine_id"] == new["medicine_id"]:
+                on_hand -= new["quantity"]
+            rate = self._demand_rates([old["medicine_id"]])[old["medicine_id"]]
+            old_state = self._state(old, on_hand, rate)
+        alerts = evaluate_change(old_state, new_state)
+        self.store_alerts(alerts)
+        self.resolve_alerts(alert_dedup.cleared_keys(cleared_conditions(old_state, new_state), alerts))
+
+    def sweep(self, page_size: int = SWEEP_PAGE_SIZE):
+        """Evaluate every batch, one page at a time -> {batches, alerts_created, alerts_updated}"""
+        def pages():
+            after = None
+            while True:
+                batches, after = self.store.inventory.page(page_size, after)
+                if batches:
+                    yield self.states(batches)
+                if after is None:
+                    return
+
+        report = {"batches": 0, "alerts_created": 0, "alerts_updated": 0}
+        for states, alerts in sweep_rules(pages()):
+            created, updated = self.store_alerts(alerts)
+            report["batches"] += len(states)
+            report["alerts_created"] += created
+            report["alerts_updated"] += updated
+        return report
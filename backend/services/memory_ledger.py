@@ -0,0 +1,86 @@
+"""
+Memory Ledger - In-memory stock movement ledger for the mock data service.
+
+Mirrors services/stock_ledger.py without a database. Movements are appended
+to an IndexedTable and never changed or removed, also when their batch is
+deleted. Every movement also records the
+batch's running balance, which acts as a snapshot taken at every movement:
+"stock at time T" is a bisect over one batch's movement times, and
+consumption over a window is the difference of two cumulative totals.
+Dispenses outside sales are also added up per medicine and UTC day, the
+ledger's share of the demand for reorder points.
+"""
+
+from bisect import bisect_right
+from datetime import datetime
+
+from services.catalog_store import IndexedTable
+from services.movement_types import CONSUMPTION_TYPES, SALE_NOTE
+from services.sales_buckets import bucket_start
+
+
+def _local(at: datetime):
+    """Naive local time, comparable with the ledger's datetime.now() stamps"""
+    return at.astimezone().replace(tzinfo=None) if at.tzinfo else at
+
+
+class MemoryLedger:
+    """Append-only movements with per-batch balances and per-medicine consumption totals"""
+
+    def __init__(self):
+        self.movements = IndexedTable("stock_movements", ("inventory_id",))
+        self._balances = {}     # inventory_id -> ([times], [balance after movement])
+        self._consumption = {}  # (medicine_id, movement_type) -> ([times], [cumulative units])
+        self._dispensed = {}  # (medicine_id, UTC day bucket) -> units dispensed outside sales
+
+    def append(self, inv: dict, movement_type: str, change: int, note: str = None):
+        """Append a movement for batch ``inv`` whose quantity is already updated"""
+        now = datetime.now()
+        movement = self.movements.insert({
+            "id": None,
+            "inventory_id": inv["id"],
+            "medicine_id": inv["medicine_id"],
+            "movement_type": movement_type,
+            "quantity_change": change,
+            "note": note,
+            "created_at": now.isoformat(),
+        })
+
+        times, balances = self._balances.setdefault(inv["id"], ([], []))
+        times.append(now)
+        balances.append(inv["quantity"])
+
+        if movement_type in CONSUMPTION_TYPES:
+            times, totals = self._consumption.setdefault((inv["medicine_id"], movement_type), ([], []))
+            times.append(now)
+            totals.append((totals[-1] if totals else 0) - change)
+        if movement_type == "dispense" and note != SALE_NOTE:
+            key = (inv["medicine_id"], bucket_start(now.astimezone(), "day"))
+            self._dispensed[key] = self._dispensed.get(key, 0) - change
+        return movement
+
+    def quantity_at(self, inventory_id: int, at: datetime):
+        """Batch quantity right after the last movement at or before ``at``"""
+        times, balances = self._balances.get(inventory_id, ([], []))
+        pos = bisect_right(times, _local(at))
+        return balances[pos - 1] if pos else 0
+
+    def _total_until(self, medicine_id: int, movement_type: str, at: datetime):
+        times, totals = self._consumption.get((medicine_id, movement_type), ([], []))
+        pos = bisect_right(times, _local(at))
+        return totals[pos - 1] if pos else 0
+
+    def consumption(self, medicine_id: int, start: datetime, end: datetime):
+        """Units dispensed and written off for a medicine between start and end"""
+        def units(movement_type):
+            return (self._total_until(medicine_id, movement_type, end)
+                    - self._total_until(medicine_id, movement_type, start))
+
+        return {"dispensed": units("dispense"), "written_off": units("write_off")}
+
+    def daily_dispenses(self, start: datetime, end: datetime):
+        """
+        Units dispensed outside sales per medicine and day of [start, end)
+        (naive UTC day buckets) -> {(medicine_id, day bucket): units}
+        """
+        return {key: units for key, units in self._dispensed.items() if start <= key[1] < end}
@@ -0,0 +1,212 @@
+"""
+Memory Rollups - Pre-aggregated analytics for the mock backend.
+
+In-memory counterpart of services/analytics_rollups.py. Subscribes to the
+medicines and inventory tables of a CatalogStore and applies every write
+as a delta to:
+
+- per category: stock value, units, batch count and medicine count
+- per medicine: units, batch count and stock value, with the stocked
+  medicines kept in a max-heap on value
+
+so the category breakdown, category distribution and top-k medicines are
+read without scanning the inventory. Heap entries are invalidated lazily:
+a write pushes the medicine's new value and outdated entries are dropped
+when they surface. reconcile() rebuilds everything from the NumPy
+inventory snapshot (services/inventory_columns.py) and reports the drift.
+"""
+
+import heapq
+import math
+import time
+
+
+class _Medicine:
+    """Running totals of one medicine"""
+    __slots__ = ("category", "price", "quantity", "batches")
+
+    def __init__(self, category: str, price: float):
+        self.category = category
+        self.price = price
+        self.quantity = 0
+        self.batches = 0
+
+    @property
+    def value(self):
+        return self.quantity * self.price
+
+
+def _category():
+    return {"total_value": 0.0, "total_quantity": 0, "item_count": 0, "medicine_count": 0}
+
+
+class MemoryRollups:
+    """Category and top-medicine rollups for one CatalogStore, updated by delta"""
+
+    def __init__(self, store, columns):
+        self.store = store
+        self.columns = columns  # InventoryColumns, the reconcile source
+        self.categories = {}
+        self.medicines = {}
+        self.in_stock = 0  # Medicines with quantity > 0
+        self._heap = []  # (-value, medicine_id), possibly outdated
+
+        for med in store.medicines.all():
+            self.on_medicine_change(None, med)
+        for inv in store.inventory.all():
+            self.on_inventory_change(None, inv)
+
+        store.medicines.subscribe(self.on_medicine_change)
+        store.inventory.subscribe(self.on_inventory_change)
+
+    # ==================== LISTENERS ====================
+
+    def on_medicine_change(self, old, new):
+        """Register, remove, reprice or recategorize a medicine"""
+        if new is None:
+            entry = self.medicines.get(old["id"])
+            if entry is not None:  # Its batches were already deleted by the store
+                self._remove(entry)
+                del self.medicines[old["id"]]
+            return
+
+        entry = self.medicines.get(new["id"])
+        if entry is None:
+            entry = self.medicines[new["id"]] = _Medicine(new["category"], new["price"])
+            self._add(new["id"], entry)
+        elif (entry.category, entry.price) != (new["category"], new["price"]):
+            self._remove(entry)
+            entry.category, entry.price = new["category"], new["price"]
+            self._add(new["id"], entry)
+
+    def on_inventory_change(self, old, new):
+        """Apply a batch write as a delta on its medicine"""
+        if old is not None:
+            self._change(old["medicine_id"], -old["quantity"], -1)
+        if new is not None:
+            self._change(new["medicine_id"], new["quantity"], 1)
+
+    def _change(self, medicine_id: int, quantity: int, batches: int):
+        entry = self.medicines.get(medicine_id)
+        if entry is None:
+            return
+        self._remove(entry)
+        entry.quantity += quantity
+        entry.batches += batches
+        self._add(medicine_id, entry)
+
+    def _add(self, medicine_id: int, entry: _Medicine):
+        totals = self.categories.get(entry.category)
+        if totals is None:
+            totals = self.categories[entry.category] = _category()
+        totals["total_value"] += entry.value
+        totals["total_quantity"] += entry.quantity
+        totals["item_count"] += entry.batches
+        totals["medicine_count"] += 1
+        if entry.quantity > 0:
+            self.in_stock += 1
+            heapq.heappush(self._heap, (-entry.value, medicine_id))
+            if len(self._heap) > 2 * self.in_stock + 64:
+                self._compact()
+
+    def _remove(self, entry: _Medicine):
+        totals = self.categories[entry.category]
+        totals["total_value"] -= entry.value
+        totals["total_quantity"] -= entry.quantity
+        totals["item_count"] -= entry.batches
+        totals["medicine_count"] -= 1
+        if totals["medicine_count"] == 0:
+            del self.categories[entry.category]
+        if entry.quantity > 0:
+            self.in_stock -= 1
+
+    def _current(self, neg_value: float, medicine_id: int):
+        """Is a heap entry still the medicine's value?"""
+        entry = self.medicines.get(medicine_id)
+        return entry is not None and entry.quantity > 0 and entry.value == -neg_value
+
+    def _compact(self):
+        """Drop outdated heap entries"""
+        self._heap = [(-e.value, i) for i, e in self.medicines.items() if e.quantity > 0]
+        heapq.heapify(self._heap)
+
+    # ==================== READS ====================
+
+    def by_category(self):
+        """Value, units and batch count per category (categories with batches only)"""
+        return [
+            {
+                "category": category,
+                "total_value": round(totals["total_value"], 2),
+                "item_count": totals["item_count"],
+                "total_quantity": totals["total_quantity"],
+            }
+            for category, totals in self.categories.items()
+            if totals["item_count"]
+        ]
+
+    def category_distribution(self):
+        """Number of medicines per category"""
+        return [
+            {"category": category, "count": totals["medicine_count"]}
+            for category, totals in self.categories.items()
+        ]
+
+    def top_medicines(self, limit: int):
+        """
+        Stocked medicines ranked by value.
+        Returns ``(rows, in_stock)`` with rows of (medicine_id, total_quantity, total_value).
+        """
+        heap = self._heap
+        top = []
+        seen = set()
+        while heap and len(top) < limit:
+            neg_value, medicine_id = heapq.heappop(heap)
+            if medicine_id not in seen and self._current(neg_value, medicine_id):
+                seen.add(medicine_id)
+                top.append((neg_value, medicine_id))
+        for item in top:
+            heapq.heappush(heap, item)
+        return [(i, self.medicines[i].quantity, -neg_value) for neg_value, i in top], self.in_stock
+
+    # ==================== RECONCILE ====================
+
+    def reconcile(self):
+        """
+        Rebuild the rollups from the inventory snapshot.
+        Returns a drift report: the categories whose figures differed.
+        """
+        started = time.perf_counter()
+        medicine_ids, quantity, batches = self.columns.by_medicine()
+        stock = {int(i): (int(q), int(b)) for i, q, b in zip(medicine_ids, quantity, batches)}
+
+        before = {category: dict(totals) for category, totals in self.categories.items()}
+        previous = {i: (e.category, e.price, e.quantity, e.batches) for i, e in self.medicines.items()}
+        self.categories = {}
+        self.medicines = {}
+        self.in_stock = 0
+        self._heap = []
+        for med in self.store.medicines.all():
+            entry = self.medicines[med["id"]] = _Medicine(med["category"], med["price"])
+            entry.quantity, entry.batches = stock.get(med["id"], (0, 0))
+            self._add(med["id"], entry)
+        self._compact()
+        medicines_fixed = sum(
+            previous.get(i) != (e.category, e.price, e.quantity, e.batches) for i, e in self.medicines.items()
+        ) + len(previous.keys() - self.medicines.keys())
+
+        drift = []
+        for category in sorted(before.keys() | self.categories.keys()):
+            old = before.get(category, _category())
+            new = self.categories.get(category, _category())
+            if not math.isclose(old["total_value"], new["total_value"], rel_tol=1e-9, abs_tol=1e-6) or any(
+                old[field] != new[field] for field in ("total_quantity", "item_count", "medicine_count")
+            ):
+                drift.append({"category": category, "rollup": old, "actual": new})
+        return {
+            "medicines": len(self.medicines),
+            "categories": len(self.categories),
+            "medicines_fixed": medicines_fixed,
+            "drift": drift,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
@@ -0,0 +1,59 @@
+"""
+Memory Sales - In-memory sales transactions for the mock data service.
+
+Mirrors services/sales_ledger.py without a database. Sales are appended to
+the store's sales table and every sale is added to its hour, day and month
+bucket for all sales, its category and its medicine, so a trend reads one
+dict entry per bucket.
+"""
+
+from datetime import timedelta
+
+from services.sales_buckets import label, query_scope, rollup_deltas, window
+
+
+class MemorySales:
+    """Append-only sales with hourly / daily / monthly rollups"""
+
+    def __init__(self, table):
+        self.sales = table  # CatalogStore.sales (its version is the "sales" collection version)
+        self.rollups = {}  # (granularity, scope, key) -> {bucket: [units, revenue, transactions]}
+
+    def append(self, sales):
+        """Append sale dicts and add them to the rollups; returns the stored sales"""
+        stored = [self.sales.insert({"id": None, "inventory_id": None, **sale}) for sale in sales]
+        for (granularity, scope, key, bucket), (units, revenue, transactions) in rollup_deltas(stored).items():
+            totals = self.rollups.setdefault((granularity, scope, key), {}).get(bucket)
+            if totals is None:
+                self.rollups[(granularity, scope, key)][bucket] = [units, revenue, transactions]
+            else:
+                totals[0] += units
+                totals[1] += revenue
+                totals[2] += transactions
+        return stored
+
+    def trends(self, days: int, granularity: str = "day", category: str = None, medicine_id: int = None, now=None):
+        """Units and revenue per bucket over the last ``days`` days, oldest first"""
+        scope, key = query_scope(category, medicine_id)
+        series = self.rollups.get((granularity, scope, key), {})
+        trends = []
+        for bucket in window(days, granularity, now):
+            units, revenue, _ = series.get(bucket, (0, 0.0, 0))
+            trends.append({"date": label(bucket, granularity), "sales": units, "revenue": round(revenue, 2)})
+        return trends
+
+    def daily_units(self, medicine_ids, start, days: int):
+        """Daily units per medicine over ``days`` days from ``start`` -> (medicine ids, day offsets, units)"""
+        buckets = [start + timedelta(days=offset) for offset in range(days)]
+        keys, offsets, units = [], [], []
+        for medicine_id in medicine_ids:
+            series = self.rollups.get(("day", "medicine", str(medicine_id)))
+            if not series:
+                continue
+            for offset, bucket in enumerate(buckets):
+                totals = series.get(bucket)
+                if totals is not None:
+                    keys.append(medicine_id)
+                    offsets.append(offset)
+                    units.append(totals[0])
+        return keys, offsets, units
@@ -2,17 +2,60 @@
 Mock Data Service - Generate fake data for development and testing.
 
 🎯 IMPORTANT FOR DATA SCIENTIST:
-This file provides mock data for development. When you're ready to integrate:
-1. Create a new file: backend/services/real_data.py
-2. Copy the function signatures from this file
-3. Replace mock data with actual database queries
-4. Update imports in API endpoints from mock_data to real_data
+This file provides mock data for development. The database-backed version
+lives in backend/services/real_data.py and exports the same functions.
+API endpoints import from services/data_source.py, which picks one of the
+two at startup (DATA_BACKEND=mock or DATA_BACKEND=db).
 
-No other changes needed! The API endpoints will work with both mock and real data.
+When adding a function here, add it to real_data.py and __all__ in both files.
 """
 
-from datetime import date, datetime, timedelta
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+import os
 import random
+import uuid
+
+import numpy as np
+
+from services.catalog_store import CatalogStore, page_ids
+from services.search_index import MedicineSearchIndex
+from services.expiry_index import ExpiryIndex
+from services.stock_counters import StockCounters
+from services.inventory_columns import InventoryColumns, NO_SUPPLIER
+from services.memory_rollups import MemoryRollups
+from services.memory_ledger import MemoryLedger
+from services.memory_sales import MemorySales
+from services.memory_alerts import MemoryAlertEngine
+from services.sales_buckets import utc
+from services.sales_generator import generate_sales
+from services.movement_types import SALE_NOTE, StockError, signed_change
+from services import reorder_policy
+
+
+# Column defaults applied to new records (mirrors the ORM models)
+MEDICINE_DEFAULTS = {
+    "generic_name": None,
+    "manufacturer": None,
+    "dosage": None,
+    "salt_composition": None,
+    "description": None,
+    "price": 0.0,
+    "unit": "piece",
+}
+SALES_HISTORY_DAYS = 365  # Generated sample sales history
+SEARCH_PAGE_CACHE_SIZE = 32  # Ranked search results kept for paging (per query and category)
+ALERT_COUNTER_FIELDS = ("status", "priority", "alert_type")  # Indexed on the alerts table
+ALERT_RETENTION_DAYS = int(os.getenv("ALERT_RETENTION_DAYS", "90"))  # Mirrors services/alert_archive.py
+ALERT_ARCHIVE_BATCH_SIZE = 1000  # Mirrors alert_archive.BATCH_SIZE: the report counts the batches the database takes
+INVENTORY_DEFAULTS = {
+    "quantity": 0,
+    "reorder_level": 10,
+    "batch_number": None,
+    "expiry_date": None,
+    "shelf_location": None,
+    "supplier_id": None,
+}
 
 
 class MockDataService:
@@ -23,10 +66,35 @@ class MockDataService:
     
     def __init__(self):
         """Initialize with sample data"""
-        self.medicines = self._generate_medicines()
-        self.inventory = self._generate_inventory()
-        self.suppliers = self._generate_suppliers()
-        self.alerts = self._generate_alerts()
+        self.store = CatalogStore()
+        self.instance_id = uuid.uuid4().hex[:8]  # Versions restart with the generated data
+        self.search_index = MedicineSearchIndex()
+        self.store.medicines.subscribe(self.search_index.on_change)
+        self._search_pages = OrderedDict()  # (query, category) -> (medicines version, ranked ids, positions)
+        self.expiry_index = ExpiryIndex()
+        self.store.inventory.subscribe(self.expiry_index.on_change)
+        self.stock_counters = StockCounters(self.store)
+        self.inventory_columns = InventoryColumns(self.store)
+        self.rollups = MemoryRollups(self.store, self.inventory_columns)
+        self.ledger = MemoryLedger()
+        self.sales = MemorySales(self.store.sales)
+        
+        for med in self._generate_medicines():
+            self.store.medicines.insert(med)
+        for sup in self._generate_suppliers():
+            self.store.suppliers.insert(sup)
+        for inv in self._generate_inventory():
+            self._record_receipt(self.store.inventory.insert(inv))
+        self.sales.append(self._generate_sales())
+        self.alert_engine = MemoryAlertEngine(self.store, self.rollups, self.sales)
+        self.alert_engine.sweep()  # Alerts for the generated stock
+    
+    # ==================== VERSIONS ====================
+    
+    def get_collection_version(self, collections):
+        """Combined version token of the given collections (changes on every write)"""
+        versions = (str(getattr(self.store, name).version) for name in collections)
+        return ".".join([self.instance_id, *versions])
     
     # ==================== MEDICINES ====================
     
@@ -68,23 +136,89 @@ class MockDataService:
     
     def get_all_medicines(self):
         """Get all medicines"""
-        return self.medicines
+        return self.store.medicines.all()
     
     def get_medicine_by_id(self, medicine_id: int):
         """Get medicine by ID"""
-        for med in self.medicines:
-            if med["id"] == medicine_id:
-                return med
-        return None
+        return self.store.medicines.get(medicine_id)
+    
+    def get_medicines_by_ids(self, medicine_ids):
+        """Get medicines for a list of IDs -> (medicines, missing_ids)"""
+        return self.store.medicines.get_many(medicine_ids)
     
     def get_medicines_by_category(self, category: str):
         """Get medicines by category"""
-        return [m for m in self.medicines if m["category"] == category]
+        return self.store.medicines.where("category", category)
+    
+    def get_categories(self):
+        """Get distinct medicine categories"""
+        return self.store.medicines.distinct("category")
     
-    def search_medicines(self, query: str):
-        """Search medicines by name"""
-        query = query.lower()
-        return [m for m in self.medicines if query in m["name"].lower()]
+    def search_medicines(self, query: str, limit: int = None):
+        """Fuzzy search by name, generic name, salt and manufacturer (best match first)"""
+        medicines = self.store.medicines
+        return [medicines.get(i) for i, _ in self.search_index.search(query, limit)]
+    
+    def _ranked_search(self, search: str, category: str = None):
+        """
+        Ranked ids matching a search (and category) with each id's position.
+        Cached until the medicines change, so later pages do not search again.
+        """
+        medicines = self.store.medicines
+        key = (search, category)
+        cached = self._search_pages.get(key)
+        if cached is not None and cached[0] == medicines.version:
+            self._search_pages.move_to_end(key)
+            return cached[1], cached[2]
+        
+        ids = [i for i, _ in self.search_index.search(search)]
+        if category:
+            ids = [i for i in ids if medicines[i]["category"] == category]
+        positions = {medicine_id: pos for pos, medicine_id in enumerate(ids)}
+        self._search_pages[key] = (medicines.version, ids, positions)
+        if len(self._search_pages) > SEARCH_PAGE_CACHE_SIZE:
+            self._search_pages.popitem(last=False)
+        return ids, positions
+    
+    def get_medicines_page(self, limit: int, after: int = None, category: str = None, search: str = None):
+        """
+        Get one keyset page of medicines, optionally filtered.
+        Search results are paged in rank order (best match first); the
+        cursor is the id of the last medicine on the page.
+        """
+        medicines = self.store.medicines
+        if search:
+            ids, positions = self._ranked_search(search, category)
+            if after is None:
+                start = 0
+            elif after in positions:
+                start = positions[after] + 1
+            else:
+                return [], None  # The cursor's medicine no longer matches
+            page = [medicines[i] for i in ids[start:start + limit]]
+            return page, page[-1]["id"] if start + limit < len(ids) else None
+        if category:
+            return medicines.page(limit, after, field="category", value=category)
+        return medicines.page(limit, after)
+    
+    def add_medicine(self, data: dict):
+        """Add a medicine to the catalog"""
+        now = datetime.now().isoformat()
+        return self.store.medicines.insert({
+            **MEDICINE_DEFAULTS,
+            **data,
+            "id": None,
+            "created_at": now,
+            "updated_at": None,  # Set by the first edit, as in the database
+        })
+    
+    def edit_medicine(self, medicine_id: int, changes: dict):
+        """Update a medicine (returns None if it does not exist)"""
+        return self.store.medicines.update(medicine_id, {**changes, "updated_at": datetime.now().isoformat()})
+    
+    def remove_medicine(self, medicine_id: int):
+        """Delete a medicine and its inventory batches (their stock ledger is kept)"""
+        return self.store.medicines.delete(medicine_id)
     
     # ==================== INVENTORY ====================
     
@@ -92,7 +226,7 @@ class MockDataService:
         """Generate sample inventory"""
         inventory = []
         
-        for i, med in enumerate(self.medicines, 1):
+        for i, med in enumerate(self.store.medicines.all(), 1):
             # Random quantity between 10 and 200
             quantity = random.randint(10, 200)
             reorder_level = 20
@@ -119,27 +253,168 @@ class MockDataService:
     
     def get_all_inventory(self):
         """Get all inventory items"""
-        return self.inventory
+        return self.store.inventory.all()
+    
+    def get_inventory_item_by_id(self, inventory_id: int):
+        """Get inventory batch by ID"""
+        return self.store.inventory.get(inventory_id)
+    
+    def get_inventory_by_ids(self, inventory_ids):
+        """Get inventory batches for a list of IDs -> (items, missing_ids)"""
+        return self.store.inventory.get_many(inventory_ids)
     
     def get_inventory_by_medicine_id(self, medicine_id: int):
         """Get inventory for specific medicine"""
-        return [inv for inv in self.inventory if inv["medicine_id"] == medicine_id]
+        return self.store.inventory.where("medicine_id", medicine_id)
+    
+    def get_inventory_by_supplier_id(self, supplier_id: int):
+        """Get inventory supplied by a specific supplier"""
+        return self.store.inventory.where("supplier_id", supplier_id)
     
     def get_low_stock_items(self, threshold: int = None):
         """Get items with low stock"""
-        return [inv for inv in self.inventory if inv["quantity"] < inv["reorder_level"]]
+        inventory = self.store.inventory
+        return [inventory.get(i) for i in self.stock_counters.low_stock()]
     
-    def get_expiring_soon(self, days: int = 30):
-        """Get items expiring within specified days"""
-        cutoff_date = date.today() + timedelta(days=days)
-        expiring = []
+    def get_inventory_page(self, limit: int, after: int = None, low_stock: bool = False, expiring_days: int = None):
+        """Get one keyset page of inventory, optionally filtered"""
+        inventory = self.store.inventory
+        if low_stock:
+            return page_ids(self.stock_counters.low_stock(), inventory, limit, after)
+        if expiring_days:
+            # Candidates from the expiry index (a bisect to the cutoff), paged in id order
+            return page_ids(sorted(self.expiry_index.ids_expiring_within(expiring_days)), inventory, limit, after)
+        return inventory.page(limit, after)
+    
+    def add_inventory_item(self, data: dict):
+        """Add an inventory batch for an existing medicine"""
+        medicine = self.store.medicines.get(data["medicine_id"])
+        if medicine is None:
+            return None
+        now = datetime.now().isoformat()
+        inv = self.store.inventory.insert({
+            **INVENTORY_DEFAULTS,
+            **data,
+            "id": None,
+            "medicine_name": medicine["name"],
+            "created_at": now,
+            "updated_at": None,  # Set by the first edit, as in the database
+        })
+        self._record_receipt(inv)
+        return inv
+    
+    def edit_inventory_item(self, inventory_id: int, changes: dict):
+        """Update an inventory batch (returns None if it does not exist)"""
+        changes = {**changes, "updated_at": datetime.now().isoformat()}
+        if "medicine_id" in changes:
+            medicine = self.store.medicines.get(changes["medicine_id"])
+            if medicine is None:
+                return None
+            changes["medicine_name"] = medicine["name"]
+        old = self.store.inventory.get(inventory_id)
+        inv = self.store.inventory.update(inventory_id, changes)
+        if inv is not None and inv["quantity"] != old["quantity"]:
+            self.ledger.append(inv, "adjustment", inv["quantity"] - old["quantity"])
+        return inv
+    
+    def remove_inventory_item(self, inventory_id: int):
+        """Delete an inventory batch (its stock ledger is kept)"""
+        return self.store.inventory.delete(inventory_id)
+    
+    def import_stock_rows(self, rows):
+        """
+        Upsert medicines by (name, dosage) and batches by (medicine, batch_number).
+        Each row holds medicine and batch fields (see services/bulk_import.py).
+        """
+        counts = {"medicines_created": 0, "medicines_updated": 0, "batches_created": 0, "batches_updated": 0}
+        medicine_fields = ["name", "category", "price", *MEDICINE_DEFAULTS]
         
-        for inv in self.inventory:
-            expiry = date.fromisoformat(inv["expiry_date"])
-            if expiry <= cutoff_date:
-                expiring.append(inv)
+        for row in rows:
+            med_values = {k: row[k] for k in medicine_fields if row.get(k) is not None}
+            medicine = next(
+                (m for m in self.store.medicines.where("name", row["name"]) if m["dosage"] == row.get("dosage")),
+                None,
+            )
+            if medicine is None:
+                medicine = self.add_medicine(med_values)
+                counts["medicines_created"] += 1
+            elif any(medicine.get(k) != v for k, v in med_values.items()):
+                medicine = self.edit_medicine(medicine["id"], med_values)
+                counts["medicines_updated"] += 1
+            
+            batch_values = {k: row[k] for k in INVENTORY_DEFAULTS if row.get(k) is not None}
+            batch = None
+            if row.get("batch_number"):
+                batch = next(
+                    (inv for inv in self.store.inventory.where("medicine_id", medicine["id"])
+                     if inv["batch_number"] == row["batch_number"]),
+                    None,
+                )
+            if batch is None:
+                self.add_inventory_item({**batch_values, "medicine_id": medicine["id"]})
+                counts["batches_created"] += 1
+            else:
+                self.edit_inventory_item(batch["id"], batch_values)
+                counts["batches_updated"] += 1
+        
+        return counts
+    
+    # ==================== STOCK LEDGER ====================
+    
+    def _record_receipt(self, inv: dict):
+        """Ledger entry for the opening quantity of a new batch"""
+        if inv["quantity"]:
+            self.ledger.append(inv, "receipt", inv["quantity"])
+    
+    def record_stock_movement(self, inventory_id: int, movement_type: str, quantity: int, note: str = None):
+        """Apply a receipt / dispense / adjustment / write-off to a batch (None if it does not exist)"""
+        change = signed_change(movement_type, quantity)
+        inv = self.store.inventory.get(inventory_id)
+        if inv is None:
+            return None
+        if inv["quantity"] + change < 0:
+            raise StockError(f"Insufficient stock: batch {inventory_id} holds {inv['quantity']}")
         
-        return expiring
+        inv = self.store.inventory.update(inventory_id, {
+            "quantity": inv["quantity"] + change,
+            "updated_at": datetime.now().isoformat(),
+        })
+        return self.ledger.append(inv, movement_type, change, note)
+    
+    def get_stock_movements_page(self, inventory_id: int, limit: int, after: int = None):
+        """Get one keyset page of a batch's movements, oldest first"""
+        return self.ledger.movements.page(limit, after, field="inventory_id", value=inventory_id)
+    
+    def get_stock_level(self, inventory_id: int, at: datetime = None):
+        """Quantity of a batch now or at a past time (None if the batch does not exist)"""
+        inv = self.store.inventory.get(inventory_id)
+        if inv is None:
+            return None
+        quantity = inv["quantity"] if at is None else self.ledger.quantity_at(inventory_id, at)
+        return {
+            "inventory_id": inventory_id,
+            "quantity": quantity,
+            "as_of": (at or datetime.now()).isoformat(),
+        }
+    
+    def get_consumption(self, medicine_id: int, start: datetime, end: datetime):
+        """Units of a medicine dispensed and written off between start and end"""
+        return {
+            "medicine_id": medicine_id,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            **self.ledger.consumption(medicine_id, start, end),
+        }
+    
+    def get_expiring_soon(self, days: int = 30):
+        """Get in-stock items expiring within specified days (soonest first)"""
+        inventory = self.store.inventory
+        return [inventory.get(i) for i in self.expiry_index.ids_expiring_within(days)]
+    
+    def get_expired_items(self):
+        """Get in-stock items that are already past their expiry date"""
+        inventory = self.store.inventory
+        return [inventory.get(i) for i in self.expiry_index.ids_expired()]
     
     # ==================== SUPPLIERS ====================
     
@@ -157,6 +432,7 @@ class MockDataService:
                 "license_number": "MH-DL-2024-001",
                 "rating": 5,
                 "total_orders": 150,
+                "lead_time_days": 3,
                 "is_active": True,
                 "created_at": datetime.now().isoformat(),
                 "updated_at": datetime.now().isoformat(),
@@ -172,6 +448,7 @@ class MockDataService:
                 "license_number": "DL-DL-2024-002",
                 "rating": 4,
                 "total_orders": 120,
+                "lead_time_days": 7,
                 "is_active": True,
                 "created_at": datetime.now().isoformat(),
                 "updated_at": datetime.now().isoformat(),
@@ -187,6 +464,7 @@ class MockDataService:
                 "license_number": "KA-DL-2024-003",
                 "rating": 5,
                 "total_orders": 200,
+                "lead_time_days": 5,
                 "is_active": True,
                 "created_at": datetime.now().isoformat(),
                 "updated_at": datetime.now().isoformat(),
@@ -195,111 +473,298 @@ class MockDataService:
     
     def get_all_suppliers(self):
         """Get all suppliers"""
-        return self.suppliers
+        return self.store.suppliers.all()
     
     def get_supplier_by_id(self, supplier_id: int):
         """Get supplier by ID"""
-        for sup in self.suppliers:
-            if sup["id"] == supplier_id:
-                return sup
-        return None
+        return self.store.suppliers.get(supplier_id)
     
     # ==================== ALERTS ====================
     
-    def _generate_alerts(self):
-        """Generate sample alerts"""
-        alerts = []
-        
-        # Low stock alerts
-        low_stock = self.get_low_stock_items()
-        for i, item in enumerate(low_stock[:5], 1):  # First 5 low stock items
-            alerts.append({
-                "id": i,
-                "alert_type": "low_stock",
-                "priority": "high",
-                "title": f"Low Stock: {item['medicine_name']}",
-                "message": f"Stock level ({item['quantity']}) is below reorder level ({item['reorder_level']}). Please reorder soon.",
-                "medicine_id": item["medicine_id"],
-                "inventory_id": item["id"],
-                "status": "unread",
-                "created_at": datetime.now().isoformat(),
-                "acknowledged_at": None,
-                "resolved_at": None,
-            })
-        
-        # Expiry alerts
-        expiring = self.get_expiring_soon(30)
-        for i, item in enumerate(expiring[:3], len(alerts) + 1):  # First 3 expiring items
-            days_left = (date.fromisoformat(item["expiry_date"]) - date.today()).days
-            priority = "critical" if days_left < 7 else "high"
-            
-            alerts.append({
-                "id": i,
-                "alert_type": "expiry",
-                "priority": priority,
-                "title": f"Expiring Soon: {item['medicine_name']}",
-                "message": f"Batch {item['batch_number']} expires in {days_left} days.",
-                "medicine_id": item["medicine_id"],
-                "inventory_id": item["id"],
-                "status": "unread",
-                "created_at": datetime.now().isoformat(),
-                "acknowledged_at": None,
-                "resolved_at": None,
-            })
-        
-        return alerts
-    
     def get_all_alerts(self):
         """Get all alerts"""
-        return self.alerts
+        return self.store.alerts.all()
+    
+    def get_alert_by_id(self, alert_id: int):
+        """Get alert by ID (archived alerts included)"""
+        return self.store.alerts.get(alert_id) or self.store.alerts_archive.get(alert_id)
+    
+    def get_alerts_by_ids(self, alert_ids):
+        """Get alerts for a list of IDs (archived alerts included) -> (alerts, missing_ids)"""
+        alerts, missing = self.store.alerts.get_many(alert_ids)
+        if not missing:
+            return alerts, missing
+        archived, missing = self.store.alerts_archive.get_many(missing)
+        found = {alert["id"]: alert for alert in alerts + archived}
+        return [found[i] for i in dict.fromkeys(alert_ids) if i in found], missing
     
     def get_alerts_by_status(self, status: str):
         """Get alerts by status"""
-        return [a for a in self.alerts if a["status"] == status]
+        return self.store.alerts.where("status", status)
+    
+    def _alerts_page(self, alerts, limit: int, after: int = None, status: str = None,
+                     priority: str = None, alert_type: str = None):
+        """One keyset page of an alerts table (hot or archive), optionally filtered"""
+        filters = {"status": status, "priority": priority, "alert_type": alert_type}
+        filters = {field: value for field, value in filters.items() if value}
+        if not filters:
+            return alerts.page(limit, after)
+        
+        # Walk the smallest matching index bucket and check the other filters per row
+        field = min(filters, key=lambda f: alerts.count_where(f, filters[f]))
+        predicate = lambda a: all(a[f] == v for f, v in filters.items())
+        return alerts.page(limit, after, field=field, value=filters[field], predicate=predicate)
+    
+    def get_alerts_page(self, limit: int, after: int = None, status: str = None,
+                        priority: str = None, alert_type: str = None):
+        """Get one keyset page of alerts, optionally filtered"""
+        return self._alerts_page(self.store.alerts, limit, after, status, priority, alert_type)
     
     def get_unread_count(self):
         """Get count of unread alerts"""
-        return len([a for a in self.alerts if a["status"] == "unread"])
+        return self.store.alerts.count_where("status", "unread")
+    
+    def get_archived_alerts_page(self, limit: int, after: int = None, status: str = None,
+                                 priority: str = None, alert_type: str = None):
+        """Get one keyset page of archived alerts, optionally filtered"""
+        return self._alerts_page(self.store.alerts_archive, limit, after, status, priority, alert_type)
+    
+    def archive_alerts(self, retention_days: int = None):
+        """Move resolved alerts created before the retention age to the archive table (in one pass)"""
+        retention_days = ALERT_RETENTION_DAYS if retention_days is None else retention_days
+        cutoff = (datetime.now() - timedelta(days=retention_days)).isoformat()
+        alerts = self.store.alerts
+        expired = [i for i in alerts.ids_where("status", "resolved") if alerts[i]["created_at"] < cutoff]
+        archived_at = datetime.now().isoformat()
+        for alert_id in expired:
+            self.store.alerts_archive.insert({**alerts.delete(alert_id), "archived_at": archived_at})
+        return {
+            "archived": len(expired),
+            "batches": -(-len(expired) // ALERT_ARCHIVE_BATCH_SIZE),
+            "cutoff": cutoff,
+        }
+    
+    def get_alert_counts(self):
+        """Get alerts per status, priority and type (the sizes of the table's index buckets)"""
+        alerts = self.store.alerts
+        return {
+            field: {value: alerts.count_where(field, value) for value in alerts.distinct(field)}
+            for field in ALERT_COUNTER_FIELDS
+        }
+    
+    def _set_alert_status(self, alert_id: int, status: str, stamp: str, from_statuses):
+        """Move an alert in one of ``from_statuses`` to ``status`` and set its ``stamp`` time"""
+        alert = self.store.alerts.get(alert_id)
+        if alert is None or alert["status"] not in from_statuses:
+            return alert
+        return self.store.alerts.update(alert_id, {"status": status, stamp: datetime.now().isoformat()})
+    
+    def acknowledge_alert(self, alert_id: int):
+        """Mark an unread alert as acknowledged"""
+        return self._set_alert_status(alert_id, "acknowledged", "acknowledged_at", ("unread",))
+    
+    def resolve_alert(self, alert_id: int):
+        """Mark an open alert as resolved"""
+        return self._set_alert_status(alert_id, "resolved", "resolved_at", ("unread", "acknowledged"))
+    
+    def dismiss_alert(self, alert_id: int):
+        """Delete an alert"""
+        return self.store.alerts.delete(alert_id)
+    
+    def reconcile_alert_counters(self):
+        """Recount the alerts and compare with the index counts -> drift report"""
+        alerts = self.store.alerts
+        actual = {}
+        for alert in alerts.all():
+            for field in ALERT_COUNTER_FIELDS:
+                key = (field, alert.get(field))
+                actual[key] = actual.get(key, 0) + 1
+        counters = {
+            (field, value): alerts.count_where(field, value)
+            for field in ALERT_COUNTER_FIELDS for value in alerts.distinct(field)
+        }
+        drift = []
+        for key in sorted(actual.keys() | counters.keys(), key=str):
+            counter, count = counters.get(key, 0), actual.get(key, 0)
+            if counter != count:
+                drift.append({"dimension": key[0], "value": key[1], "counter": counter, "actual": count})
+        return {"alerts": len(alerts), "counters": len(actual), "drift": drift}
+    
+    def get_latest_alert_id(self):
+        """Get the highest alert ID (None if there are no alerts)"""
+        return self.store.alerts.last_id()
+    
+    def sweep_alerts(self):
+        """Evaluate the alert rules for every batch"""
+        return self.alert_engine.sweep()
+    
+    # ==================== SALES ====================
+    
+    def _generate_sales(self):
+        """Generate sample sales history up to today"""
+        today = datetime.now(timezone.utc).date()
+        return generate_sales(
+            self.store.medicines.all(), today - timedelta(days=SALES_HISTORY_DAYS), today, transactions_per_day=40
+        )
+    
+    def record_sale(self, inventory_id: int, quantity: int, unit_price: float = None, sold_at: datetime = None):
+        """Dispense from a batch and record the sale (None if the batch does not exist)"""
+        inv = self.store.inventory.get(inventory_id)
+        if inv is None:
+            return None
+        med = self.store.medicines.get(inv["medicine_id"])
+        self.record_stock_movement(inventory_id, "dispense", quantity, SALE_NOTE)
+        
+        unit_price = med["price"] if unit_price is None else unit_price
+        sale, = self.sales.append([{
+            "medicine_id": med["id"],
+            "inventory_id": inventory_id,
+            "category": med["category"],
+            "quantity": quantity,
+            "unit_price": unit_price,
+            "total": round(quantity * unit_price, 2),
+            "sold_at": sold_at or datetime.now(timezone.utc),
+        }])
+        return {**sale, "sold_at": sale["sold_at"].isoformat()}
+    
+    def get_sales_page(self, limit: int, after: int = None, medicine_id: int = None, category: str = None,
+                       start: datetime = None, end: datetime = None):
+        """Get one keyset page of sales, optionally filtered by medicine / category and time"""
+        start = utc(start) if start else None
+        end = utc(end) if end else None
+        
+        def predicate(sale):
+            if category and medicine_id is None and sale["category"] != category:
+                return False
+            sold_at = utc(sale["sold_at"])
+            return (start is None or sold_at >= start) and (end is None or sold_at < end)
+        
+        field, value = ("medicine_id", medicine_id) if medicine_id is not None else (None, None)
+        sales, next_cursor = self.store.sales.page(limit, after, field=field, value=value, predicate=predicate)
+        return [{**sale, "sold_at": sale["sold_at"].isoformat()} for sale in sales], next_cursor
+    
+    # ==================== REORDER POINTS ====================
+    
+    def recompute_reorder_points(self):
+        """Recompute every batch's reorder level from recent demand and raise stock-out forecast alerts"""
+        columns = self.inventory_columns
+        valid = columns.column("valid")
+        batch_ids = columns.column("batch_id")[valid]
+        medicines = columns.column("medicine_id")[valid]
+        supplier_ids = columns.column("supplier_id")[valid]
+        report = {
+            "batches": len(batch_ids), "medicines": 0, "estimated": 0, "levels_updated": 0, "stockouts": 0,
+            "alerts_created": 0, "alerts_updated": 0,
+        }
+        if not len(batch_ids):
+            return report
+        
+        lead_times = {
+            sup["id"]: sup.get("lead_time_days") or reorder_policy.DEFAULT_LEAD_TIME_DAYS
+            for sup in self.store.suppliers.all()
+        }
+        lead_time = np.array([
+            lead_times.get(int(sid), reorder_policy.DEFAULT_LEAD_TIME_DAYS) if sid != NO_SUPPLIER
+            else reorder_policy.DEFAULT_LEAD_TIME_DAYS
+            for sid in supplier_ids
+        ])
+        medicine_ids = np.unique(medicines)
+        start, end = reorder_policy.demand_window()
+        # Units sold plus units dispensed outside sales
+        keys, days, units = self.sales.daily_units(medicine_ids.tolist(), start, reorder_policy.DEMAND_WINDOW_DAYS)
+        for (medicine_id, bucket), dispensed in self.ledger.daily_dispenses(start, end).items():
+            keys.append(medicine_id)
+            days.append((bucket - start).days)
+            units.append(dispensed)
+        rate, std, demand_days = reorder_policy.daily_demand(medicine_ids, keys, days, units)
+        levels = columns.column("reorder_level")[valid]
+        result = reorder_policy.plan(
+            medicines, columns.column("quantity")[valid], lead_time, columns.column("price")[valid], levels,
+            medicine_ids, rate, std, demand_days,
+        )
+        
+        now = datetime.now().isoformat()
+        changed = np.flatnonzero(result["reorder_level"] != levels)
+        for i in changed:
+            self.store.inventory.update(int(batch_ids[i]), {
+                "reorder_level": int(result["reorder_level"][i]),
+                "updated_at": now,
+            })
+        
+        stockouts = result["medicine_ids"][result["stockout"]]
+        names = {int(i): self.store.medicines[int(i)]["name"] for i in stockouts}
+        created, updated = self.alert_engine.store_alerts(reorder_policy.stockout_alerts(result, names))
+        
+        report.update(
+            medicines=len(medicine_ids),
+            estimated=int(result["estimated"].sum()),
+            levels_updated=len(changed),
+            stockouts=len(stockouts),
+            alerts_created=created,
+            alerts_updated=updated,
+        )
+        return report
     
     # ==================== ANALYTICS (Mock) ====================
     
     def get_dashboard_stats(self):
         """Get dashboard statistics"""
-        total_medicines = len(self.medicines)
-        total_inventory_value = sum(
-            inv["quantity"] * next(m["price"] for m in self.medicines if m["id"] == inv["medicine_id"])
-            for inv in self.inventory
-        )
-        low_stock_count = len(self.get_low_stock_items())
-        expiring_count = len(self.get_expiring_soon(30))
+        total_medicines = len(self.store.medicines)
+        total_inventory_value = self.stock_counters.inventory_value()
+        low_stock_count = self.stock_counters.low_stock_count()
+        expiring_count = self.expiry_index.count_expiring_within(30)
         
         return {
             "total_medicines": total_medicines,
-            "total_inventory_value": round(total_inventory_value, 2),
+            "total_inventory_value": total_inventory_value,
             "low_stock_items": low_stock_count,
             "expiring_soon": expiring_count,
         }
     
-    def get_sales_trends(self, days: int = 30):
-        """Get mock sales trends (Data Scientist will replace with real data)"""
-        trends = []
-        for i in range(days):
-            day = date.today() - timedelta(days=days - i - 1)
-            trends.append({
-                "date": day.isoformat(),
-                "sales": random.randint(50, 150),
-                "revenue": random.randint(5000, 15000),
+    def get_inventory_stats(self):
+        """Get inventory statistics for the inventory page"""
+        stats = self.get_dashboard_stats()
+        return {
+            "total_medicines": stats["total_medicines"],
+            "total_inventory_items": len(self.store.inventory),
+            "total_value": stats["total_inventory_value"],
+            "low_stock_count": stats["low_stock_items"],
+            "expiring_soon_count": stats["expiring_soon"],
+        }
+    
+    def get_inventory_value_by_category(self):
+        """Get inventory value, quantity and batch count per category"""
+        return self.rollups.by_category()
+    
+    def get_top_medicines(self, limit: int = 10):
+        """Get top medicines by stock value, plus the number of medicines in stock"""
+        rows, in_stock = self.rollups.top_medicines(limit)
+        medicines = self.store.medicines
+        top = []
+        for medicine_id, total_quantity, total_value in rows:
+            med = medicines.get(medicine_id)
+            top.append({
+                "medicine_id": medicine_id,
+                "name": med["name"],
+                "category": med["category"],
+                "total_quantity": total_quantity,
+                "total_value": round(total_value, 2),
+                "unit_price": med["price"],
             })
-        return trends
+        return top, in_stock
+    
+    def get_sales_trends(self, days: int = 30, granularity: str = "day", category: str = None,
+                         medicine_id: int = None):
+        """Get units sold and revenue per hour / day / month (from the sales rollups)"""
+        return self.sales.trends(days, granularity, category, medicine_id)
     
     def get_category_distribution(self):
         """Get medicine distribution by category"""
-        categories = {}
-        for med in self.medicines:
-            cat = med["category"]
-            categories[cat] = categories.get(cat, 0) + 1
-        
-        return [{"category": k, "count": v} for k, v in categories.items()]
+        return self.rollups.category_distribution()
+    
+    def reconcile_rollups(self):
+        """Rebuild the analytics rollups from the inventory and report drift"""
+        return self.rollups.reconcile()
 
 
 # Create singleton instance
@@ -309,6 +774,10 @@ mock_data = MockDataService()
 # ==================== EASY-TO-USE FUNCTIONS ====================
 # These are what your API endpoints will call
 
+def get_collection_version(collections):
+    """Get the version token of collections (for ETags)"""
+    return mock_data.get_collection_version(collections)
+
 def get_all_medicines():
     """Get all medicines - API endpoint will call this"""
     return mock_data.get_all_medicines()
@@ -317,14 +786,103 @@ def get_medicine_by_id(medicine_id: int):
     """Get medicine by ID"""
     return mock_data.get_medicine_by_id(medicine_id)
 
-def search_medicines(query: str):
-    """Search medicines"""
-    return mock_data.search_medicines(query)
+def get_medicines_by_ids(medicine_ids):
+    """Get medicines for a list of IDs -> (medicines, missing_ids)"""
+    return mock_data.get_medicines_by_ids(medicine_ids)
+
+def get_medicines_by_category(category: str):
+    """Get medicines in a category"""
+    return mock_data.get_medicines_by_category(category)
+
+def get_categories():
+    """Get distinct medicine categories"""
+    return mock_data.get_categories()
+
+def search_medicines(query: str, limit: int = None):
+    """Search medicines (ranked)"""
+    return mock_data.search_medicines(query, limit)
+
+def get_medicines_page(limit: int, after: int = None, category: str = None, search: str = None):
+    """Get one page of medicines -> (items, next_cursor)"""
+    return mock_data.get_medicines_page(limit, after, category, search)
+
+def add_medicine(data: dict):
+    """Add a medicine"""
+    return mock_data.add_medicine(data)
+
+def edit_medicine(medicine_id: int, changes: dict):
+    """Update a medicine"""
+    return mock_data.edit_medicine(medicine_id, changes)
+
+def remove_medicine(medicine_id: int):
+    """Delete a medicine"""
+    return mock_data.remove_medicine(medicine_id)
 
 def get_all_inventory():
     """Get all inventory"""
     return mock_data.get_all_inventory()
 
+def get_inventory_item_by_id(inventory_id: int):
+    """Get inventory batch by ID"""
+    return mock_data.get_inventory_item_by_id(inventory_id)
+
+def get_inventory_by_ids(inventory_ids):
+    """Get inventory batches for a list of IDs -> (items, missing_ids)"""
+    return mock_data.get_inventory_by_ids(inventory_ids)
+
+def get_inventory_by_medicine_id(medicine_id: int):
+    """Get inventory for a medicine"""
+    return mock_data.get_inventory_by_medicine_id(medicine_id)
+
+def get_inventory_by_supplier_id(supplier_id: int):
+    """Get inventory for a supplier"""
+    return mock_data.get_inventory_by_supplier_id(supplier_id)
+
+def get_inventory_page(limit: int, after: int = None, low_stock: bool = False, expiring_days: int = None):
+    """Get one page of inventory -> (items, next_cursor)"""
+    return mock_data.get_inventory_page(limit, after, low_stock, expiring_days)
+
+def add_inventory_item(data: dict):
+    """Add an inventory batch"""
+    return mock_data.add_inventory_item(data)
+
+def edit_inventory_item(inventory_id: int, changes: dict):
+    """Update an inventory batch"""
+    return mock_data.edit_inventory_item(inventory_id, changes)
+
+def remove_inventory_item(inventory_id: int):
+    """Delete an inventory batch"""
+    return mock_data.remove_inventory_item(inventory_id)
+
+def import_stock_rows(rows):
+    """Bulk upsert validated stock rows"""
+    return mock_data.import_stock_rows(rows)
+
+def record_stock_movement(inventory_id: int, movement_type: str, quantity: int, note: str = None):
+    """Record a stock movement for a batch"""
+    return mock_data.record_stock_movement(inventory_id, movement_type, quantity, note)
+
+def get_stock_movements_page(inventory_id: int, limit: int, after: int = None):
+    """Get one page of a batch's movements -> (items, next_cursor)"""
+    return mock_data.get_stock_movements_page(inventory_id, limit, after)
+
+def get_stock_level(inventory_id: int, at: datetime = None):
+    """Get a batch's quantity now or at a past time"""
+    return mock_data.get_stock_level(inventory_id, at)
+
+def record_sale(inventory_id: int, quantity: int, unit_price: float = None, sold_at: datetime = None):
+    """Record a sale from a batch"""
+    return mock_data.record_sale(inventory_id, quantity, unit_price, sold_at)
+
+def get_sales_page(limit: int, after: int = None, medicine_id: int = None, category: str = None,
+                   start: datetime = None, end: datetime = None):
+    """Get one page of sales -> (items, next_cursor)"""
+    return mock_data.get_sales_page(limit, after, medicine_id, category, start, end)
+
+def get_consumption(medicine_id: int, start: datetime, end: datetime):
+    """Get units dispensed and written off for a medicine"""
+    return mock_data.get_consumption(medicine_id, start, end)
+
 def get_low_stock_items():
     """Get low stock items"""
     return mock_data.get_low_stock_items()
@@ -333,26 +891,167 @@ def get_expiring_soon(days: int = 30):
     """Get expiring items"""
     return mock_data.get_expiring_soon(days)
 
+def get_expired_items():
+    """Get expired items"""
+    return mock_data.get_expired_items()
+
 def get_all_suppliers():
     """Get all suppliers"""
     return mock_data.get_all_suppliers()
 
+def get_supplier_by_id(supplier_id: int):
+    """Get supplier by ID"""
+    return mock_data.get_supplier_by_id(supplier_id)
+
 def get_all_alerts():
     """Get all alerts"""
     return mock_data.get_all_alerts()
 
+def get_alert_by_id(alert_id: int):
+    """Get alert by ID"""
+    return mock_data.get_alert_by_id(alert_id)
+
+def get_alerts_by_ids(alert_ids):
+    """Get alerts for a list of IDs (archived alerts included) -> (alerts, missing_ids)"""
+    return mock_data.get_alerts_by_ids(alert_ids)
+
+def get_alerts_by_status(status: str):
+    """Get alerts by status"""
+    return mock_data.get_alerts_by_status(status)
+
+def get_alerts_page(limit: int, after: int = None, status: str = None,
+                    priority: str = None, alert_type: str = None):
+    """Get one page of alerts -> (items, next_cursor)"""
+    return mock_data.get_alerts_page(limit, after, status, priority, alert_type)
+
+def get_archived_alerts_page(limit: int, after: int = None, status: str = None,
+                             priority: str = None, alert_type: str = None):
+    """Get one page of archived alerts -> (items, next_cursor)"""
+    return mock_data.get_archived_alerts_page(limit, after, status, priority, alert_type)
+
+def archive_alerts(retention_days: int = None):
+    """Move resolved alerts past the retention age (ALERT_RETENTION_DAYS) to the archive"""
+    return mock_data.archive_alerts(retention_days)
+
 def get_unread_alerts_count():
     """Get unread alerts count"""
     return mock_data.get_unread_count()
 
+def get_latest_alert_id():
+    """Get the highest alert ID (None if there are no alerts)"""
+    return mock_data.get_latest_alert_id()
+
+def get_alert_counts():
+    """Get alerts per status, priority and type"""
+    return mock_data.get_alert_counts()
+
+def acknowledge_alert(alert_id: int):
+    """Mark an unread alert as acknowledged (None if it does not exist)"""
+    return mock_data.acknowledge_alert(alert_id)
+
+def resolve_alert(alert_id: int):
+    """Mark an open alert as resolved (None if it does not exist)"""
+    return mock_data.resolve_alert(alert_id)
+
+def dismiss_alert(alert_id: int):
+    """Delete an alert (None if it does not exist)"""
+    return mock_data.dismiss_alert(alert_id)
+
+def reconcile_alert_counters():
+    """Recount the alerts and return the drift report of the alert counters"""
+    return mock_data.reconcile_alert_counters()
+
+def sweep_alerts():
+    """Evaluate the alert rules for every batch and store the new alerts"""
+    return mock_data.sweep_alerts()
+
 def get_dashboard_stats():
     """Get dashboard statistics"""
     return mock_data.get_dashboard_stats()
 
-def get_sales_trends(days: int = 30):
+def get_inventory_stats():
+    """Get inventory statistics"""
+    return mock_data.get_inventory_stats()
+
+def get_inventory_value_by_category():
+    """Get inventory value per category"""
+    return mock_data.get_inventory_value_by_category()
+
+def get_top_medicines(limit: int = 10):
+    """Get top medicines by stock value, plus the number of medicines in stock"""
+    return mock_data.get_top_medicines(limit)
+
+def get_sales_trends(days: int = 30, granularity: str = "day", category: str = None, medicine_id: int = None):
     """Get sales trends"""
-    return mock_data.get_sales_trends(days)
+    return mock_data.get_sales_trends(days, granularity, category, medicine_id)
 
 def get_category_distribution():
     """Get category distribution"""
     return mock_data.get_category_distribution()
+
+def reconcile_analytics_rollups():
+    """Rebuild the analytics rollups and return the drift report"""
+    return mock_data.reconcile_rollups()
+
+def recompute_reorder_points():
+    """Recompute reorder levels from recent demand and raise stock-out forecast alerts"""
+    return mock_data.recompute_reorder_points()
+
+
+__all__ = [
+    "get_collection_version",
+    "get_all_medicines",
+    "get_medicine_by_id",
+    "get_medicines_by_ids",
+    "get_medicines_by_category",
+    "get_categories",
+    "search_medicines",
+    "get_medicines_page",
+    "add_medicine",
+    "edit_medicine",
+    "remove_medicine",
+    "get_all_inventory",
+    "get_inventory_item_by_id",
+    "get_inventory_by_ids",
+    "get_inventory_by_medicine_id",
+    "get_inventory_by_supplier_id",
+    "get_inventory_page",
+    "add_inventory_item",
+    "edit_inventory_item",
+    "remove_inventory_item",
+    "import_stock_rows",
+    "record_stock_movement",
+    "get_stock_movements_page",
+    "get_stock_level",
+    "record_sale",
+    "get_sales_page",
+    "get_consumption",
+    "get_low_stock_items",
+    "get_expiring_soon",
+    "get_expired_items",
+    "get_all_suppliers",
+    "get_supplier_by_id",
+    "get_all_alerts",
+    "get_alert_by_id",
+    "get_alerts_by_ids",
+    "get_alerts_by_status",
+    "get_alerts_page",
+    "get_archived_alerts_page",
+    "archive_alerts",
+    "get_unread_alerts_count",
+    "get_alert_counts",
+    "acknowledge_alert",
+    "resolve_alert",
+    "dismiss_alert",
+    "reconcile_alert_counters",
+    "get_latest_alert_id",
+    "sweep_alerts",
+    "get_dashboard_stats",
+    "get_inventory_stats",
+    "get_inventory_value_by_category",
+    "get_top_medicines",
+    "get_sales_trends",
+    "get_category_distribution",
+    "reconcile_analytics_rollups",
+    "recompute_reorder_points",
+]
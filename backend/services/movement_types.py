@@ -0,0 +1,35 @@
+"""
+Movement Types - Stock movement kinds and validation shared by both ledgers.
+
+Used by services/stock_ledger.py (database) and services/memory_ledger.py
+(mock data); kept free of database imports so the mock backend does not
+load SQLAlchemy.
+"""
+
+# Movement type -> sign applied to the (positive) quantity; 0 = signed as given
+MOVEMENT_TYPES = {
+    "receipt": 1,
+    "dispense": -1,
+    "write_off": -1,
+    "adjustment": 0,
+}
+CONSUMPTION_TYPES = ("dispense", "write_off")
+SALE_NOTE = "Sale"  # Note of the dispense recorded with a sale (the sale itself is in the sales rollups)
+
+
+class StockError(ValueError):
+    """Invalid movement (unknown type, bad quantity or not enough stock)"""
+
+
+def signed_change(movement_type: str, quantity: int):
+    """Convert a movement type and quantity into a signed quantity change"""
+    if movement_type not in MOVEMENT_TYPES:
+        raise StockError(f"Unknown movement type '{movement_type}'. Use one of: {', '.join(MOVEMENT_TYPES)}")
+    sign = MOVEMENT_TYPES[movement_type]
+    if sign == 0:
+        if quantity == 0:
+            raise StockError("Adjustment quantity must not be zero")
+        return quantity
+    if quantity <= 0:
+        raise StockError(f"{movement_type} quantity must be positive")
+    return sign * quantity
@@ -0,0 +1,891 @@
+"""
+Real Data Service - Database-backed implementation of the data functions.
+
+Same function signatures as services/mock_data.py, backed by SQLAlchemy.
+Every function opens its own session from core.database.SessionLocal and
+returns plain dicts, so the API endpoints work unchanged with either backend.
+
+Writes use ``_session()``; read-only functions use ``_read_session()``,
+which is a separate connection pool for SQLite (WAL readers never wait for
+the writer) or a replica when DATABASE_READ_URL is set.
+
+Paged listings use keyset pagination (``WHERE id > :after ORDER BY id
+LIMIT n``) so page N costs the same as page 1.
+
+Medicine search is typo tolerant on PostgreSQL (pg_trgm word similarity,
+ranked with the field weights of the mock search index) and a substring
+match on other databases such as SQLite.
+
+Inventory rows include ``medicine_name``. List queries load the related
+medicine in the same SELECT (joined eager load) instead of lazy-loading
+``Inventory.medicine`` once per row.
+"""
+
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import case, delete, func, insert, literal, or_, select, tuple_, update
+from sqlalchemy.orm import joinedload
+
+from core.database import ReadSessionLocal, SessionLocal, engine
+from models import Medicine, Inventory, Supplier, Alert, AlertArchive, StockMovement, CollectionVersion, Sale
+from services import (
+    alert_archive, alert_counters, alert_engine, analytics_rollups, reorder_points, sales_ledger, stock_ledger,
+)
+from services.search_index import FIELD_WEIGHTS
+
+
+MEDICINE_FIELDS = {c.name for c in Medicine.__table__.columns} - {"id", "created_at", "updated_at"}
+INVENTORY_FIELDS = {c.name for c in Inventory.__table__.columns} - {"id", "created_at", "updated_at"}
+TRIGRAM_SEARCH = engine.dialect.name == "postgresql"  # pg_trgm fuzzy search (models/medicine.py)
+
+
+@contextmanager
+def _session():
+    """Open a session and always close it"""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@contextmanager
+def _read_session():
+    """Open a session on the read pool (see core.database) and always close it"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _inventory_query():
+    """Inventory SELECT with the medicine joined in"""
+    return select(Inventory).options(joinedload(Inventory.medicine))
+
+
+def _inventory_dict(inv: Inventory):
+    """Inventory row as dict, including the denormalized medicine name"""
+    data = inv.to_dict()
+    data["medicine_name"] = inv.medicine.name if inv.medicine else None
+    return data
+
+
+def _keyset_page(db, query, model, limit: int, after: int = None):
+    """
+    Run one keyset page of ``query`` ordered by ``model.id``.
+    Returns ``(rows, next_cursor)``.
+    """
+    if after is not None:
+        query = query.where(model.id > after)
+    rows = list(db.scalars(query.order_by(model.id).limit(limit + 1)))
+    if len(rows) > limit:
+        return rows[:limit], rows[limit - 1].id
+    return rows, None
+
+
+def _by_ids(rows, ids):
+    """
+    Order ``rows`` (objects with .id) as the requested ``ids``.
+    Returns ``(rows, missing_ids)``; repeated ids are returned once.
+    """
+    found = {row.id: row for row in rows}
+    ids = list(dict.fromkeys(ids))
+    return [found[i] for i in ids if i in found], [i for i in ids if i not in found]
+
+
+def _inventory_values(data: dict):
+    """Keep only inventory columns and parse ISO expiry dates"""
+    values = {k: v for k, v in data.items() if k in INVENTORY_FIELDS}
+    if isinstance(values.get("expiry_date"), str):
+        values["expiry_date"] = date.fromisoformat(values["expiry_date"])
+    return values
+
+
+def _bump_versions(db, *collections):
+    """Increment collection versions (ETags) in the caller's transaction"""
+    result = db.execute(
+        update(CollectionVersion)
+        .where(CollectionVersion.name.in_(collections))
+        .values(version=CollectionVersion.version + 1)
+    )
+    if result.rowcount < len(collections):
+        existing = set(db.scalars(select(CollectionVersion.name).where(CollectionVersion.name.in_(collections))))
+        db.execute(insert(CollectionVersion), [
+            {"name": name, "version": 1} for name in collections if name not in existing
+        ])
+
+
+def _evaluate_alerts(db, before: dict, inventory_ids):
+    """
+    Run the alert rules for changed batches (``before``: their states
+    before the write). Returns ("alerts",) if alerts were raised or
+    updated, for _bump_versions.
+    """
+    return ("alerts",) if any(alert_engine.evaluate_changes(db, before, inventory_ids)) else ()
+
+
+# ==================== VERSIONS ====================
+
+def get_collection_version(collections):
+    """Combined version token of the given collections (changes on every write)"""
+    with _read_session() as db:
+        versions = dict(db.execute(
+            select(CollectionVersion.name, CollectionVersion.version)
+            .where(CollectionVersion.name.in_(collections))
+        ).all())
+    return ".".join(str(versions.get(name, 0)) for name in collections)
+
+
+# ==================== MEDICINES ====================
+
+def get_all_medicines():
+    """Get all medicines"""
+    with _read_session() as db:
+        rows = db.scalars(select(Medicine).order_by(Medicine.id))
+        return [m.to_dict() for m in rows]
+
+def get_medicine_by_id(medicine_id: int):
+    """Get medicine by ID"""
+    with _read_session() as db:
+        med = db.get(Medicine, medicine_id)
+        return med.to_dict() if med else None
+
+def get_medicines_by_ids(medicine_ids):
+    """Get medicines for a list of IDs with one IN query -> (medicines, missing_ids)"""
+    with _read_session() as db:
+        rows = db.scalars(select(Medicine).where(Medicine.id.in_(set(medicine_ids))))
+        medicines, missing = _by_ids(rows, medicine_ids)
+        return [m.to_dict() for m in medicines], missing
+
+def get_medicines_by_category(category: str):
+    """Get medicines in a category"""
+    with _read_session() as db:
+        rows = db.scalars(select(Medicine).where(Medicine.category == category).order_by(Medicine.id))
+        return [m.to_dict() for m in rows]
+
+def get_categories():
+    """Get distinct medicine categories"""
+    with _read_session() as db:
+        return list(db.scalars(select(Medicine.category).distinct()))
+
+def _search_filter(query: str):
+    """
+    Search match on the searchable medicine fields: substring, plus pg_trgm
+    word similarity on PostgreSQL (both use the GIN trigram indexes)
+    """
+    pattern = f"%{query}%"
+    matches = [getattr(Medicine, field).ilike(pattern) for field in FIELD_WEIGHTS]
+    if TRIGRAM_SEARCH:
+        # "query <% field": the query is similar to some word of the field (typo tolerant)
+        matches += [literal(query).op("<%")(getattr(Medicine, field)) for field in FIELD_WEIGHTS]
+    return or_(*matches)
+
+def _search_rank(query: str):
+    """
+    Sort key of a search match (ascending): name prefix first, then name
+    substring, then the rest. On PostgreSQL the field-weighted trigram word
+    similarity counts as well, as in the mock search index.
+    """
+    name_bonus = case(
+        (Medicine.name.ilike(f"{query}%"), 0),
+        (Medicine.name.ilike(f"%{query}%"), 1),
+        else_=2,
+    )
+    if not TRIGRAM_SEARCH:
+        return name_bonus
+    similarity = func.greatest(*(
+        func.word_similarity(query, getattr(Medicine, field)) * (weight / FIELD_WEIGHTS["name"])
+        for field, weight in FIELD_WEIGHTS.items()
+    ))
+    return name_bonus / 2.0 - similarity
+
+def search_medicines(query: str, limit: int = None):
+    """Search medicines, best match first (fuzzy on PostgreSQL, substring match on other databases)"""
+    with _read_session() as db:
+        rows = db.scalars(
+            select(Medicine).where(_search_filter(query))
+            .order_by(_search_rank(query), Medicine.name, Medicine.id).limit(limit)
+        )
+        return [m.to_dict() for m in rows]
+
+def _search_page(db, query, search: str, limit: int, after: int = None):
+    """
+    One page of search matches in rank order, keyset on (rank, name, id):
+    the cursor is the last medicine's id and its rank is looked up by id.
+    """
+    rank = _search_rank(search)
+    if after is not None:
+        cursor = db.execute(select(rank, Medicine.name).where(Medicine.id == after)).first()
+        if cursor is None:
+            return [], None
+        query = query.where(tuple_(rank, Medicine.name, Medicine.id) > tuple_(*cursor, after))
+    rows = list(db.scalars(query.order_by(rank, Medicine.name, Medicine.id).limit(limit + 1)))
+    if len(rows) > limit:
+        return rows[:limit], rows[limit - 1].id
+    return rows, None
+
+def get_medicines_page(limit: int, after: int = None, category: str = None, search: str = None):
+    """Get one page of medicines (search matches in rank order) -> (items, next_cursor)"""
+    query = select(Medicine)
+    if category:
+        query = query.where(Medicine.category == category)
+    with _read_session() as db:
+        if search:
+            rows, next_cursor = _search_page(db, query.where(_search_filter(search)), search, limit, after)
+        else:
+            rows, next_cursor = _keyset_page(db, query, Medicine, limit, after)
+        return [m.to_dict() for m in rows], next_cursor
+
+def add_medicine(data: dict):
+    """Add a medicine"""
+    with _session() as db:
+        med = Medicine(**{k: v for k, v in data.items() if k in MEDICINE_FIELDS})
+        db.add(med)
+        db.flush()
+        analytics_rollups.refresh_medicines(db, [med.id])
+        _bump_versions(db, "medicines")
+        db.commit()
+        db.refresh(med)
+        return med.to_dict()
+
+def edit_medicine(medicine_id: int, changes: dict):
+    """Update a medicine (returns None if it does not exist)"""
+    with _session() as db:
+        med = db.get(Medicine, medicine_id)
+        if med is None:
+            return None
+        for key, value in changes.items():
+            if key in MEDICINE_FIELDS:
+                setattr(med, key, value)
+        analytics_rollups.refresh_medicines(db, [medicine_id])
+        _bump_versions(db, "medicines", "inventory")
+        db.commit()
+        db.refresh(med)
+        return med.to_dict()
+
+def remove_medicine(medicine_id: int):
+    """Delete a medicine and its inventory batches (their stock ledger is kept)"""
+    with _session() as db:
+        med = db.get(Medicine, medicine_id)
+        if med is None:
+            return None
+        data = med.to_dict()
+        db.execute(
+            update(Alert)
+            .where(Alert.medicine_id == medicine_id)
+            .values(medicine_id=None, inventory_id=None)
+        )
+        db.execute(delete(Inventory).where(Inventory.medicine_id == medicine_id))
+        db.delete(med)
+        analytics_rollups.refresh_medicines(db, [medicine_id])
+        _bump_versions(db, "medicines", "inventory", "alerts")
+        db.commit()
+        return data
+
+
+# ==================== INVENTORY ====================
+
+def get_all_inventory():
+    """Get all inventory"""
+    with _read_session() as db:
+        rows = db.scalars(_inventory_query().order_by(Inventory.id))
+        return [_inventory_dict(inv) for inv in rows]
+
+def _inventory_item(db, inventory_id: int):
+    """Inventory batch as dict from an open session (None if missing)"""
+    inv = db.scalars(_inventory_query().where(Inventory.id == inventory_id)).first()
+    return _inventory_dict(inv) if inv else None
+
+def get_inventory_item_by_id(inventory_id: int):
+    """Get inventory batch by ID"""
+    with _read_session() as db:
+        return _inventory_item(db, inventory_id)
+
+def get_inventory_by_ids(inventory_ids):
+    """Get inventory batches for a list of IDs with one IN query -> (items, missing_ids)"""
+    with _read_session() as db:
+        rows = db.scalars(_inventory_query().where(Inventory.id.in_(set(inventory_ids))))
+        items, missing = _by_ids(rows, inventory_ids)
+        return [_inventory_dict(inv) for inv in items], missing
+
+def get_inventory_by_medicine_id(medicine_id: int):
+    """Get inventory for a medicine"""
+    with _read_session() as db:
+        rows = db.scalars(
+            _inventory_query().where(Inventory.medicine_id == medicine_id).order_by(Inventory.id)
+        )
+        return [_inventory_dict(inv) for inv in rows]
+
+def get_inventory_by_supplier_id(supplier_id: int):
+    """Get inventory for a supplier"""
+    with _read_session() as db:
+        rows = db.scalars(
+            _inventory_query().where(Inventory.supplier_id == supplier_id).order_by(Inventory.id)
+        )
+        return [_inventory_dict(inv) for inv in rows]
+
+def get_inventory_page(limit: int, after: int = None, low_stock: bool = False, expiring_days: int = None):
+    """Get one page of inventory -> (items, next_cursor)"""
+    query = _inventory_query()
+    if low_stock:
+        query = query.where(Inventory.quantity < Inventory.reorder_level)
+    elif expiring_days:
+        query = query.where(
+            Inventory.expiry_date <= date.today() + timedelta(days=expiring_days),
+            Inventory.quantity > 0,
+        )
+    with _read_session() as db:
+        rows, next_cursor = _keyset_page(db, query, Inventory, limit, after)
+        return [_inventory_dict(inv) for inv in rows], next_cursor
+
+def add_inventory_item(data: dict):
+    """Add an inventory batch (returns None if the medicine does not exist)"""
+    with _session() as db:
+        if db.get(Medicine, data["medicine_id"]) is None:
+            return None
+        inv = Inventory(**_inventory_values(data))
+        db.add(inv)
+        db.flush()
+        stock_ledger.append_movements(db, [_movement(inv.id, inv.medicine_id, "receipt", inv.quantity or 0)])
+        analytics_rollups.refresh_medicines(db, [inv.medicine_id])
+        _bump_versions(db, "inventory", *_evaluate_alerts(db, {}, [inv.id]))
+        db.commit()
+        return _inventory_item(db, inv.id)
+
+def edit_inventory_item(inventory_id: int, changes: dict):
+    """Update an inventory batch (returns None if it does not exist)"""
+    with _session() as db:
+        inv = db.get(Inventory, inventory_id)
+        if inv is None:
+            return None
+        values = _inventory_values(changes)
+        if "medicine_id" in values and db.get(Medicine, values["medicine_id"]) is None:
+            return None
+        old_quantity, old_medicine_id = inv.quantity, inv.medicine_id
+        before = alert_engine.batch_states(db, [inventory_id])
+        for key, value in values.items():
+            setattr(inv, key, value)
+        stock_ledger.append_movements(
+            db, [_movement(inv.id, inv.medicine_id, "adjustment", inv.quantity - old_quantity)]
+        )
+        analytics_rollups.refresh_medicines(db, [old_medicine_id, inv.medicine_id])
+        _bump_versions(db, "inventory", *_evaluate_alerts(db, before, [inventory_id]))
+        db.commit()
+        return _inventory_item(db, inventory_id)
+
+def remove_inventory_item(inventory_id: int):
+    """Delete an inventory batch (its stock ledger is kept)"""
+    with _session() as db:
+        data = _inventory_item(db, inventory_id)
+        if data is None:
+            return None
+        db.execute(update(Alert).where(Alert.inventory_id == inventory_id).values(inventory_id=None))
+        db.execute(delete(Inventory).where(Inventory.id == inventory_id))
+        analytics_rollups.refresh_medicines(db, [data["medicine_id"]])
+        _bump_versions(db, "inventory", "alerts")
+        db.commit()
+    return data
+
+def import_stock_rows(rows):
+    """
+    Bulk upsert validated stock rows in one transaction.
+
+    Medicines are matched on (name, dosage) and batches on
+    (medicine_id, batch_number) with one SELECT each; new rows go in with a
+    multi-row INSERT and matches with a bulk UPDATE by primary key.
+    """
+    counts = {"medicines_created": 0, "medicines_updated": 0, "batches_created": 0, "batches_updated": 0}
+
+    with _session() as db:
+        # Medicines: last row wins for repeated (name, dosage)
+        medicine_rows = {}
+        for row in rows:
+            values = {k: row[k] for k in MEDICINE_FIELDS if row.get(k) is not None}
+            medicine_rows.setdefault((row["name"], row.get("dosage")), {}).update(values)
+
+        medicine_ids = {
+            (name, dosage): med_id
+            for med_id, name, dosage in db.execute(
+                select(Medicine.id, Medicine.name, Medicine.dosage)
+                .where(Medicine.name.in_({name for name, _ in medicine_rows}))
+            )
+        }
+        changed_medicines = [{"id": medicine_ids[k], **v} for k, v in medicine_rows.items() if k in medicine_ids]
+        new_medicines = [v for k, v in medicine_rows.items() if k not in medicine_ids]
+        if new_medicines:
+            created = db.execute(
+                insert(Medicine).returning(Medicine.id, Medicine.name, Medicine.dosage),
+                new_medicines,
+            )
+            medicine_ids.update({(name, dosage): med_id for med_id, name, dosage in created})
+            counts["medicines_created"] = len(new_medicines)
+
+        # Batches: rows with a batch number are upserted, the rest are new batches
+        batch_rows = {}
+        new_batches = []
+        for row in rows:
+            values = _inventory_values({k: v for k, v in row.items() if v is not None})
+            values["medicine_id"] = medicine_ids[(row["name"], row.get("dosage"))]
+            if row.get("batch_number"):
+                batch_rows.setdefault((values["medicine_id"], row["batch_number"]), {}).update(values)
+            else:
+                new_batches.append(values)
+
+        batch_ids = {}
+        old_quantities = {}
+        if batch_rows:
+            for batch_id, medicine_id, batch_number, quantity in db.execute(
+                select(Inventory.id, Inventory.medicine_id, Inventory.batch_number, Inventory.quantity)
+                .where(tuple_(Inventory.medicine_id, Inventory.batch_number).in_(list(batch_rows)))
+            ):
+                batch_ids[(medicine_id, batch_number)] = batch_id
+                old_quantities[batch_id] = quantity
+        changed_batches = [{"id": batch_ids[k], **v} for k, v in batch_rows.items() if k in batch_ids]
+        new_batches += [v for k, v in batch_rows.items() if k not in batch_ids]
+        before = alert_engine.batch_states(db, [batch["id"] for batch in changed_batches])
+
+        if changed_medicines:
+            db.execute(update(Medicine), changed_medicines)
+            counts["medicines_updated"] = len(changed_medicines)
+        movements = []
+        new_batch_ids = []
+        if new_batches:
+            created = db.execute(
+                insert(Inventory).returning(Inventory.id, Inventory.medicine_id, Inventory.quantity),
+                new_batches,
+            ).all()
+            movements += [_movement(*batch, "receipt", quantity) for *batch, quantity in created]
+            new_batch_ids = [batch_id for batch_id, _, _ in created]
+            counts["batches_created"] = len(new_batches)
+        if changed_batches:
+            db.execute(update(Inventory), changed_batches)
+            movements += [
+                _movement(b["id"], b["medicine_id"], "adjustment", b["quantity"] - old_quantities[b["id"]])
+                for b in changed_batches
+            ]
+            counts["batches_updated"] = len(changed_batches)
+        stock_ledger.append_movements(db, movements)
+        analytics_rollups.refresh_medicines(db, medicine_ids.values())
+        changed_ids = [*before, *new_batch_ids]
+        _bump_versions(db, "medicines", "inventory", *_evaluate_alerts(db, before, changed_ids))
+        db.commit()
+
+    return counts
+
+# ==================== STOCK LEDGER ====================
+
+def _movement(inventory_id: int, medicine_id: int, movement_type: str, quantity_change: int):
+    """Ledger row for a quantity change made through the CRUD / import paths"""
+    return {
+        "inventory_id": inventory_id,
+        "medicine_id": medicine_id,
+        "movement_type": movement_type,
+        "quantity_change": quantity_change,
+    }
+
+def _utc(value: datetime):
+    """Timezone-aware UTC datetime (naive values are taken as UTC)"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def record_stock_movement(inventory_id: int, movement_type: str, quantity: int, note: str = None):
+    """Apply a receipt / dispense / adjustment / write-off to a batch (None if it does not exist)"""
+    with _session() as db:
+        before = alert_engine.batch_states(db, [inventory_id])
+        movement = stock_ledger.record_movement(db, inventory_id, movement_type, quantity, note)
+        if movement is None:
+            return None
+        analytics_rollups.refresh_medicines(db, [movement.medicine_id])
+        _bump_versions(db, "inventory", *_evaluate_alerts(db, before, [inventory_id]))
+        db.commit()
+        db.refresh(movement)
+        return movement.to_dict()
+
+def get_stock_movements_page(inventory_id: int, limit: int, after: int = None):
+    """Get one page of a batch's movements, oldest first -> (items, next_cursor)"""
+    query = select(StockMovement).where(StockMovement.inventory_id == inventory_id)
+    with _read_session() as db:
+        rows, next_cursor = _keyset_page(db, query, StockMovement, limit, after)
+        return [movement.to_dict() for movement in rows], next_cursor
+
+def get_stock_level(inventory_id: int, at: datetime = None):
+    """Quantity of a batch now or at a past time (None if the batch does not exist)"""
+    as_of = _utc(at) if at is not None else datetime.now(timezone.utc)
+    with _read_session() as db:
+        inv = db.get(Inventory, inventory_id)
+        if inv is None:
+            return None
+        quantity = inv.quantity if at is None else stock_ledger.quantity_at(db, inventory_id, as_of)
+        return {"inventory_id": inventory_id, "quantity": quantity, "as_of": as_of.isoformat()}
+
+def record_sale(inventory_id: int, quantity: int, unit_price: float = None, sold_at: datetime = None):
+    """Dispense from a batch and record the sale (None if the batch does not exist)"""
+    with _session() as db:
+        before = alert_engine.batch_states(db, [inventory_id])
+        sale = sales_ledger.record_sale(db, inventory_id, quantity, unit_price, _utc(sold_at) if sold_at else None)
+        if sale is None:
+            return None
+        analytics_rollups.refresh_medicines(db, [sale.medicine_id])
+        _bump_versions(db, "inventory", "sales", *_evaluate_alerts(db, before, [inventory_id]))
+        db.commit()
+        db.refresh(sale)
+        return sale.to_dict()
+
+def get_sales_page(limit: int, after: int = None, medicine_id: int = None, category: str = None,
+                   start: datetime = None, end: datetime = None):
+    """Get one page of sales, optionally filtered by medicine / category and time -> (items, next_cursor)"""
+    query = select(Sale)
+    if medicine_id is not None:
+        query = query.where(Sale.medicine_id == medicine_id)
+    elif category:
+        query = query.where(Sale.category == category)
+    if start is not None:
+        query = query.where(Sale.sold_at >= _utc(start))
+    if end is not None:
+        query = query.where(Sale.sold_at < _utc(end))
+    with _read_session() as db:
+        rows, next_cursor = _keyset_page(db, query, Sale, limit, after)
+        return [sale.to_dict() for sale in rows], next_cursor
+
+def get_consumption(medicine_id: int, start: datetime, end: datetime):
+    """Units of a medicine dispensed and written off between start and end"""
+    start, end = _utc(start), _utc(end)
+    with _read_session() as db:
+        return {
+            "medicine_id": medicine_id,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            **stock_ledger.consumption(db, medicine_id, start, end),
+        }
+
+def get_low_stock_items():
+    """Get low stock items"""
+    with _read_session() as db:
+        rows = db.scalars(
+            _inventory_query().where(Inventory.quantity < Inventory.reorder_level).order_by(Inventory.id)
+        )
+        return [_inventory_dict(inv) for inv in rows]
+
+def get_expiring_soon(days: int = 30):
+    """Get in-stock items expiring within N days (soonest first)"""
+    cutoff_date = date.today() + timedelta(days=days)
+    with _read_session() as db:
+        rows = db.scalars(
+            _inventory_query()
+            .where(Inventory.expiry_date <= cutoff_date, Inventory.quantity > 0)
+            .order_by(Inventory.expiry_date, Inventory.id)
+        )
+        return [_inventory_dict(inv) for inv in rows]
+
+def get_expired_items():
+    """Get in-stock items already past their expiry date"""
+    with _read_session() as db:
+        rows = db.scalars(
+            _inventory_query()
+            .where(Inventory.expiry_date < date.today(), Inventory.quantity > 0)
+            .order_by(Inventory.expiry_date, Inventory.id)
+        )
+        return [_inventory_dict(inv) for inv in rows]
+
+
+# ==================== SUPPLIERS ====================
+
+def get_all_suppliers():
+    """Get all suppliers"""
+    with _read_session() as db:
+        return [s.to_dict() for s in db.scalars(select(Supplier).order_by(Supplier.id))]
+
+def get_supplier_by_id(supplier_id: int):
+    """Get supplier by ID"""
+    with _read_session() as db:
+        sup = db.get(Supplier, supplier_id)
+        return sup.to_dict() if sup else None
+
+
+# ==================== ALERTS ====================
+
+def get_all_alerts():
+    """Get all alerts"""
+    with _read_session() as db:
+        return [a.to_dict() for a in db.scalars(select(Alert).order_by(Alert.id))]
+
+def get_alert_by_id(alert_id: int):
+    """Get alert by ID (archived alerts included)"""
+    with _read_session() as db:
+        alert = db.get(Alert, alert_id) or db.get(AlertArchive, alert_id)
+        return alert.to_dict() if alert else None
+
+def get_alerts_by_ids(alert_ids):
+    """Get alerts for a list of IDs (archived alerts included) with one IN query per table -> (alerts, missing_ids)"""
+    with _read_session() as db:
+        ids = set(alert_ids)
+        rows = list(db.scalars(select(Alert).where(Alert.id.in_(ids))))
+        archived_ids = ids - {row.id for row in rows}
+        if archived_ids:
+            rows += db.scalars(select(AlertArchive).where(AlertArchive.id.in_(archived_ids)))
+        alerts, missing = _by_ids(rows, alert_ids)
+        return [a.to_dict() for a in alerts], missing
+
+def get_alerts_by_status(status: str):
+    """Get alerts by status"""
+    with _read_session() as db:
+        rows = db.scalars(select(Alert).where(Alert.status == status).order_by(Alert.id))
+        return [a.to_dict() for a in rows]
+
+def get_alerts_page(limit: int, after: int = None, status: str = None,
+                    priority: str = None, alert_type: str = None):
+    """Get one page of alerts -> (items, next_cursor)"""
+    query = select(Alert)
+    if status:
+        query = query.where(Alert.status == status)
+    if priority:
+        query = query.where(Alert.priority == priority)
+    if alert_type:
+        query = query.where(Alert.alert_type == alert_type)
+    with _read_session() as db:
+        rows, next_cursor = _keyset_page(db, query, Alert, limit, after)
+        return [a.to_dict() for a in rows], next_cursor
+
+def get_archived_alerts_page(limit: int, after: int = None, status: str = None,
+                             priority: str = None, alert_type: str = None):
+    """Get one page of archived alerts -> (items, next_cursor)"""
+    query = select(AlertArchive)
+    if status:
+        query = query.where(AlertArchive.status == status)
+    if priority:
+        query = query.where(AlertArchive.priority == priority)
+    if alert_type:
+        query = query.where(AlertArchive.alert_type == alert_type)
+    with _read_session() as db:
+        rows, next_cursor = _keyset_page(db, query, AlertArchive, limit, after)
+        return [a.to_dict() for a in rows], next_cursor
+
+def archive_alerts(retention_days: int = None):
+    """Move resolved alerts past the retention age (ALERT_RETENTION_DAYS) to the archive, committing per batch"""
+    retention_days = alert_archive.RETENTION_DAYS if retention_days is None else retention_days
+    now = datetime.now(timezone.utc)
+    report = {"archived": 0, "batches": 0, "cutoff": alert_archive.cutoff(retention_days, now).isoformat()}
+    with _session() as db:
+        for moved in alert_archive.archive(db, retention_days, now=now):
+            report["archived"] += moved
+            report["batches"] += 1
+            _bump_versions(db, "alerts")
+            db.commit()
+    return report
+
+def get_unread_alerts_count():
+    """Get unread alerts count (from the alert counters)"""
+    with _read_session() as db:
+        return alert_counters.count(db, "status", "unread")
+
+def get_alert_counts():
+    """Get alerts per status, priority and type (from the alert counters)"""
+    with _read_session() as db:
+        return alert_counters.counts(db)
+
+def _set_alert_status(alert_id: int, status: str, stamp: str, from_statuses):
+    """Move an alert in one of ``from_statuses`` to ``status`` and set its ``stamp`` time"""
+    with _session() as db:
+        alert = db.get(Alert, alert_id, with_for_update=True)
+        if alert is None:
+            return None
+        if alert.status in from_statuses:
+            old = {"status": alert.status, "priority": alert.priority, "alert_type": alert.alert_type}
+            alert.status = status
+            setattr(alert, stamp, datetime.now(timezone.utc))
+            alert_counters.apply(db, alert_counters.change(old, {**old, "status": status}))
+            _bump_versions(db, "alerts")
+            db.commit()
+        return alert.to_dict()
+
+def acknowledge_alert(alert_id: int):
+    """Mark an unread alert as acknowledged (None if it does not exist)"""
+    return _set_alert_status(alert_id, "acknowledged", "acknowledged_at", ("unread",))
+
+def resolve_alert(alert_id: int):
+    """Mark an open alert as resolved (None if it does not exist)"""
+    return _set_alert_status(alert_id, "resolved", "resolved_at", ("unread", "acknowledged"))
+
+def dismiss_alert(alert_id: int):
+    """Delete an alert (None if it does not exist)"""
+    with _session() as db:
+        alert = db.get(Alert, alert_id, with_for_update=True)
+        if alert is None:
+            return None
+        data = alert.to_dict()
+        db.delete(alert)
+        alert_counters.apply(db, alert_counters.change(data, None))
+        _bump_versions(db, "alerts")
+        db.commit()
+        return data
+
+def reconcile_alert_counters():
+    """Recount the alerts into the alert counters and return the drift report"""
+    with _session() as db:
+        report = alert_counters.reconcile(db)
+        if report["drift"]:
+            _bump_versions(db, "alerts")
+        db.commit()
+    return report
+
+def get_latest_alert_id():
+    """Get the highest alert ID (None if there are no alerts)"""
+    with _read_session() as db:
+        return db.scalar(select(func.max(Alert.id)))
+
+def sweep_alerts():
+    """Evaluate the alert rules for every batch, committing page by page"""
+    report = {"batches": 0, "alerts_created": 0, "alerts_updated": 0}
+    with _session() as db:
+        for batches, created, updated in alert_engine.sweep(db):
+            report["batches"] += batches
+            report["alerts_created"] += created
+            report["alerts_updated"] += updated
+            if created or updated:
+                _bump_versions(db, "alerts")
+            db.commit()
+    return report
+
+
+# ==================== ANALYTICS ====================
+
+def get_dashboard_stats():
+    """Get dashboard statistics"""
+    cutoff_date = date.today() + timedelta(days=30)
+    with _read_session() as db:
+        total_medicines = db.scalar(select(func.count(Medicine.id)))
+        total_value = db.scalar(
+            select(func.coalesce(func.sum(Inventory.quantity * Medicine.price), 0))
+            .join(Medicine, Inventory.medicine_id == Medicine.id)
+        )
+        low_stock_count = db.scalar(
+            select(func.count(Inventory.id)).where(Inventory.quantity < Inventory.reorder_level)
+        )
+        expiring_count = db.scalar(
+            select(func.count(Inventory.id))
+            .where(Inventory.expiry_date <= cutoff_date, Inventory.quantity > 0)
+        )
+
+    return {
+        "total_medicines": total_medicines,
+        "total_inventory_value": round(float(total_value), 2),
+        "low_stock_items": low_stock_count,
+        "expiring_soon": expiring_count,
+    }
+
+def get_inventory_stats():
+    """Get inventory statistics"""
+    stats = get_dashboard_stats()
+    with _read_session() as db:
+        total_items = db.scalar(select(func.count(Inventory.id)))
+
+    return {
+        "total_medicines": stats["total_medicines"],
+        "total_inventory_items": total_items,
+        "total_value": stats["total_inventory_value"],
+        "low_stock_count": stats["low_stock_items"],
+        "expiring_soon_count": stats["expiring_soon"],
+    }
+
+def get_inventory_value_by_category():
+    """Get inventory value per category (from the category rollups)"""
+    with _read_session() as db:
+        return analytics_rollups.value_by_category(db)
+
+def get_top_medicines(limit: int = 10):
+    """Get top medicines by stock value, plus the number of medicines in stock (from the rollups)"""
+    with _read_session() as db:
+        return analytics_rollups.top_medicines(db, limit)
+
+def get_sales_trends(days: int = 30, granularity: str = "day", category: str = None, medicine_id: int = None):
+    """Get units sold and revenue per hour / day / month (from the sales rollups)"""
+    with _read_session() as db:
+        return sales_ledger.sales_trends(db, days, granularity, category, medicine_id)
+
+def get_category_distribution():
+    """Get category distribution (from the category rollups)"""
+    with _read_session() as db:
+        return analytics_rollups.category_distribution(db)
+
+def reconcile_analytics_rollups():
+    """Rebuild the analytics rollups from the source tables and return the drift report"""
+    with _session() as db:
+        report = analytics_rollups.reconcile(db)
+        db.commit()
+    return report
+
+def recompute_reorder_points():
+    """Recompute reorder levels from recent demand and raise stock-out forecast alerts"""
+    with _session() as db:
+        report = reorder_points.recompute(db)
+        collections = []
+        if report["levels_updated"]:
+            collections.append("inventory")
+        if report["alerts_created"] or report["alerts_updated"]:
+            collections.append("alerts")
+        if collections:
+            _bump_versions(db, *collections)
+        db.commit()
+    return report
+
+
+__all__ = [
+    "get_collection_version",
+    "get_all_medicines",
+    "get_medicine_by_id",
+    "get_medicines_by_ids",
+    "get_medicines_by_category",
+    "get_categories",
+    "search_medicines",
+    "get_medicines_page",
+    "add_medicine",
+    "edit_medicine",
+    "remove_medicine",
+    "get_all_inventory",
+    "get_inventory_item_by_id",
+    "get_inventory_by_ids",
+    "get_inventory_by_medicine_id",
+    "get_inventory_by_supplier_id",
+    "get_inventory_page",
+    "add_inventory_item",
+    "edit_inventory_item",
+    "remove_inventory_item",
+    "import_stock_rows",
+    "record_stock_movement",
+    "get_stock_movements_page",
+    "get_stock_level",
+    "record_sale",
+    "get_sales_page",
+    "get_consumption",
+    "get_low_stock_items",
+    "get_expiring_soon",
+    "get_expired_items",
+    "get_all_suppliers",
+    "get_supplier_by_id",
+    "get_all_alerts",
+    "get_alert_by_id",
+    "get_alerts_by_ids",
+    "get_alerts_by_status",
+    "get_alerts_page",
+    "get_archived_alerts_page",
+    "archive_alerts",
+    "get_unread_alerts_count",
+    "get_alert_counts",
+    "acknowledge_alert",
+    "resolve_alert",
+    "dismiss_alert",
+    "reconcile_alert_counters",
+    "get_latest_alert_id",
+    "sweep_alerts",
+    "get_dashboard_stats",
+    "get_inventory_stats",
+    "get_inventory_value_by_category",
+    "get_top_medicines",
+    "get_sales_trends",
+    "get_category_distribution",
+    "reconcile_analytics_rollups",
+    "recompute_reorder_points",
+]
@@ -0,0 +1,130 @@
+"""
+Reorder Points Service - Recompute every batch's reorder level from recent demand.
+
+Database side of services/reorder_policy.py. One run reads all batches
+(medicine, quantity, current level, supplier lead time, price), the daily
+medicine sales rollups of the demand window and the ledger's dispenses
+outside sales (stock_ledger.daily_dispenses) as plain column tuples,
+computes every reorder point at once with NumPy, then:
+
+- writes reorder_level for the batches whose level changed, one
+  executemany UPDATE per chunk; medicines with too little demand history
+  keep their levels (see reorder_policy); the alert rules are then
+  evaluated for those batches (alert_engine.evaluate_changes), so a batch
+  the new level puts below it gets its low-stock alert as on any other write
+- raises a forecast alert for each medicine predicted to run out before a
+  new order can arrive; an open forecast alert of the medicine is updated
+  instead (alert_engine.store_alerts)
+
+Functions take an open session and never commit; callers own the transaction.
+"""
+
+import numpy as np
+from sqlalchemy import bindparam, func, select
+
+from models import Inventory, Medicine, SalesRollup, Supplier
+from services import stock_ledger
+from services.alert_engine import batch_states, evaluate_changes, store_alerts
+from services.reorder_policy import (
+    DEFAULT_LEAD_TIME_DAYS, SERVICE_LEVEL, daily_demand, demand_window, plan, stockout_alerts,
+)
+
+CHUNK_SIZE = 500  # Ids per IN (...) lookup
+UPDATE_CHUNK_SIZE = 5000  # Rows per executemany UPDATE
+
+
+def _daily_units(db, start, end):
+    """Daily medicine rollup rows of [start, end) -> (medicine ids, day offsets, units)"""
+    rows = db.execute(
+        select(SalesRollup.key, SalesRollup.bucket, SalesRollup.units).where(
+            SalesRollup.granularity == "day",
+            SalesRollup.scope == "medicine",
+            SalesRollup.bucket >= start,
+            SalesRollup.bucket < end,
+        )
+    ).all()
+    keys = [int(key) for key, _, _ in rows]
+    days = [(bucket - start).days for _, bucket, _ in rows]
+    units = [units for _, _, units in rows]
+    return keys, days, units
+
+
+def _daily_demand_rows(db, start, end):
+    """Sales rollup rows plus the ledger's dispenses outside sales -> (medicine ids, day offsets, units)"""
+    keys, days, units = _daily_units(db, start, end)
+    for (medicine_id, bucket), dispensed in stock_ledger.daily_dispenses(db, start, end).items():
+        keys.append(medicine_id)
+        days.append((bucket - start).days)
+        units.append(dispensed)
+    return keys, days, units
+
+
+def _chunks(values, size: int = CHUNK_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def recompute(db, now=None, service_level: float = SERVICE_LEVEL):
+    """
+    Recompute reorder levels and raise stock-out forecast alerts.
+    Returns counts: batches, medicines, estimated (medicines with enough demand history),
+    levels_updated, stockouts, alerts_created, alerts_updated (stock-out
+    forecasts and the alerts of batches whose level changed).
+    """
+    rows = db.execute(
+        select(
+            Inventory.id,
+            Inventory.medicine_id,
+            Inventory.quantity,
+            Inventory.reorder_level,
+            func.coalesce(Supplier.lead_time_days, DEFAULT_LEAD_TIME_DAYS),
+            Medicine.price,
+        )
+        .join(Medicine, Inventory.medicine_id == Medicine.id)
+        .outerjoin(Supplier, Inventory.supplier_id == Supplier.id)
+    ).all()
+    report = {
+        "batches": len(rows), "medicines": 0, "estimated": 0, "levels_updated": 0, "stockouts": 0,
+        "alerts_created": 0, "alerts_updated": 0,
+    }
+    if not rows:
+        return report
+
+    batch_ids, medicines, quantity, levels, lead_time, price = (np.array(column) for column in zip(*rows))
+    levels = np.array([-1 if level is None else level for level in levels], dtype=np.int64)
+    medicine_ids = np.unique(medicines)
+    start, end = demand_window(now)
+    rate, std, demand_days = daily_demand(medicine_ids, *_daily_demand_rows(db, start, end))
+    result = plan(medicines, quantity, lead_time, price, levels, medicine_ids, rate, std, demand_days, service_level)
+
+    changed = np.flatnonzero(result["reorder_level"] != levels)
+    changed_ids = [int(batch_ids[i]) for i in changed]
+    before = batch_states(db, changed_ids)
+    table = Inventory.__table__
+    statement = (
+        table.update()
+        .where(table.c.id == bindparam("b_id"))
+        .values(reorder_level=bindparam("b_reorder_level"))
+    )
+    for chunk in _chunks(changed, UPDATE_CHUNK_SIZE):
+        db.execute(statement, [
+            {"b_id": int(batch_ids[i]), "b_reorder_level": int(result["reorder_level"][i])} for i in chunk
+        ])
+
+    stockout_ids = [int(i) for i in result["medicine_ids"][result["stockout"]]]
+    names = {}
+    for chunk in _chunks(stockout_ids):
+        names.update(db.execute(select(Medicine.id, Medicine.name).where(Medicine.id.in_(chunk))).all())
+    created, updated = store_alerts(db, stockout_alerts(result, names))
+    level_created, level_updated = evaluate_changes(db, before, changed_ids)
+
+    report.update(
+        medicines=len(medicine_ids),
+        estimated=int(result["estimated"].sum()),
+        levels_updated=len(changed),
+        stockouts=len(stockout_ids),
+        alerts_created=created + level_created,
+        alerts_updated=updated + level_updated,
+    )
+    return report
@@ -0,0 +1,174 @@
+"""
+Reorder Policy - Reorder points and order quantities for all SKUs at once.
+
+Used by services/reorder_points.py (database) and the mock data service;
+kept free of database imports. Everything is computed on NumPy arrays, one
+element per medicine or per batch:
+
+- demand: mean and standard deviation of daily units over the last
+  DEMAND_WINDOW_DAYS days: units sold (daily medicine sales rollups) plus
+  units dispensed outside sales (stock ledger dispenses not noted as a sale)
+- reorder point: expected demand over the supplier lead time plus safety
+  stock, ``rate * L + z * std * sqrt(L)`` for the target service level
+- order quantity: economic order quantity ``sqrt(2 * D * S / H)`` for
+  annual demand D, cost per order S and annual holding cost per unit H
+- stock-out: stock on hand covers fewer days than the lead time, so it
+  runs out before a new order can arrive
+
+Reorder points are per medicine, while ``reorder_level`` is stored per
+batch and compared with the batch's own quantity. Each batch therefore
+gets a share of the medicine's reorder point in proportion to its stock,
+so every batch is below its level exactly when the medicine is below its
+reorder point (as of the run).
+
+A medicine needs demand on at least MIN_DEMAND_DAYS days of the window
+before its levels are computed; with less history (new or slow-moving
+medicines) its batches keep their current level, or get
+DEFAULT_REORDER_LEVEL if they have none, and no stock-out is forecast.
+Computed levels are at least REORDER_LEVEL_FLOOR.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from statistics import NormalDist
+
+import numpy as np
+
+from services.sales_buckets import bucket_start
+
+DEMAND_WINDOW_DAYS = 56
+SERVICE_LEVEL = 0.95
+DEFAULT_LEAD_TIME_DAYS = 7  # Batches without a supplier
+ORDER_COST = 250.0  # Cost of placing one order
+HOLDING_RATE = 0.25  # Annual holding cost as a share of the unit price
+MIN_HOLDING_COST = 0.01  # Per unit and year; keeps EOQ finite for free items
+MIN_DEMAND_DAYS = int(os.getenv("REORDER_MIN_DEMAND_DAYS", "7"))  # Days with demand before levels are computed
+DEFAULT_REORDER_LEVEL = int(os.getenv("DEFAULT_REORDER_LEVEL", "10"))  # Batches without a level (models/inventory.py)
+REORDER_LEVEL_FLOOR = int(os.getenv("REORDER_LEVEL_FLOOR", "1"))  # Lowest computed level
+
+
+def demand_window(now: datetime = None):
+    """Day buckets covered by the demand window: [start, end) in naive UTC, today excluded"""
+    end = bucket_start(now or datetime.now(timezone.utc), "day")
+    return end - timedelta(days=DEMAND_WINDOW_DAYS), end
+
+
+def daily_demand(medicine_ids, keys, days, units, window_days: int = DEMAND_WINDOW_DAYS):
+    """
+    Mean and standard deviation of daily units per medicine.
+
+    ``medicine_ids`` is sorted; ``keys``, ``days`` and ``units`` describe
+    demand rows (medicine id, day offset in the window, units). Rows of the
+    same medicine and day are added up (sales and other dispenses); days
+    without a row count as zero. Returns ``(rate, std, demand_days)``
+    arrays aligned with ``medicine_ids``, ``demand_days`` being the number
+    of days with demand.
+    """
+    medicine_ids = np.asarray(medicine_ids, dtype=np.int64)
+    keys = np.asarray(keys, dtype=np.int64)
+    days = np.asarray(days, dtype=np.int64)
+    units = np.asarray(units, dtype=np.float64)
+
+    rows = np.searchsorted(medicine_ids, keys)
+    known = rows < len(medicine_ids)
+    known[known] = medicine_ids[rows[known]] == keys[known]
+    keep = known & (days >= 0) & (days < window_days)
+
+    # Units per (medicine, day) cell; sums of units and of squares then give mean and variance
+    cells, cell_of_row = np.unique(rows[keep] * window_days + days[keep], return_inverse=True)
+    per_day = np.bincount(cell_of_row, weights=units[keep], minlength=len(cells))
+    cell_rows = cells // window_days
+    total = np.bincount(cell_rows, weights=per_day, minlength=len(medicine_ids))
+    squares = np.bincount(cell_rows, weights=per_day ** 2, minlength=len(medicine_ids))
+    demand_days = np.bincount(cell_rows[per_day > 0], minlength=len(medicine_ids))
+    rate = total / window_days
+    variance = np.maximum(squares / window_days - rate ** 2, 0.0)
+    return rate, np.sqrt(variance), demand_days
+
+
+def plan(batch_medicines, quantity, lead_time, price, levels, medicine_ids, rate, std, demand_days,
+         service_level: float = SERVICE_LEVEL, order_cost: float = ORDER_COST, holding_rate: float = HOLDING_RATE):
+    """
+    Reorder plan for all batches.
+
+    Batch arrays: ``batch_medicines``, ``quantity``, ``lead_time`` (days),
+    ``price`` and the current reorder ``levels`` (-1 for none). Medicine
+    arrays: sorted ``medicine_ids`` with their daily demand ``rate``,
+    ``std`` and ``demand_days`` (see daily_demand).
+
+    Returns a dict of arrays: per batch ``reorder_level``; per medicine
+    (``medicine_ids``) ``rate``, ``on_hand``, ``lead_time``, ``reorder_point``,
+    ``safety_stock``, ``order_quantity``, ``days_of_cover``, ``stockout`` and
+    ``estimated`` (enough demand history for a computed level).
+    """
+    batch_medicines = np.asarray(batch_medicines, dtype=np.int64)
+    quantity = np.asarray(quantity, dtype=np.float64)
+    medicine_ids = np.asarray(medicine_ids, dtype=np.int64)
+    rows = np.searchsorted(medicine_ids, batch_medicines)
+    count = len(medicine_ids)
+
+    on_hand = np.bincount(rows, weights=quantity, minlength=count)
+    batches = np.bincount(rows, minlength=count)
+    # A medicine is restocked at the pace of its slowest supplier; its price is the batch price
+    lead = np.zeros(count)
+    np.maximum.at(lead, rows, np.asarray(lead_time, dtype=np.float64))
+    unit_price = np.zeros(count)
+    unit_price[rows] = price
+
+    z = NormalDist().inv_cdf(service_level)
+    safety_stock = z * std * np.sqrt(lead)
+    reorder_point = np.ceil(rate * lead + safety_stock)
+    holding_cost = np.maximum(holding_rate * unit_price, MIN_HOLDING_COST)
+    order_quantity = np.ceil(np.sqrt(2 * rate * 365 * order_cost / holding_cost))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days_of_cover = np.where(rate > 0, on_hand / rate, np.inf)
+        share = np.where(on_hand[rows] > 0, quantity / on_hand[rows], 1 / np.maximum(batches[rows], 1))
+
+    # Too little history: keep the level set by hand (or the default) rather than one computed from noise
+    estimated = np.asarray(demand_days) >= MIN_DEMAND_DAYS
+    levels = np.asarray(levels, dtype=np.int64)
+    computed = np.maximum(np.ceil(reorder_point[rows] * share), REORDER_LEVEL_FLOOR)
+    kept = np.where(levels >= 0, levels, DEFAULT_REORDER_LEVEL)
+
+    return {
+        "reorder_level": np.where(estimated[rows], computed, kept).astype(np.int64),
+        "medicine_ids": medicine_ids,
+        "rate": rate,
+        "on_hand": on_hand.astype(np.int64),
+        "lead_time": lead,
+        "reorder_point": reorder_point.astype(np.int64),
+        "safety_stock": safety_stock,
+        "order_quantity": order_quantity.astype(np.int64),
+        "days_of_cover": days_of_cover,
+        "stockout": estimated & (rate > 0) & (days_of_cover < lead),
+        "estimated": estimated,
+    }
+
+
+def stockout_alerts(plan_result, names):
+    """
+    Forecast alert dicts for the medicines predicted to run out before a
+    new order arrives. ``names`` maps medicine id -> name. Critical when
+    stock covers less than half the lead time.
+    """
+    alerts = []
+    for row in np.flatnonzero(plan_result["stockout"]):
+        medicine_id = int(plan_result["medicine_ids"][row])
+        cover = float(plan_result["days_of_cover"][row])
+        lead = float(plan_result["lead_time"][row])
+        rate = float(plan_result["rate"][row])
+        alerts.append({
+            "alert_type": "forecast",
+            "priority": "critical" if cover < lead / 2 else "high",
+            "title": f"Stock-out Forecast: {names.get(medicine_id, f'Medicine {medicine_id}')}",
+            "message": (
+                f"{int(plan_result['on_hand'][row])} units cover {cover:.1f} days at {rate:.1f}/day, "
+                f"less than the {lead:g}-day supplier lead time. "
+                f"Suggested order: {int(plan_result['order_quantity'][row])} units."
+            ),
+            "medicine_id": medicine_id,
+            "inventory_id": None,
+            "status": "unread",
+            "condition": "shortfall",  # Same dedup key as alert_rules.ForecastShortfallRule
+        })
+    return alerts
@@ -0,0 +1,150 @@
+"""
+Result Cache - In-process cache for read-heavy data functions.
+
+Analytics and stats are read far more often than the data changes. The
+functions wrapped in services/data_source.py keep their results here, keyed
+on function and arguments:
+
+- TTL: each wrapped function has its own time to live
+- Invalidation: an entry records the collection versions (see
+  get_collection_version) of the collections it was computed from and is
+  dropped as soon as one of them changes. A medicine write therefore
+  invalidates medicine-based results only, in every worker process, since
+  the versions live in the data layer.
+- Memory bound: entries are evicted least recently used first once their
+  approximate size exceeds RESULT_CACHE_MAX_MB.
+
+Hit, miss, eviction, expiry and invalidation counters are exposed at
+/health/result-cache. Set RESULT_CACHE=0 to disable caching.
+
+Cached results are shared between callers and must not be mutated.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from functools import wraps
+
+ENABLED = os.getenv("RESULT_CACHE", "1").lower() in ("1", "true", "yes")
+MAX_BYTES = int(float(os.getenv("RESULT_CACHE_MAX_MB", "64")) * 1024 * 1024)
+
+
+def approx_size(value):
+    """Approximate memory held by a result (containers are walked recursively)"""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(approx_size(k) + approx_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(approx_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class _Entry:
+    __slots__ = ("value", "version", "expires_at", "size")
+
+    def __init__(self, value, version, expires_at, size):
+        self.value = value
+        self.version = version
+        self.expires_at = expires_at
+        self.size = size
+
+
+class ResultCache:
+    """TTL + LRU cache bounded by approximate size, validated against collection versions"""
+
+    def __init__(self, version, max_bytes: int = MAX_BYTES, enabled: bool = ENABLED):
+        self._version = version  # collections -> version token
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def cached(self, *collections: str, ttl: float, daily: bool = False):
+        """
+        Decorator: cache results for ``ttl`` seconds while ``collections`` are unchanged.
+        Set ``daily`` when the result also depends on today's date.
+        """
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+                version = self._version(collections)
+                if daily:
+                    version = f"{version}.{date.today().isoformat()}"
+
+                found, value = self._get(key, version)
+                if found:
+                    return value
+                value = fn(*args, **kwargs)
+                self._put(key, value, version, ttl)
+                return value
+
+            wrapper.cache = self
+            return wrapper
+        return decorator
+
+    def _get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.version != version:
+                    self.invalidations += 1
+                    self._drop(key)
+                elif entry.expires_at <= time.monotonic():
+                    self.expirations += 1
+                    self._drop(key)
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, entry.value
+            self.misses += 1
+            return False, None
+
+    def _put(self, key, value, version, ttl: float):
+        size = approx_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(value, version, time.monotonic() + ttl, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key):
+        self.bytes -= self._entries.pop(key).size
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        """Counters and memory use for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,103 @@
+"""
+Sales Buckets - Time buckets and rollup scopes shared by both sales ledgers.
+
+Used by services/sales_ledger.py (database) and services/memory_sales.py
+(mock data); kept free of database imports so the mock backend does not
+load SQLAlchemy.
+
+Every sale is added to one bucket per granularity (hour, day, month) in
+three scopes: all sales, its category and its medicine. A trend query
+then reads one row per bucket for the requested scope.
+
+Buckets are naive UTC datetimes; aware datetimes are converted and naive
+ones are taken as UTC.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+GRANULARITIES = ("hour", "day", "month")
+MAX_HOURLY_DAYS = 92  # Hourly trends cover at most ~3 months (2208 points)
+
+
+def utc(at: datetime):
+    """Naive UTC datetime (naive values are taken as UTC)"""
+    if at.tzinfo is not None:
+        at = at.astimezone(timezone.utc).replace(tzinfo=None)
+    return at
+
+
+def bucket_start(at: datetime, granularity: str):
+    """Start of the bucket containing ``at``"""
+    at = utc(at)
+    if granularity == "hour":
+        return at.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return at.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "month":
+        return at.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown granularity '{granularity}'. Use one of: {', '.join(GRANULARITIES)}")
+
+
+def _next_bucket(bucket: datetime, granularity: str):
+    if granularity == "hour":
+        return bucket + timedelta(hours=1)
+    if granularity == "day":
+        return bucket + timedelta(days=1)
+    return (bucket + timedelta(days=32)).replace(day=1)
+
+
+def window(days: int, granularity: str, now: datetime = None):
+    """Buckets of the last ``days`` days up to and including the current one, oldest first"""
+    now = utc(now or datetime.now(timezone.utc))
+    last = bucket_start(now, granularity)
+    if granularity == "hour":
+        bucket = last - timedelta(hours=24 * days - 1)
+    else:
+        bucket = bucket_start(now - timedelta(days=days - 1), granularity)
+    buckets = []
+    while bucket <= last:
+        buckets.append(bucket)
+        bucket = _next_bucket(bucket, granularity)
+    return buckets
+
+
+def label(bucket: datetime, granularity: str):
+    """Bucket as shown in the API: 2025-01-31T13:00:00, 2025-01-31 or 2025-01"""
+    if granularity == "hour":
+        return bucket.isoformat()
+    if granularity == "day":
+        return bucket.date().isoformat()
+    return bucket.strftime("%Y-%m")
+
+
+def scopes(category: str, medicine_id: int):
+    """Rollup scopes a sale counts towards: (scope, key) pairs"""
+    return (("all", ""), ("category", category), ("medicine", str(medicine_id)))
+
+
+def query_scope(category: str = None, medicine_id: int = None):
+    """Scope read by a trend query (a medicine filter wins over a category filter)"""
+    if medicine_id is not None:
+        return "medicine", str(medicine_id)
+    if category:
+        return "category", category
+    return "all", ""
+
+
+def rollup_deltas(sales, deltas: dict = None):
+    """
+    Aggregate sales into rollup deltas:
+    {(granularity, scope, key, bucket): [units, revenue, transactions]}
+    """
+    deltas = {} if deltas is None else deltas
+    for sale in sales:
+        buckets = [(granularity, bucket_start(sale["sold_at"], granularity)) for granularity in GRANULARITIES]
+        for scope, key in scopes(sale["category"], sale["medicine_id"]):
+            for granularity, bucket in buckets:
+                delta = deltas.get((granularity, scope, key, bucket))
+                if delta is None:
+                    delta = deltas[(granularity, scope, key, bucket)] = [0, 0.0, 0]
+                delta[0] += sale["quantity"]
+                delta[1] += sale["total"]
+                delta[2] += 1
+    return deltas
@@ -0,0 +1,65 @@
+"""
+Sales Generator - Synthetic sales history for development and benchmarks.
+
+Produces plausible pharmacy sales over any date range: a few medicines
+sell far more than the rest (Pareto popularity), demand peaks in winter,
+dips on Sundays, grows slowly year over year and follows opening hours
+during the day. The output is deterministic for a given seed.
+
+Used by the mock backend for its sample history and by
+scripts/generate_sales.py / scripts/bench_sales.py for multi-year data.
+"""
+
+import math
+import random
+from datetime import date, datetime, time, timedelta, timezone
+
+# Share of daily sales per hour (opening hours 08:00-22:00)
+HOUR_WEIGHTS = {8: 3, 9: 6, 10: 8, 11: 9, 12: 8, 13: 7, 14: 6, 15: 6, 16: 7, 17: 9, 18: 10, 19: 9, 20: 6, 21: 4}
+# Monday .. Sunday
+WEEKDAY_FACTORS = (1.05, 1.0, 1.0, 1.0, 1.1, 1.15, 0.7)
+YEARLY_GROWTH = 0.08
+
+
+def generate_sales(medicines, start: date, end: date, transactions_per_day: int = 200, seed: int = 42):
+    """
+    Yield sale dicts in time order for every day in [start, end).
+
+    ``medicines`` are dicts with id, category and price. Each sale has
+    medicine_id, category, quantity, unit_price, total and sold_at (UTC).
+    """
+    if not medicines:
+        return
+    rng = random.Random(seed)
+    popularity = [rng.paretovariate(1.2) for _ in medicines]
+    cum_weights = []
+    total = 0.0
+    for weight in popularity:
+        total += weight
+        cum_weights.append(total)
+    hours = list(HOUR_WEIGHTS)
+    hour_weights = list(HOUR_WEIGHTS.values())
+
+    day = start
+    while day < end:
+        years = (day - start).days / 365.25
+        seasonal = 1 + 0.25 * math.cos(2 * math.pi * (day.timetuple().tm_yday - 15) / 365.25)
+        mean = transactions_per_day * seasonal * WEEKDAY_FACTORS[day.weekday()] * (1 + YEARLY_GROWTH) ** years
+        count = max(0, round(rng.gauss(mean, math.sqrt(mean))))
+
+        midnight = datetime.combine(day, time(), tzinfo=timezone.utc)
+        picks = rng.choices(medicines, cum_weights=cum_weights, k=count)
+        offsets = sorted(
+            hour * 3600 + rng.randrange(3600) for hour in rng.choices(hours, weights=hour_weights, k=count)
+        )
+        for med, offset in zip(picks, offsets):
+            quantity = 1 + int(rng.expovariate(0.6))
+            yield {
+                "medicine_id": med["id"],
+                "category": med["category"],
+                "quantity": quantity,
+                "unit_price": med["price"],
+                "total": round(quantity * med["price"], 2),
+                "sold_at": midnight + timedelta(seconds=offset),
+            }
+        day += timedelta(days=1)
@@ -0,0 +1,115 @@
+"""
+Sales Ledger Service - Sales transactions with hourly, daily and monthly rollups.
+
+Database side of sales (models/sale.py). A sale dispenses stock through the
+stock ledger, appends a Sale row and adds its units and revenue to the
+SalesRollup rows of its hour, day and month for all sales, its category
+and its medicine, all in the caller's transaction. Bulk loads
+(append_sales) aggregate a whole chunk in memory first, so each rollup row
+is written once per chunk. Rollup rows are upserted (services/upserts.py):
+the first concurrent sales of a new bucket add to the same row instead of
+colliding on its primary key.
+
+A trend query reads one primary-key range of SalesRollup, so its cost
+depends on the number of buckets shown, not on the years of transactions
+behind them.
+
+Functions take an open session and never commit; callers own the transaction.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import insert, select
+
+from models import Inventory, Medicine, Sale, SalesRollup
+from services import stock_ledger
+from services.movement_types import SALE_NOTE
+from services.sales_buckets import label, query_scope, rollup_deltas, utc, window
+from services.upserts import add_deltas
+
+# ==================== WRITES ====================
+
+def record_sale(db, inventory_id: int, quantity: int, unit_price: float = None, sold_at=None):
+    """
+    Dispense ``quantity`` from a batch and record the sale.
+    Returns the Sale, or None if the batch does not exist.
+    Raises StockError if the batch holds less than ``quantity``.
+    """
+    row = db.execute(
+        select(Inventory.medicine_id, Medicine.category, Medicine.price)
+        .join(Medicine, Inventory.medicine_id == Medicine.id)
+        .where(Inventory.id == inventory_id)
+    ).first()
+    if row is None:
+        return None
+    medicine_id, category, price = row
+
+    movement = stock_ledger.record_movement(db, inventory_id, "dispense", quantity, SALE_NOTE)
+    if movement is None:
+        return None
+    unit_price = price if unit_price is None else unit_price
+    values = {
+        "medicine_id": medicine_id,
+        "inventory_id": inventory_id,
+        "category": category,
+        "quantity": quantity,
+        "unit_price": unit_price,
+        "total": round(quantity * unit_price, 2),
+        "sold_at": sold_at or datetime.now(timezone.utc),
+    }
+    sale = Sale(**values)
+    db.add(sale)
+    db.flush()
+    _apply_rollups(db, rollup_deltas([values]))
+    return sale
+
+
+def append_sales(db, sales):
+    """
+    Bulk-insert sale dicts (medicine_id, category, quantity, unit_price,
+    total, sold_at; inventory_id optional) and update the rollups once.
+    Stock is not touched: used for imported or generated history.
+    """
+    sales = list(sales)
+    if not sales:
+        return 0
+    db.execute(insert(Sale), sales)
+    _apply_rollups(db, rollup_deltas(sales))
+    return len(sales)
+
+
+def _apply_rollups(db, deltas: dict):
+    """Add rollup deltas to their rows, creating the missing ones (one upsert, safe under concurrent sales)"""
+    add_deltas(db, SalesRollup, (
+        {"granularity": g, "scope": s, "key": k, "bucket": b, "units": u, "revenue": r, "transactions": t}
+        for (g, s, k, b), (u, r, t) in deltas.items()
+    ), ("units", "revenue", "transactions"))
+
+
+# ==================== READS ====================
+
+def sales_trends(db, days: int, granularity: str = "day", category: str = None, medicine_id: int = None,
+                 now=None):
+    """
+    Units and revenue per bucket over the last ``days`` days, oldest first.
+    Buckets without sales are reported as zero.
+    """
+    buckets = window(days, granularity, now)
+    scope, key = query_scope(category, medicine_id)
+    found = {
+        utc(bucket): (units, revenue)
+        for bucket, units, revenue in db.execute(
+            select(SalesRollup.bucket, SalesRollup.units, SalesRollup.revenue).where(
+                SalesRollup.granularity == granularity,
+                SalesRollup.scope == scope,
+                SalesRollup.key == key,
+                SalesRollup.bucket >= buckets[0],
+                SalesRollup.bucket <= buckets[-1],
+            )
+        )
+    }
+    trends = []
+    for bucket in buckets:
+        units, revenue = found.get(bucket, (0, 0.0))
+        trends.append({"date": label(bucket, granularity), "sales": units, "revenue": round(revenue, 2)})
+    return trends
@@ -0,0 +1,198 @@
+"""
+Medicine Search Index - Trigram inverted index for fuzzy medicine search.
+
+Indexes name, generic_name, salt_composition and manufacturer. Every word
+is padded with two leading spaces before it is cut into trigrams, so the
+first grams of a word double as prefix postings: typing "amo" already
+matches "Amoxicillin", and a typo such as "parcetamol" still shares most of
+its trigrams with "paracetamol".
+
+Query evaluation only touches the rarest postings lists: a medicine needs at
+least ``MIN_MATCH`` of the query's trigrams to match, so by pigeonhole it
+must appear in one of the ``n - needed + 1`` rarest lists. Those candidates
+are then scored with O(1) lookups into the remaining lists.
+
+Very short queries ("p", "par") would hit a large share of the catalog
+through the padded grams, so they use a sorted list of name words
+instead: a bisect finds the first word with that prefix and the scan stops
+after ``limit`` medicines.
+
+The index is updated incrementally through IndexedTable change listeners.
+"""
+
+import heapq
+from bisect import bisect_left, insort
+import math
+import re
+from collections import Counter
+
+# Field weights used for ranking (a hit in the name counts most)
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "generic_name": 2.0,
+    "salt_composition": 1.5,
+    "manufacturer": 1.0,
+}
+
+# Queries shorter than this use the name-prefix list instead of trigrams
+MIN_GRAM_QUERY = 4
+
+# Fraction of the query's trigrams a medicine must contain to match
+MIN_MATCH = 0.6
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _word_grams(word: str, complete: bool = True):
+    """Trigrams of one word; complete words also get a trailing-space gram"""
+    padded = "  " + word + (" " if complete else "")
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def text_grams(text: str):
+    """All trigrams of an indexed text value"""
+    grams = set()
+    for word in _WORD_RE.findall((text or "").lower()):
+        grams |= _word_grams(word)
+    return grams
+
+
+def query_grams(query: str):
+    """
+    Trigrams of a search query.
+    The last word may still be half-typed, so it is treated as a prefix.
+    """
+    words = _WORD_RE.findall(query.lower())
+    grams = set()
+    for i, word in enumerate(words):
+        grams |= _word_grams(word, complete=i < len(words) - 1)
+    return grams
+
+
+class MedicineSearchIndex:
+    """
+    Trigram postings over the searchable medicine fields.
+
+    ``postings[gram]`` maps medicine id to the weight of the best field
+    containing that gram.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self._names = {}
+        self._name_words = []  # sorted (word, medicine_id) pairs
+
+    def __len__(self):
+        return len(self._names)
+
+    # ==================== MAINTENANCE ====================
+
+    def _record_grams(self, record: dict):
+        """gram -> best field weight for one medicine"""
+        weights = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for gram in text_grams(record.get(field)):
+                if weights.get(gram, 0) < weight:
+                    weights[gram] = weight
+        return weights
+
+    def add(self, record: dict):
+        """Index a medicine"""
+        medicine_id = record["id"]
+        for gram, weight in self._record_grams(record).items():
+            self.postings.setdefault(gram, {})[medicine_id] = weight
+        name = (record.get("name") or "").lower()
+        self._names[medicine_id] = name
+        for word in set(_WORD_RE.findall(name)):
+            insort(self._name_words, (word, medicine_id))
+
+    def remove(self, record: dict):
+        """Remove a medicine from the index"""
+        medicine_id = record["id"]
+        for gram in self._record_grams(record):
+            posting = self.postings.get(gram)
+            if posting is not None:
+                posting.pop(medicine_id, None)
+                if not posting:
+                    del self.postings[gram]
+        name = self._names.pop(medicine_id, "")
+        for word in set(_WORD_RE.findall(name)):
+            pos = bisect_left(self._name_words, (word, medicine_id))
+            if pos < len(self._name_words) and self._name_words[pos] == (word, medicine_id):
+                self._name_words.pop(pos)
+
+    def on_change(self, old, new):
+        """IndexedTable listener: keep the index in sync with the medicines table"""
+        if old is not None and new is not None and all(
+            old.get(field) == new.get(field) for field in FIELD_WEIGHTS
+        ):
+            return
+        if old is not None:
+            self.remove(old)
+        if new is not None:
+            self.add(new)
+
+    # ==================== QUERY ====================
+
+    def search(self, query: str, limit: int = None):
+        """
+        Get ``(medicine_id, score)`` pairs ranked best first.
+
+        Score is the weighted share of query trigrams found, plus a bonus
+        when the name starts with (or contains) the query.
+        """
+        text = query.lower().strip()
+        if len(text) < MIN_GRAM_QUERY:
+            return self._search_name_prefix(text, limit)
+
+        grams = query_grams(query)
+        if not grams:
+            return []
+
+        needed = max(1, math.ceil(len(grams) * MIN_MATCH))
+        lists = sorted((self.postings.get(g, {}) for g in grams), key=len)
+        cut = len(lists) - needed + 1
+
+        # Candidates come from the rarest lists only
+        hits = Counter()
+        for posting in lists[:cut]:
+            hits.update(posting.keys())
+
+        results = []
+        for medicine_id, count in hits.items():
+            for posting in lists[cut:]:
+                if medicine_id in posting:
+                    count += 1
+            if count < needed:
+                continue
+
+            score = sum(posting.get(medicine_id, 0) for posting in lists)
+            score /= len(grams) * FIELD_WEIGHTS["name"]
+            name = self._names[medicine_id]
+            if name.startswith(text):
+                score += 1.0
+            elif text in name:
+                score += 0.5
+            results.append((medicine_id, round(score, 4)))
+
+        rank = lambda r: (-r[1], self._names[r[0]], r[0])
+        if limit:
+            return heapq.nsmallest(limit, results, key=rank)
+        return sorted(results, key=rank)
+
+    def _search_name_prefix(self, prefix: str, limit: int = None):
+        """Medicines with a name word starting with prefix, whole-name prefix first"""
+        if not _WORD_RE.fullmatch(prefix):
+            return []
+
+        words = self._name_words
+        pos = bisect_left(words, (prefix,))
+        seen = {}
+        while pos < len(words) and words[pos][0].startswith(prefix):
+            medicine_id = words[pos][1]
+            pos += 1
+            if medicine_id not in seen:
+                seen[medicine_id] = 2.0 if self._names[medicine_id].startswith(prefix) else 1.5
+                if limit and len(seen) == limit:
+                    break
+        return sorted(seen.items(), key=lambda r: (-r[1], self._names[r[0]], r[0]))
@@ -0,0 +1,135 @@
+"""
+Stock Counters - Low-stock membership and dashboard totals kept up to date
+as stock changes happen.
+
+Subscribes to the medicines and inventory tables of a CatalogStore and
+applies every write as a delta, so reading the low-stock list, its size or
+the total stock value never rescans the inventory.
+
+Set STOCK_COUNTERS_VERIFY=1 to compare every read against a full
+recompute; a mismatch raises AssertionError. This is meant for development
+and tests, since each verified read costs a full pass.
+"""
+
+import math
+import os
+from bisect import bisect_left, insort
+
+VERIFY = os.getenv("STOCK_COUNTERS_VERIFY", "").lower() in ("1", "true", "yes")
+
+
+def _is_low_stock(inv: dict):
+    return inv["quantity"] < inv["reorder_level"]
+
+
+class StockCounters:
+    """
+    Incrementally maintained stock figures for one CatalogStore.
+
+    - ``low_stock_ids``: sorted ids of batches below their reorder level
+    - ``total_value``: sum of quantity x price over all batches
+    - ``total_quantity``: units in stock over all batches
+    """
+
+    def __init__(self, store, verify: bool = VERIFY):
+        self.store = store
+        self.verify_reads = verify
+        self.low_stock_ids = []
+        self.total_value = 0.0
+        self.total_quantity = 0
+        self._prices = {}
+        self._medicine_quantity = {}
+
+        for med in store.medicines.all():
+            self._prices[med["id"]] = med["price"]
+        for inv in store.inventory.all():
+            self._apply(inv, 1)
+
+        store.medicines.subscribe(self.on_medicine_change)
+        store.inventory.subscribe(self.on_inventory_change)
+
+    # ==================== LISTENERS ====================
+
+    def on_medicine_change(self, old, new):
+        """Track prices; a price change revalues all stock of that medicine"""
+        if new is None:
+            self._prices.pop(old["id"], None)
+            return
+        if old is not None and old["price"] != new["price"]:
+            quantity = self._medicine_quantity.get(new["id"], 0)
+            self.total_value += quantity * (new["price"] - old["price"])
+        self._prices[new["id"]] = new["price"]
+
+    def on_inventory_change(self, old, new):
+        """Apply a batch write as a delta"""
+        if old is not None:
+            self._apply(old, -1)
+        if new is not None:
+            self._apply(new, 1)
+
+    def _apply(self, inv: dict, sign: int):
+        medicine_id = inv["medicine_id"]
+        quantity = inv["quantity"] * sign
+        self.total_quantity += quantity
+        self.total_value += quantity * self._prices.get(medicine_id, 0.0)
+        remaining = self._medicine_quantity.get(medicine_id, 0) + quantity
+        if remaining:
+            self._medicine_quantity[medicine_id] = remaining
+        else:  # Last batch deleted (or emptied): absent reads as 0, so the map only holds stocked medicines
+            self._medicine_quantity.pop(medicine_id, None)
+
+        if _is_low_stock(inv):
+            ids = self.low_stock_ids
+            pos = bisect_left(ids, inv["id"])
+            if sign > 0:
+                ids.insert(pos, inv["id"])
+            elif pos < len(ids) and ids[pos] == inv["id"]:
+                ids.pop(pos)
+
+    # ==================== READS ====================
+
+    def low_stock_count(self):
+        self._check()
+        return len(self.low_stock_ids)
+
+    def inventory_value(self):
+        self._check()
+        return round(self.total_value, 2)
+
+    def low_stock(self):
+        """Sorted ids of low-stock batches"""
+        self._check()
+        return self.low_stock_ids
+
+    # ==================== VERIFICATION ====================
+
+    def recompute(self):
+        """Full recompute from the store: (low_stock_ids, total_value, total_quantity)"""
+        medicines = self.store.medicines
+        low_stock_ids = []
+        total_value = 0.0
+        total_quantity = 0
+        for inv in self.store.inventory.all():
+            med = medicines.get(inv["medicine_id"])
+            total_quantity += inv["quantity"]
+            total_value += inv["quantity"] * (med["price"] if med else 0.0)
+            if _is_low_stock(inv):
+                insort(low_stock_ids, inv["id"])
+        return low_stock_ids, total_value, total_quantity
+
+    def verify(self):
+        """Compare against a full recompute and return a list of mismatches"""
+        low_stock_ids, total_value, total_quantity = self.recompute()
+        mismatches = []
+        if low_stock_ids != self.low_stock_ids:
+            mismatches.append(f"low_stock_ids: {self.low_stock_ids} != {low_stock_ids}")
+        if not math.isclose(total_value, self.total_value, rel_tol=1e-9, abs_tol=1e-6):
+            mismatches.append(f"total_value: {self.total_value} != {total_value}")
+        if total_quantity != self.total_quantity:
+            mismatches.append(f"total_quantity: {self.total_quantity} != {total_quantity}")
+        return mismatches
+
+    def _check(self):
+        if self.verify_reads:
+            mismatches = self.verify()
+            assert not mismatches, "Stock counters drifted: " + "; ".join(mismatches)
@@ -0,0 +1,206 @@
+"""
+Stock Ledger Service - Append-only stock movements with quantity snapshots.
+
+Database side of the ledger (models/stock_movement.py). Stock changes are
+only ever appended as StockMovement rows, which are never updated or
+deleted (not even when their batch is); Inventory.quantity is updated in
+the same transaction as a write-through copy for the rest of the app.
+
+Reads stay fast as the ledger grows:
+- current quantity = latest StockSnapshot + movements after its position
+- stock at time T  = latest snapshot taken before T + movements up to T
+- consumption      = one index range scan on (medicine_id, type, created_at)
+- daily dispenses  = dispenses outside sales per medicine and day, the
+                     ledger's share of the demand for reorder points
+
+take_snapshots() is run periodically (workers/snapshot_stock.py) so the
+tail after the latest snapshot stays short.
+
+Functions take an open session and never commit; callers own the transaction.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import and_, exists, func, insert, literal, or_, select
+
+from models import Inventory, StockMovement, StockSnapshot
+from services.movement_types import CONSUMPTION_TYPES, SALE_NOTE, StockError, signed_change
+from services.sales_buckets import bucket_start
+
+OPENING_BALANCE_NOTE = "Opening balance"
+
+
+# ==================== WRITES ====================
+
+def record_movement(db, inventory_id: int, movement_type: str, quantity: int, note: str = None):
+    """
+    Append one movement and apply it to Inventory.quantity.
+    Returns the StockMovement, or None if the batch does not exist.
+    """
+    change = signed_change(movement_type, quantity)
+    inv = db.scalars(select(Inventory).where(Inventory.id == inventory_id).with_for_update()).first()
+    if inv is None:
+        return None
+    if inv.quantity + change < 0:
+        raise StockError(f"Insufficient stock: batch {inventory_id} holds {inv.quantity}")
+
+    movement = StockMovement(
+        inventory_id=inventory_id,
+        medicine_id=inv.medicine_id,
+        movement_type=movement_type,
+        quantity_change=change,
+        note=note,
+    )
+    db.add(movement)
+    inv.quantity += change
+    db.flush()
+    return movement
+
+
+def append_movements(db, movements):
+    """Bulk-append movement dicts (used by imports and batch edits)"""
+    movements = [m for m in movements if m["quantity_change"]]
+    if movements:
+        db.execute(insert(StockMovement), movements)
+
+
+def backfill_opening_balances(db):
+    """
+    Record an opening-balance adjustment for batches with stock but no ledger rows,
+    so that every batch's quantity equals the sum of its movements.
+    """
+    no_movements = ~exists().where(StockMovement.inventory_id == Inventory.id)
+    source = select(
+        Inventory.id,
+        Inventory.medicine_id,
+        literal("adjustment"),
+        Inventory.quantity,
+        literal(OPENING_BALANCE_NOTE),
+    ).where(Inventory.quantity != 0, no_movements)
+    result = db.execute(
+        insert(StockMovement).from_select(
+            ["inventory_id", "medicine_id", "movement_type", "quantity_change", "note"],
+            source,
+        )
+    )
+    return result.rowcount
+
+
+def take_snapshots(db, chunk_size: int = 10_000):
+    """
+    Materialize the quantity of every batch that moved since the last run.
+
+    All snapshots of one run share the same ledger position, so the
+    highest last_movement_id is the watermark for the next run.
+    Returns the number of snapshots written.
+    """
+    watermark = db.scalar(select(func.coalesce(func.max(StockSnapshot.last_movement_id), 0)))
+    high = db.scalar(select(func.max(StockMovement.id)))
+    if high is None or high <= watermark:
+        return 0
+
+    deltas = dict(db.execute(
+        select(StockMovement.inventory_id, func.sum(StockMovement.quantity_change))
+        .where(StockMovement.id > watermark, StockMovement.id <= high)
+        .group_by(StockMovement.inventory_id)
+    ).all())
+
+    taken_at = datetime.now(timezone.utc)
+    batch_ids = list(deltas)
+    for start in range(0, len(batch_ids), chunk_size):
+        chunk = batch_ids[start:start + chunk_size]
+        previous = dict(db.execute(_latest_snapshots(chunk)).all())
+        db.execute(insert(StockSnapshot), [
+            {
+                "inventory_id": batch_id,
+                "quantity": previous.get(batch_id, 0) + deltas[batch_id],
+                "last_movement_id": high,
+                "taken_at": taken_at,
+            }
+            for batch_id in chunk
+        ])
+    return len(batch_ids)
+
+
+# ==================== READS ====================
+
+def _latest_snapshots(inventory_ids):
+    """(inventory_id, quantity) of the latest snapshot of each batch"""
+    latest = (
+        select(StockSnapshot.inventory_id, func.max(StockSnapshot.last_movement_id).label("position"))
+        .where(StockSnapshot.inventory_id.in_(inventory_ids))
+        .group_by(StockSnapshot.inventory_id)
+        .subquery()
+    )
+    return select(StockSnapshot.inventory_id, StockSnapshot.quantity).join(
+        latest,
+        and_(
+            StockSnapshot.inventory_id == latest.c.inventory_id,
+            StockSnapshot.last_movement_id == latest.c.position,
+        ),
+    )
+
+
+def quantity_at(db, inventory_id: int, at: datetime = None):
+    """
+    Quantity of a batch now (at=None) or at time ``at``:
+    latest applicable snapshot plus the movements after it.
+    """
+    snapshot_query = select(StockSnapshot.quantity, StockSnapshot.last_movement_id).where(
+        StockSnapshot.inventory_id == inventory_id
+    )
+    if at is not None:
+        snapshot_query = snapshot_query.where(StockSnapshot.taken_at <= at)
+    snapshot = db.execute(
+        snapshot_query.order_by(StockSnapshot.last_movement_id.desc()).limit(1)
+    ).first()
+    base, position = (snapshot.quantity, snapshot.last_movement_id) if snapshot else (0, 0)
+
+    tail_query = select(func.coalesce(func.sum(StockMovement.quantity_change), 0)).where(
+        StockMovement.inventory_id == inventory_id,
+        StockMovement.id > position,
+    )
+    if at is not None:
+        tail_query = tail_query.where(StockMovement.created_at <= at)
+    return base + db.scalar(tail_query)
+
+
+def consumption(db, medicine_id: int, start: datetime, end: datetime):
+    """Units dispensed and written off for a medicine in [start, end)"""
+    rows = db.execute(
+        select(StockMovement.movement_type, (-func.sum(StockMovement.quantity_change)).label("units"))
+        .where(
+            StockMovement.medicine_id == medicine_id,
+            StockMovement.movement_type.in_(CONSUMPTION_TYPES),
+            StockMovement.created_at >= start,
+            StockMovement.created_at < end,
+        )
+        .group_by(StockMovement.movement_type)
+    )
+    totals = {movement_type: int(units) for movement_type, units in rows}
+    return {
+        "dispensed": totals.get("dispense", 0),
+        "written_off": totals.get("write_off", 0),
+    }
+
+
+def daily_dispenses(db, start: datetime, end: datetime):
+    """
+    Units dispensed outside sales (dispenses not noted as a sale, which the
+    sales rollups already count) per medicine and day of [start, end).
+    ``start`` and ``end`` are naive UTC day buckets.
+    Returns {(medicine_id, day bucket): units}.
+    """
+    rows = db.execute(
+        select(StockMovement.medicine_id, StockMovement.created_at, StockMovement.quantity_change).where(
+            StockMovement.movement_type == "dispense",
+            or_(StockMovement.note.is_(None), StockMovement.note != SALE_NOTE),
+            StockMovement.created_at >= start.replace(tzinfo=timezone.utc),
+            StockMovement.created_at < end.replace(tzinfo=timezone.utc),
+        )
+    )
+    totals = {}
+    for medicine_id, created_at, change in rows:
+        key = (medicine_id, bucket_start(created_at, "day"))
+        totals[key] = totals.get(key, 0) - change
+    return totals
@@ -0,0 +1,33 @@
+"""
+Upserts - Add deltas to counter rows in one statement.
+
+Counter tables (alert counters, sales rollups) get a row the first time a
+key is seen. Reading which keys exist and then inserting the missing ones
+lets two concurrent transactions insert the same primary key, and the
+loser's whole transaction (a sale, a stock write) fails. add_deltas()
+uses INSERT ... ON CONFLICT (primary key) DO UPDATE SET column = column +
+excluded.column instead, supported by both PostgreSQL and SQLite (3.24+).
+
+Functions take an open session and never commit; callers own the transaction.
+"""
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+def add_deltas(db, model, rows, columns):
+    """
+    Insert ``rows`` (dicts with the primary key and ``columns``) into
+    ``model``'s table; where a row already exists, add the given values of
+    ``columns`` to it instead.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    table = model.__table__
+    statement = dialect.insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=list(table.primary_key.columns),
+        set_={column: table.c[column] + statement.excluded[column] for column in columns},
+    )
+    db.execute(statement, rows)
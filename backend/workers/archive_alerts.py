@@ -0,0 +1,29 @@
+"""
+Alert Archive Job - Move old resolved alerts out of the hot alerts table.
+
+Resolved alerts created more than ALERT_RETENTION_DAYS ago (default 90) are
+moved to the archive in batches, one commit per batch, so listings, stats
+and the unread count keep reading a small table. Run it daily (e.g. cron)
+from the backend folder:
+
+    python -m workers.archive_alerts [retention_days]
+"""
+
+import sys
+import time
+
+from services.real_data import archive_alerts
+
+
+def run(retention_days: int = None):
+    """Archive resolved alerts past the retention age"""
+    started = time.perf_counter()
+    report = archive_alerts(retention_days)
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+if __name__ == "__main__":
+    result = run(int(sys.argv[1]) if len(sys.argv) > 1 else None)
+    print(f"✅ Alert archive: {result['archived']} resolved alerts created before {result['cutoff']} "
+          f"archived in {result['batches']} batches, {result['seconds']}s")
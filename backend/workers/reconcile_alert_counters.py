@@ -0,0 +1,37 @@
+"""
+Alert Counter Reconcile Job - Check the alert counters against the alerts table.
+
+The counters per status, priority and type (services/alert_counters.py)
+are updated by delta on every alert write. This job recounts the alerts
+with one grouped query, fixes any counter that drifted and prints what
+changed. Run it periodically (e.g. nightly cron) and once after creating
+the alert_counters table on an existing database, from the backend folder:
+
+    python -m workers.reconcile_alert_counters
+"""
+
+import time
+
+from core.database import SessionLocal
+from services.alert_counters import reconcile
+
+
+def run():
+    """Reconcile all alert counters in one transaction"""
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        report = reconcile(db)
+        db.commit()
+    finally:
+        db.close()
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+if __name__ == "__main__":
+    result = run()
+    print(f"✅ Alert counters reconciled: {result['alerts']} alerts, {result['counters']} counters "
+          f"in {result['seconds']}s")
+    for drift in result["drift"]:
+        print(f"   ⚠️  {drift['dimension']}={drift['value']}: {drift['counter']} -> {drift['actual']}")
@@ -0,0 +1,31 @@
+"""
+Reorder Point Job - Recompute reorder levels from recent demand.
+
+Computes every batch's reorder level at once from the daily demand rate
+and variability of the last weeks of demand and the supplier lead time
+(services/reorder_policy.py), writes the levels that changed and raises a
+forecast alert for each medicine predicted to run out before a new order
+arrives. Run it periodically (e.g. nightly cron) from the backend folder:
+
+    python -m workers.reorder_points
+"""
+
+import time
+
+from services.real_data import recompute_reorder_points
+
+
+def run():
+    """Recompute reorder levels and forecast alerts in one transaction"""
+    started = time.perf_counter()
+    report = recompute_reorder_points()
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+if __name__ == "__main__":
+    result = run()
+    print(f"✅ Reorder points: {result['levels_updated']} of {result['batches']} batch levels updated "
+          f"({result['estimated']} of {result['medicines']} medicines with enough demand history), "
+          f"{result['stockouts']} predicted stock-outs, {result['alerts_created']} alerts created, "
+          f"{result['alerts_updated']} updated in {result['seconds']}s")
@@ -0,0 +1,38 @@
+"""
+Stock Snapshot Job - Keep stock ledger reads short.
+
+Records opening balances for batches that predate the ledger, then writes a
+StockSnapshot for every batch that moved since the previous run, so
+current / point-in-time stock only sums the movements after the latest
+snapshot. Run it periodically (e.g. nightly cron) from the backend folder:
+
+    python -m workers.snapshot_stock
+"""
+
+import time
+
+from core.database import SessionLocal
+from services.stock_ledger import backfill_opening_balances, take_snapshots
+
+
+def run():
+    """Backfill opening balances and snapshot moved batches in one transaction"""
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        backfilled = backfill_opening_balances(db)
+        snapshots = take_snapshots(db)
+        db.commit()
+    finally:
+        db.close()
+    return {
+        "opening_balances": backfilled,
+        "snapshots": snapshots,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+if __name__ == "__main__":
+    result = run()
+    print(f"✅ Stock snapshots: {result['snapshots']} written, "
+          f"{result['opening_balances']} opening balances recorded in {result['seconds']}s")
@@ -0,0 +1,31 @@
+"""
+Alert Sweep Job - Evaluate the alert rules for the whole inventory.
+
+Stock changes raise alerts for the batch they touch as they happen
+(services/alert_engine.py). Conditions that change with time alone, such
+as a batch entering a new expiry band, need a periodic pass over every
+batch. The sweep reads the inventory one keyset page at a time and commits
+after each page. Run it periodically (e.g. daily cron) from the backend
+folder:
+
+    python -m workers.sweep_alerts
+"""
+
+import time
+
+from services.real_data import sweep_alerts
+
+
+def run():
+    """Sweep all batches"""
+    started = time.perf_counter()
+    report = sweep_alerts()
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+if __name__ == "__main__":
+    result = run()
+    print(f"✅ Alert sweep: {result['batches']} batches evaluated, "
+          f"{result['alerts_created']} alerts created, {result['alerts_updated']} updated "
+          f"in {result['seconds']}s")
@@ -1,21 +1,87 @@
+import sys
+import time
+from pathlib import Path
+
 import modal
 
 app = modal.App("smart-pharmacy-ml")
 
+FORECASTING_DIR = Path(__file__).parent / "models" / "demand-forecasting"
+REMOTE_FORECASTING_DIR = "/root/demand_forecasting"
+
 image = modal.Image.debian_slim().pip_install(
     "fastapi",
     "torch",
     "transformers",
+    "numpy",
     "pandas",
     "scikit-learn",
     "xgboost",
-)
+).add_local_dir(FORECASTING_DIR, remote_path=REMOTE_FORECASTING_DIR)
 
-@app.function(image=image, gpu="T4")
+
+def _forecast(histories, data: dict):
+    """Run the forecast engine on a list of histories; bad input -> HTTP 400"""
+    from fastapi import HTTPException
+
+    sys.path.append(REMOTE_FORECASTING_DIR)
+    from forecast_engine import INTERVAL, SEASON_LENGTH, forecast
+
+    try:
+        return forecast(
+            histories,
+            int(data.get("horizon", 7)),
+            method=data.get("method", "ets"),
+            season_length=int(data.get("season_length", SEASON_LENGTH)),
+            interval=float(data.get("interval", INTERVAL)),
+        )
+    except (TypeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+# Forecasting is vectorized NumPy (and optional CPU gradient boosting): no GPU
+@app.function(image=image, cpu=2.0, memory=2048)
 @modal.web_endpoint(method="POST")
 def predict_demand(data: dict):
-    # Placeholder for demand forecasting
-    return {"predicted_demand": 150, "confidence": 0.85}
+    """Forecast one SKU: {"history": [...], "horizon": 7, "method": "ets"}"""
+    result = _forecast([data.get("history") or []], data)
+    return {
+        "predicted_demand": round(float(result.mean[0].sum()), 2),
+        "forecast": result.mean[0].round(2).tolist(),
+        "lower": result.lower[0].round(2).tolist(),
+        "upper": result.upper[0].round(2).tolist(),
+        "confidence": float(data.get("interval", 0.8)),
+    }
+
+
+@app.function(image=image, cpu=8.0, memory=8192, timeout=600)
+@modal.web_endpoint(method="POST")
+def predict_demand_batch(data: dict):
+    """
+    Forecast N SKUs x H periods in one batch:
+    {"series": [{"sku": "...", "history": [...]}, ...], "horizon": 28, "method": "ets"}
+    """
+    series = data.get("series") or []
+    start = time.perf_counter()
+    result = _forecast([item.get("history") or [] for item in series], data)
+    mean, lower, upper = result.mean.round(2), result.lower.round(2), result.upper.round(2)
+    return {
+        "method": data.get("method", "ets"),
+        "horizon": mean.shape[1],
+        "skus": len(series),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        "forecasts": [
+            {
+                "sku": item.get("sku"),
+                "predicted_demand": round(float(mean[row].sum()), 2),
+                "forecast": mean[row].tolist(),
+                "lower": lower[row].tolist(),
+                "upper": upper[row].tolist(),
+            }
+            for row, item in enumerate(series)
+        ],
+    }
+
 
 @app.function(image=image, gpu="T4")
 @modal.web_endpoint(method="POST")
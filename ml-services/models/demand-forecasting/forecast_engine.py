@@ -0,0 +1,232 @@
+"""
+Forecast Engine - Batch demand forecasting for every SKU at once on CPU.
+
+History is one matrix: a row per SKU, a column per period (oldest first,
+missing periods NaN). Every method works on the whole matrix with NumPy,
+so a batch costs one pass over the periods instead of one model per SKU:
+
+- ets: damped-trend Holt-Winters with additive seasonality. A small grid
+  of smoothing parameters is run side by side and each SKU keeps the set
+  with the lowest one-step error.
+- seasonal_naive: repeat the last season.
+- gbm: one gradient-boosted model shared by all SKUs on scaled lag
+  features, forecast recursively (xgboost, else scikit-learn; both are
+  optional and imported on first use).
+
+Forecasts and interval bounds are clipped at zero demand.
+"""
+
+from itertools import product
+from statistics import NormalDist
+from typing import NamedTuple
+
+import numpy as np
+
+SEASON_LENGTH = 7  # Daily history, weekly seasonality
+MAX_HISTORY = 364  # Periods kept per SKU (older history is dropped)
+INTERVAL = 0.8
+
+# Smoothing grid searched per SKU: (alpha, beta, gamma); trend damping is fixed
+ETS_GRID = list(product((0.1, 0.3, 0.6), (0.0, 0.05), (0.05, 0.2)))
+PHI = 0.9
+
+# Gradient boosting
+GBM_LAGS = (1, 2, 3, 7, 14, 28)
+GBM_WINDOWS = (7, 28)  # Rolling means
+GBM_TRAIN_PERIODS = 56  # Most recent periods used as training targets
+GBM_MAX_ROWS = 1_000_000  # SKUs are sampled above this many training rows
+
+
+class Forecast(NamedTuple):
+    """Arrays of shape (skus, horizon)"""
+    mean: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+
+
+def to_matrix(series, max_history: int = MAX_HISTORY):
+    """Stack per-SKU histories of any length into a right-aligned float matrix (NaN-padded)"""
+    series = [np.asarray(values, dtype=float)[-max_history:] for values in series]
+    width = max((len(values) for values in series), default=0)
+    matrix = np.full((len(series), max(width, 1)), np.nan)
+    for row, values in enumerate(series):
+        if len(values):
+            matrix[row, -len(values):] = values
+    return matrix
+
+
+def _z(interval: float):
+    if not 0 < interval < 1:
+        raise ValueError("interval must be between 0 and 1")
+    return NormalDist().inv_cdf((1 + interval) / 2)
+
+
+def _bounds(mean, sigma, interval: float):
+    """Clip the mean at zero and wrap it in mean -/+ z * sigma"""
+    mean = np.maximum(mean, 0.0)
+    spread = _z(interval) * sigma
+    return Forecast(mean, np.maximum(mean - spread, 0.0), mean + spread)
+
+
+# ==================== SEASONAL NAIVE ====================
+
+def seasonal_naive(history, horizon: int, season_length: int = SEASON_LENGTH, interval: float = INTERVAL):
+    """Repeat the last season; spread from the season-over-season differences"""
+    history = np.asarray(history, dtype=float)
+    season_length = min(season_length, history.shape[1])
+    last = np.nan_to_num(history[:, -season_length:])
+    mean = np.tile(last, (1, -(-horizon // season_length)))[:, :horizon]
+
+    diffs = history[:, season_length:] - history[:, :-season_length]
+    observed = ~np.isnan(diffs)
+    squared = np.where(observed, diffs, 0.0) ** 2
+    sigma = np.sqrt(squared.sum(axis=1) / np.maximum(observed.sum(axis=1), 1))
+    seasons_ahead = np.arange(horizon) // season_length + 1
+    return _bounds(mean, sigma[:, None] * np.sqrt(seasons_ahead), interval)
+
+
+# ==================== EXPONENTIAL SMOOTHING ====================
+
+def holt_winters(history, horizon: int, season_length: int = SEASON_LENGTH, interval: float = INTERVAL,
+                 grid=ETS_GRID, phi: float = PHI):
+    """
+    Damped additive Holt-Winters for every SKU; each SKU keeps the grid
+    entry with the lowest one-step squared error. Missing periods leave the
+    state untouched.
+    """
+    history = np.asarray(history, dtype=float)
+    skus, periods = history.shape
+    m = season_length
+    alpha, beta, gamma = (np.array(column)[:, None] for column in zip(*grid))  # (G, 1)
+
+    # Initial state from the first two seasons: mean level, per-phase offsets, no trend
+    first = history[:, :min(periods, 2 * m)]
+    observed = ~np.isnan(first)
+    values = np.where(observed, first, 0.0)
+    base = values.sum(axis=1) / np.maximum(observed.sum(axis=1), 1)
+    phase = np.arange(first.shape[1]) % m
+    offsets = np.zeros((skus, m))
+    for p in range(min(m, first.shape[1])):
+        hits = observed[:, phase == p]
+        offsets[:, p] = np.where(
+            hits.any(axis=1), (values[:, phase == p].sum(axis=1) / np.maximum(hits.sum(axis=1), 1)) - base, 0.0
+        )
+
+    level = np.repeat(base[None, :], len(grid), axis=0)  # (G, N)
+    trend = np.zeros_like(level)
+    season = np.repeat(offsets[None, :, :], len(grid), axis=0)  # (G, N, m)
+    sse = np.zeros_like(level)
+    errors = np.zeros(skus, dtype=int)
+
+    for t in range(periods):
+        y = history[:, t]
+        seen = ~np.isnan(y)
+        p = t % m
+        damped = phi * trend
+        error = np.where(seen, np.nan_to_num(y) - (level + damped + season[:, :, p]), 0.0)
+        if t >= m:  # Skip the first season: its errors only measure the initial state
+            sse += error * error
+            errors += seen
+        level += damped + alpha * error
+        trend = damped + beta * error
+        season[:, :, p] += gamma * error
+
+    best = sse.argmin(axis=0)
+    rows = np.arange(skus)
+    level, trend, season = level[best, rows], trend[best, rows], season[best, rows]
+    sigma = np.sqrt(sse[best, rows] / np.maximum(errors, 1))
+
+    steps = np.arange(1, horizon + 1)
+    damping = np.cumsum(phi ** steps)  # phi + phi^2 + ... + phi^h
+    phases = (periods + steps - 1) % m
+    mean = level[:, None] + trend[:, None] * damping + season[:, phases]
+    # Variance of a level-only model: sigma^2 * (1 + (h - 1) * alpha^2)
+    spread = sigma[:, None] * np.sqrt(1 + (steps - 1) * alpha[best, 0][:, None] ** 2)
+    return _bounds(mean, spread, interval)
+
+
+# ==================== GRADIENT BOOSTING ====================
+
+def _regressor():
+    """xgboost if installed, else scikit-learn's histogram gradient boosting"""
+    try:
+        from xgboost import XGBRegressor
+        return XGBRegressor(n_estimators=200, max_depth=6, learning_rate=0.1, tree_method="hist", n_jobs=-1)
+    except ImportError:
+        pass
+    try:
+        from sklearn.ensemble import HistGradientBoostingRegressor
+        return HistGradientBoostingRegressor(max_iter=200, learning_rate=0.1)
+    except ImportError:
+        raise ImportError("method 'gbm' needs xgboost or scikit-learn") from None
+
+
+def _features(scaled, t: int, season_length: int):
+    """Feature rows (one per SKU) for predicting column ``t`` of the scaled history"""
+    columns = [scaled[:, t - lag] for lag in GBM_LAGS]
+    columns += [scaled[:, t - window:t].mean(axis=1) for window in GBM_WINDOWS]
+    columns.append(np.full(len(scaled), t % season_length, dtype=float))
+    return np.column_stack(columns)
+
+
+def gradient_boosted(history, horizon: int, season_length: int = SEASON_LENGTH, interval: float = INTERVAL,
+                     train_periods: int = GBM_TRAIN_PERIODS, max_rows: int = GBM_MAX_ROWS, seed: int = 42):
+    """
+    One boosted model for all SKUs. Demand is scaled by each SKU's mean
+    (missing periods count as zero), trained on the last ``train_periods``
+    periods and rolled forward one period at a time. The interval uses
+    each SKU's in-sample one-step error for every step ahead.
+    """
+    history = np.asarray(history, dtype=float)
+    skus, periods = history.shape
+    warmup = max(max(GBM_LAGS), max(GBM_WINDOWS))
+    if periods <= warmup:
+        raise ValueError(f"method 'gbm' needs more than {warmup} periods of history")
+
+    filled = np.nan_to_num(history)
+    scale = filled.mean(axis=1)
+    scale[scale <= 0] = 1.0
+    scaled = np.concatenate([filled / scale[:, None], np.zeros((skus, horizon))], axis=1)
+
+    targets = range(max(warmup, periods - train_periods), periods)
+    sample = np.arange(skus)
+    if skus * len(targets) > max_rows:
+        sample = np.random.default_rng(seed).choice(skus, max_rows // len(targets), replace=False)
+    features = np.concatenate([_features(scaled[sample], t, season_length) for t in targets])
+    labels = np.concatenate([scaled[sample, t] for t in targets])
+    model = _regressor()
+    model.fit(features, labels)
+
+    # In-sample one-step error of every SKU over the training periods
+    fitted = np.column_stack([model.predict(_features(scaled, t, season_length)) for t in targets])
+    sigma = np.sqrt(((scaled[:, targets.start:periods] - fitted) ** 2).mean(axis=1)) * scale
+
+    for t in range(periods, periods + horizon):
+        scaled[:, t] = np.maximum(model.predict(_features(scaled, t, season_length)), 0.0)
+    mean = scaled[:, periods:] * scale[:, None]
+    return _bounds(mean, np.repeat(sigma[:, None], horizon, axis=1), interval)
+
+
+# ==================== BATCH ====================
+
+METHODS = {
+    "ets": holt_winters,
+    "seasonal_naive": seasonal_naive,
+    "gbm": gradient_boosted,
+}
+
+
+def forecast(history, horizon: int, method: str = "ets", season_length: int = SEASON_LENGTH,
+             interval: float = INTERVAL):
+    """Forecast ``horizon`` periods for every row of ``history`` (a matrix or a list of series)"""
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}'. Use one of: {', '.join(METHODS)}")
+    if horizon < 1:
+        raise ValueError("horizon must be at least 1")
+    if season_length < 1:
+        raise ValueError("season_length must be at least 1")
+    if not isinstance(history, np.ndarray):
+        history = to_matrix(history)
+    if history.ndim != 2:
+        raise ValueError("history must be a matrix of shape (skus, periods)")
+    return METHODS[method](history, horizon, season_length, interval)
@@ -0,0 +1,140 @@
+"""
+Benchmark the alert rule engine (services/alert_rules.py) on synthetic
+inventory:
+
+- sweep: rules over every batch state, generated one page at a time
+- incremental: evaluate_change for single stock changes
+- database (--db): alert_engine.sweep over a fresh SQLite database file,
+  keyset pages of 5000 batches with a commit after each page; run twice,
+  the second sweep folds its alerts into the open ones (alert dedup)
+
+Usage (from the project root):
+    python scripts/bench_alert_engine.py [batches] [--db]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+PAGE_SIZE = 5000
+MEDICINES_PER_BATCH = 0.05  # 1M batches -> 50k medicines
+
+
+def batch_row(rng, batch_id: int, medicines: int, today: date):
+    return {
+        "id": batch_id,
+        "medicine_id": 1 + batch_id % medicines,
+        "quantity": rng.randint(0, 300),
+        "reorder_level": 20,
+        "batch_number": f"B-{batch_id}",
+        "expiry_date": today + timedelta(days=rng.randint(-30, 720)),
+        "supplier_id": 1 + batch_id % 10,
+    }
+
+
+def synthetic_pages(batches: int, medicines: int, seed: int = 42):
+    """Alert-rule states, PAGE_SIZE at a time"""
+    rng = random.Random(seed)
+    today = date.today()
+    for start in range(1, batches + 1, PAGE_SIZE):
+        page = []
+        for batch_id in range(start, min(start + PAGE_SIZE, batches + 1)):
+            state = batch_row(rng, batch_id, medicines, today)
+            del state["supplier_id"]
+            state.update(
+                medicine_name=f"Medicine {state['medicine_id']}",
+                on_hand=state["quantity"] * 20,
+                demand_rate=rng.lognormvariate(1.0, 1.0),
+                lead_time_days=7,
+            )
+            page.append(state)
+        yield page
+
+
+def bench_rules(batches: int, medicines: int):
+    from services.alert_rules import evaluate_change, sweep
+
+    started = time.perf_counter()
+    evaluated = alerts = 0
+    for states, raised in sweep(synthetic_pages(batches, medicines)):
+        evaluated += len(states)
+        alerts += len(raised)
+    seconds = time.perf_counter() - started
+    print(f"  rules sweep    {seconds:7.2f}s  {evaluated / seconds:>10,.0f} batches/s  {alerts:,} alerts "
+          "(includes generating the states)")
+
+    states = next(synthetic_pages(PAGE_SIZE, medicines))
+    rng = random.Random(7)
+    changes = []
+    for state in states:
+        new = dict(state)
+        new["quantity"] = max(0, state["quantity"] - rng.randint(1, 30))
+        new["on_hand"] = state["on_hand"] - (state["quantity"] - new["quantity"])
+        changes.append((state, new))
+    started = time.perf_counter()
+    for _ in range(20):
+        for old, new in changes:
+            evaluate_change(old, new)
+    per_change = (time.perf_counter() - started) / (20 * len(changes)) * 1e6
+    print(f"  incremental    {per_change:7.1f}µs per stock change (rules only)")
+
+
+def bench_db(batches: int, medicines: int):
+    from sqlalchemy import func, insert, select
+
+    from core.database import Base, SessionLocal, engine
+    from models import Alert, Inventory, Medicine, Supplier
+    from services import alert_engine, analytics_rollups
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    today = date.today()
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        db.execute(insert(Supplier), [{"name": f"Supplier {i}", "lead_time_days": 2 + i} for i in range(10)])
+        db.execute(insert(Medicine), [
+            {"name": f"Medicine {i}", "category": f"Category {i % 20}", "price": 1.0 + i % 50}
+            for i in range(1, medicines + 1)
+        ])
+        for start in range(1, batches + 1, 50_000):
+            db.execute(insert(Inventory), [
+                batch_row(rng, i, medicines, today) for i in range(start, min(start + 50_000, batches + 1))
+            ])
+        analytics_rollups.reconcile(db)
+        db.commit()
+    print(f"  database       {batches:,} batches seeded in {time.perf_counter() - started:.1f}s")
+
+    for label in ("db sweep", "db re-sweep"):
+        started = time.perf_counter()
+        evaluated = created = updated = 0
+        with SessionLocal() as db:
+            for page_batches, page_created, page_updated in alert_engine.sweep(db):
+                evaluated += page_batches
+                created += page_created
+                updated += page_updated
+                db.commit()
+            rows = db.scalar(select(func.count(Alert.id)))
+        seconds = time.perf_counter() - started
+        print(f"  {label:<14} {seconds:7.2f}s  {evaluated / seconds:>10,.0f} batches/s  "
+              f"{created:,} alerts created, {updated:,} updated, {rows:,} rows")
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    batches = int(args[0]) if args else 1_000_000
+    medicines = max(1, int(batches * MEDICINES_PER_BATCH))
+
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_alerts.db")
+    sys.path.append(BACKEND)
+    print(f"{batches:,} batches, {medicines:,} medicines")
+    bench_rules(batches, medicines)
+    if "--db" in sys.argv:
+        bench_db(batches, medicines)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Load test for the alert stream (GET /api/v1/alerts/stream, services/alert_hub.py).
+
+Starts one API worker (uvicorn; mock data unless DATA_BACKEND is set), opens
+N Server-Sent Events connections to it, then raises one new alert per round
+(a stock-sheet import with an empty batch) and measures:
+
+- connections held by the worker and its memory per idle connection
+- delivery latency: from the import request until each client has the
+  "alerts" event (p50 / p99 / max), and how many clients received it
+
+Latency includes the hub's poll interval (ALERT_STREAM_POLL_SECONDS) and
+this process reading N streams, so it is an upper bound.
+
+Usage (from the project root):
+    python scripts/bench_alert_stream.py [connections] [--rounds N] [--app module:app]
+"""
+
+import asyncio
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+PORT = 8765
+BASE_URL = f"http://127.0.0.1:{PORT}/api/v1"
+CONNECT_BATCH = 250  # Connections opened at a time
+ROUND_TIMEOUT = 10  # Seconds to wait for every client to receive an event
+
+
+def option(name: str, default):
+    if name in sys.argv:
+        return type(default)(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+def rss_mb(pid: int):
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def start_server(app: str):
+    env = {**os.environ, "DATA_BACKEND": os.getenv("DATA_BACKEND", "mock")}
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--port", str(PORT), "--log-level", "warning",
+         "--no-access-log", "--backlog", "4096"],
+        cwd=BACKEND,
+        env=env,
+    )
+
+
+async def wait_ready(http, server):
+    for _ in range(200):
+        if server.poll() is not None:
+            raise SystemExit("API worker exited")
+        try:
+            if (await http.get(f"{BASE_URL}/alerts/unread-count")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise SystemExit("API worker did not start")
+
+
+async def listen(http, state):
+    """One SSE client: counts the connection, stamps each "alerts" event with the round"""
+    async with http.stream("GET", f"{BASE_URL}/alerts/stream") as response:
+        event = None
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[7:]
+            elif line.startswith("data: "):
+                if event == "unread" and '"delta":0' in line:
+                    state["connected"] += 1
+                elif event == "alerts":
+                    state["arrivals"].setdefault(state["round"], []).append(time.perf_counter())
+
+
+def stock_sheet(round_no: int):
+    return f"name,category,price,quantity,batch_number\nParacetamol,Pain Relief,2.5,0,BENCH-{time.time_ns()}-{round_no}\n"
+
+
+async def run(connections: int, rounds: int, app: str):
+    server = start_server(app)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    state = {"connected": 0, "round": None, "arrivals": {}}
+    tasks = []
+    try:
+        async with httpx.AsyncClient(timeout=30) as control, \
+                httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(None)) as http:
+            await wait_ready(control, server)
+            base_rss = rss_mb(server.pid)
+
+            started = time.perf_counter()
+            for start in range(0, connections, CONNECT_BATCH):
+                batch = min(CONNECT_BATCH, connections - start)
+                tasks.extend(asyncio.create_task(listen(http, state)) for _ in range(batch))
+                deadline = time.perf_counter() + 30
+                while state["connected"] < start + batch and time.perf_counter() < deadline:
+                    await asyncio.sleep(0.05)
+            connected = state["connected"]
+            connect_seconds = time.perf_counter() - started
+            await asyncio.sleep(1)
+            held_rss = rss_mb(server.pid)
+            print(f"  connections    {connected:,} of {connections:,} open in {connect_seconds:.1f}s")
+            print(f"  worker memory  {base_rss:.0f} MB -> {held_rss:.0f} MB, "
+                  f"{(held_rss - base_rss) * 1024 / max(connected, 1):.1f} KB per idle connection")
+
+            latencies, delivered = [], []
+            for round_no in range(rounds):
+                state["round"] = round_no
+                sent = time.perf_counter()
+                files = {"file": ("bench.csv", stock_sheet(round_no), "text/csv")}
+                response = await control.post(f"{BASE_URL}/inventory/inventory/import", files=files)
+                response.raise_for_status()
+                deadline = sent + ROUND_TIMEOUT
+                while len(state["arrivals"].get(round_no, ())) < connected and time.perf_counter() < deadline:
+                    await asyncio.sleep(0.01)
+                arrivals = state["arrivals"].get(round_no, [])
+                delivered.append(len(arrivals))
+                latencies.extend(arrival - sent for arrival in arrivals)
+                await asyncio.sleep(0.3)
+
+            if latencies:
+                latencies.sort()
+                p50 = statistics.median(latencies) * 1000
+                p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+                print(f"  delivery       {rounds} rounds, {min(delivered):,}-{max(delivered):,} clients per event; "
+                      f"latency p50 {p50:.0f}ms  p99 {p99:.0f}ms  max {latencies[-1] * 1000:.0f}ms")
+            stats = await control.get(f"http://127.0.0.1:{PORT}/health/alert-stream")
+            if stats.status_code == 200:
+                print(f"  hub            {stats.json()}")
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        server.terminate()
+        server.wait()
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    args = [arg for arg in args if sys.argv[sys.argv.index(arg) - 1] not in ("--rounds", "--app")]
+    connections = int(args[0]) if args else 2000
+    rounds = option("--rounds", 20)
+    app = option("--app", "api.main:app")
+
+    # One file descriptor per connection on both ends
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    print(f"{connections:,} SSE connections to one worker ({app})")
+    asyncio.run(run(connections, rounds, app))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark batch demand forecasting (ml-services/models/demand-forecasting)
+on synthetic daily sales: every method forecasts all SKUs in one batch,
+scored against held-out periods.
+
+Demand per SKU: log-normal base rate, weekly profile, slow trend and
+Poisson noise; a share of SKUs is intermittent (most days zero).
+
+Usage (from the project root):
+    python scripts/bench_forecast.py [skus] [days] [horizon] [methods...]
+"""
+
+import os
+import sys
+import time
+
+ENGINE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ml-services", "models", "demand-forecasting"
+)
+WEEKLY_PROFILE = (1.0, 1.1, 1.2, 1.0, 0.95, 0.75, 0.6)
+INTERMITTENT_SHARE = 0.2
+
+
+def synthetic_demand(skus: int, periods: int, seed: int = 42):
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(periods)
+    base = rng.lognormal(1.0, 1.2, skus)
+    base[rng.random(skus) < INTERMITTENT_SHARE] *= 0.05
+    trend = 1 + rng.normal(0, 0.0015, skus)[:, None] * t
+    profile = np.array(WEEKLY_PROFILE)[(t + rng.integers(0, 7, skus)[:, None]) % 7]
+    return rng.poisson(np.maximum(base[:, None] * trend * profile, 0)).astype(float)
+
+
+def main():
+    sys.path.append(ENGINE)
+    import numpy as np
+    from forecast_engine import forecast
+
+    skus = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 365
+    horizon = int(sys.argv[3]) if len(sys.argv) > 3 else 28
+    methods = sys.argv[4:] or ["seasonal_naive", "ets", "gbm"]
+
+    start = time.perf_counter()
+    demand = synthetic_demand(skus, days + horizon)
+    history, actual = demand[:, :days], demand[:, days:]
+    print(f"{skus:,} SKUs x {days} days history, horizon {horizon} "
+          f"(generated in {time.perf_counter() - start:.1f}s)\n")
+
+    print(f"{'method':<16}{'seconds':>10}{'SKUs/s':>12}{'WAPE':>8}{'coverage':>10}")
+    for method in methods:
+        start = time.perf_counter()
+        try:
+            result = forecast(history, horizon, method)
+        except ImportError as exc:
+            print(f"{method:<16}skipped: {exc}")
+            continue
+        elapsed = time.perf_counter() - start
+        wape = np.abs(result.mean - actual).sum() / actual.sum()
+        coverage = ((actual >= result.lower) & (actual <= result.upper)).mean()
+        print(f"{method:<16}{elapsed:>10.2f}{skus / elapsed:>12,.0f}{wape:>8.3f}{coverage:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark JSON responses for 10k-row list endpoints: FastAPI's default
+response_model validation + json vs the FAST_JSON path (api/fast_json.py).
+
+Requests are sent straight to the ASGI app (no HTTP client), and CPU time
+is measured per request as process time.
+
+Usage (from the project root):
+    python scripts/bench_json.py [rows] [requests]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from datetime import date, timedelta
+from typing import List
+
+# Add backend to path so we can import modules
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from fastapi import FastAPI
+
+from api import fast_json
+from api.v1.alerts import AlertResponse
+from api.v1.inventory import InventoryResponse, MedicineResponse
+
+
+def synthetic_rows(rows: int):
+    today = date.today()
+    medicines = [
+        {
+            "id": i, "name": f"Medicine {i}", "generic_name": f"Generic {i}", "category": f"Category {i % 20}",
+            "manufacturer": "ABC Pharma", "dosage": "500mg", "salt_composition": f"Salt {i}",
+            "price": 1.5 + i % 100, "unit": "strip", "description": None,
+            "created_at": "2025-01-01T00:00:00", "updated_at": "2025-01-01T00:00:00",
+        }
+        for i in range(1, rows + 1)
+    ]
+    inventory = [
+        {
+            "id": i, "medicine_id": i, "medicine_name": f"Medicine {i}", "quantity": i % 300,
+            "reorder_level": 20, "batch_number": f"BATCH-{i:06d}",
+            "expiry_date": (today + timedelta(days=i % 365)).isoformat(), "shelf_location": "A-01",
+            "supplier_id": i % 3 + 1, "created_at": "2025-01-01T00:00:00", "updated_at": "2025-01-01T00:00:00",
+        }
+        for i in range(1, rows + 1)
+    ]
+    alerts = [
+        {
+            "id": i, "alert_type": "low_stock", "priority": "high", "title": f"Low Stock: Medicine {i}",
+            "message": "Stock level is below reorder level. Please reorder soon.", "medicine_id": i,
+            "inventory_id": i, "status": "unread", "created_at": "2025-01-01T00:00:00",
+            "acknowledged_at": None, "resolved_at": None,
+        }
+        for i in range(1, rows + 1)
+    ]
+    return {"medicines": (medicines, MedicineResponse), "inventory": (inventory, InventoryResponse),
+            "alerts": (alerts, AlertResponse)}
+
+
+def list_endpoint(records, model):
+    def endpoint():
+        return fast_json.records_response(records, model)
+    return endpoint
+
+
+def build_app(datasets):
+    app = FastAPI()
+    for name, (records, model) in datasets.items():
+        app.add_api_route(f"/{name}", list_endpoint(records, model), response_model=List[model])
+    return app
+
+
+async def get(app, path: str):
+    """Run one GET request through the ASGI app and return the body"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 80),
+    }
+    chunks = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(chunks)
+
+
+async def cpu_per_request(app, path: str, requests: int):
+    await get(app, path)  # warm up
+    start = time.process_time()
+    for _ in range(requests):
+        body = await get(app, path)
+    return (time.process_time() - start) / requests * 1000, len(body)
+
+
+async def run(datasets, requests: int):
+    app = build_app(datasets)
+    for name in datasets:
+        fast_json.FAST_JSON = False
+        default_ms, default_size = await cpu_per_request(app, f"/{name}", requests)
+        fast_json.FAST_JSON = True
+        fast_ms, fast_size = await cpu_per_request(app, f"/{name}", requests)
+        print(f"  {name:10} default {default_ms:8.1f} ms ({default_size / 1e6:.2f} MB)   "
+              f"fast {fast_ms:8.1f} ms ({fast_size / 1e6:.2f} MB)   {default_ms / fast_ms:5.1f}x")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    print(f"{rows:,} rows per response, {requests} requests each (CPU ms per request)")
+    asyncio.run(run(synthetic_rows(rows), requests))
+
+
+if __name__ == "__main__":
+    main()
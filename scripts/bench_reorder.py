@@ -0,0 +1,77 @@
+"""
+Benchmark the reorder point job (services/reorder_points.py) on a
+synthetic catalog: batches spread over medicines and suppliers, with
+eight weeks of daily sales rollups per medicine.
+
+Runs on a fresh SQLite database file. The first run writes every level;
+the second run finds nothing changed.
+
+Usage (from the project root):
+    python scripts/bench_reorder.py [batches] [medicines]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+
+
+def seed(batches: int, medicines: int):
+    from sqlalchemy import insert
+
+    from core.database import Base, SessionLocal, engine
+    from models import Inventory, Medicine, SalesRollup, Supplier
+    from services.reorder_policy import DEMAND_WINDOW_DAYS, demand_window
+
+    rng = random.Random(42)
+    Base.metadata.create_all(bind=engine)
+    start, _ = demand_window()
+    with SessionLocal() as db:
+        db.execute(insert(Supplier), [{"name": f"Supplier {i}", "lead_time_days": 2 + i} for i in range(10)])
+        db.execute(insert(Medicine), [
+            {"name": f"Medicine {i}", "category": f"Category {i % 20}", "price": 1.0 + i % 50}
+            for i in range(1, medicines + 1)
+        ])
+        db.execute(insert(Inventory), [
+            {"medicine_id": 1 + i % medicines, "quantity": rng.randint(0, 40), "supplier_id": 1 + i % 10}
+            for i in range(batches)
+        ])
+        rates = [rng.lognormvariate(1.0, 1.0) for _ in range(medicines)]
+        for day in range(DEMAND_WINDOW_DAYS):
+            bucket = start + timedelta(days=day)
+            db.execute(insert(SalesRollup), [
+                {"granularity": "day", "scope": "medicine", "key": str(m + 1), "bucket": bucket,
+                 "units": units, "revenue": units * 1.0, "transactions": units}
+                for m, rate in enumerate(rates)
+                if (units := round(rng.expovariate(1 / rate)))
+            ])
+        db.commit()
+
+
+def main():
+    batches = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    medicines = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_reorder.db"
+    sys.path.append(BACKEND)
+    from core.database import SessionLocal
+    from services.reorder_points import recompute
+
+    started = time.perf_counter()
+    seed(batches, medicines)
+    print(f"{batches:,} batches, {medicines:,} medicines seeded in {time.perf_counter() - started:.1f}s")
+
+    for run in ("first run", "second run"):
+        started = time.perf_counter()
+        with SessionLocal() as db:
+            report = recompute(db)
+            db.commit()
+        print(f"  {run:12} {time.perf_counter() - started:6.2f}s  {report}")
+
+
+if __name__ == "__main__":
+    main()
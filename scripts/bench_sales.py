@@ -0,0 +1,98 @@
+"""
+Benchmark sales trends on years of synthetic history: reading the
+hourly / daily / monthly rollups (services/sales_ledger.py) vs grouping
+the raw sales rows for the same window.
+
+Runs on a fresh SQLite database file.
+
+Usage (from the project root):
+    python scripts/bench_sales.py [years] [transactions_per_day] [medicines]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+QUERIES = [
+    ("30 days by hour", 30, "hour", {}),
+    ("365 days by day", 365, "day", {}),
+    ("365 days by day, 1 category", 365, "day", {"category": "Category 3"}),
+    ("365 days by day, 1 medicine", 365, "day", {"medicine_id": 1}),
+    ("all years by month", 3650, "month", {}),
+]
+SQLITE_FORMATS = {"hour": "%Y-%m-%dT%H:00:00", "day": "%Y-%m-%d", "month": "%Y-%m"}
+
+
+def seed_medicines(medicines: int):
+    from sqlalchemy import insert
+
+    from core.database import Base, SessionLocal, engine
+    from models import Medicine
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.execute(insert(Medicine), [
+            {"name": f"Medicine {i}", "category": f"Category {i % 20}", "price": 1.0 + i % 50}
+            for i in range(1, medicines + 1)
+        ])
+        db.commit()
+
+
+def scan_trends(db, days: int, granularity: str, category: str = None, medicine_id: int = None):
+    """The same trend computed from the raw sales rows"""
+    from sqlalchemy import func, select
+
+    from models import Sale
+    from services.sales_buckets import window
+
+    bucket = func.strftime(SQLITE_FORMATS[granularity], Sale.sold_at)
+    query = (
+        select(bucket, func.sum(Sale.quantity), func.sum(Sale.total))
+        .where(Sale.sold_at >= window(days, granularity)[0])
+        .group_by(bucket)
+    )
+    if medicine_id is not None:
+        query = query.where(Sale.medicine_id == medicine_id)
+    elif category:
+        query = query.where(Sale.category == category)
+    return db.execute(query).all()
+
+
+def timed(fn, repeat: int = 5):
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    years = float(sys.argv[1]) if len(sys.argv) > 1 else 3
+    transactions_per_day = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    medicines = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_sales.db"
+    sys.path.append(BACKEND)
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from core.database import ReadSessionLocal
+    from generate_sales import load
+    from services.sales_ledger import sales_trends
+
+    seed_medicines(medicines)
+    started = time.perf_counter()
+    total = load(years, transactions_per_day)
+    seconds = time.perf_counter() - started
+    print(f"{total:,} sales over {years:g} years, {medicines} medicines: "
+          f"loaded with rollups in {seconds:.1f}s ({total / seconds:,.0f} sales/s)")
+
+    with ReadSessionLocal() as db:
+        for name, days, granularity, filters in QUERIES:
+            rollup_ms = timed(lambda: sales_trends(db, days, granularity, **filters))
+            scan_ms = timed(lambda: scan_trends(db, days, granularity, **filters))
+            print(f"  {name:30} rollups {rollup_ms:8.2f} ms   scan {scan_ms:9.2f} ms   {scan_ms / rollup_ms:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
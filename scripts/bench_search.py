@@ -0,0 +1,61 @@
+"""
+Benchmark the medicine search index on a synthetic catalog.
+
+Usage (from the project root):
+    python scripts/bench_search.py [num_medicines]
+"""
+
+import os
+import random
+import sys
+import time
+
+# Add backend to path so we can import modules
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from services.search_index import MedicineSearchIndex
+
+CONSONANTS = "bcdfghklmnprstvxz"
+VOWELS = "aeiou"
+SYLLABLES = [c + v + e for c in CONSONANTS for v in VOWELS for e in ("", "n", "l", "r", "x")]
+QUERIES = ["p", "pa", "par", "vita", "paracet", "paracetamol", "parcetamol", "acetaminophen"]
+
+
+def random_word(rng):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = random.Random(42)
+    index = MedicineSearchIndex()
+
+    start = time.perf_counter()
+    for i in range(1, size + 1):
+        index.add({
+            "id": i,
+            "name": random_word(rng).title(),
+            "generic_name": random_word(rng),
+            "salt_composition": f"{random_word(rng)} {random_word(rng)}",
+            "manufacturer": f"{random_word(rng).title()} Pharma",
+        })
+    index.add({
+        "id": size + 1,
+        "name": "Paracetamol",
+        "generic_name": "Acetaminophen",
+        "salt_composition": "Acetaminophen",
+        "manufacturer": "ABC Pharma",
+    })
+    print(f"Indexed {size + 1:,} medicines in {time.perf_counter() - start:.2f}s")
+
+    runs = 50
+    for query in QUERIES:
+        start = time.perf_counter()
+        for _ in range(runs):
+            results = index.search(query, limit=20)
+        elapsed_ms = (time.perf_counter() - start) / runs * 1000
+        print(f"  {query!r:18} {elapsed_ms:8.3f} ms  {len(results):3d} results")
+
+
+if __name__ == "__main__":
+    main()
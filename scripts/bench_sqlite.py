@@ -0,0 +1,129 @@
+"""
+Benchmark concurrent reads and writes on SQLite, stock settings vs the
+production profile (WAL, pragmas, read/write pool split; see core/database.py).
+
+Each profile runs on a fresh database file with separate reader and writer
+processes (like gunicorn workers): readers page through inventory and look
+up batch stock while writers record stock movements.
+
+Usage (from the project root):
+    python scripts/bench_sqlite.py [seconds] [readers] [writers] [batches]
+"""
+
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+PROFILES = ["default", "production"]
+
+
+def seed(batches: int):
+    from sqlalchemy import insert
+
+    from core.database import Base, engine, SessionLocal
+    from models import Inventory, Medicine
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.execute(insert(Medicine), [
+            {"name": f"Medicine {i}", "category": f"Category {i % 20}", "price": 1.0 + i % 50}
+            for i in range(1, batches + 1)
+        ])
+        db.execute(insert(Inventory), [
+            {"medicine_id": i, "quantity": 100, "reorder_level": 20, "batch_number": f"B-{i}"}
+            for i in range(1, batches + 1)
+        ])
+        db.commit()
+
+
+def _worker(kind: str, seconds: float, batches: int, results):
+    """One reader or writer process (like one gunicorn worker)"""
+    sys.path.append(BACKEND)
+    from services import real_data
+
+    rng = random.Random()
+    done, errors, latencies = 0, 0, []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            if kind == "reads":
+                real_data.get_inventory_page(50, rng.randint(0, batches - 50))
+                real_data.get_stock_level(rng.randint(1, batches))
+            else:
+                real_data.record_stock_movement(rng.randint(1, batches), "receipt", 1)
+        except Exception:
+            errors += 1
+            continue
+        done += 1
+        latencies.append(time.perf_counter() - started)
+    results.put((kind, done, errors, latencies))
+
+
+def run_profile(seconds: float, readers: int, writers: int, batches: int):
+    """Runs inside the child process; prints one result line"""
+    sys.path.append(BACKEND)
+    seed(batches)
+
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=_worker, args=(kind, seconds, batches, results))
+        for kind, number in (("reads", readers), ("writes", writers))
+        for _ in range(number)
+    ]
+    for process in processes:
+        process.start()
+
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    latencies = {"reads": [], "writes": []}
+    for _ in processes:
+        kind, done, errors, worker_latencies = results.get()
+        counts[kind] += done
+        counts["errors"] += errors
+        latencies[kind] += worker_latencies
+    for process in processes:
+        process.join()
+
+    def p95(values):
+        return sorted(values)[int(len(values) * 0.95)] * 1000 if values else 0.0
+
+    print(
+        f"{os.environ['SQLITE_PROFILE']:>10}  "
+        f"reads/s {counts['reads'] / seconds:8.1f} (p95 {p95(latencies['reads']):7.1f} ms)  "
+        f"writes/s {counts['writes'] / seconds:8.1f} (p95 {p95(latencies['writes']):7.1f} ms)  "
+        f"errors {counts['errors']}"
+    )
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if arg != "--child"]
+    seconds = float(args[0]) if len(args) > 0 else 10
+    readers = int(args[1]) if len(args) > 1 else 8
+    writers = int(args[2]) if len(args) > 2 else 2
+    batches = int(args[3]) if len(args) > 3 else 20_000
+
+    if "--child" in sys.argv:
+        run_profile(seconds, readers, writers, batches)
+        return
+
+    print(f"{seconds:g}s, {readers} readers, {writers} writers, {batches:,} batches")
+    for profile in PROFILES:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {
+                **os.environ,
+                "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+                "SQLITE_PROFILE": profile,
+            }
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), *map(str, (seconds, readers, writers, batches)), "--child"],
+                env=env, cwd=BACKEND, check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Fill the configured database (DATABASE_URL) with synthetic sales history
+for the medicines already in it, e.g. to try the sales trends against
+years of data. Sales and their rollups are written in chunks of one
+transaction each; stock levels are not changed.
+
+Usage (from the project root):
+    python scripts/generate_sales.py [years] [transactions_per_day] [seed]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+# Add backend to path so we can import modules
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from sqlalchemy import select
+
+from core.database import Base, SessionLocal, engine
+from models import Medicine
+from services.sales_generator import generate_sales
+from services.sales_ledger import append_sales
+
+CHUNK_SIZE = 50_000
+
+
+def load(years: float, transactions_per_day: int, seed: int = 42):
+    """Generate and store ``years`` of sales ending yesterday; returns the number of sales"""
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        medicines = [
+            {"id": med_id, "category": category, "price": price or 0.0}
+            for med_id, category, price in db.execute(select(Medicine.id, Medicine.category, Medicine.price))
+        ]
+    if not medicines:
+        raise SystemExit("No medicines in the database - add or import some first")
+
+    end = datetime.now(timezone.utc).date()
+    start = end - timedelta(days=round(365.25 * years))
+    sales = generate_sales(medicines, start, end, transactions_per_day, seed)
+    total = 0
+    while chunk := list(islice(sales, CHUNK_SIZE)):
+        with SessionLocal() as db:
+            total += append_sales(db, chunk)
+            db.commit()
+    return total
+
+
+def main():
+    years = float(sys.argv[1]) if len(sys.argv) > 1 else 3
+    transactions_per_day = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 42
+    started = time.perf_counter()
+    total = load(years, transactions_per_day, seed)
+    print(f"✅ {total:,} sales over {years:g} years written in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
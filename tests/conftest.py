@@ -0,0 +1,96 @@
+"""
+Shared fixtures.
+
+The backend is imported the way the API runs it (``from services import ...``
+from inside backend/). Database tests get a fresh in-memory SQLite database
+with every table; ``real_data`` points the database backend's sessions at it.
+``load_database`` imports a private copy of core/database.py, whose engines
+are configured from the environment at import time.
+"""
+
+import os
+import sys
+
+import pytest
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+sys.path.insert(0, BACKEND)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("DATA_BACKEND", "mock")
+
+
+@pytest.fixture
+def engine():
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import StaticPool
+
+    import models  # noqa: F401  (registers the tables)
+    from core.database import Base
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    from sqlalchemy.orm import sessionmaker
+
+    return sessionmaker(bind=engine, autoflush=False)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def real_data(session_factory, monkeypatch):
+    """services.real_data with its write and read sessions on the test database"""
+    from services import real_data
+
+    monkeypatch.setattr(real_data, "SessionLocal", session_factory)
+    monkeypatch.setattr(real_data, "ReadSessionLocal", session_factory)
+    return real_data
+
+
+@pytest.fixture
+def mock():
+    """A fresh MockDataService with its generated sample data"""
+    from services.mock_data import MockDataService
+
+    return MockDataService()
+
+
+@pytest.fixture
+def load_database(monkeypatch, tmp_path):
+    """
+    Import a private copy of core/database.py with the given environment,
+    on a SQLite file in tmp_path unless ``url`` is given.
+    """
+    import asyncio
+    import importlib.util
+
+    from core import database
+
+    loaded = []
+
+    def load(url: str = None, **env):
+        monkeypatch.setenv("DATABASE_URL", url or f"sqlite:///{tmp_path / 'pharmacy.db'}")
+        for name, value in env.items():
+            monkeypatch.setenv(name, str(value))
+        spec = importlib.util.spec_from_file_location(f"database_under_test_{len(loaded)}", database.__file__)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        loaded.append(module)
+        return module
+
+    yield load
+    for module in loaded:
+        if module._async_engine is not None:
+            asyncio.run(module._async_engine.dispose())
+        module.read_engine.dispose()
+        module.engine.dispose()
@@ -0,0 +1,33 @@
+"""Alert listing with ?history=true over the hot and archived alerts (mock backend)."""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.v1 import alerts
+from services import data_source
+
+
+def test_history_pages_the_union_of_both_tables():
+    app = FastAPI()
+    app.include_router(alerts.router, prefix="/api/v1/alerts")
+    client = TestClient(app)
+
+    for medicine_id in range(1, 7):
+        data_source.add_inventory_item({"medicine_id": medicine_id, "quantity": 1, "reorder_level": 10})
+    for alert in data_source.get_all_alerts()[-6::2]:
+        data_source.resolve_alert(alert["id"])
+    assert client.post("/api/v1/alerts/archive", params={"older_than_days": 0}).json()["archived"] > 0
+
+    hot = [alert["id"] for alert in client.get("/api/v1/alerts/").json()]
+    archived = [alert["id"] for alert in data_source.get_archived_alerts_page(500)[0]]
+    assert hot and archived and not set(hot) & set(archived)
+
+    listed, after = [], None
+    while True:
+        params = {"history": "true", "limit": 7, **({"after": after} if after else {})}
+        response = client.get("/api/v1/alerts/", params=params)
+        listed += [alert["id"] for alert in response.json()]
+        after = response.headers.get("X-Next-Cursor")
+        if after is None:
+            break
+    assert listed == sorted(hot + archived)
@@ -0,0 +1,51 @@
+"""ETag / If-None-Match on the polled inventory endpoints (mock backend)."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.v1 import inventory
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = FastAPI()
+    app.include_router(inventory.router, prefix="/api/v1/inventory")
+    return TestClient(app)
+
+
+def test_unchanged_collections_answer_304(client):
+    first = client.get("/api/v1/inventory/categories")
+    tag = first.headers["ETag"]
+    assert first.status_code == 200 and first.headers["Cache-Control"] == "no-cache"
+
+    again = client.get("/api/v1/inventory/categories", headers={"If-None-Match": tag})
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["ETag"] == tag
+    for header in (f"W/{tag}", f'"other", {tag}', "*"):
+        assert client.get("/api/v1/inventory/categories", headers={"If-None-Match": header}).status_code == 304
+
+
+def test_a_write_changes_the_etag(client):
+    tag = client.get("/api/v1/inventory/stats").headers["ETag"]
+    medicines_tag = client.get("/api/v1/inventory/medicines").headers["ETag"]
+    created = client.post("/api/v1/inventory/medicines", json={
+        "name": "Etagamol", "category": "Painkiller", "price": 1.5,
+    })
+    assert created.status_code == 201
+
+    for path, old in (("/api/v1/inventory/stats", tag), ("/api/v1/inventory/medicines", medicines_tag)):
+        response = client.get(path, headers={"If-None-Match": old})
+        assert response.status_code == 200 and response.headers["ETag"] != old
+    stats = client.get("/api/v1/inventory/stats").json()
+    assert stats == client.get("/api/v1/inventory/stats").json()
+
+
+def test_the_tag_only_covers_the_collections_read(client):
+    tag = client.get("/api/v1/inventory/categories").headers["ETag"]
+    batch = client.get("/api/v1/inventory/inventory", params={"limit": 1}).json()[0]
+    moved = client.post(f"/api/v1/inventory/inventory/{batch['id']}/movements", json={
+        "movement_type": "receipt", "quantity": 1,
+    })
+    assert moved.status_code == 201
+    assert client.get("/api/v1/inventory/categories", headers={"If-None-Match": tag}).status_code == 304
@@ -0,0 +1,108 @@
+"""FAST_JSON responses are byte-for-byte the documents of the validated (stdlib JSON) path."""
+
+from datetime import date, datetime, timezone
+from typing import Optional
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from api import fast_json
+from api.v1.alerts import AlertResponse
+from api.v1.analytics import SalesTrend
+from api.v1.inventory import InventoryResponse, MedicineResponse
+
+
+class Reading(BaseModel):
+    """Float, optional and unicode fields"""
+    name: str
+    value: float
+    note: Optional[str]
+
+
+MEDICINES = [
+    {"id": 1, "name": "Paracetamol", "generic_name": None, "category": "Painkiller", "manufacturer": "Acme",
+     "dosage": "500mg", "price": 2, "unit": "tablet", "description": "Not in the response model"},
+    {"id": 2, "name": "Ibuprofène", "generic_name": "Ibuprofen", "category": "Painkiller", "manufacturer": None,
+     "dosage": None, "price": 0.1 + 0.2, "unit": "tablet"},
+]
+INVENTORY = [
+    {"id": 7, "medicine_id": 1, "medicine_name": "Paracetamol", "quantity": 0, "reorder_level": 10,
+     "batch_number": None, "expiry_date": "2030-01-31", "shelf_location": None, "supplier_id": 3},
+]
+ALERTS = [
+    {"id": 3, "alert_type": "low_stock", "priority": "high", "title": "Low Stock: Paracetamol", "message": "…",
+     "medicine_id": 1, "inventory_id": None, "status": "unread", "condition": None, "occurrences": 2,
+     "last_triggered_at": "2025-06-10T15:30:00.123456+00:00", "created_at": "2025-06-10T15:30:00",
+     "acknowledged_at": None, "resolved_at": None},
+]
+TRENDS = [
+    {"date": "2025-06-10", "sales": 3, "revenue": 7.5},
+    {"date": "2025-06-11", "sales": 0, "revenue": 0},
+    {"date": "2025-06-12", "sales": 1, "revenue": 1e16},
+]
+READINGS = [
+    {"name": "small", "value": 1e-7, "note": None},
+    {"name": "large", "value": 123456789.123456789, "note": "µg / ✓"},
+    {"name": "negative", "value": -0.0, "note": ""},
+]
+PAYLOAD = {
+    "generated_at": datetime(2025, 6, 10, 15, 30, 0, 123456, tzinfo=timezone.utc),
+    "naive_at": datetime(2025, 6, 10, 15, 30),
+    "day": date(2025, 6, 10),
+    "total_value": 1234.5,
+    "ratio": 1 / 3,
+    "missing": None,
+    "nested": [{"count": 2, "share": 0.25, "label": "Ünïcode"}],
+}
+
+
+def app():
+    app = FastAPI()
+
+    for path, records, model in (
+        ("/medicines", MEDICINES, MedicineResponse),
+        ("/inventory", INVENTORY, InventoryResponse),
+        ("/alerts", ALERTS, AlertResponse),
+        ("/trends", TRENDS, SalesTrend),
+        ("/readings", READINGS, Reading),
+    ):
+        def endpoint(response: Response, records=records, model=model):
+            response.headers["X-Next-Cursor"] = "42"
+            return fast_json.records_response(records, model, response)
+
+        app.get(path, response_model=list[model])(endpoint)
+
+    @app.get("/payload")
+    def payload():
+        return fast_json.payload_response(PAYLOAD)
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["/medicines", "/inventory", "/alerts", "/trends", "/readings", "/payload"])
+def test_fast_path_returns_the_same_bytes(path, monkeypatch):
+    monkeypatch.setattr(fast_json, "FAST_JSON", False)
+    slow = app().get(path)
+    monkeypatch.setattr(fast_json, "FAST_JSON", True)
+    fast = app().get(path)
+
+    assert slow.status_code == fast.status_code == 200
+    assert fast.content == slow.content
+    assert fast.headers["content-type"] == slow.headers["content-type"] == "application/json"
+    if path != "/payload":
+        assert fast.headers["x-next-cursor"] == slow.headers["x-next-cursor"] == "42"
+
+
+def test_only_floats_orjson_writes_differently_take_the_validated_path(monkeypatch):
+    monkeypatch.setattr(fast_json, "FAST_JSON", True)
+    for records, model in ((MEDICINES, MedicineResponse), (ALERTS, AlertResponse), (TRENDS[:2], SalesTrend)):
+        assert isinstance(fast_json.records_response(records, model), ORJSONResponse)
+    assert fast_json.records_response(TRENDS, SalesTrend) is TRENDS  # 1e16
+    assert fast_json.records_response(READINGS, Reading) is READINGS  # 1e-7
+    assert isinstance(fast_json.payload_response(PAYLOAD), ORJSONResponse)
+    nan = {"value": float("nan")}
+    assert fast_json.payload_response(nan) is nan
+    assert fast_json.project(MEDICINES[:1], MedicineResponse)[0]["price"] == 2.0
@@ -0,0 +1,77 @@
+"""Archiving resolved alerts past the retention age."""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+from models import Alert
+from services import alert_archive, mock_data
+
+
+def ids(records):
+    return [record["id"] for record in records]
+
+
+def test_db_archive_moves_old_resolved_alerts(real_data, db):
+    medicine = real_data.add_medicine({"name": "Paracetamol", "category": "Painkiller", "price": 2.0})
+    for quantity in range(5):
+        real_data.add_inventory_item({"medicine_id": medicine["id"], "quantity": quantity, "reorder_level": 10})
+    alert_ids = ids(real_data.get_all_alerts())
+    for alert_id in alert_ids[:3]:
+        real_data.resolve_alert(alert_id)
+    # Two resolved alerts and one open one past the retention age
+    old = datetime.now(timezone.utc) - timedelta(days=alert_archive.RETENTION_DAYS + 1)
+    db.execute(update(Alert).where(Alert.id.in_([alert_ids[0], alert_ids[1], alert_ids[3]])).values(created_at=old))
+    db.commit()
+
+    report = real_data.archive_alerts()
+    assert report["archived"] == 2 and report["batches"] == 1
+    assert ids(real_data.get_all_alerts()) == alert_ids[2:]
+    archived, next_cursor = real_data.get_archived_alerts_page(10)
+    assert ids(archived) == alert_ids[:2] and next_cursor is None
+    assert all(alert["status"] == "resolved" and alert["archived_at"] for alert in archived)
+
+    # The counters count the hot table only
+    assert real_data.get_alert_counts()["status"] == {"resolved": 1, "unread": 2}
+    assert real_data.reconcile_alert_counters()["drift"] == []
+    assert real_data.archive_alerts()["archived"] == 0
+
+
+def test_db_archive_works_in_batches(real_data, db):
+    medicine = real_data.add_medicine({"name": "Paracetamol", "category": "Painkiller", "price": 2.0})
+    for quantity in range(5):
+        real_data.add_inventory_item({"medicine_id": medicine["id"], "quantity": quantity, "reorder_level": 10})
+    for alert_id in ids(real_data.get_all_alerts()):
+        real_data.resolve_alert(alert_id)
+
+    moved = list(alert_archive.archive(db, retention_days=0, batch_size=2, now=datetime.now(timezone.utc)))
+    assert moved == [2, 2, 1]
+    db.commit()
+    assert real_data.get_all_alerts() == [] and real_data.get_alert_counts()["status"] == {}
+
+
+def test_mock_archive_matches(mock):
+    for medicine_id in (1, 2, 3):
+        mock.add_inventory_item({"medicine_id": medicine_id, "quantity": 1, "reorder_level": 10})
+    resolved = ids(mock.get_all_alerts())[-3:-1]
+    for alert_id in resolved:
+        mock.resolve_alert(alert_id)
+    counts = mock.get_alert_counts()["status"]
+
+    assert mock.archive_alerts(retention_days=0)["archived"] == counts["resolved"]
+    assert "resolved" not in mock.get_alert_counts()["status"]
+    assert set(resolved) <= set(ids(mock.get_archived_alerts_page(500)[0]))
+    assert not set(resolved) & set(ids(mock.get_all_alerts()))
+    assert mock.reconcile_alert_counters()["drift"] == []
+
+
+def test_mock_archive_reports_database_batches(mock, monkeypatch):
+    assert mock_data.ALERT_ARCHIVE_BATCH_SIZE == alert_archive.BATCH_SIZE
+    monkeypatch.setattr(mock_data, "ALERT_ARCHIVE_BATCH_SIZE", 2)
+    for quantity in range(5):
+        mock.add_inventory_item({"medicine_id": 1, "quantity": quantity, "reorder_level": 10})
+    for alert_id in ids(mock.get_all_alerts()):
+        mock.resolve_alert(alert_id)
+    report = mock.archive_alerts(retention_days=0)
+    assert report["batches"] == -(-report["archived"] // 2) and report["archived"] > 2
+    assert mock.archive_alerts(retention_days=0)["batches"] == 0
@@ -0,0 +1,84 @@
+"""Alert counters kept by delta, checked with reconcile (database and mock backends)."""
+
+import random
+
+from sqlalchemy import update
+
+from models import AlertCounter
+from services import alert_counters
+
+
+def counted(alerts):
+    """Alerts per status, priority and type, counted from the alerts themselves"""
+    result = {dimension: {} for dimension in alert_counters.DIMENSIONS}
+    for alert in alerts:
+        for dimension in alert_counters.DIMENSIONS:
+            result[dimension][alert[dimension]] = result[dimension].get(alert[dimension], 0) + 1
+    return result
+
+
+def raise_alerts(backend, medicine_id, batches):
+    for quantity in range(batches):
+        backend.add_inventory_item({"medicine_id": medicine_id, "quantity": quantity % 5, "reorder_level": 10})
+
+
+def change_statuses(backend, rng, steps):
+    for _ in range(steps):
+        alert_id = rng.choice([alert["id"] for alert in backend.get_all_alerts()])
+        rng.choice([backend.acknowledge_alert, backend.resolve_alert, backend.dismiss_alert])(alert_id)
+
+
+def test_db_counters_follow_alert_writes(real_data):
+    medicine = real_data.add_medicine({"name": "Paracetamol", "category": "Painkiller", "price": 2.0})
+    raise_alerts(real_data, medicine["id"], 12)
+    change_statuses(real_data, random.Random(0), 10)
+    real_data.sweep_alerts()
+
+    alerts = real_data.get_all_alerts()
+    assert real_data.get_alert_counts() == counted(alerts)
+    assert real_data.get_unread_alerts_count() == sum(alert["status"] == "unread" for alert in alerts)
+    assert real_data.reconcile_alert_counters()["drift"] == []
+
+
+def test_db_reconcile_reports_and_fixes_drift(real_data, db):
+    medicine = real_data.add_medicine({"name": "Paracetamol", "category": "Painkiller", "price": 2.0})
+    raise_alerts(real_data, medicine["id"], 2)
+    db.execute(update(AlertCounter).where(AlertCounter.value == "unread").values(count=7))
+    db.commit()
+
+    report = real_data.reconcile_alert_counters()
+    assert report["drift"] == [{"dimension": "status", "value": "unread", "counter": 7, "actual": 2}]
+    assert real_data.get_unread_alerts_count() == 2
+    assert real_data.reconcile_alert_counters()["drift"] == []
+
+
+def test_mock_counters_follow_alert_writes(mock):
+    raise_alerts(mock, 1, 12)
+    change_statuses(mock, random.Random(0), 30)
+
+    alerts = mock.get_all_alerts()
+    assert mock.get_alert_counts() == counted(alerts)
+    assert mock.get_unread_count() == sum(alert["status"] == "unread" for alert in alerts)
+    assert mock.reconcile_alert_counters()["drift"] == []
+
+
+def test_db_counter_comes_back_after_reaching_zero(real_data, db):
+    medicine = real_data.add_medicine({"name": "Paracetamol", "category": "Painkiller", "price": 2.0})
+    raise_alerts(real_data, medicine["id"], 1)
+    [alert] = real_data.get_all_alerts()
+    real_data.dismiss_alert(alert["id"])
+    assert real_data.get_alert_counts()["status"] == {}
+    assert db.query(AlertCounter).count() == 0  # Zero counters are dropped
+
+    raise_alerts(real_data, medicine["id"], 1)
+    assert real_data.get_alert_counts()["status"] == {"unread": 1}
+    assert real_data.reconcile_alert_counters()["drift"] == []
+
+
+def test_db_apply_adds_to_counters_it_did_not_read(db):
+    # Two writers that both saw no counter row: the second one adds to the first one's row
+    for _ in range(2):
+        alert_counters.apply(db, {("status", "unread"): 1, ("priority", "high"): 2})
+    alert_counters.apply(db, {("priority", "high"): -4})
+    assert alert_counters.counts(db)["status"] == {"unread": 2}
+    assert alert_counters.counts(db)["priority"] == {}
@@ -0,0 +1,99 @@
+"""Alert dedup and digests, and the one-open-alert-per-key guarantee of the database."""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from models import Alert
+from services import alert_counters, alert_dedup, alert_engine
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def trigger(inventory_id, priority="medium", condition="below_reorder"):
+    return {
+        "alert_type": "low_stock",
+        "priority": priority,
+        "title": f"Low stock {inventory_id}",
+        "message": "Below the reorder level",
+        "medicine_id": None,
+        "inventory_id": inventory_id,
+        "status": "unread",
+        "condition": condition,
+    }
+
+
+def open_alert(alert_id, alert, **fields):
+    return {"id": alert_id, "alert_type": alert["alert_type"], "priority": "medium", "status": "unread",
+            "occurrences": 1, **fields}
+
+
+def test_repeats_update_the_open_alert():
+    first = trigger(1)
+    inserts, updates = alert_dedup.plan([first, trigger(1, "high")], {}, NOW)
+    assert len(inserts) == 1 and updates == []
+    assert inserts[0]["priority"] == "high" and inserts[0]["dedup_key"] == "low_stock:-:1:below_reorder"
+
+    opened = {inserts[0]["dedup_key"]: open_alert(7, first, status="acknowledged")}
+    inserts, updates = alert_dedup.plan([trigger(1, "critical")], opened, NOW)
+    assert inserts == []
+    [(alert_id, changes)] = updates
+    assert alert_id == 7 and changes["occurrences"] == 2 and changes["status"] == "unread"
+
+    _, [(_, changes)] = alert_dedup.plan([trigger(1, "low")], opened, NOW)
+    assert changes["priority"] == "low" and "status" not in changes  # Not escalated: stays acknowledged
+
+
+def test_bursts_become_one_digest():
+    burst = [trigger(n) for n in range(alert_dedup.DIGEST_THRESHOLD + 1)]
+    [digest], updates = alert_dedup.plan(burst, {}, NOW)
+    assert updates == [] and digest["occurrences"] == len(burst)
+    assert digest["dedup_key"] == alert_dedup.digest_key("low_stock", "below_reorder")
+
+    # While the digest is open, new alerts of its type and condition join it
+    opened = {digest["dedup_key"]: open_alert(3, digest, occurrences=len(burst))}
+    inserts, [(alert_id, changes)] = alert_dedup.plan([trigger(100)], opened, NOW)
+    assert inserts == [] and alert_id == 3 and changes["occurrences"] == len(burst) + 1
+
+
+def open_rows(db):
+    return db.execute(select(Alert.id, Alert.occurrences).where(Alert.status.in_(alert_dedup.OPEN_STATUSES))).all()
+
+
+def test_one_open_alert_per_dedup_key(db):
+    row = {**trigger(1), "dedup_key": "low_stock:-:1:below_reorder"}
+    db.execute(insert(Alert), [{**row, "status": "resolved"}, {**row, "status": "resolved"}, row])
+    with pytest.raises(IntegrityError):
+        with db.begin_nested():
+            db.execute(insert(Alert), [{**row, "status": "acknowledged"}])
+    assert len(open_rows(db)) == 1
+
+
+def test_a_lost_insert_race_updates_the_winners_alert(db, monkeypatch):
+    assert alert_engine.store_alerts(db, [trigger(1)], NOW) == (1, 0)
+
+    # A concurrent evaluation planned before the first one committed: it sees no open alert once
+    lookups = []
+    real_open_alerts = alert_engine._open_alerts
+
+    def stale_open_alerts(session, keys):
+        lookups.append(keys)
+        return {} if len(lookups) == 1 else real_open_alerts(session, keys)
+
+    monkeypatch.setattr(alert_engine, "_open_alerts", stale_open_alerts)
+    assert alert_engine.store_alerts(db, [trigger(1, "high")], NOW) == (0, 1)
+    assert len(lookups) == 2
+    [(_, occurrences)] = open_rows(db)
+    assert occurrences == 2
+    assert alert_counters.reconcile(db)["drift"] == []
+
+
+def test_repeated_mock_sweeps_do_not_add_alerts(mock):
+    mock.sweep_alerts()
+    count = len(mock.get_all_alerts())
+    report = mock.sweep_alerts()
+    assert report["alerts_created"] == 0 and len(mock.get_all_alerts()) == count
+    keys = [alert["dedup_key"] for alert in mock.store.alerts.all() if alert["status"] in alert_dedup.OPEN_STATUSES]
+    assert len(keys) == len(set(keys))
@@ -0,0 +1,87 @@
+"""Alert stream hub: new alerts and unread changes, failed polls."""
+
+import asyncio
+import json
+import logging
+
+from services.alert_hub import AlertHub
+
+
+class Alerts:
+    """A version-counted alert list in place of the data layer"""
+
+    def __init__(self):
+        self.alerts = []
+        self.version = 0
+        self.fail = False
+
+    def add(self, status="unread"):
+        self.alerts.append({"id": len(self.alerts) + 1, "status": status})
+        self.version += 1
+
+    def get_version(self, collections):
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        return str(self.version)
+
+    def page(self, limit, after):
+        rows = [alert for alert in self.alerts if after is None or alert["id"] > after]
+        return rows[:limit], (rows[limit - 1]["id"] if len(rows) > limit else None)
+
+    def unread(self):
+        return sum(alert["status"] == "unread" for alert in self.alerts)
+
+    def latest_id(self):
+        return self.alerts[-1]["id"] if self.alerts else None
+
+    def hub(self):
+        return AlertHub(self.get_version, self.page, self.unread, self.latest_id, poll_seconds=0.01)
+
+
+def events(subscriber):
+    messages = []
+    while not subscriber.queue.empty():
+        lines = dict(line.split(": ", 1) for line in subscriber.queue.get_nowait().strip().split("\n"))
+        messages.append((lines["event"], json.loads(lines["data"])))
+    return messages
+
+
+def test_new_alerts_and_unread_changes_are_pushed():
+    source = Alerts()
+    source.add()
+
+    async def run():
+        hub = source.hub()
+        subscriber = await hub.subscribe()
+        source.add()
+        source.add("acknowledged")
+        await asyncio.sleep(0.05)
+        hub.unsubscribe(subscriber)
+        return subscriber
+
+    assert events(asyncio.run(run())) == [
+        ("alerts", {"alerts": [{"id": 2, "status": "unread"}, {"id": 3, "status": "acknowledged"}]}),
+        ("unread", {"unread_count": 2, "delta": 1}),
+    ]
+
+
+def test_failed_polls_are_logged_and_retried(caplog):
+    source = Alerts()
+
+    async def run():
+        hub = source.hub()
+        subscriber = await hub.subscribe()
+        source.fail = True
+        await asyncio.sleep(0.03)
+        source.fail = False
+        source.add()
+        await asyncio.sleep(0.03)
+        hub.unsubscribe(subscriber)
+        return hub, subscriber
+
+    with caplog.at_level(logging.ERROR, logger="services.alert_hub"):
+        hub, subscriber = asyncio.run(run())
+    assert hub.stats()["errors"] >= 1
+    assert caplog.records and caplog.records[0].getMessage() == "Alert stream poll failed"
+    assert caplog.records[0].exc_info is not None
+    assert [event for event, _ in events(subscriber)] == ["alerts", "unread"]
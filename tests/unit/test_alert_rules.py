@@ -0,0 +1,146 @@
+"""Alert rules evaluated on batch writes and by sweeps (rules, database and mock backends)."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from services import alert_rules
+
+TODAY = date(2025, 6, 10)
+
+
+def state(quantity, reorder_level=20, expiry_days=365, **fields):
+    return {
+        "id": 1, "medicine_id": 7, "medicine_name": "Paracetamol", "batch_number": "B1",
+        "quantity": quantity, "reorder_level": reorder_level, "expiry_date": TODAY + timedelta(days=expiry_days),
+        "on_hand": quantity, "demand_rate": 0.0, "lead_time_days": 7, **fields,
+    }
+
+
+def conditions(alerts):
+    return sorted((alert["alert_type"], alert["condition"], alert.get("priority")) for alert in alerts)
+
+
+def test_change_raises_only_new_conditions():
+    assert conditions(alert_rules.evaluate_change(state(50), state(15), today=TODAY)) == [
+        ("anomaly", "drawdown", "medium"), ("low_stock", "below_reorder", "medium"),
+    ]
+    # Still below the level with the same priority: nothing new
+    assert alert_rules.evaluate_change(state(15), state(12), today=TODAY) == []
+    # Escalation raises the same condition again with the new priority
+    assert conditions(alert_rules.evaluate_change(state(12), state(5), today=TODAY)) == [
+        ("low_stock", "below_reorder", "high"),
+    ]
+    # Fields no rule reads are not evaluated
+    assert alert_rules.evaluate_change(state(5), state(5, batch_number="B2"), today=TODAY) == []
+
+
+def test_change_clears_conditions_that_stop_holding():
+    assert alert_rules.cleared_conditions(state(15), state(5), today=TODAY) == []
+    assert conditions(alert_rules.cleared_conditions(state(5), state(0), today=TODAY)) == [
+        ("low_stock", "below_reorder", None),
+    ]
+    restocked = alert_rules.cleared_conditions(state(0, expiry_days=20), state(100, expiry_days=20), today=TODAY)
+    assert conditions(restocked) == [("low_stock", "out_of_stock", None)]
+    # Emptied: the batch no longer counts as expiring
+    emptied = alert_rules.cleared_conditions(state(5, expiry_days=20), state(0, expiry_days=20), today=TODAY)
+    assert ("expiry", "expiring_30d", None) in conditions(emptied)
+    assert alert_rules.cleared_conditions(None, state(5), today=TODAY) == []
+
+
+# ==================== BACKENDS ====================
+
+# (movement, quantity) applied to a batch of 50 units with reorder level 20, and the
+# open alerts of the medicine afterwards: (alert_type, condition, priority)
+STEPS = [
+    (("dispense", 35), [("anomaly", "drawdown", "medium"), ("low_stock", "below_reorder", "medium")]),
+    (("dispense", 10), [("anomaly", "drawdown", "medium"), ("low_stock", "below_reorder", "high")]),
+    (("dispense", 5), [("anomaly", "drawdown", "medium"), ("low_stock", "out_of_stock", "critical")]),
+    (("receipt", 100), [("anomaly", "drawdown", "medium")]),
+]
+
+
+def open_alerts(backend, medicine_id):
+    return sorted(
+        (alert["alert_type"], alert["condition"], alert["priority"])
+        for alert in backend.get_all_alerts()
+        if alert["medicine_id"] == medicine_id and alert["status"] in ("unread", "acknowledged")
+    )
+
+
+def run_steps(backend):
+    """Apply STEPS to a new batch; yields the open alerts after each step"""
+    medicine = backend.add_medicine({"name": "Rulecillin", "category": "Antibiotic", "price": 2.0})
+    expiry = (date.today() + timedelta(days=365)).isoformat()
+    batch = backend.add_inventory_item({
+        "medicine_id": medicine["id"], "quantity": 50, "reorder_level": 20, "expiry_date": expiry,
+    })
+    for movement, _ in STEPS:
+        backend.record_stock_movement(batch["id"], *movement)
+        yield open_alerts(backend, medicine["id"])
+
+
+@pytest.mark.parametrize("backend", ["real_data", "mock"])
+def test_batch_writes_raise_escalate_and_resolve(backend, request):
+    backend = request.getfixturevalue(backend)
+    assert list(run_steps(backend)) == [expected for _, expected in STEPS]
+
+
+def test_db_escalation_updates_the_open_alert(real_data):
+    steps = run_steps(real_data)
+    next(steps)
+    first = {alert["condition"]: alert for alert in real_data.get_all_alerts()}["below_reorder"]
+    next(steps)
+    alerts = {alert["id"]: alert for alert in real_data.get_all_alerts()}
+    assert alerts[first["id"]]["priority"] == "high" and alerts[first["id"]]["occurrences"] == 2
+    list(steps)
+    resolved = [alert for alert in real_data.get_all_alerts() if alert["status"] == "resolved"]
+    assert sorted(alert["condition"] for alert in resolved) == ["below_reorder", "out_of_stock"]
+    assert all(alert["resolved_at"] for alert in resolved)
+    assert real_data.reconcile_alert_counters()["drift"] == []
+
+
+def test_backends_agree(real_data, mock):
+    assert list(run_steps(real_data)) == list(run_steps(mock))
+
+
+@pytest.mark.parametrize("backend", ["real_data", "mock"])
+def test_sweep_matches_incremental(backend, request):
+    backend = request.getfixturevalue(backend)
+    # A batch with stock expiring soon and one taken further below its level by incremental writes
+    medicine = backend.add_medicine({"name": "Sweepamol", "category": "Painkiller", "price": 2.0})
+    soon = (date.today() + timedelta(days=20)).isoformat()
+    for quantity, expiry in ((30, soon), (8, None)):
+        batch = backend.add_inventory_item({
+            "medicine_id": medicine["id"], "quantity": quantity, "reorder_level": 10, "expiry_date": expiry,
+        })
+        backend.record_stock_movement(batch["id"], "dispense", 5)
+    incremental = open_alerts(backend, medicine["id"])
+    assert incremental == [("expiry", "expiring_30d", "high"), ("low_stock", "below_reorder", "high")]
+
+    # The sweep finds the same conditions: it only refreshes the open alerts
+    report = backend.sweep_alerts()
+    assert report["alerts_created"] == 0 and report["alerts_updated"] >= len(incremental)
+    assert open_alerts(backend, medicine["id"]) == incremental
+
+
+def test_mock_open_alert_index_follows_status_changes(mock):
+    steps = run_steps(mock)
+    next(steps)
+    engine = mock.alert_engine
+    below = {alert["condition"]: alert for alert in mock.get_all_alerts()}["below_reorder"]
+    assert engine._open[below["dedup_key"]] == below["id"]
+
+    # Acknowledged is still open; resolving (or dismissing) takes the key out of the index
+    mock.acknowledge_alert(below["id"])
+    assert engine._open[below["dedup_key"]] == below["id"]
+    mock.resolve_alert(below["id"])
+    assert below["dedup_key"] not in engine._open
+
+    # The condition raised again opens a new alert instead of folding into the resolved one
+    next(steps)
+    reopened = engine._open[below["dedup_key"]]
+    assert reopened != below["id"] and mock.get_alert_by_id(reopened)["priority"] == "high"
+    open_ids = {alert["dedup_key"]: alert["id"] for alert in mock.get_all_alerts()
+                if alert["status"] in ("unread", "acknowledged")}
+    assert engine._open == open_ids
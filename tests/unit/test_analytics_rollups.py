@@ -0,0 +1,111 @@
+"""Analytics rollups kept by delta, checked with reconcile (database and mock backends)."""
+
+import random
+
+import pytest
+from sqlalchemy import update
+
+from models import CategoryRollup
+from services import analytics_rollups
+
+
+def random_writes(backend, rng, medicine_ids, steps):
+    """Stock, price, category and delete writes through the backend's public functions"""
+    batch_ids = []
+    for _ in range(steps):
+        op = rng.random()
+        if op < 0.3 or not batch_ids:
+            batch = {"medicine_id": rng.choice(medicine_ids), "quantity": rng.randint(0, 40)}
+            batch_ids.append(backend.add_inventory_item(batch)["id"])
+        elif op < 0.55:
+            backend.record_stock_movement(rng.choice(batch_ids), "receipt", rng.randint(1, 20))
+        elif op < 0.7:
+            backend.edit_inventory_item(rng.choice(batch_ids), {"medicine_id": rng.choice(medicine_ids)})
+        elif op < 0.8:
+            backend.remove_inventory_item(batch_ids.pop(rng.randrange(len(batch_ids))))
+        elif op < 0.9:
+            backend.edit_medicine(rng.choice(medicine_ids), {"price": round(rng.uniform(0, 20), 2)})
+        else:
+            backend.edit_medicine(rng.choice(medicine_ids), {"category": rng.choice(["A", "B", "C"])})
+
+
+def by_category(backend):
+    return {row["category"]: row for row in backend.get_inventory_value_by_category()}
+
+
+def expected_by_category(backend):
+    """The category breakdown computed from every batch"""
+    medicines = {med["id"]: med for med in backend.get_all_medicines()}
+    expected = {}
+    for inv in backend.get_all_inventory():
+        med = medicines[inv["medicine_id"]]
+        row = expected.setdefault(med["category"], {
+            "category": med["category"], "total_value": 0.0, "item_count": 0, "total_quantity": 0,
+        })
+        row["total_value"] += inv["quantity"] * (med["price"] or 0.0)
+        row["item_count"] += 1
+        row["total_quantity"] += inv["quantity"]
+    return {category: dict(row, total_value=pytest.approx(row["total_value"], abs=0.01))
+            for category, row in expected.items()}
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_db_rollups_match_the_source_tables(real_data, seed):
+    rng = random.Random(seed)
+    medicine_ids = [
+        real_data.add_medicine({"name": f"Medicine {n}", "category": rng.choice("ABC"), "price": 2.0})["id"]
+        for n in range(6)
+    ]
+    random_writes(real_data, rng, medicine_ids, 80)
+    real_data.remove_medicine(medicine_ids.pop())
+
+    assert by_category(real_data) == expected_by_category(real_data)
+    report = real_data.reconcile_analytics_rollups()
+    assert report["drift"] == [] and report["medicines_fixed"] == 0
+    assert report["medicines"] == len(medicine_ids)
+
+
+def test_db_reconcile_reports_and_fixes_drift(real_data, db):
+    med = real_data.add_medicine({"name": "Paracetamol", "category": "Painkiller", "price": 2.0})
+    real_data.add_inventory_item({"medicine_id": med["id"], "quantity": 10})
+    db.execute(update(CategoryRollup).values(total_quantity=CategoryRollup.total_quantity + 5))
+    db.commit()
+
+    report = analytics_rollups.reconcile(db)
+    assert [(d["category"], d["rollup"]["total_quantity"], d["actual"]["total_quantity"])
+            for d in report["drift"]] == [("Painkiller", 15, 10)]
+    db.commit()
+    assert analytics_rollups.reconcile(db)["drift"] == []
+
+
+def test_mock_rollups_match_the_inventory(mock):
+    rng = random.Random(0)
+    medicine_ids = [med["id"] for med in mock.get_all_medicines()]
+    random_writes(mock, rng, medicine_ids, 300)
+
+    assert by_category(mock) == expected_by_category(mock)
+    report = mock.reconcile_rollups()
+    assert report["drift"] == [] and report["medicines_fixed"] == 0
+
+    top, in_stock = mock.get_top_medicines(5)
+    values = sorted((row["total_value"] for row in expected_top(mock)), reverse=True)
+    assert [row["total_value"] for row in top] == pytest.approx(values[:5], abs=0.01)
+    assert in_stock == len(values)
+
+
+def expected_top(mock):
+    totals = {}
+    for inv in mock.get_all_inventory():
+        totals[inv["medicine_id"]] = totals.get(inv["medicine_id"], 0) + inv["quantity"]
+    return [
+        {"medicine_id": i, "total_value": quantity * (mock.get_medicine_by_id(i)["price"] or 0.0)}
+        for i, quantity in totals.items() if quantity > 0
+    ]
+
+
+def test_mock_reconcile_reports_drift(mock):
+    category = next(iter(mock.rollups.categories))
+    mock.rollups.categories[category]["total_quantity"] += 1
+    report = mock.reconcile_rollups()
+    assert [d["category"] for d in report["drift"]] == [category]
+    assert mock.reconcile_rollups()["drift"] == []
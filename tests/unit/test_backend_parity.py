@@ -0,0 +1,134 @@
+"""The database backend (real_data) and MockDataService answer the same CRUD and listing calls alike."""
+
+from datetime import date, timedelta
+
+from services.alert_dedup import alert_key
+
+STAMPS = ("created_at", "updated_at", "acknowledged_at", "resolved_at", "last_triggered_at", "archived_at")
+CATEGORY = "Paritycin"
+
+
+class Ids:
+    """Maps one backend's ids to their order of appearance, so both backends read the same"""
+
+    def __init__(self):
+        self.seen = {}
+
+    def __call__(self, kind, value):
+        if value is None:
+            return None
+        return self.seen.setdefault((kind, value), len([key for key in self.seen if key[0] == kind]) + 1)
+
+
+def normalize(value, ids):
+    """Records with positional ids and timestamps reduced to whether they are set"""
+    if isinstance(value, list):
+        return [normalize(item, ids) for item in value]
+    if isinstance(value, tuple):
+        return tuple(normalize(item, ids) for item in value)
+    if not isinstance(value, dict):
+        return value
+    kind = "alert" if "alert_type" in value else "inventory" if "quantity" in value else "medicine"
+    record = {}
+    for key, item in value.items():
+        if key in STAMPS:
+            record[key] = item is not None
+        elif key == "dedup_key":
+            record[key] = item == alert_key(value)
+        elif key == "id":
+            record[key] = ids(kind, item)
+        elif key in ("medicine_id", "inventory_id"):
+            record[key] = ids(key.split("_")[0], item)
+        else:
+            record[key] = item
+    return record
+
+
+def scenario(backend):
+    """Run the same calls against a backend -> list of (call, normalized result)"""
+    ids = Ids()
+    seen = []
+
+    def see(call, result):
+        seen.append((call, normalize(result, ids)))
+        return result
+
+    def page_ids(fetch):
+        pages, after = [], None
+        while True:
+            records, after = fetch(after)
+            pages.append([ids("medicine", record["id"]) for record in records])
+            if after is None:
+                return pages
+
+    # ==================== MEDICINES ====================
+    medicines = [
+        see("add_medicine", backend.add_medicine({
+            "name": f"Parity {name}", "category": CATEGORY, "price": price, "dosage": "10mg",
+            "manufacturer": "Parity Labs",
+        }))
+        for name, price in (("Alpha", 1.5), ("Beta", 2.0), ("Gamma", 3.25))
+    ]
+    first, second, third = (medicine["id"] for medicine in medicines)
+    see("get_medicine_by_id", backend.get_medicine_by_id(first))
+    see("edit_medicine", backend.edit_medicine(second, {"price": 2.5, "generic_name": "Betamol"}))
+    see("get_medicines_by_category", sorted(backend.get_medicines_by_category(CATEGORY), key=lambda m: m["id"]))
+    see("get_medicines_by_ids", backend.get_medicines_by_ids([third, first, 10 ** 9]))
+    see("get_medicines_page", page_ids(lambda after: backend.get_medicines_page(2, after, category=CATEGORY)))
+    see("search_medicines", [m["name"] for m in backend.search_medicines("Parity Gamma")][:1])
+    see("get_categories", CATEGORY in backend.get_categories())
+
+    # ==================== INVENTORY ====================
+    expiry = (date.today() + timedelta(days=200)).isoformat()
+    batches = [
+        see("add_inventory_item", backend.add_inventory_item({
+            "medicine_id": medicine_id, "quantity": quantity, "reorder_level": 10, "batch_number": f"PB-{quantity}",
+            "expiry_date": expiry, "shelf_location": "P1",
+        }))
+        for medicine_id, quantity in ((first, 50), (first, 20), (second, 5), (third, 0))
+    ]
+    see("get_inventory_item_by_id", backend.get_inventory_item_by_id(batches[0]["id"]))
+    see("edit_inventory_item", backend.edit_inventory_item(batches[1]["id"], {"quantity": 8, "shelf_location": "P2"}))
+    see("get_inventory_by_medicine_id", sorted(backend.get_inventory_by_medicine_id(first), key=lambda i: i["id"]))
+    see("get_inventory_by_ids", backend.get_inventory_by_ids([batches[3]["id"], batches[0]["id"], 10 ** 9]))
+    see("remove_inventory_item", backend.remove_inventory_item(batches[0]["id"]))
+    see("get_inventory_item_by_id removed", backend.get_inventory_item_by_id(batches[0]["id"]))
+    ours = {batch["id"] for batch in batches}
+    see("get_low_stock_items", sorted(
+        ids("inventory", item["id"]) for item in backend.get_low_stock_items() if item["id"] in ours
+    ))
+
+    # ==================== ALERTS ====================
+    medicine_ids = {first, second, third}
+
+    def our_alerts():
+        alerts = [a for a in backend.get_all_alerts() if a["medicine_id"] in medicine_ids]
+        return sorted(alerts, key=lambda a: (a["inventory_id"], a["alert_type"], a["condition"]))
+
+    alerts = see("get_all_alerts", our_alerts())
+    alert_ids = [alert["id"] for alert in alerts]
+    see("get_alert_by_id", backend.get_alert_by_id(alert_ids[0]))
+    see("get_alerts_by_ids", backend.get_alerts_by_ids([alert_ids[-1], 10 ** 9]))
+    see("acknowledge_alert", backend.acknowledge_alert(alert_ids[0]))
+    see("resolve_alert", backend.resolve_alert(alert_ids[1]))
+    see("resolve_alert again", backend.resolve_alert(alert_ids[1]))
+    see("dismiss_alert", backend.dismiss_alert(alert_ids[-1]))
+    see("get_alert_by_id dismissed", backend.get_alert_by_id(alert_ids[-1]))
+    see("get_alerts_by_status", sorted(
+        ids("alert", a["id"]) for a in backend.get_alerts_by_status("acknowledged") if a["medicine_id"] in medicine_ids
+    ))
+    see("get_all_alerts after", our_alerts())
+
+    # ==================== REMOVAL ====================
+    see("remove_medicine", backend.remove_medicine(third))
+    see("get_medicine_by_id removed", backend.get_medicine_by_id(third))
+    see("get_inventory_by_medicine_id removed", backend.get_inventory_by_medicine_id(third))
+    see("get_medicines_by_category after", [m["name"] for m in backend.get_medicines_by_category(CATEGORY)])
+    return seen
+
+
+def test_backends_answer_alike(real_data, mock):
+    database, memory = scenario(real_data), scenario(mock)
+    assert [call for call, _ in database] == [call for call, _ in memory]
+    for (call, expected), (_, actual) in zip(database, memory):
+        assert actual == expected, call
@@ -0,0 +1,39 @@
+"""Fetching many records by id in one call."""
+
+
+def ids(records):
+    return [record["id"] for record in records]
+
+
+def test_mock_batches_keep_request_order(mock):
+    medicines, missing = mock.get_medicines_by_ids([3, 999, 1, 3])
+    assert ids(medicines) == [3, 1] and missing == [999]
+    batches, missing = mock.get_inventory_by_ids([2, 1, 0])
+    assert ids(batches) == [2, 1] and missing == [0]
+
+
+def test_mock_alert_batches_include_archived_alerts(mock):
+    for medicine_id in (1, 2):
+        mock.add_inventory_item({"medicine_id": medicine_id, "quantity": 1, "reorder_level": 10})
+    open_ids = ids(mock.get_all_alerts())[-2:]
+    archived_id = open_ids[0]
+    mock.resolve_alert(archived_id)
+    assert mock.archive_alerts(retention_days=0)["archived"] == 1
+
+    alerts, missing = mock.get_alerts_by_ids([open_ids[1], 999_999, archived_id])
+    assert ids(alerts) == [open_ids[1], archived_id] and missing == [999_999]
+    assert alerts[1] == mock.get_alert_by_id(archived_id)
+
+
+def test_db_alert_batches_include_archived_alerts(real_data):
+    medicine = real_data.add_medicine({"name": "Paracetamol", "category": "Painkiller", "price": 2.0})
+    for quantity in (1, 2, 3):
+        real_data.add_inventory_item({"medicine_id": medicine["id"], "quantity": quantity, "reorder_level": 10})
+    first, second, third = ids(real_data.get_all_alerts())
+    real_data.resolve_alert(second)
+    assert real_data.archive_alerts(retention_days=0)["archived"] == 1
+
+    alerts, missing = real_data.get_alerts_by_ids([third, second, 404, first, second])
+    assert ids(alerts) == [third, second, first] and missing == [404]
+    assert alerts[1] == real_data.get_alert_by_id(second)
+    assert alerts[1]["archived_at"] is not None
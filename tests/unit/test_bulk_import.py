@@ -0,0 +1,127 @@
+"""Chunked CSV / Excel stock import: validation, error report, chunk boundaries and upserts."""
+
+import csv
+
+import pandas as pd
+import pytest
+
+from services import bulk_import
+
+HEADER = ["Name", "Category", "Price", "Quantity", "Dosage", "Batch Number", "Expiry Date", "Reorder Level"]
+ROWS = [
+    ["Importamol", "Painkiller", "2.5", "100", "500mg", "P-1", "2030-01-31", "20"],
+    ["", "Painkiller", "-1", "1.5", "", "", "31/01/2030", "x"],  # Row 3: every check fails but reorder_level
+    ["Importicillin", "Antibiotic", "4", "30", "250mg", "", "", ""],
+    ["Importicillin", "", "4", "abc", "250mg", "", "", ""],  # Row 5: first row of the second chunk of 3
+    ["Importamol", "Painkiller", "2.75", "80", "500mg", "P-1", "2030-01-31", "25"],  # Same batch as row 2
+    ["Importamol", "Painkiller", "2.75", "40", "500mg", "P-2", "2031-06-30", ""],
+]
+CHUNK_SIZE = 3
+
+
+def write_csv(path, rows=ROWS):
+    with open(path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+    return str(path)
+
+
+def write_xlsx(path, rows=ROWS):
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(HEADER)
+    for row in rows:
+        sheet.append([value or None for value in row])
+    workbook.save(path)
+    return str(path)
+
+
+def errors_by_row(report):
+    return {error["row"]: error["errors"] for error in report["errors"]}
+
+
+def test_validation_reports_every_failed_check_with_file_rows():
+    frame = pd.DataFrame([ROWS[1], ROWS[3]], columns=bulk_import._normalize_columns(HEADER), dtype=str)
+    records, errors = bulk_import.validate_chunk(frame, first_row=10)
+    assert records == []
+    assert errors == [
+        {"row": 10, "errors": [
+            "name is required",
+            "price must be a non-negative number",
+            "quantity must be a non-negative integer",
+            "reorder_level must be a non-negative integer",
+            "expiry_date must be a date (YYYY-MM-DD)",
+        ]},
+        {"row": 11, "errors": ["category is required", "quantity must be a non-negative integer"]},
+    ]
+
+
+def test_validation_cleans_valid_rows():
+    frame = pd.DataFrame(ROWS[:1], columns=bulk_import._normalize_columns(HEADER), dtype=str)
+    (record,), errors = bulk_import.validate_chunk(frame, first_row=2)
+    assert errors == []
+    assert (record["name"], record["price"], record["quantity"]) == ("Importamol", 2.5, 100)
+    assert record["reorder_level"] == 20 and record["batch_number"] == "P-1"
+    assert record["expiry_date"] == "2030-01-31" and record["supplier_id"] is None and record["unit"] is None
+
+
+def test_format_errors(tmp_path):
+    with pytest.raises(bulk_import.ImportFormatError, match="Missing required columns: price, quantity"):
+        bulk_import.validate_chunk(pd.DataFrame({"name": ["A"], "category": ["B"]}), 2)
+    path = tmp_path / "stock.txt"
+    path.write_text("name\n")
+    with pytest.raises(bulk_import.ImportFormatError, match="Unsupported file type"):
+        list(bulk_import.iter_chunks(str(path)))
+
+
+@pytest.mark.parametrize("write", [write_csv, write_xlsx])
+def test_chunks_keep_file_row_numbers(tmp_path, write):
+    path = write(tmp_path / f"stock{'.csv' if write is write_csv else '.xlsx'}")
+    assert [len(chunk) for chunk in bulk_import.iter_chunks(path, CHUNK_SIZE)] == [3, 3]
+
+    calls = []
+
+    def write_rows(records):
+        calls.append([record["name"] for record in records])
+        return {"batches_created": len(records)}
+
+    report = bulk_import.import_file(path, write_rows, CHUNK_SIZE)
+    assert calls == [["Importamol", "Importicillin"], ["Importamol", "Importamol"]]
+    assert (report["rows_total"], report["rows_imported"], report["rows_failed"]) == (6, 4, 2)
+    assert sorted(errors_by_row(report)) == [3, 5]
+    assert errors_by_row(report)[5] == ["category is required", "quantity must be a non-negative integer"]
+    assert report["batches_created"] == 4 and not report["errors_truncated"]
+
+
+def test_error_report_is_truncated(tmp_path, monkeypatch):
+    monkeypatch.setattr(bulk_import, "MAX_REPORTED_ERRORS", 1)
+    path = write_csv(tmp_path / "stock.csv")
+    report = bulk_import.import_file(path, lambda records: {}, CHUNK_SIZE)
+    assert report["rows_failed"] == 2 and errors_by_row(report).keys() == {3}
+    assert report["errors_truncated"]
+
+
+@pytest.mark.parametrize("backend", ["real_data", "mock"])
+def test_unknown_medicines_and_batches_are_created_and_known_ones_updated(tmp_path, backend, request):
+    backend = request.getfixturevalue(backend)
+    path = write_csv(tmp_path / "stock.csv")
+    report = bulk_import.import_file(path, backend.import_stock_rows, CHUNK_SIZE)
+
+    # Chunk 1 creates both medicines and their batches; chunk 2 finds Importamol and batch P-1
+    assert (report["medicines_created"], report["batches_created"], report["batches_updated"]) == (2, 3, 1)
+    assert report["medicines_updated"] >= 1
+
+    medicines = [m for m in backend.get_all_medicines() if m["name"] in ("Importamol", "Importicillin")]
+    importamol = [m for m in medicines if m["name"] == "Importamol" and m["dosage"] == "500mg"]
+    assert len(importamol) == 1 and importamol[0]["price"] == 2.75
+    batches = {inv["batch_number"]: inv for inv in backend.get_inventory_by_medicine_id(importamol[0]["id"])}
+    assert (batches["P-1"]["quantity"], batches["P-1"]["reorder_level"]) == (80, 25)
+    assert batches["P-2"]["quantity"] == 40
+
+    # Importing the same file again only updates
+    again = bulk_import.import_file(path, backend.import_stock_rows, CHUNK_SIZE)
+    assert again["medicines_created"] == 0 and again["batches_updated"] == 3  # P-1 in both chunks, P-2
+    assert again["batches_created"] == 1  # The Importicillin row has no batch number: always a new batch
@@ -0,0 +1,71 @@
+"""Indexed in-memory tables of the mock data service."""
+
+import pytest
+
+from services.catalog_store import CatalogStore, IndexedTable
+
+
+def make_table():
+    table = IndexedTable("items", ("kind", "color"))
+    for kind, color in [("a", "red"), ("b", "red"), ("a", "blue"), ("c", None)]:
+        table.insert({"id": None, "kind": kind, "color": color})
+    return table
+
+
+def test_lookups_by_id_and_index():
+    table = make_table()
+    assert len(table) == 4 and 2 in table and table[2]["kind"] == "b"
+    assert table.get(9) is None
+    assert table.get_many([3, 9, 1, 3]) == ([table[3], table[1]], [9])
+    assert [r["id"] for r in table.where("kind", "a")] == [1, 3]
+    assert table.ids_where("kind", "z") == []
+    assert set(table.distinct("color")) == {"red", "blue", None}
+    assert table.count_where("color", "red") == 2
+    assert table.last_id() == 4
+
+
+def test_indexes_follow_updates_and_deletes():
+    table = make_table()
+    table.update(1, {"kind": "b"})
+    assert table.ids_where("kind", "a") == [3]
+    assert table.ids_where("kind", "b") == [1, 2]
+    table.delete(2)
+    assert table.ids_where("kind", "b") == [1]
+    assert table.ids_where("color", "red") == [1]
+    table.delete(3)
+    assert "a" not in table.distinct("kind")  # Empty buckets are dropped
+    assert table.update(3, {"kind": "x"}) is None and table.delete(3) is None
+
+
+def test_ids_are_never_reused_and_duplicates_rejected():
+    table = make_table()
+    table.delete(4)
+    assert table.insert({"id": None, "kind": "d"})["id"] == 5
+    with pytest.raises(KeyError):
+        table.insert({"id": 5, "kind": "d"})
+
+
+def test_listeners_get_old_and_new_versions_and_versions_count_writes():
+    table = make_table()
+    changes = []
+    table.subscribe(lambda old, new: changes.append((old and old["kind"], new and new["kind"])))
+    version = table.version
+    stored = table[1]
+    table.insert({"id": None, "kind": "e"})
+    table.update(1, {"kind": "f"})
+    table.delete(2)
+    assert changes == [(None, "e"), ("a", "f"), ("b", None)]
+    assert table.version == version + 3
+    assert stored["kind"] == "a"  # Updates replace the record, they do not mutate it
+
+
+def test_store_keeps_inventory_in_sync_with_medicines():
+    store = CatalogStore()
+    med = store.medicines.insert({"id": None, "name": "Paracetamol", "category": "Painkiller"})
+    store.inventory.insert({"id": None, "medicine_id": med["id"], "medicine_name": "Paracetamol", "supplier_id": 1})
+    store.inventory.insert({"id": None, "medicine_id": med["id"], "medicine_name": "Paracetamol", "supplier_id": 2})
+
+    store.medicines.update(med["id"], {"name": "Acetaminophen"})
+    assert {inv["medicine_name"] for inv in store.inventory.all()} == {"Acetaminophen"}
+    store.medicines.delete(med["id"])
+    assert len(store.inventory) == 0 and store.inventory.ids_where("supplier_id", 1) == []
@@ -0,0 +1,69 @@
+"""Engine configuration of core/database.py: env-driven pools, checkout statistics and the async session."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+
+def test_pool_settings_come_from_the_environment(load_database):
+    database = load_database(
+        SQLITE_PROFILE="default", DB_POOL_SIZE=3, DB_MAX_OVERFLOW=2, DB_POOL_TIMEOUT=7, DB_POOL_RECYCLE=60,
+        DB_POOL_PRE_PING="false",
+    )
+    pool = database.engine.pool
+    assert (pool.size(), pool._max_overflow, pool._timeout, pool._recycle, pool._pre_ping) == (3, 2, 7.0, 60, False)
+    assert database.read_engine is database.engine  # No replica and no SQLite profile
+
+    stats = database.get_pool_stats()
+    assert list(stats) == ["sync"]
+    assert stats["sync"]["pool_class"] == "InstrumentedQueuePool"
+    assert (stats["sync"]["size"], stats["sync"]["max_overflow"], stats["sync"]["checkouts"]) == (3, 2, 0)
+
+
+def test_stats_count_checkouts(load_database):
+    database = load_database(SQLITE_PROFILE="default", DB_POOL_SIZE=2, DB_MAX_OVERFLOW=1)
+    first, second = database.engine.connect(), database.engine.connect()
+    stats = database.get_pool_stats()["sync"]
+    assert (stats["checkouts"], stats["checked_out"], stats["timeouts"]) == (2, 2, 0)
+
+    first.close()
+    second.close()
+    with database.engine.connect():  # Reuses a pooled connection
+        pass
+    stats = database.get_pool_stats()["sync"]
+    assert (stats["checkouts"], stats["checked_out"], stats["checked_in"]) == (3, 0, 2)
+    assert stats["wait_max_ms"] >= stats["wait_avg_ms"] >= 0
+
+
+def test_stats_time_waits_for_a_full_pool(load_database):
+    database = load_database(SQLITE_PROFILE="default", DB_POOL_SIZE=1, DB_MAX_OVERFLOW=0, DB_POOL_TIMEOUT=0.2)
+    with database.engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            database.engine.connect()
+    stats = database.get_pool_stats()["sync"]
+    assert (stats["checkouts"], stats["timeouts"]) == (1, 1)
+    assert stats["wait_max_ms"] >= 200
+    assert stats["wait_avg_ms"] >= 100  # (~0 + ~200) / 2 attempts
+
+
+def test_async_session_uses_its_own_instrumented_pool(load_database):
+    pytest.importorskip("aiosqlite")
+    database = load_database(SQLITE_PROFILE="default", DB_POOL_SIZE=2, DB_MAX_OVERFLOW=0)
+    assert database.async_database_url().startswith("sqlite+aiosqlite:///")
+    assert database.async_database_url("postgresql://db/pharmacy") == "postgresql+asyncpg://db/pharmacy"
+
+    async def query():
+        sessions = database.get_async_db()
+        db = await sessions.__anext__()
+        try:
+            return (await db.execute(text("SELECT 1"))).scalar()
+        finally:
+            await sessions.aclose()
+
+    assert asyncio.run(query()) == 1
+    stats = database.get_pool_stats()["async"]
+    assert stats["pool_class"] == "InstrumentedAsyncAdaptedQueuePool"
+    assert (stats["size"], stats["checkouts"], stats["checked_out"]) == (2, 1, 0)
+    assert database.get_pool_stats()["sync"]["checkouts"] == 0
@@ -0,0 +1,61 @@
+"""Sorted expiry index over the inventory table."""
+
+from datetime import date, timedelta
+
+from services.catalog_store import IndexedTable
+from services.expiry_index import ExpiryIndex
+
+TODAY = date(2025, 6, 1)
+
+
+def make_inventory(*batches):
+    table = IndexedTable("inventory", ("medicine_id",))
+    index = ExpiryIndex()
+    table.subscribe(index.on_change)
+    for days, quantity in batches:
+        expiry = None if days is None else (TODAY + timedelta(days=days)).isoformat()
+        table.insert({"id": None, "medicine_id": 1, "quantity": quantity, "expiry_date": expiry})
+    return table, index
+
+
+def test_ranges_are_soonest_first():
+    table, index = make_inventory((40, 5), (-3, 5), (10, 5), (None, 5), (10, 5), (-10, 5))
+    assert index.ids_expiring_within(30, TODAY) == [6, 2, 3, 5]
+    assert index.count_expiring_within(30, TODAY) == 4
+    assert index.ids_expired(TODAY) == [6, 2]
+    assert index.count_expired(TODAY) == 2
+    assert index.ids_expiring_within(0, TODAY) == [6, 2]
+
+
+def test_only_batches_in_stock_are_indexed():
+    table, index = make_inventory((5, 5), (6, 0))
+    assert index.ids_expiring_within(30, TODAY) == [1]
+    table.update(1, {"quantity": 0})
+    table.update(2, {"quantity": 3})
+    assert index.ids_expiring_within(30, TODAY) == [2]
+    table.update(2, {"expiry_date": (TODAY + timedelta(days=60)).isoformat()})
+    assert index.ids_expiring_within(30, TODAY) == []
+    table.delete(2)
+    assert len(index) == 0
+
+
+def test_mock_expiring_pages_match_a_full_scan(mock):
+    for n in range(60):
+        mock.add_inventory_item({
+            "medicine_id": 1 + n % 10,
+            "quantity": n % 4,
+            "expiry_date": (date.today() + timedelta(days=n)).isoformat(),
+        })
+    cutoff = (date.today() + timedelta(days=30)).isoformat()
+    expected = [
+        inv["id"] for inv in mock.get_all_inventory()
+        if inv["quantity"] > 0 and inv["expiry_date"] and inv["expiry_date"] <= cutoff
+    ]
+
+    ids, after = [], None
+    while True:
+        items, after = mock.get_inventory_page(7, after, expiring_days=30)
+        ids += [inv["id"] for inv in items]
+        if after is None:
+            break
+    assert ids == sorted(expected)
@@ -0,0 +1,82 @@
+"""CSV and Parquet export streams: headers, row counts across page / row group boundaries, schemas."""
+
+import csv
+import io
+
+import pytest
+
+from services import exports
+
+COLUMNS = ["id", "name", "price", "generic_name"]
+
+
+def medicines(count):
+    return [
+        {"id": i, "name": f"Medicine {i}", "price": i + 0.5, "generic_name": None if i % 2 else f"Generic {i}",
+         "category": "Painkiller"}
+        for i in range(1, count + 1)
+    ]
+
+
+def pager(records):
+    """fetch_page(limit, after) over a list, keyed on id like the backends' keyset pages"""
+    def fetch_page(limit, after):
+        rest = [record for record in records if after is None or record["id"] > after]
+        page = rest[:limit]
+        return page, page[-1]["id"] if len(rest) > limit else None
+    return fetch_page
+
+
+@pytest.mark.parametrize("count, page_sizes", [(0, []), (6, [3, 3]), (7, [3, 3, 1])])
+def test_pages_cover_every_record_once(count, page_sizes):
+    pages = list(exports.iter_pages(pager(medicines(count)), page_size=3))
+    assert [len(page) for page in pages] == page_sizes
+    assert [record["id"] for page in pages for record in page] == list(range(1, count + 1))
+
+
+@pytest.mark.parametrize("count", [0, 1, 3, 7])
+def test_csv_has_one_header_and_every_row(count):
+    chunks = list(exports.csv_chunks(exports.iter_pages(pager(medicines(count)), page_size=3), COLUMNS))
+    assert len(chunks) == max(-(-count // 3), 1)  # One chunk per page; the header alone if there are none
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+    assert rows[0] == COLUMNS
+    assert [row[0] for row in rows[1:]] == [str(i) for i in range(1, count + 1)]
+    if count:
+        assert rows[1] == ["1", "Medicine 1", "1.5", ""]  # None is an empty cell
+
+
+def test_parquet_reads_back_with_the_schema():
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    records = medicines(10)
+    pages = exports.iter_pages(pager(records), page_size=3)
+    chunks = list(exports.parquet_chunks(pages, "medicines", COLUMNS, row_group_size=4))
+    parquet = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+
+    assert parquet.schema_arrow == pa.schema([
+        ("id", pa.int64()), ("name", pa.string()), ("price", pa.float64()), ("generic_name", pa.string()),
+    ])
+    # Pages of 3 are buffered to at least 4 rows: 6 rows (groups of 4 + 2), then 4
+    groups = [parquet.metadata.row_group(i).num_rows for i in range(parquet.num_row_groups)]
+    assert groups == [4, 2, 4] and len(chunks) == 3  # Two row group writes and the footer
+    table = parquet.read()
+    assert table.column("id").to_pylist() == list(range(1, 11))
+    assert table.column("generic_name").to_pylist()[:2] == [None, "Generic 2"]
+    assert table.column("price").to_pylist()[-1] == 10.5
+
+
+def test_parquet_of_nothing_is_an_empty_file_with_the_schema():
+    pq = pytest.importorskip("pyarrow.parquet")
+    chunks = list(exports.parquet_chunks(iter([]), "sales", ["id", "total"]))
+    table = pq.read_table(io.BytesIO(b"".join(chunks)))
+    assert table.num_rows == 0 and table.column_names == ["id", "total"]
+
+
+def test_column_selection():
+    assert exports.select_columns("sales") == list(exports.EXPORT_COLUMNS["sales"])
+    assert exports.select_columns("sales", " total, id ,total") == ["total", "id"]
+    with pytest.raises(exports.ExportError, match="Unknown collection"):
+        exports.select_columns("suppliers")
+    with pytest.raises(exports.ExportError, match="Unknown columns"):
+        exports.select_columns("sales", "id,profit")
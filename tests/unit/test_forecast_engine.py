@@ -0,0 +1,140 @@
+"""Batch demand forecasts of ml-services/models/demand-forecasting/forecast_engine.py."""
+
+import os
+import sys
+import types
+
+import numpy as np
+import pytest
+
+ENGINE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "ml-services", "models", "demand-forecasting",
+)
+sys.path.insert(0, ENGINE)
+
+import forecast_engine  # noqa: E402
+
+HORIZON = 10
+
+
+def weekly_history(skus=4, periods=70, seed=3):
+    rng = np.random.default_rng(seed)
+    profile = np.array([1.0, 1.2, 0.8, 1.0, 1.5, 0.5, 0.3])
+    base = rng.uniform(2, 20, skus)[:, None]
+    return rng.poisson(base * profile[np.arange(periods) % 7]).astype(float)
+
+
+def check(result, skus, horizon=HORIZON):
+    assert result.mean.shape == result.lower.shape == result.upper.shape == (skus, horizon)
+    assert np.isfinite(result.mean).all() and np.isfinite(result.upper).all()
+    assert (result.lower >= 0).all() and (result.lower <= result.mean).all() and (result.mean <= result.upper).all()
+
+
+@pytest.mark.parametrize("method", ["ets", "seasonal_naive"])
+def test_every_sku_gets_a_bounded_forecast(method):
+    history = weekly_history()
+    check(forecast_engine.forecast(history, HORIZON, method), len(history))
+
+
+@pytest.mark.parametrize("method", ["ets", "seasonal_naive"])
+def test_all_zero_history_forecasts_zero(method):
+    result = forecast_engine.forecast(np.zeros((3, 28)), HORIZON, method)
+    check(result, 3)
+    assert not result.mean.any() and not result.upper.any()
+
+
+@pytest.mark.parametrize("method", ["ets", "seasonal_naive"])
+def test_histories_shorter_than_a_season(method):
+    # Ragged histories are right-aligned; the shortest has 2 periods, none a full season
+    history = forecast_engine.to_matrix([[3, 4, 5], [1, 0], [2, 2, 2, 2, 2]])
+    check(forecast_engine.forecast(history, HORIZON, method), 3)
+
+
+def test_forecasts_are_clipped_at_zero():
+    # A steep fall: the trend and the seasonal repeat would go negative
+    history = np.array([[60.0, 50, 40, 30, 20, 10, 0] * 2, [0, 0, 0, 0, 0, 0, 9] * 2])
+    for method in ("ets", "seasonal_naive"):
+        result = forecast_engine.forecast(history, 14, method)
+        check(result, 2, 14)
+
+
+def test_seasonal_naive_repeats_the_last_season():
+    history = np.tile(np.arange(7.0), (2, 3))
+    result = forecast_engine.seasonal_naive(history, HORIZON)
+    assert result.mean[0].tolist() == [0, 1, 2, 3, 4, 5, 6, 0, 1, 2]
+    assert (result.upper == result.mean).all()  # No season-over-season change: no spread
+
+
+def test_to_matrix_right_aligns_and_truncates():
+    matrix = forecast_engine.to_matrix([[1, 2, 3, 4], [5]], max_history=3)
+    assert matrix.shape == (2, 3)
+    assert matrix[0].tolist() == [2, 3, 4]
+    assert np.isnan(matrix[1, :2]).all() and matrix[1, 2] == 5
+    assert forecast_engine.to_matrix([]).shape == (0, 1)
+
+
+def test_invalid_arguments():
+    history = weekly_history()
+    with pytest.raises(ValueError, match="Unknown method"):
+        forecast_engine.forecast(history, HORIZON, "arima")
+    with pytest.raises(ValueError, match="horizon"):
+        forecast_engine.forecast(history, 0)
+    with pytest.raises(ValueError, match="interval"):
+        forecast_engine.forecast(history, HORIZON, interval=1.5)
+    with pytest.raises(ValueError, match="periods of history"):
+        forecast_engine.forecast(history[:, :20], HORIZON, "gbm")
+
+
+# ==================== GRADIENT BOOSTING ====================
+
+class MeanRegressor:
+    """Stand-in for a boosted regressor: predicts the training mean"""
+
+    def __init__(self, **params):
+        self.params = params
+
+    def fit(self, features, labels):
+        self.value = float(np.mean(labels))
+        return self
+
+    def predict(self, features):
+        return np.full(len(features), self.value)
+
+
+def fake_module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    return module
+
+
+def test_gbm_prefers_xgboost(monkeypatch):
+    monkeypatch.setitem(sys.modules, "xgboost", fake_module("xgboost", XGBRegressor=MeanRegressor))
+    assert isinstance(forecast_engine._regressor(), MeanRegressor)
+    history = weekly_history()
+    result = forecast_engine.forecast(history, HORIZON, "gbm")
+    check(result, len(history))
+    assert np.allclose(result.mean, result.mean[:, :1])  # A constant model: flat scaled forecasts
+
+
+def test_gbm_falls_back_to_scikit_learn(monkeypatch):
+    ensemble = fake_module("sklearn.ensemble", HistGradientBoostingRegressor=MeanRegressor)
+    monkeypatch.setitem(sys.modules, "xgboost", None)  # Import fails
+    monkeypatch.setitem(sys.modules, "sklearn", fake_module("sklearn", ensemble=ensemble))
+    monkeypatch.setitem(sys.modules, "sklearn.ensemble", ensemble)
+    regressor = forecast_engine._regressor()
+    assert isinstance(regressor, MeanRegressor) and regressor.params["max_iter"] == 200
+
+
+def test_gbm_without_either_library(monkeypatch):
+    monkeypatch.setitem(sys.modules, "xgboost", None)
+    monkeypatch.setitem(sys.modules, "sklearn", None)
+    monkeypatch.setitem(sys.modules, "sklearn.ensemble", None)
+    with pytest.raises(ImportError, match="xgboost or scikit-learn"):
+        forecast_engine.forecast(weekly_history(), HORIZON, "gbm")
+
+
+def test_gbm_with_scikit_learn():
+    pytest.importorskip("sklearn")
+    history = weekly_history()
+    check(forecast_engine.gradient_boosted(history, HORIZON), len(history))
@@ -0,0 +1,69 @@
+"""Keyset pagination of the listings (mock and database backends)."""
+
+from services.catalog_store import IndexedTable
+
+
+def collect(fetch, limit):
+    """Walk every page of ``fetch(limit, after)`` and return the ids in order"""
+    ids, after = [], None
+    while True:
+        items, after = fetch(limit, after)
+        ids += [item["id"] for item in items]
+        if after is None:
+            return ids
+
+
+def test_indexed_table_pages_in_id_order_with_filters():
+    table = IndexedTable("items", ("kind",))
+    for i in range(1, 101):
+        table.insert({"id": None, "kind": "a" if i % 3 else "b", "n": i})
+    table.delete(50)
+
+    assert collect(table.page, 7) == [i for i in range(1, 101) if i != 50]
+    assert collect(lambda limit, after: table.page(limit, after, field="kind", value="b"), 4) == list(range(3, 101, 3))
+    even = lambda record: record["n"] % 2 == 0
+    assert collect(lambda limit, after: table.page(limit, after, predicate=even), 9) == [
+        i for i in range(2, 101, 2) if i != 50
+    ]
+
+
+def test_mock_search_pages_follow_the_ranking(mock, monkeypatch):
+    for n in range(40):
+        mock.add_medicine({"name": f"Paracetamol {n}", "category": "Painkiller" if n % 2 else "Fever"})
+    ranked = [m["id"] for m in mock.search_medicines("paracetamol")]
+
+    calls = []
+    search = mock.search_index.search
+    monkeypatch.setattr(mock.search_index, "search", lambda *args: calls.append(args) or search(*args))
+    assert collect(lambda limit, after: mock.get_medicines_page(limit, after, search="paracetamol"), 6) == ranked
+    assert len(calls) == 1  # Later pages reuse the ranked result
+
+    by_category = collect(
+        lambda limit, after: mock.get_medicines_page(limit, after, category="Fever", search="paracetamol"), 5
+    )
+    assert by_category == [i for i in ranked if mock.get_medicine_by_id(i)["category"] == "Fever"]
+
+
+def test_mock_search_pages_see_catalog_changes(mock):
+    first, cursor = mock.get_medicines_page(2, search="vitamin")
+    mock.add_medicine({"name": "Vitamin B12", "category": "Vitamin"})
+    rest = collect(lambda limit, after: mock.get_medicines_page(limit, after or cursor, search="vitamin"), 2)
+    assert "Vitamin B12" in [mock.get_medicine_by_id(i)["name"] for i in [m["id"] for m in first] + rest]
+
+
+def test_db_pages(real_data):
+    for n in range(30):
+        real_data.add_medicine({"name": f"Drug {n:02d}", "category": "A" if n % 3 else "B", "price": 1.0})
+    real_data.add_medicine({"name": "Co-Amoxiclav", "category": "C", "price": 1.0})
+    for n in range(12):
+        real_data.add_medicine({"name": f"Amox {n}", "generic_name": "amoxicillin", "category": "C", "price": 1.0})
+
+    everything = [m["id"] for m in real_data.get_all_medicines()]
+    assert collect(real_data.get_medicines_page, 7) == everything
+    assert collect(lambda limit, after: real_data.get_medicines_page(limit, after, category="B"), 4) == [
+        m["id"] for m in real_data.get_medicines_by_category("B")
+    ]
+
+    ranked = [m["id"] for m in real_data.search_medicines("amox")]
+    assert len(ranked) == 13 and ranked != sorted(ranked)
+    assert collect(lambda limit, after: real_data.get_medicines_page(limit, after, search="amox"), 5) == ranked
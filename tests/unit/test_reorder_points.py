@@ -0,0 +1,122 @@
+"""Reorder levels from demand history (policy, database and mock backends)."""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import select, update
+
+from models import StockMovement
+from services import reorder_policy, stock_ledger
+from services.memory_ledger import MemoryLedger
+from services.movement_types import SALE_NOTE
+from services.sales_buckets import bucket_start
+
+
+def plan_one(levels, demand_days, rate=4.0, std=1.0):
+    """Plan for one medicine with two batches of 30 and 10 units"""
+    return reorder_policy.plan(
+        [1, 1], [30, 10], [7, 7], [2.0, 2.0], levels, [1], np.array([rate]), np.array([std]), np.array([demand_days]),
+    )
+
+
+def test_levels_need_enough_demand_history():
+    kept = plan_one([25, -1], 0, rate=0.0, std=0.0)
+    assert kept["reorder_level"].tolist() == [25, reorder_policy.DEFAULT_REORDER_LEVEL]
+    assert not kept["estimated"][0] and not kept["stockout"][0]
+
+    few = plan_one([25, 5], reorder_policy.MIN_DEMAND_DAYS - 1)
+    assert few["reorder_level"].tolist() == [25, 5] and not few["stockout"][0]
+
+    computed = plan_one([25, 5], reorder_policy.MIN_DEMAND_DAYS)
+    assert computed["estimated"][0] and computed["reorder_point"][0] == 33  # ceil(4 * 7 + 1.645 * sqrt(7))
+    assert computed["reorder_level"].tolist() == [25, 9]
+
+
+def test_computed_levels_have_a_floor():
+    result = plan_one([25, 5], reorder_policy.MIN_DEMAND_DAYS, rate=0.01, std=0.0)
+    assert result["reorder_level"].tolist() == [1, 1]
+
+
+def test_daily_demand_adds_up_rows_of_the_same_day():
+    # Medicine 1: 4 units sold and 2 dispensed on day 0, 6 sold on day 1; medicine 2: nothing
+    rate, std, demand_days = reorder_policy.daily_demand([1, 2], [1, 1, 1, 9], [0, 0, 1, 0], [4, 2, 6, 5], 2)
+    assert rate.tolist() == [6.0, 0.0] and std.tolist() == [0.0, 0.0]
+    assert demand_days.tolist() == [2, 0]
+
+
+def test_db_keeps_levels_without_history(real_data):
+    medicine = real_data.add_medicine({"name": "Newcillin", "category": "Antibiotic", "price": 2.0})
+    batch = real_data.add_inventory_item({"medicine_id": medicine["id"], "quantity": 40, "reorder_level": 25})
+
+    report = real_data.recompute_reorder_points()
+    assert report["estimated"] == 0 and report["levels_updated"] == 0
+    assert real_data.get_inventory_item_by_id(batch["id"])["reorder_level"] == 25
+
+
+def test_db_demand_counts_dispenses_outside_sales(real_data, db):
+    medicine = real_data.add_medicine({"name": "Paracetamol", "category": "Painkiller", "price": 2.0})
+    batch = real_data.add_inventory_item({"medicine_id": medicine["id"], "quantity": 500, "reorder_level": 25})
+    today = bucket_start(datetime.now(timezone.utc), "day")
+    real_data.record_sale(batch["id"], 3)  # Today: outside the window, and counted by the sales rollups
+    days = range(1, reorder_policy.MIN_DEMAND_DAYS + 1)
+    for _ in days:
+        real_data.record_stock_movement(batch["id"], "dispense", 5, "Ward order")
+    movements = db.scalars(
+        select(StockMovement.id).where(StockMovement.note == "Ward order").order_by(StockMovement.id)
+    ).all()
+    for movement_id, day in zip(movements, days):
+        stamp = (today - timedelta(days=day) + timedelta(hours=12)).replace(tzinfo=timezone.utc)
+        db.execute(update(StockMovement).where(StockMovement.id == movement_id).values(created_at=stamp))
+    db.commit()
+
+    start, end = reorder_policy.demand_window()
+    assert sorted(stock_ledger.daily_dispenses(db, start, end).values()) == [5] * len(days)
+    assert stock_ledger.daily_dispenses(db, today, today + timedelta(days=1)) == {}  # The sale's dispense
+
+    report = real_data.recompute_reorder_points()
+    assert report["estimated"] == 1 and report["levels_updated"] == 1
+    assert real_data.get_inventory_item_by_id(batch["id"])["reorder_level"] >= reorder_policy.REORDER_LEVEL_FLOOR
+
+
+def test_db_raised_level_raises_low_stock_alert(real_data, db):
+    medicine = real_data.add_medicine({"name": "Paracetamol", "category": "Painkiller", "price": 2.0})
+    batch = real_data.add_inventory_item({"medicine_id": medicine["id"], "quantity": 760, "reorder_level": 10})
+    today = bucket_start(datetime.now(timezone.utc), "day")
+    days = range(1, reorder_policy.MIN_DEMAND_DAYS + 1)
+    for _ in days:
+        real_data.record_stock_movement(batch["id"], "dispense", 100, "Ward order")
+    movements = db.scalars(select(StockMovement.id).where(StockMovement.note == "Ward order")).all()
+    for movement_id, day in zip(movements, days):
+        stamp = (today - timedelta(days=day) + timedelta(hours=12)).replace(tzinfo=timezone.utc)
+        db.execute(update(StockMovement).where(StockMovement.id == movement_id).values(created_at=stamp))
+    db.commit()
+
+    def low_stock():
+        return [
+            alert for alert in real_data.get_all_alerts()
+            if alert["alert_type"] == "low_stock" and alert["inventory_id"] == batch["id"]
+        ]
+
+    assert low_stock() == []
+    report = real_data.recompute_reorder_points()
+    assert report["levels_updated"] == 1 and report["alerts_created"] >= 1
+    assert real_data.get_inventory_item_by_id(batch["id"])["reorder_level"] > 60
+    assert [alert["condition"] for alert in low_stock()] == ["below_reorder"]
+
+
+def test_mock_keeps_levels_without_history(mock):
+    medicine = mock.add_medicine({"name": "Newcillin", "category": "Antibiotic", "price": 2.0})
+    batch = mock.add_inventory_item({"medicine_id": medicine["id"], "quantity": 40, "reorder_level": 25})
+    mock.recompute_reorder_points()
+    assert mock.get_inventory_item_by_id(batch["id"])["reorder_level"] == 25
+
+
+def test_memory_ledger_counts_dispenses_outside_sales():
+    ledger = MemoryLedger()
+    inv = {"id": 1, "medicine_id": 7, "quantity": 10}
+    ledger.append(inv, "dispense", -4, SALE_NOTE)
+    ledger.append(inv, "dispense", -2, "Ward order")
+    ledger.append(inv, "write_off", -1)
+    today = bucket_start(datetime.now(timezone.utc), "day")
+    assert ledger.daily_dispenses(today, today + timedelta(days=1)) == {(7, today): 2}
+    assert ledger.daily_dispenses(today - timedelta(days=1), today) == {}
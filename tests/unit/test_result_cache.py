@@ -0,0 +1,91 @@
+"""Result cache: invalidation by collection version, TTL and size bound."""
+
+import pytest
+
+from services import result_cache as result_cache_module
+from services.result_cache import ResultCache, approx_size
+
+
+class Versions:
+    """Collection versions that the tests bump by hand"""
+
+    def __init__(self):
+        self.versions = {"medicines": 0, "inventory": 0}
+
+    def __call__(self, collections):
+        return ".".join(str(self.versions[name]) for name in collections)
+
+
+def make_cached(cache, *collections, ttl=60):
+    calls = []
+
+    def compute(n):
+        calls.append(n)
+        return [n] * 10
+
+    compute.__name__ = "_".join(("compute", *collections))  # Entries are keyed on the function name
+    return cache.cached(*collections, ttl=ttl)(compute), calls
+
+
+def test_a_version_change_invalidates_only_dependent_results():
+    versions = Versions()
+    cache = ResultCache(versions)
+    by_medicines, medicine_calls = make_cached(cache, "medicines")
+    by_inventory, inventory_calls = make_cached(cache, "inventory")
+
+    assert by_medicines(1) is by_medicines(1)
+    by_inventory(1)
+    versions.versions["medicines"] += 1
+    by_medicines(1)
+    by_inventory(1)
+    assert medicine_calls == [1, 1] and inventory_calls == [1]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (2, 3, 1)
+
+
+def test_entries_expire_after_their_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(result_cache_module.time, "monotonic", lambda: now[0])
+    cache = ResultCache(Versions())
+    compute, calls = make_cached(cache, "medicines", ttl=10)
+
+    compute(1)
+    now[0] += 9
+    compute(1)
+    now[0] += 1
+    compute(1)
+    assert calls == [1, 1] and cache.stats()["expirations"] == 1
+
+
+def test_least_recently_used_entries_are_evicted_past_the_size_bound():
+    cache = ResultCache(Versions(), max_bytes=int(approx_size([1] * 10) * 2.5))
+    compute, calls = make_cached(cache, "medicines")
+
+    compute(1)
+    compute(2)
+    compute(1)  # 2 is now the least recently used
+    compute(3)
+    compute(1)
+    compute(2)
+    assert calls == [1, 2, 3, 2]
+    assert cache.stats()["evictions"] == 2 and cache.bytes <= cache.max_bytes
+
+
+def test_disabled_cache_always_calls_through():
+    cache = ResultCache(Versions(), enabled=False)
+    compute, calls = make_cached(cache, "medicines")
+    compute(1)
+    compute(1)
+    assert calls == [1, 1] and cache.stats()["entries"] == 0
+
+
+def test_data_source_results_follow_writes():
+    from services import data_source
+
+    stats = data_source.get_dashboard_stats()
+    assert data_source.get_dashboard_stats() is stats
+    batch = data_source.get_all_inventory()[0]
+    data_source.record_stock_movement(batch["id"], "receipt", 5)
+    fresh = data_source.get_dashboard_stats()
+    assert fresh is not stats
+    assert fresh == pytest.approx(data_source.get_dashboard_stats.__wrapped__())
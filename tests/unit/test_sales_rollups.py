@@ -0,0 +1,117 @@
+"""Sales rollups per hour / day / month and the trends read from them (database and mock backends)."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+from models import Sale, SalesRollup
+from services import sales_ledger
+from services.catalog_store import IndexedTable
+from services.memory_sales import MemorySales
+
+NOW = datetime(2025, 6, 10, 15, 30, tzinfo=timezone.utc)
+
+
+def sale(medicine_id, category, quantity, hours_ago, unit_price=2.0):
+    return {
+        "medicine_id": medicine_id,
+        "category": category,
+        "quantity": quantity,
+        "unit_price": unit_price,
+        "total": round(quantity * unit_price, 2),
+        "sold_at": NOW - timedelta(hours=hours_ago),
+    }
+
+
+SALES = [
+    sale(1, "Painkiller", 3, 0),
+    sale(1, "Painkiller", 2, 1),
+    sale(2, "Painkiller", 5, 26),
+    sale(3, "Antibiotic", 4, 26, unit_price=5.0),
+    sale(3, "Antibiotic", 1, 24 * 40),  # Previous month, outside a 7-day window
+]
+
+
+def units(trends):
+    return [row["sales"] for row in trends]
+
+
+def trend_views(trends):
+    """Every granularity and filter of one backend's trends function"""
+    return {
+        (granularity, scope): trends(days, granularity, **filters)
+        for granularity, days in (("hour", 2), ("day", 7), ("month", 60))
+        for scope, filters in (
+            ("all", {}), ("category", {"category": "Painkiller"}), ("medicine", {"medicine_id": 3}),
+        )
+    }
+
+
+def test_append_sales_writes_one_rollup_row_per_bucket_and_scope(db):
+    assert sales_ledger.append_sales(db, SALES[:1]) == 1
+    rows = db.scalars(select(SalesRollup)).all()
+    assert len(rows) == 9  # 3 granularities x (all, category, medicine)
+    assert {(row.scope, row.key) for row in rows} == {("all", ""), ("category", "Painkiller"), ("medicine", "1")}
+    assert all((row.units, row.revenue, row.transactions) == (3, 6.0, 1) for row in rows)
+
+
+def test_sales_of_a_bucket_add_up_across_calls(db):
+    # Separate calls for the same new buckets (as two concurrent sales would) add to the same rows
+    sales_ledger.append_sales(db, SALES[:1])
+    sales_ledger.append_sales(db, SALES[1:2])
+    hour, day = (
+        db.get(SalesRollup, (granularity, "all", "", bucket))
+        for granularity, bucket in (("hour", datetime(2025, 6, 10, 14)), ("day", datetime(2025, 6, 10)))
+    )
+    assert (hour.units, hour.transactions) == (2, 1)
+    assert (day.units, day.revenue, day.transactions) == (5, 10.0, 2)
+
+
+def test_trends_fill_empty_buckets_with_zero(db):
+    sales_ledger.append_sales(db, SALES)
+    trends = sales_ledger.sales_trends(db, 7, "day", now=NOW)
+    assert [row["date"] for row in trends] == [f"2025-06-{day:02d}" for day in range(4, 11)]
+    assert units(trends) == [0, 0, 0, 0, 0, 9, 5]
+    assert trends[-2]["revenue"] == 30.0
+
+    assert units(sales_ledger.sales_trends(db, 2, "hour", now=NOW))[-2:] == [2, 3]
+    assert units(sales_ledger.sales_trends(db, 60, "month", now=NOW)) == [0, 1, 14]
+    assert units(sales_ledger.sales_trends(db, 7, "day", category="Antibiotic", now=NOW))[-2:] == [4, 0]
+    assert units(sales_ledger.sales_trends(db, 7, "day", medicine_id=1, now=NOW))[-2:] == [0, 5]
+    assert units(sales_ledger.sales_trends(db, 7, "day", medicine_id=99, now=NOW)) == [0] * 7
+
+
+def test_record_sale_dispenses_and_rolls_up(real_data, db):
+    medicine = real_data.add_medicine({"name": "Paracetamol", "category": "Painkiller", "price": 2.5})
+    batch = real_data.add_inventory_item({"medicine_id": medicine["id"], "quantity": 10})
+    recorded = real_data.record_sale(batch["id"], 4)
+    assert (recorded["quantity"], recorded["unit_price"], recorded["total"]) == (4, 2.5, 10.0)
+    assert real_data.get_inventory_item_by_id(batch["id"])["quantity"] == 6
+
+    today = real_data.get_sales_trends(1, "day", medicine_id=medicine["id"])
+    assert today == real_data.get_sales_trends(1, "day", category="Painkiller")
+    assert (today[-1]["sales"], today[-1]["revenue"]) == (4, 10.0)
+    assert db.scalar(select(func.count(Sale.id))) == 1
+
+
+def test_backends_report_the_same_trends(db):
+    memory = MemorySales(IndexedTable("sales", ("medicine_id",)))
+    memory.append(SALES)
+    sales_ledger.append_sales(db, SALES)
+
+    def db_trends(days, granularity, **filters):
+        return sales_ledger.sales_trends(db, days, granularity, now=NOW, **filters)
+
+    def memory_trends(days, granularity, **filters):
+        return memory.trends(days, granularity, now=NOW, **filters)
+
+    assert trend_views(db_trends) == trend_views(memory_trends)
+
+
+@pytest.mark.parametrize("granularity", ["hour", "day", "month"])
+def test_mock_record_sale_rolls_up(mock, granularity):
+    batch = mock.add_inventory_item({"medicine_id": 1, "quantity": 10})
+    before = mock.get_sales_trends(1, granularity, medicine_id=1)[-1]["sales"]
+    mock.record_sale(batch["id"], 3)
+    assert mock.get_sales_trends(1, granularity, medicine_id=1)[-1]["sales"] == before + 3
@@ -0,0 +1,67 @@
+"""Trigram medicine search (mock index) and the database search query."""
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from models import Medicine
+from services.catalog_store import IndexedTable
+from services.search_index import MedicineSearchIndex
+
+
+def make_index(*names):
+    table = IndexedTable("medicines", ("name",))
+    index = MedicineSearchIndex()
+    table.subscribe(index.on_change)
+    for name, generic in names:
+        table.insert({"id": None, "name": name, "generic_name": generic})
+    return table, index
+
+
+def names(table, results):
+    return [table[medicine_id]["name"] for medicine_id, _ in results]
+
+
+def test_typos_and_prefixes_match():
+    table, index = make_index(
+        ("Paracetamol", "Acetaminophen"), ("Amoxicillin", "Amoxicillin"), ("Amlodipine", "Amlodipine"),
+        ("Calpol", "Paracetamol"),
+    )
+    assert names(table, index.search("parcetamol")) == ["Paracetamol", "Calpol"]
+    assert names(table, index.search("amo")) == ["Amoxicillin"]
+    assert names(table, index.search("am")) == ["Amlodipine", "Amoxicillin"]
+    assert index.search("zzzzzz") == []
+
+
+def test_name_hits_rank_above_other_fields():
+    table, index = make_index(("Calpol", "Paracetamol"), ("Paracetamol", "Acetaminophen"))
+    assert names(table, index.search("paracetamol")) == ["Paracetamol", "Calpol"]
+    assert names(table, index.search("paracetamol", limit=1)) == ["Paracetamol"]
+
+
+def test_index_follows_renames_and_deletes():
+    table, index = make_index(("Paracetamol", None), ("Ibuprofen", None))
+    table.update(1, {"name": "Acetaminophen"})
+    assert names(table, index.search("paracetamol")) == []
+    assert names(table, index.search("acetaminophen")) == ["Acetaminophen"]
+    table.delete(2)
+    assert index.search("ibuprofen") == [] and index.search("ibu") == []
+    assert len(index) == 1
+
+
+def test_db_search_falls_back_to_substring_on_sqlite(real_data):
+    for name in ("Co-Amoxiclav", "Amoxicillin", "Paracetamol"):
+        real_data.add_medicine({"name": name, "category": "A", "price": 1.0})
+    assert [m["name"] for m in real_data.search_medicines("amox")] == ["Amoxicillin", "Co-Amoxiclav"]
+    assert real_data.search_medicines("parcetamol") == []  # No typo tolerance without pg_trgm
+
+
+def test_db_search_uses_trigram_similarity_on_postgresql(real_data, monkeypatch):
+    monkeypatch.setattr(real_data, "TRIGRAM_SEARCH", True)
+    query = select(Medicine.id).where(real_data._search_filter("parcetamol")).order_by(
+        real_data._search_rank("parcetamol")
+    )
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert "<%" in sql and "word_similarity" in sql
+
+    indexes = {index.name: index for index in Medicine.__table__.indexes}
+    assert indexes["ix_medicines_name_trgm"].dialect_options["postgresql"]["using"] == "gin"
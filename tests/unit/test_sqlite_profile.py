@@ -0,0 +1,62 @@
+"""The SQLite production profile of core/database.py: pragmas, one writer and a query_only read pool."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+
+def pragmas(engine, *names):
+    with engine.connect() as connection:
+        return {name: connection.execute(text(f"PRAGMA {name}")).scalar() for name in names}
+
+
+def test_profile_applies_pragmas_to_every_connection(load_database):
+    database = load_database(SQLITE_PROFILE="production", SQLITE_BUSY_TIMEOUT_MS=1234, SQLITE_CACHE_SIZE_KB=2048)
+    assert database.USE_SQLITE_PROFILE
+    expected = {
+        "journal_mode": "wal", "synchronous": 1, "busy_timeout": 1234, "cache_size": -2048, "temp_store": 2,
+        "query_only": 0,
+    }
+    assert pragmas(database.engine, *expected) == expected
+    assert pragmas(database.read_engine, *expected) == {**expected, "query_only": 1}
+
+
+def test_profile_has_one_writer_and_a_read_pool(load_database):
+    database = load_database(SQLITE_PROFILE="production", DB_POOL_SIZE=4, SQLITE_READ_POOL_SIZE=3)
+    assert (database.engine.pool.size(), database.engine.pool._max_overflow) == (1, 0)
+    assert database.read_engine is not database.engine
+    assert database.read_engine.pool.size() == 3
+    assert set(database.get_pool_stats()) == {"sync", "read"}
+
+
+def test_read_pool_rejects_writes(load_database):
+    database = load_database(SQLITE_PROFILE="production")
+    with database.SessionLocal() as db:
+        db.execute(text("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)"))
+        db.execute(text("INSERT INTO notes (body) VALUES ('written')"))
+        db.commit()
+
+    with database.ReadSessionLocal() as db:
+        assert db.execute(text("SELECT body FROM notes")).scalars().all() == ["written"]
+        with pytest.raises(OperationalError, match="readonly"):
+            db.execute(text("INSERT INTO notes (body) VALUES ('read pool')"))
+        db.rollback()
+
+    # Writes committed through the writer are visible to readers (WAL)
+    with database.SessionLocal() as db:
+        db.execute(text("INSERT INTO notes (body) VALUES ('again')"))
+        db.commit()
+    with database.ReadSessionLocal() as db:
+        assert db.execute(text("SELECT count(*) FROM notes")).scalar() == 2
+
+
+def test_default_profile_keeps_sqlite_settings(load_database):
+    database = load_database(SQLITE_PROFILE="default")
+    assert not database.USE_SQLITE_PROFILE and database.read_engine is database.engine
+    assert pragmas(database.engine, "journal_mode", "query_only") == {"journal_mode": "delete", "query_only": 0}
+
+
+def test_memory_database_is_not_profiled(load_database):
+    database = load_database("sqlite://", SQLITE_PROFILE="production")
+    assert not database.USE_SQLITE_PROFILE and database.read_engine is database.engine
+    assert pragmas(database.engine, "journal_mode") == {"journal_mode": "memory"}
@@ -0,0 +1,76 @@
+"""Incremental stock counters, checked in verification mode."""
+
+import random
+
+import pytest
+
+from services.catalog_store import CatalogStore
+from services.stock_counters import StockCounters
+
+
+def make_store(rng, medicines=8, batches=40):
+    store = CatalogStore()
+    for n in range(medicines):
+        price = rng.choice([0.0, 2.5, 10.0])
+        store.medicines.insert({"id": None, "name": f"Medicine {n}", "category": "A", "price": price})
+    for _ in range(batches):
+        store.inventory.insert(random_batch(rng, store))
+    return store
+
+
+def random_batch(rng, store):
+    return {
+        "id": None,
+        "medicine_id": rng.choice(store.medicines.all())["id"],
+        "supplier_id": None,
+        "quantity": rng.randint(0, 50),
+        "reorder_level": rng.randint(0, 30),
+    }
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_writes_match_a_full_recompute(seed):
+    rng = random.Random(seed)
+    store = make_store(rng)
+    counters = StockCounters(store, verify=True)
+
+    for _ in range(500):
+        op = rng.random()
+        batch_ids = [inv["id"] for inv in store.inventory.all()]
+        medicine_ids = [med["id"] for med in store.medicines.all()]
+        if op < 0.3 or not batch_ids:
+            store.inventory.insert(random_batch(rng, store))
+        elif op < 0.7:
+            store.inventory.update(rng.choice(batch_ids), {
+                "quantity": rng.randint(0, 50), "reorder_level": rng.randint(0, 30),
+            })
+        elif op < 0.8:
+            store.inventory.update(rng.choice(batch_ids), {"medicine_id": rng.choice(medicine_ids)})
+        elif op < 0.9:
+            store.inventory.delete(rng.choice(batch_ids))
+        elif op < 0.97:
+            store.medicines.update(rng.choice(medicine_ids), {"price": round(rng.uniform(0, 20), 2)})
+        elif len(medicine_ids) > 1:
+            store.medicines.delete(rng.choice(medicine_ids))  # Also deletes its batches
+
+        # Every read compares with a full recompute in verification mode
+        counters.low_stock_count()
+        counters.inventory_value()
+        low_stock, total_value, total_quantity = counters.recompute()
+        assert counters.low_stock() == low_stock
+        assert counters.total_value == pytest.approx(total_value)
+        assert counters.total_quantity == total_quantity
+        # Per-medicine units only for medicines with stock: deleted and emptied ones drop out
+        units = {}
+        for inv in store.inventory.all():
+            units[inv["medicine_id"]] = units.get(inv["medicine_id"], 0) + inv["quantity"]
+        assert counters._medicine_quantity == {medicine_id: n for medicine_id, n in units.items() if n}
+
+
+def test_verification_mode_reports_drift():
+    store = make_store(random.Random(0))
+    counters = StockCounters(store, verify=True)
+    counters.total_quantity += 1
+    assert counters.verify() == [f"total_quantity: {counters.total_quantity} != {counters.total_quantity - 1}"]
+    with pytest.raises(AssertionError, match="Stock counters drifted"):
+        counters.low_stock()
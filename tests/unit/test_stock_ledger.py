@@ -0,0 +1,81 @@
+"""Append-only stock ledger (database and mock backends)."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from models import StockMovement
+from services import stock_ledger
+from services.movement_types import StockError
+
+
+def consumption(backend, medicine_id, window):
+    totals = backend.get_consumption(medicine_id, *window)
+    return totals["dispensed"], totals["written_off"]
+
+
+def all_movements(backend, inventory_id):
+    movements, _ = backend.get_stock_movements_page(inventory_id, 500)
+    return [(m["movement_type"], m["quantity_change"]) for m in movements]
+
+
+def exercise(backend, medicine_id):
+    """Receive, dispense, write off and adjust one new batch; returns its id"""
+    batch = backend.add_inventory_item({"medicine_id": medicine_id, "quantity": 50, "reorder_level": 5})
+    backend.record_stock_movement(batch["id"], "dispense", 12)
+    backend.record_stock_movement(batch["id"], "write_off", 3)
+    backend.record_stock_movement(batch["id"], "adjustment", -5)
+    return batch["id"]
+
+
+@pytest.fixture
+def medicine_id(real_data):
+    return real_data.add_medicine({"name": "Paracetamol", "category": "Painkiller", "price": 2.0})["id"]
+
+
+def test_quantity_is_the_sum_of_the_movements(real_data, medicine_id, db):
+    batch_id = exercise(real_data, medicine_id)
+    assert all_movements(real_data, batch_id) == [
+        ("receipt", 50), ("dispense", -12), ("write_off", -3), ("adjustment", -5),
+    ]
+    assert real_data.get_inventory_item_by_id(batch_id)["quantity"] == 30
+    with pytest.raises(StockError):
+        real_data.record_stock_movement(batch_id, "dispense", 31)
+
+    assert stock_ledger.take_snapshots(db) == 1
+    db.commit()
+    real_data.record_stock_movement(batch_id, "receipt", 10)
+    assert stock_ledger.quantity_at(db, batch_id) == 40
+    assert stock_ledger.quantity_at(db, batch_id, datetime.now(timezone.utc) - timedelta(days=1)) == 0
+
+
+def test_deleting_a_batch_keeps_its_ledger(real_data, medicine_id, db):
+    batch_id = exercise(real_data, medicine_id)
+    window = (datetime.now(timezone.utc) - timedelta(hours=1), datetime.now(timezone.utc) + timedelta(hours=1))
+    before = real_data.get_consumption(medicine_id, *window)
+
+    real_data.remove_inventory_item(batch_id)
+    assert len(all_movements(real_data, batch_id)) == 4
+    assert real_data.get_consumption(medicine_id, *window) == before
+    assert real_data.get_stock_level(batch_id) is None
+
+    # The next batch gets a new id, not the deleted one's history
+    new_batch = real_data.add_inventory_item({"medicine_id": medicine_id, "quantity": 7})
+    assert new_batch["id"] != batch_id
+    assert all_movements(real_data, new_batch["id"]) == [("receipt", 7)]
+
+    real_data.remove_medicine(medicine_id)
+    assert db.query(StockMovement).count() == 5
+    assert real_data.get_consumption(medicine_id, *window) == before
+
+
+def test_backends_keep_the_same_history(real_data, medicine_id, mock):
+    window = (datetime.now(timezone.utc) - timedelta(hours=1), datetime.now(timezone.utc) + timedelta(hours=1))
+    histories = []
+    for backend, med in ((real_data, medicine_id), (mock, 1)):
+        batch_id = exercise(backend, med)
+        consumed = consumption(backend, med, window)
+        backend.remove_inventory_item(batch_id)
+        histories.append((all_movements(backend, batch_id), consumed, consumption(backend, med, window)))
+    assert histories[0] == histories[1]
+    assert histories[0][1] == (12, 3) == histories[0][2]